@@ -1,28 +1,224 @@
 """Script to rename a project.
 
 1. Input the new project and repo names.
-1. Copy the files to the new project name.
-1. Update the contents of the files.
+1. Copy the files to the new project name, updating their contents.
 1. Create a credentials file.
+
+Files are copied and rewritten in a single pass over the tree, on a thread
+pool.  Every name in the name map is replaced in one scan per file with a
+compiled alternation regex.  Binary files (with a NUL byte near the start)
+are copied as is, and files larger than ``MMAP_THRESHOLD`` are scanned
+through ``mmap`` instead of being read into memory.
+
+With ``--dry-run`` nothing is written: a unified diff of every change is
+streamed to stdout instead.
+
+Every copy writes a manifest, ``.rename_manifest.json``, in the new project.
+It records, per file, the size, mtime and hash of the template source and
+the hash of the written output.  ``--sync`` re-runs the rename on an
+existing project from an updated template.  It only copies files whose
+source changed, detected by mtime and size first and by hash only when those
+differ.  A destination file whose hash no longer matches the recorded output
+was edited locally: it is reported as a conflict and left alone, unless
+``--force`` is given.
 """
 
+from collections import Counter
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import replace
+import difflib
+from functools import lru_cache
+import hashlib
+import json
+import mmap
 from pathlib import Path
 import re
 import shutil
 from typing import Annotated
+from typing import NamedTuple
 
 from rich import print as rprint
 import typer
 
 app = typer.Typer()
 
+# Files at least this large are scanned through mmap
+MMAP_THRESHOLD = 1 << 20
+# A NUL byte in the first bytes marks a file as binary
+BINARY_SNIFF_SIZE = 8192
+# Written in the new project root, records what each file was copied from
+MANIFEST_NAME = ".rename_manifest.json"
+
+
+class NameReplacer:
+    """Replace every key of a name map in a single scan.
+
+    Keys are tried longest first, so a key is never shadowed by one of its
+    prefixes, and replaced text is never scanned again.
+
+    Args:
+        name_map: Old names mapped to new names.
+    """
+
+    def __init__(self, name_map: dict[str, str]) -> None:
+        """Compile the alternation patterns for text and bytes."""
+        keys = sorted(name_map, key=len, reverse=True)
+        self.str_map = dict(name_map)
+        self.bytes_map = {k.encode(): v.encode() for k, v in name_map.items()}
+        self.str_pattern = re.compile("|".join(re.escape(k) for k in keys))
+        self.bytes_pattern = re.compile(b"|".join(re.escape(k.encode()) for k in keys))
+
+    def replace_str(self, s: str) -> str:
+        """Replace all names in a string."""
+        return self.str_pattern.sub(lambda m: self.str_map[m.group()], s)
+
+    def replace_bytes(self, data: bytes) -> bytes:
+        """Replace all names in UTF-8 encoded content."""
+        return self.bytes_pattern.sub(lambda m: self.bytes_map[m.group()], data)
+
+
+@lru_cache(maxsize=8)
+def _name_replacer(name_items: tuple[tuple[str, str], ...]) -> NameReplacer:
+    """Build a replacer once per name map."""
+    return NameReplacer(dict(name_items))
+
 
 def replace_in_str(s: str, name_map: dict[str, str]) -> str:
     """Replace all instances of project_name (and variations) in a string."""
-    for old, new in name_map.items():
-        s = s.replace(old, new)
-    return s
+    return _name_replacer(tuple(name_map.items())).replace_str(s)
+
+
+def is_binary(head: bytes) -> bool:
+    """Return whether the first bytes of a file mark it as binary."""
+    return b"\0" in head
+
+
+def file_hash(fp: Path) -> str:
+    """Return the hex digest of a file's content."""
+    with fp.open("rb") as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    """How one file of the new project was produced.
+
+    Attributes:
+        source: Source path relative to the template root.
+        source_mtime_ns: Source modification time when last copied.
+        source_size: Source size when last copied.
+        source_hash: Source content hash when last copied.
+        output_hash: Hash of the file as written, to detect local edits.
+    """
+
+    source: str
+    source_mtime_ns: int
+    source_size: int
+    source_hash: str
+    output_hash: str
+
+
+class CopyTask(NamedTuple):
+    """One file to copy, with its paths relative to both project roots."""
+
+    old_fp: Path
+    new_fp: Path
+    old_rel: str
+    new_rel: str
+
+
+def sync_file(old_fp: Path, new_fp: Path, replacer: NameReplacer) -> str:
+    """Copy a file, replacing the names in its content unless it is binary.
+
+    The file mode is copied too.
+
+    Args:
+        old_fp: Source file.
+        new_fp: Destination file; its folder is created if missing.
+        replacer: Name replacer.
+
+    Returns:
+        What was done: ``"rewritten"``, ``"copied"`` (no name found) or
+        ``"binary"``.
+    """
+    new_fp.parent.mkdir(parents=True, exist_ok=True)
+    if old_fp.stat().st_size >= MMAP_THRESHOLD:
+        action = _sync_large_file(old_fp, new_fp, replacer)
+    else:
+        data = old_fp.read_bytes()
+        if is_binary(data[:BINARY_SNIFF_SIZE]):
+            new_fp.write_bytes(data)
+            action = "binary"
+        else:
+            new_data = replacer.replace_bytes(data)
+            new_fp.write_bytes(new_data)
+            action = "copied" if new_data == data else "rewritten"
+    shutil.copymode(old_fp, new_fp)
+    return action
+
+
+def _sync_large_file(old_fp: Path, new_fp: Path, replacer: NameReplacer) -> str:
+    """Copy a large file through mmap, streaming the replaced content."""
+    with (
+        old_fp.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        if is_binary(mm[:BINARY_SNIFF_SIZE]):
+            shutil.copyfile(old_fp, new_fp)
+            return "binary"
+        if replacer.bytes_pattern.search(mm) is None:
+            shutil.copyfile(old_fp, new_fp)
+            return "copied"
+        with new_fp.open("wb") as out:
+            pos = 0
+            for match in replacer.bytes_pattern.finditer(mm):
+                out.write(mm[pos : match.start()])
+                out.write(replacer.bytes_map[match.group()])
+                pos = match.end()
+            out.write(mm[pos:])
+    return "rewritten"
+
+
+def diff_file(
+    old_fp: Path,
+    old_rel: str,
+    new_rel: str,
+    replacer: NameReplacer,
+) -> str:
+    """Return the unified diff ``sync_file`` would apply, without writing.
+
+    Args:
+        old_fp: Source file.
+        old_rel: Source path relative to the old root, for the diff header.
+        new_rel: Destination path relative to the new root.
+        replacer: Name replacer.
+
+    Returns:
+        The diff, a one-line note for binary or renamed-only files, or an
+        empty string if the file is copied unchanged.
+    """
+    data = old_fp.read_bytes()
+    if is_binary(data[:BINARY_SNIFF_SIZE]):
+        return f"Binary file {old_rel} copied to {new_rel}\n"
+    old_text = data.decode(errors="replace")
+    new_text = replacer.replace_str(old_text)
+    lines = difflib.unified_diff(
+        old_text.splitlines(keepends=True),
+        new_text.splitlines(keepends=True),
+        fromfile=f"a/{old_rel}",
+        tofile=f"b/{new_rel}",
+    )
+    diff = "".join(
+        line if line.endswith("\n") else f"{line}\n\\ No newline at end of file\n"
+        for line in lines
+    )
+    if not diff and old_rel != new_rel:
+        return f"Renamed {old_rel} to {new_rel}\n"
+    return diff
 
 
 def rglobber(fol: Path, skip_fols: list[str]) -> Generator[Path]:
@@ -36,13 +232,6 @@ def rglobber(fol: Path, skip_fols: list[str]) -> Generator[Path]:
             yield item
 
 
-def update_file_content(fp: Path, name_map: dict[str, str]) -> None:
-    """Update the contents of a file."""
-    contents = fp.read_text()
-    new_contents = replace_in_str(contents, name_map)
-    fp.write_text(new_contents)
-
-
 class Rename:
     """Class to rename a project."""
 
@@ -97,6 +286,8 @@ class Rename:
             self.name_map["Pitrified"] = self.github_username
             self.name_map["pitrified"] = self.github_username.lower()
 
+        self.replacer = NameReplacer(self.name_map)
+
         rprint("[bold]Name map:[/bold]")
         rprint(self.name_map)
 
@@ -131,9 +322,12 @@ class Rename:
             rprint("Exiting.")
             raise typer.Exit
 
-    def copy_files(self) -> None:
-        """Copy files to the new project name."""
-        rprint("Copying files...")
+    def plan_files(self) -> list[CopyTask]:
+        """List the files to copy, with their destination paths.
+
+        Relative paths are POSIX strings sliced from the root, as
+        ``Path.relative_to`` dominates the time of a no-change sync.
+        """
         # skip these directories (matched by directory name)
         skip_fols = [
             "__pycache__",
@@ -159,6 +353,8 @@ class Rename:
         # except those listed in special_portions
         skip_prefixes = [
             "scratch_space/00_vibes/",
+            # tests of this script, which is not copied
+            "tests/meta/",
         ]
         # special cases: copied to a custom destination path
         special_portions = {
@@ -170,10 +366,11 @@ class Rename:
             ),
         }
 
+        root_len = len(str(self.old_root_fol)) + 1
+        plan: list[CopyTask] = []
         for old_fp in rglobber(self.old_root_fol, skip_fols):
             # get the portion of the source path relative to the root
-            old_relative_portion = old_fp.relative_to(self.old_root_fol)
-            old_relative_str = str(old_relative_portion)
+            old_relative_str = str(old_fp)[root_len:]
 
             # skip certain files
             if old_relative_str in skip_portions:
@@ -187,26 +384,211 @@ class Rename:
             # change the file name in the relative portion
             if old_relative_str in special_portions:
                 # change the file name in a custom way
-                new_relative_portion = Path(special_portions[old_relative_str])
+                new_relative_str = special_portions[old_relative_str]
             else:
                 # change the file name in the standard way with the name map
-                new_relative_portion = Path(
-                    replace_in_str(old_relative_str, self.name_map),
+                new_relative_str = self.replacer.replace_str(old_relative_str)
+
+            plan.append(
+                CopyTask(
+                    old_fp=old_fp,
+                    new_fp=self.new_root_fol / new_relative_str,
+                    old_rel=Path(old_relative_str).as_posix(),
+                    new_rel=Path(new_relative_str).as_posix(),
                 )
+            )
+        return plan
 
-            # get the destination path
-            new_fp = self.new_root_fol / new_relative_portion
+    @property
+    def manifest_fp(self) -> Path:
+        """Path of the manifest in the new project."""
+        return self.new_root_fol / MANIFEST_NAME
 
-            # ensure the destination directory exists
-            new_fp.parent.mkdir(parents=True, exist_ok=True)
-            # copy the file
-            shutil.copy(old_fp, new_fp)
+    def load_manifest(self) -> dict[str, ManifestEntry]:
+        """Load the manifest of the new project.
+
+        Returns:
+            Manifest entries keyed by path relative to the new root.
+
+        Raises:
+            typer.Exit: If the manifest is missing or was written with a
+                different name map.
+        """
+        if not self.manifest_fp.exists():
+            rprint(
+                f"[red]Error: no {MANIFEST_NAME} in {self.new_root_fol}, "
+                "run without --sync first.[/red]"
+            )
+            raise typer.Exit(code=1)
+        raw = json.loads(self.manifest_fp.read_text())
+        if raw["name_map"] != self.name_map:
+            rprint(
+                "[red]Error: the project was generated with a different "
+                f"name map: {raw['name_map']}[/red]"
+            )
+            raise typer.Exit(code=1)
+        return {rel: ManifestEntry(**item) for rel, item in raw["files"].items()}
 
-    def update_files(self) -> None:
-        """Update the contents of the files."""
-        rprint("Updating files...")
-        for new_fp in rglobber(self.new_root_fol, []):
-            update_file_content(new_fp, self.name_map)
+    def save_manifest(self, files: dict[str, ManifestEntry]) -> None:
+        """Write the manifest of the new project."""
+        raw = {
+            "name_map": self.name_map,
+            "files": {rel: asdict(files[rel]) for rel in sorted(files)},
+        }
+        self.manifest_fp.write_text(json.dumps(raw, indent=2) + "\n")
+
+    def _copy_entry(self, task: CopyTask) -> tuple[str, ManifestEntry]:
+        """Copy a file and return its action and manifest entry."""
+        old_fp, new_fp = task.old_fp, task.new_fp
+        stat = old_fp.stat()
+        action = sync_file(old_fp, new_fp, self.replacer)
+        entry = ManifestEntry(
+            source=task.old_rel,
+            source_mtime_ns=stat.st_mtime_ns,
+            source_size=stat.st_size,
+            source_hash=file_hash(old_fp),
+            output_hash=file_hash(new_fp),
+        )
+        return action, entry
+
+    def copy_files(self, workers: int | None = None) -> Counter[str]:
+        """Copy the files to the new project, updating their contents.
+
+        Also writes the manifest used by ``sync_files``.
+
+        Args:
+            workers: Thread pool size; None for the executor default.
+
+        Returns:
+            Number of files per action of ``sync_file``.
+        """
+        rprint("Copying and updating files...")
+        plan = self.plan_files()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self._copy_entry, plan))
+        actions = Counter(action for action, _ in results)
+        self.save_manifest(
+            {
+                task.new_rel: entry
+                for task, (_, entry) in zip(plan, results, strict=True)
+            }
+        )
+        rprint(
+            f"Copied {len(plan)} files: {actions['rewritten']} rewritten, "
+            f"{actions['copied']} unchanged, {actions['binary']} binary"
+        )
+        return actions
+
+    def _sync_entry(
+        self,
+        task: CopyTask,
+        entry: ManifestEntry | None,
+        *,
+        force: bool,
+    ) -> tuple[str, ManifestEntry | None]:
+        """Bring one file up to date with its source.
+
+        Returns:
+            The status (``"unchanged"``, ``"added"``, ``"updated"`` or
+            ``"conflict"``) and the manifest entry to keep.
+        """
+        old_fp, new_fp = task.old_fp, task.new_fp
+        stat = old_fp.stat()
+        if (
+            entry is not None
+            and entry.source_mtime_ns == stat.st_mtime_ns
+            and entry.source_size == stat.st_size
+        ):
+            return "unchanged", entry
+        source_hash = file_hash(old_fp)
+        if entry is not None and entry.source_hash == source_hash:
+            # Touched but not changed: remember the new stat for next time
+            return "unchanged", replace(
+                entry, source_mtime_ns=stat.st_mtime_ns, source_size=stat.st_size
+            )
+        if not force and new_fp.exists():
+            expected = entry.output_hash if entry is not None else None
+            if file_hash(new_fp) != expected:
+                return "conflict", entry
+        sync_file(old_fp, new_fp, self.replacer)
+        new_entry = ManifestEntry(
+            source=task.old_rel,
+            source_mtime_ns=stat.st_mtime_ns,
+            source_size=stat.st_size,
+            source_hash=source_hash,
+            output_hash=file_hash(new_fp),
+        )
+        return ("added" if entry is None else "updated"), new_entry
+
+    def sync_files(
+        self,
+        workers: int | None = None,
+        *,
+        force: bool = False,
+    ) -> Counter[str]:
+        """Update an existing project with the template files that changed.
+
+        Args:
+            workers: Thread pool size; None for the executor default.
+            force: Overwrite local edits instead of reporting conflicts.
+
+        Returns:
+            Number of files per status, plus ``"removed"`` for files whose
+            template source no longer exists.
+        """
+        rprint("Syncing changed files...")
+        manifest = self.load_manifest()
+        plan = self.plan_files()
+
+        def sync_task(task: CopyTask) -> tuple[str, ManifestEntry | None]:
+            return self._sync_entry(task, manifest.get(task.new_rel), force=force)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(sync_task, plan))
+
+        statuses: Counter[str] = Counter()
+        files: dict[str, ManifestEntry] = {}
+        for task, (status, entry) in zip(plan, results, strict=True):
+            rel = task.new_rel
+            statuses[status] += 1
+            if entry is not None:
+                files[rel] = entry
+            if status == "conflict":
+                rprint(f"[yellow]Conflict: {rel} was edited locally, skipped.[/yellow]")
+        for rel in sorted(manifest.keys() - {task.new_rel for task in plan}):
+            statuses["removed"] += 1
+            rprint(f"[yellow]Removed from the template: {rel}[/yellow]")
+        self.save_manifest(files)
+        rprint(
+            f"Synced {len(plan)} files: {statuses['updated']} updated, "
+            f"{statuses['added']} added, {statuses['unchanged']} unchanged, "
+            f"{statuses['conflict']} conflicts, {statuses['removed']} removed"
+        )
+        return statuses
+
+    def diff_files(self, workers: int | None = None) -> int:
+        """Stream the unified diff of the copy to stdout, writing nothing.
+
+        Diffs are computed on the thread pool and printed in file order as
+        soon as each one is ready.
+
+        Args:
+            workers: Thread pool size; None for the executor default.
+
+        Returns:
+            Number of files that would differ from their source.
+        """
+
+        def diff_task(task: CopyTask) -> str:
+            return diff_file(task.old_fp, task.old_rel, task.new_rel, self.replacer)
+
+        n_changed = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for diff in pool.map(diff_task, self.plan_files()):
+                if diff:
+                    n_changed += 1
+                    typer.echo(diff, nl=False)
+        return n_changed
 
     def create_cred_file(self) -> None:
         """Create the credentials file."""
@@ -215,11 +597,32 @@ class Rename:
         sample_cred = f"{self.name_map['PROJECT_NAME']}_SAMPLE_ENV_VAR=sample"
         self.cred_fp.write_text(sample_cred)
 
-    def run(self) -> None:
-        """Run the renaming process."""
+    def run(
+        self,
+        *,
+        dry_run: bool = False,
+        sync: bool = False,
+        force: bool = False,
+        workers: int | None = None,
+    ) -> None:
+        """Run the renaming process.
+
+        Args:
+            dry_run: Print the diff of the changes instead of writing them.
+            sync: Update an existing project with the changed template files.
+            force: With ``sync``, overwrite files edited locally.
+            workers: Thread pool size; None for the executor default.
+        """
+        if dry_run:
+            n_changed = self.diff_files(workers)
+            rprint(f"[bold]Dry run:[/bold] {n_changed} files would change.")
+            return
+        if sync:
+            self.sync_files(workers, force=force)
+            rprint("[bold green]Done.[/bold green]")
+            return
         self.check_inputs()
-        self.copy_files()
-        self.update_files()
+        self.copy_files(workers)
         self.create_cred_file()
         rprint("[bold green]Done.[/bold green]")
 
@@ -247,10 +650,31 @@ def main(
             )
         ),
     ] = None,
+    dry_run: Annotated[  # noqa: FBT002
+        bool,
+        typer.Option(help="Print a unified diff of the changes, write nothing."),
+    ] = False,
+    sync: Annotated[  # noqa: FBT002
+        bool,
+        typer.Option(
+            help=(
+                "Update an existing generated project, copying only the "
+                "template files that changed since the last run."
+            )
+        ),
+    ] = False,
+    force: Annotated[  # noqa: FBT002
+        bool,
+        typer.Option(help="With --sync, overwrite files edited locally."),
+    ] = False,
+    workers: Annotated[
+        int | None,
+        typer.Option(help="Number of I/O threads. Defaults to the executor default."),
+    ] = None,
 ) -> None:
     """Rename the project template to a new project name."""
     rename = Rename(project_name, repo_name, github_username)
-    rename.run()
+    rename.run(dry_run=dry_run, sync=sync, force=force, workers=workers)
 
 
 if __name__ == "__main__":
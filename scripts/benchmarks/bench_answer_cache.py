@@ -0,0 +1,85 @@
+"""Benchmark lookups in the semantic answer cache.
+
+Fills a ``SemanticAnswerCache`` with ``--entries`` random answers of
+``--dim``-dimension embeddings, then times lookups of near-duplicates of
+cached questions (hits) and of random questions (misses), and the insert of
+new answers into the full cache, which evicts the least recently used.
+
+Usage:
+    uv run python scripts/benchmarks/bench_answer_cache.py --entries 10000
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Annotated
+
+from loguru import logger as lg
+import numpy as np
+import typer
+
+from project_name.rag.answer_cache import SemanticAnswerCache
+
+app = typer.Typer()
+
+SOURCES = [{"id": "a", "source": "a.md", "score": 0.9}]
+
+
+def time_ms(calls: list[tuple], func: Callable[..., object]) -> list[float]:
+    """Call ``func`` on each argument tuple, returning the times in ms."""
+    times = []
+    for args in calls:
+        start = time.perf_counter()
+        func(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+@app.command()
+def main(
+    entries: Annotated[int, typer.Option(help="Cached answers")] = 10_000,
+    dim: Annotated[int, typer.Option(help="Embedding dimension")] = 768,
+    lookups: Annotated[int, typer.Option(help="Lookups per kind")] = 500,
+) -> None:
+    """Run the answer cache benchmark."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((entries, dim), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticAnswerCache(Path(tmp) / "answers.sqlite", max_entries=entries)
+        start = time.perf_counter()
+        for i, vector in enumerate(vectors):
+            cache.put(vector.tolist(), 5, f"Q{i}", f"Answer {i}.", SOURCES)
+        lg.info(f"Filled {entries} answers in {time.perf_counter() - start:.1f} s")
+
+        picks = rng.integers(0, entries, lookups)
+        noise = 0.05 * rng.standard_normal((lookups, dim), dtype=np.float32)
+        hits = [
+            ((vectors[i] + n).tolist(), 5) for i, n in zip(picks, noise, strict=True)
+        ]
+        misses = [
+            (v.tolist(), 5)
+            for v in rng.standard_normal((lookups, dim), dtype=np.float32)
+        ]
+        new = [
+            (v.tolist(), 5, "New?", "New.", SOURCES)
+            for v in rng.standard_normal((lookups, dim), dtype=np.float32)
+        ]
+        for label, calls, func in (
+            ("hit", hits, cache.get),
+            ("miss", misses, cache.get),
+            ("insert", new, cache.put),
+        ):
+            times = time_ms(calls, func)
+            lg.info(
+                f"{label}: median {statistics.median(times):.2f} ms, "
+                f"p95 {statistics.quantiles(times, n=20)[-1]:.2f} ms"
+            )
+        n_lookups = cache.stats.hits + cache.stats.misses
+        lg.info(f"Hit rate {cache.stats.hit_rate:.1%} over {n_lookups} lookups")
+        cache.close()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,105 @@
+"""Benchmark the BM25 keyword index.
+
+Indexes a synthetic corpus of ``--chunks`` chunks drawn from a Zipf-like
+vocabulary with a few identifiers, then reports:
+
+* the indexing and save throughput, and the size of the saved postings;
+* the time to reopen the index, which maps the postings instead of reading
+  them;
+* the median and p95 latency of keyword searches, before and after a batch
+  of unsaved additions.
+
+Usage:
+    uv run python scripts/benchmarks/bench_bm25.py --chunks 100000
+"""
+
+from pathlib import Path
+import random
+import statistics
+import tempfile
+import time
+from typing import Annotated
+
+from haystack import Document
+from loguru import logger as lg
+import typer
+
+from project_name.rag.bm25 import BM25Index
+
+app = typer.Typer()
+
+
+def make_chunks(n_chunks: int, words: int, vocab: int) -> list[Document]:
+    """Return chunks of Zipf-distributed words with a rare identifier each."""
+    rng = random.Random(0)  # noqa: S311
+    terms = [f"w{i}" for i in range(vocab)]
+    weights = [1 / (i + 1) for i in range(vocab)]
+    return [
+        Document(
+            id=str(i),
+            content=" ".join(rng.choices(terms, weights, k=words)) + f" ERR_{i}",
+            meta={"source": f"{i // 10}.md"},
+        )
+        for i in range(n_chunks)
+    ]
+
+
+def search_ms(index: BM25Index, queries: list[str], top_k: int) -> list[float]:
+    """Run the queries, returning the time of each in ms."""
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, top_k)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def log_latency(label: str, times: list[float]) -> None:
+    """Log the median and p95 of ``times``."""
+    lg.info(
+        f"{label}: median {statistics.median(times):.2f} ms, "
+        f"p95 {statistics.quantiles(times, n=20)[-1]:.2f} ms"
+    )
+
+
+@app.command()
+def main(
+    chunks: Annotated[int, typer.Option(help="Chunks in the corpus")] = 100_000,
+    words: Annotated[int, typer.Option(help="Words per chunk")] = 150,
+    vocab: Annotated[int, typer.Option(help="Vocabulary size")] = 30_000,
+    queries: Annotated[int, typer.Option(help="Searches per run")] = 200,
+) -> None:
+    """Run the BM25 benchmark."""
+    documents = make_chunks(chunks, words, vocab)
+    rng = random.Random(1)  # noqa: S311
+    questions = [
+        f"w{rng.randrange(50)} w{rng.randrange(5_000)} ERR_{rng.randrange(chunks)}"
+        for _ in range(queries)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        fol = Path(tmp) / "bm25"
+        index = BM25Index(fol)
+        start = time.perf_counter()
+        index.add(documents)
+        added = time.perf_counter() - start
+        start = time.perf_counter()
+        index.save()
+        saved = time.perf_counter() - start
+        size = sum(fp.stat().st_size for fp in fol.rglob("*.npy"))
+        lg.info(
+            f"Indexed {chunks} chunks in {added:.1f} s "
+            f"({chunks / added:,.0f} chunks/s), saved in {saved:.1f} s, "
+            f"postings {size / 2**20:.1f} MiB"
+        )
+
+        start = time.perf_counter()
+        reopened = BM25Index(fol)
+        lg.info(f"Reopened in {time.perf_counter() - start:.2f} s")
+        log_latency("search", search_ms(reopened, questions, top_k=20))
+
+        reopened.add(make_chunks(1_000, words, vocab))
+        log_latency("search with 1000 unsaved", search_ms(reopened, questions, 20))
+
+
+if __name__ == "__main__":
+    app()
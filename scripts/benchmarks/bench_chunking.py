@@ -0,0 +1,72 @@
+"""Benchmark the token chunker against haystack's word splitter.
+
+Splits a synthetic corpus with ``DocumentSplitter`` by words, then with
+``TokenChunker`` inline and on a thread pool, and reports the throughput
+of each and the token count spread of the word chunks, which the token
+chunker bounds exactly.
+
+Usage:
+    uv run python scripts/benchmarks/bench_chunking.py --encoding cl100k_base
+"""
+
+import random
+import time
+from typing import Annotated
+
+from haystack import Document
+from haystack.components.preprocessors import DocumentSplitter
+from loguru import logger as lg
+import typer
+
+from project_name.rag.chunking import TokenChunker
+from project_name.rag.chunking import get_encoding
+
+app = typer.Typer()
+
+WORDS = ["token", "chunk", "naïve", "café", "embedding", "retrieval", "über", "a"]
+
+
+def make_corpus(n_docs: int, words_per_doc: int) -> list[str]:
+    """Return random texts mixing ASCII and accented words."""
+    rng = random.Random(0)  # noqa: S311
+    return [" ".join(rng.choices(WORDS, k=words_per_doc)) for _ in range(n_docs)]
+
+
+@app.command()
+def main(
+    encoding: Annotated[str, typer.Option(help="Model or encoding name")] = (
+        "cl100k_base"
+    ),
+    n_docs: Annotated[int, typer.Option(help="Texts in the corpus")] = 2_000,
+    words_per_doc: Annotated[int, typer.Option(help="Words per text")] = 2_000,
+    chunk_tokens: Annotated[int, typer.Option(help="Tokens per chunk")] = 512,
+    workers: Annotated[int, typer.Option(help="Threads of the pooled run")] = 4,
+) -> None:
+    """Run the chunking benchmark."""
+    texts = make_corpus(n_docs, words_per_doc)
+    enc = get_encoding(encoding)
+
+    splitter = DocumentSplitter(split_by="word", split_length=chunk_tokens // 2)
+    splitter.warm_up()
+    start = time.perf_counter()
+    word_chunks = splitter.run(documents=[Document(content=t) for t in texts])
+    elapsed = time.perf_counter() - start
+    sizes = [len(enc.encode(d.content or "")) for d in word_chunks["documents"]]
+    lg.info(
+        f"word splitter: {n_docs / elapsed:.0f} docs/s, "
+        f"chunk tokens {min(sizes)}..{max(sizes)}"
+    )
+
+    for n_workers in (1, workers):
+        chunker = TokenChunker(enc, chunk_tokens=chunk_tokens, workers=n_workers)
+        start = time.perf_counter()
+        sizes = [chunk.n_tokens for chunk in chunker.iter_chunks(texts)]
+        elapsed = time.perf_counter() - start
+        lg.info(
+            f"token chunker, {n_workers} worker(s): {n_docs / elapsed:.0f} docs/s, "
+            f"chunk tokens {min(sizes)}..{max(sizes)}"
+        )
+
+
+if __name__ == "__main__":
+    app()
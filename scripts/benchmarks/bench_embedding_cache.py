@@ -0,0 +1,102 @@
+"""Benchmark re-indexing a partly changed corpus through the embedding cache.
+
+Embeds a synthetic corpus of chunks through ``CachedDocumentEmbedder`` with
+a fake embedder that counts the chunks it receives, changes a fraction of
+the chunks and embeds the corpus again, as a rebuild of the store would.
+
+Reports the embedder calls of each pass, the hit rate of the second, and
+the cache lookup time per chunk, the overhead paid on a hit.
+
+Usage:
+    uv run python scripts/benchmarks/bench_embedding_cache.py --n-chunks 20000
+"""
+
+from dataclasses import replace
+from pathlib import Path
+import random
+import tempfile
+import time
+from typing import Annotated
+from typing import Any
+
+from haystack import Document
+from haystack import component
+from loguru import logger as lg
+import typer
+
+from project_name.rag.embedding_cache import CachedDocumentEmbedder
+
+app = typer.Typer()
+
+
+@component
+class CountingEmbedder:
+    """Return random vectors, counting the embedded chunks."""
+
+    model = "counting"
+
+    def __init__(self, dim: int) -> None:
+        """Set the vector dimension."""
+        self.dim = dim
+        self.embedded = 0
+
+    @component.output_types(documents=list[Document], meta=dict[str, Any])
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Embed the documents with random vectors."""
+        self.embedded += len(documents)
+        return {
+            "documents": [
+                replace(doc, embedding=[random.random() for _ in range(self.dim)])  # noqa: S311
+                for doc in documents
+            ],
+            "meta": {},
+        }
+
+
+def embed_all(
+    embedder: CachedDocumentEmbedder, docs: list[Document], batch_size: int
+) -> float:
+    """Embed the documents in batches and return the elapsed seconds."""
+    start = time.perf_counter()
+    for i in range(0, len(docs), batch_size):
+        embedder.run(documents=docs[i : i + batch_size])
+    return time.perf_counter() - start
+
+
+@app.command()
+def main(
+    n_chunks: Annotated[int, typer.Option(help="Chunks in the corpus")] = 20_000,
+    changed: Annotated[float, typer.Option(help="Fraction changed")] = 0.05,
+    dim: Annotated[int, typer.Option(help="Vector dimension")] = 768,
+    batch_size: Annotated[int, typer.Option(help="Chunks per call")] = 32,
+) -> None:
+    """Run the embedding cache benchmark."""
+    docs = [Document(content=f"chunk {i} " * 20) for i in range(n_chunks)]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_fol = Path(tmp)
+        first = CountingEmbedder(dim)
+        elapsed = embed_all(
+            CachedDocumentEmbedder(first, cache_fol=cache_fol), docs, batch_size
+        )
+        lg.info(f"first pass: {first.embedded} chunks embedded in {elapsed:.2f} s")
+
+        n_changed = int(n_chunks * changed)
+        for i in random.sample(range(n_chunks), n_changed):
+            docs[i] = Document(content=f"changed {i} " * 20)
+        second = CountingEmbedder(dim)
+        embedder = CachedDocumentEmbedder(second, cache_fol=cache_fol)
+        elapsed = embed_all(embedder, docs, batch_size)
+        stats = embedder.cache.stats
+        lg.info(
+            f"second pass, {changed:.0%} changed: {second.embedded} chunks embedded "
+            f"({second.embedded / n_chunks:.1%} of the first pass), "
+            f"hit rate {stats.hit_rate:.1%}, {elapsed:.2f} s"
+        )
+
+        lookup = CachedDocumentEmbedder(CountingEmbedder(dim), cache_fol=cache_fol)
+        elapsed = embed_all(lookup, docs, batch_size)
+        lg.info(f"all hits: {elapsed / n_chunks * 1e6:.1f} us per chunk")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,191 @@
+"""Benchmark the shared LLM client against direct SDK calls.
+
+Serves a fake OpenAI-compatible embedding server on a local port: each
+request takes ``--latency-ms`` plus ``--per-text-ms`` per text, and requests
+beyond ``--capacity`` in flight are refused with 429.  Then embeds:
+
+* ``--questions`` single questions at once, a fifth of them repeated, as
+  concurrent API requests would: one SDK request per question, against one
+  ``embed`` call per question through the client;
+* ``--chunks`` chunks in batches of ``--batch-size``: one batch after the
+  other, as the haystack embedders do, against one ``embed_many`` call.
+
+Reports the wall time, the requests the server received and how many it
+refused, for each run.
+
+Usage:
+    uv run python scripts/benchmarks/bench_llm_client.py --capacity 8
+"""
+
+import asyncio
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+import random
+from threading import Lock
+from threading import Thread
+import time
+from typing import Annotated
+
+from loguru import logger as lg
+import openai
+from pydantic import SecretStr
+import typer
+
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.rag.llm_client import build_llm_client
+
+app = typer.Typer()
+
+
+class ServerStats:
+    """Requests seen by the fake server."""
+
+    def __init__(self, capacity: int) -> None:
+        """Start with no request."""
+        self.capacity = capacity
+        self.lock = Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.refused = 0
+
+    def reset(self) -> None:
+        """Forget the previous run."""
+        with self.lock:
+            self.requests = 0
+            self.refused = 0
+
+
+def make_handler(
+    stats: ServerStats, latency_s: float, per_text_s: float
+) -> type[BaseHTTPRequestHandler]:
+    """Return a fake embeddings handler with the given latency and capacity."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            """Embed the input, or refuse it when over capacity."""
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with stats.lock:
+                stats.requests += 1
+                refused = stats.in_flight >= stats.capacity
+                stats.refused += refused
+                stats.in_flight += not refused
+            if refused:
+                self._send(429, {"error": {"message": "Rate limit reached"}})
+                return
+            try:
+                time.sleep(latency_s + per_text_s * len(body["input"]))
+                data = [
+                    {"object": "embedding", "index": i, "embedding": [float(len(t))]}
+                    for i, t in enumerate(body["input"])
+                ]
+                self._send(200, {"object": "list", "model": "fake", "data": data})
+            finally:
+                with stats.lock:
+                    stats.in_flight -= 1
+
+        def _send(self, status: int, payload: dict) -> None:
+            """Send a JSON response."""
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            """Keep the benchmark output quiet."""
+
+    return Handler
+
+
+async def direct_questions(url: str, questions: list[str]) -> None:
+    """Embed each question in its own request, all at once."""
+    client = openai.AsyncOpenAI(api_key="fake", base_url=url)
+    await asyncio.gather(
+        *(client.embeddings.create(model="fake", input=[q]) for q in questions)
+    )
+    await client.close()
+
+
+async def direct_chunks(url: str, chunks: list[str], batch_size: int) -> None:
+    """Embed the chunks one batch after the other."""
+    client = openai.AsyncOpenAI(api_key="fake", base_url=url)
+    for start in range(0, len(chunks), batch_size):
+        await client.embeddings.create(
+            model="fake", input=chunks[start : start + batch_size]
+        )
+    await client.close()
+
+
+async def client_questions(config: EmbedderConfig, questions: list[str]) -> None:
+    """Embed each question with its own call to the shared client."""
+    client = build_llm_client(config, config=LLMClientConfig(retry_backoff=0.05))
+    await asyncio.gather(*(client.embed(q) for q in questions))
+    await client.aclose()
+
+
+async def client_chunks(config: EmbedderConfig, chunks: list[str]) -> None:
+    """Embed the chunks with one call to the shared client."""
+    client = build_llm_client(config, config=LLMClientConfig(retry_backoff=0.05))
+    await client.embed_many(chunks)
+    lg.info(f"  final limit {client.embedding_limiter.limit:.1f}")
+    await client.aclose()
+
+
+def timed(label: str, stats: ServerStats, coro: object) -> None:
+    """Run ``coro`` and log its time and the requests the server saw."""
+    stats.reset()
+    start = time.perf_counter()
+    asyncio.run(coro)  # type: ignore[arg-type]
+    elapsed = time.perf_counter() - start
+    lg.info(
+        f"{label}: {elapsed:.2f} s, {stats.requests} requests, {stats.refused} refused"
+    )
+
+
+@app.command()
+def main(
+    questions: Annotated[int, typer.Option(help="Concurrent questions")] = 200,
+    chunks: Annotated[int, typer.Option(help="Chunks to ingest")] = 2_000,
+    batch_size: Annotated[int, typer.Option(help="Texts per request")] = 32,
+    capacity: Annotated[int, typer.Option(help="Requests the server serves")] = 8,
+    latency_ms: Annotated[float, typer.Option(help="Latency per request")] = 20.0,
+    per_text_ms: Annotated[float, typer.Option(help="Latency per text")] = 0.5,
+) -> None:
+    """Run the LLM client benchmark."""
+    stats = ServerStats(capacity)
+    handler = make_handler(stats, latency_ms / 1000, per_text_ms / 1000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    config = EmbedderConfig(
+        backend="openai",
+        model="fake",
+        url=url,
+        api_key=SecretStr("fake"),
+        batch_size=batch_size,
+    )
+
+    rng = random.Random(0)  # noqa: S311
+    unique = [f"question {i}" for i in range(questions * 4 // 5)]
+    asked = unique + rng.choices(unique, k=questions - len(unique))
+    rng.shuffle(asked)
+    timed("questions, one SDK request each", stats, direct_questions(url, asked))
+    timed("questions, shared client", stats, client_questions(config, asked))
+
+    texts = [f"chunk {i} " * 20 for i in range(chunks)]
+    timed(
+        "chunks, sequential batches",
+        stats,
+        direct_chunks(url, texts, batch_size),
+    )
+    timed("chunks, shared client", stats, client_chunks(config, texts))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,163 @@
+"""Benchmark the time-to-first-token of streamed answers.
+
+Serves a fake OpenAI-compatible chat server on a local port, which waits
+``--first-token-ms`` before streaming ``--tokens`` fragments, and streams
+answers through ``QueryService`` with ``--concurrency`` requests at once:
+
+* with the pooled backend of the service, as the API does;
+* with a fresh backend per answer, paying the connection setup each time.
+
+Reports the median and p95 time-to-first-token of each run, and what the
+service adds on top of the server's own first-token latency.
+
+Usage:
+    uv run python scripts/benchmarks/bench_query_ttft.py --concurrency 8
+"""
+
+import asyncio
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+import statistics
+from threading import Thread
+import time
+from typing import Annotated
+
+from haystack import Document
+from loguru import logger as lg
+from pydantic import SecretStr
+import typer
+
+from project_name.config.rag.query_config import GeneratorConfig
+from project_name.rag.chat import build_chat_backend
+from project_name.rag.query import QueryService
+
+app = typer.Typer()
+
+DOCS = [Document(content=f"Passage {i}.", meta={"source": f"{i}.md"}) for i in range(5)]
+
+
+class StaticRetriever:
+    """Return the same passages for every question."""
+
+    def embed(self, query: str) -> list[float]:  # noqa: ARG002
+        """Return the same embedding for every question."""
+        return [1.0]
+
+    def retrieve(
+        self,
+        query: str,  # noqa: ARG002
+        top_k: int,
+        embedding: list[float] | None = None,  # noqa: ARG002
+    ) -> list[Document]:
+        """Return the first ``top_k`` passages."""
+        return DOCS[:top_k]
+
+
+def make_handler(first_token_s: float, n_tokens: int) -> type[BaseHTTPRequestHandler]:
+    """Return a fake chat completions handler with the given latency."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            """Stream ``n_tokens`` chunks after ``first_token_s`` seconds."""
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(first_token_s)
+            for i in range(n_tokens):
+                chunk = {
+                    "id": "c",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": "fake",
+                    "choices": [{"index": 0, "delta": {"content": f" t{i}"}}],
+                }
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def _write_chunk(self, data: bytes) -> None:
+            """Write one HTTP chunk and flush it."""
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            """Keep the benchmark output quiet."""
+
+    return Handler
+
+
+async def answer_ttft(service: QueryService) -> float:
+    """Stream one answer and return its time-to-first-token in ms."""
+    started_at = time.perf_counter()
+    documents = await service.retrieve("question")
+    async for event, data in service.stream_answer(
+        "question", documents, started_at=started_at
+    ):
+        if event == "done":
+            return data["ttft_ms"]
+    msg = "The answer did not finish"
+    raise RuntimeError(msg)
+
+
+async def run(
+    config: GeneratorConfig, n_requests: int, concurrency: int, *, pooled: bool
+) -> list[float]:
+    """Stream ``n_requests`` answers, ``concurrency`` at a time."""
+    pooled_service = QueryService(
+        StaticRetriever(), build_chat_backend(config), max_concurrency=concurrency
+    )
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with slots:
+            if pooled:
+                return await answer_ttft(pooled_service)
+            service = QueryService(StaticRetriever(), build_chat_backend(config))
+            try:
+                return await answer_ttft(service)
+            finally:
+                await service.aclose()
+
+    ttfts = await asyncio.gather(*(one() for _ in range(n_requests)))
+    await pooled_service.aclose()
+    return list(ttfts)
+
+
+@app.command()
+def main(
+    n_requests: Annotated[int, typer.Option(help="Answers per run")] = 200,
+    concurrency: Annotated[int, typer.Option(help="Answers at once")] = 8,
+    first_token_ms: Annotated[int, typer.Option(help="Server first token")] = 20,
+    tokens: Annotated[int, typer.Option(help="Tokens per answer")] = 50,
+) -> None:
+    """Run the time-to-first-token benchmark."""
+    handler = make_handler(first_token_ms / 1000, tokens)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    config = GeneratorConfig(
+        backend="openai",
+        model="fake",
+        url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        api_key=SecretStr("bench"),
+    )
+    try:
+        for pooled in (True, False):
+            ttfts = asyncio.run(run(config, n_requests, concurrency, pooled=pooled))
+            median = statistics.median(ttfts)
+            p95 = statistics.quantiles(ttfts, n=20)[-1]
+            label = "pooled backend" if pooled else "backend per answer"
+            lg.info(
+                f"{label}: ttft median {median:.1f} ms, p95 {p95:.1f} ms, "
+                f"overhead {median - first_token_ms:.1f} ms"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    app()
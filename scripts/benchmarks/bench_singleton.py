@@ -0,0 +1,97 @@
+"""Benchmark Singleton construction under contention and the hot path.
+
+Compares the locked ``Singleton`` metaclass with the previous unlocked
+check-then-create version:
+
+* first call: ``--n-threads`` threads call a class with a slow constructor
+  at the same moment; reports how many instances were built;
+* hot path: every thread calls the class ``--n-calls`` times once the
+  instance exists; reports ns per call.
+
+Usage:
+    uv run python scripts/benchmarks/bench_singleton.py --n-threads 16
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Annotated
+from typing import Any
+from typing import ClassVar
+
+from loguru import logger as lg
+import typer
+
+from project_name.metaclasses.singleton import Singleton
+
+app = typer.Typer()
+
+
+class UnlockedSingleton(type):
+    """The previous metaclass: unlocked check-then-create."""
+
+    _instances: ClassVar[dict[type, Any]] = {}
+
+    def __call__(cls, *args, **kwargs):  # noqa: ANN002, ANN003, ANN204
+        """Singleton instance creation."""
+        if cls not in cls._instances:
+            cls._instances[cls] = super().__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+def make_class(metaclass: type, built: list[int], init_s: float) -> type:
+    """Create a class whose constructor records itself and sleeps."""
+
+    def __init__(_self: object) -> None:  # noqa: N807
+        built.append(1)
+        time.sleep(init_s)
+
+    return metaclass("Params", (), {"__init__": __init__})
+
+
+def bench_first_call(label: str, metaclass: type, n_threads: int) -> None:
+    """Call a fresh class from many threads at once and count constructions."""
+    built: list[int] = []
+    cls = make_class(metaclass, built, init_s=0.05)
+    barrier = threading.Barrier(n_threads)
+
+    def first_call(_: int) -> object:
+        barrier.wait()
+        return cls()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(n_threads) as pool:
+        list(pool.map(first_call, range(n_threads)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    lg.info(f"{label}: first call built {len(built)} instances in {elapsed_ms:.0f} ms")
+
+
+def bench_hot_path(label: str, metaclass: type, n_threads: int, n_calls: int) -> None:
+    """Time repeated calls once the instance exists."""
+    cls = make_class(metaclass, [], init_s=0)
+    cls()
+
+    def hammer(_: int) -> None:
+        for _ in range(n_calls):
+            cls()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(n_threads) as pool:
+        list(pool.map(hammer, range(n_threads)))
+    elapsed_ns = (time.perf_counter() - start) * 1e9
+    lg.info(f"{label}: hot path {elapsed_ns / (n_threads * n_calls):.0f} ns/call")
+
+
+@app.command()
+def main(
+    n_threads: Annotated[int, typer.Option(help="Concurrent threads")] = 16,
+    n_calls: Annotated[int, typer.Option(help="Calls per thread")] = 200_000,
+) -> None:
+    """Run the singleton contention benchmark."""
+    for label, metaclass in [("unlocked", UnlockedSingleton), ("locked  ", Singleton)]:
+        bench_first_call(label, metaclass, n_threads)
+        bench_hot_path(label, metaclass, n_threads, n_calls)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,92 @@
+"""Benchmark Jinja2 template cold start and render latency.
+
+Compares the default environment against one with a warm bytecode cache and
+startup precompilation, as configured by ``configure_templates``.
+
+Reports, for each setup:
+
+* cold start: time from a fresh environment to the first render of every page;
+* p50 / p99 latency of repeated renders of each page.
+
+Usage:
+    uv run python scripts/benchmarks/bench_template_render.py --n-renders 5000
+"""
+
+from pathlib import Path
+import statistics
+import tempfile
+import time
+from typing import Annotated
+from typing import Any
+
+from fastapi.templating import Jinja2Templates
+from loguru import logger as lg
+import typer
+
+from project_name.params.project_name_params import get_project_name_paths
+from project_name.webapp.core.assets import AssetManifest
+from project_name.webapp.core.templates import configure_templates
+
+app = typer.Typer()
+
+USER = {
+    "name": "Bench User",
+    "email": "bench@example.com",
+    "picture": "https://example.com/bench.jpg",
+}
+PAGES: dict[str, dict[str, Any]] = {
+    "pages/landing.html": {"user": None, "flash": None, "active_page": "landing"},
+    "pages/dashboard.html": {"user": USER, "active_page": "dashboard"},
+    "partials/user_card.html": {"user": USER},
+    "pages/error.html": {"user": None, "status_code": 404, "message": "Missing"},
+}
+
+
+def make_templates(cache_fol: Path | None) -> Jinja2Templates:
+    """Build a fresh renderer, optionally with bytecode cache and precompile."""
+    templates = Jinja2Templates(directory=get_project_name_paths().templates_fol)
+    templates.env.globals["asset_url"] = AssetManifest().url
+    if cache_fol is not None:
+        configure_templates(templates, cache_fol, auto_reload=False)
+    return templates
+
+
+def render_all(templates: Jinja2Templates) -> None:
+    """Render every benchmarked page once."""
+    for name, context in PAGES.items():
+        templates.env.get_template(name).render(context)
+
+
+def bench_setup(label: str, cache_fol: Path | None, n_renders: int) -> None:
+    """Report cold start and per-page render latency for one setup."""
+    start = time.perf_counter()
+    templates = make_templates(cache_fol)
+    render_all(templates)
+    cold_ms = (time.perf_counter() - start) * 1000
+    lg.info(f"{label}: cold start {cold_ms:.2f} ms")
+
+    for name, context in PAGES.items():
+        timings = []
+        for _ in range(n_renders):
+            start = time.perf_counter()
+            templates.env.get_template(name).render(context)
+            timings.append((time.perf_counter() - start) * 1e6)
+        cuts = statistics.quantiles(timings, n=100)
+        lg.info(f"{label}: {name:<24} p50 {cuts[49]:7.1f} us | p99 {cuts[98]:7.1f} us")
+
+
+@app.command()
+def main(
+    n_renders: Annotated[int, typer.Option(help="Renders per page")] = 2000,
+) -> None:
+    """Run the template render benchmark."""
+    bench_setup("default ", None, n_renders)
+    with tempfile.TemporaryDirectory() as tmp_fol:
+        cache_fol = Path(tmp_fol)
+        # Populate the bytecode cache as a previous deploy would have
+        make_templates(cache_fol)
+        bench_setup("bytecode", cache_fol, n_renders)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,160 @@
+"""Benchmark ``BaseModelKwargs.to_kw`` against the previous implementation.
+
+The previous implementation iterated the model into a dict, popped
+``kwargs`` and filtered it again for ``exclude_none``.  Reports the time per
+call of, for each ``exclude_none`` setting:
+
+* previous: the old implementation;
+* current: the field-plan implementation on a mutable model;
+* frozen: the memoized result of a frozen model without a ``kwargs`` dict;
+* recursive: ``to_kw(recursive=True)`` against ``model_dump`` plus flattening.
+
+The pytest-benchmark plugin is not a dependency of the project, so this is a
+standalone script like the other benchmarks.
+
+Usage:
+    uv run python scripts/benchmarks/bench_to_kw.py --n-calls 100000
+"""
+
+from collections.abc import Callable
+import time
+from typing import Annotated
+from typing import Any
+
+from loguru import logger as lg
+from pydantic import ConfigDict
+from pydantic import Field
+import typer
+
+from project_name.data_models.basemodel_kwargs import BaseModelKwargs
+
+app = typer.Typer()
+
+
+def previous_to_kw(model: BaseModelKwargs, *, exclude_none: bool = False) -> dict:
+    """Run the previous ``to_kw`` implementation."""
+    base_dict = (
+        {k: v for k, v in model if v is not None} if exclude_none else dict(model)
+    )
+    if "kwargs" in base_dict:
+        kwargs_value = base_dict.pop("kwargs")
+        if isinstance(kwargs_value, dict):
+            if exclude_none:
+                base_dict.update(
+                    {k: v for k, v in kwargs_value.items() if v is not None}
+                )
+            else:
+                base_dict.update(kwargs_value)
+        else:
+            base_dict["kwargs"] = kwargs_value
+    return base_dict
+
+
+class EmbedderConfig(BaseModelKwargs):
+    """A config shaped like one splatted into a haystack component."""
+
+    model: str = "nomic-embed-text"
+    url: str = "http://localhost:11434"
+    batch_size: int = 32
+    timeout: float | None = 120.0
+    prefix: str | None = None
+    suffix: str | None = None
+    progress_bar: bool = False
+    kwargs: dict[str, Any] = Field(
+        default_factory=lambda: {"keep_alive": "5m", "truncate": None}
+    )
+
+
+class FrozenEmbedderConfig(EmbedderConfig):
+    """The same config, frozen.
+
+    Without the ``kwargs`` dict, which could be mutated in place and so would
+    keep the result from being memoized.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    kwargs: dict[str, Any] | None = None
+
+
+class PipelineConfig(BaseModelKwargs):
+    """A config nesting other configs."""
+
+    name: str = "ingest"
+    embedder: EmbedderConfig = Field(default_factory=EmbedderConfig)
+    fallbacks: list[EmbedderConfig] = Field(
+        default_factory=lambda: [EmbedderConfig(), EmbedderConfig()]
+    )
+
+
+def flatten_kwargs(value: Any) -> Any:  # noqa: ANN401
+    """Flatten ``kwargs`` keys of a ``model_dump`` result at every level."""
+    if isinstance(value, list):
+        return [flatten_kwargs(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    flat = {k: flatten_kwargs(v) for k, v in value.items() if k != "kwargs"}
+    if isinstance(value.get("kwargs"), dict):
+        flat.update(flatten_kwargs(value["kwargs"]))
+    return flat
+
+
+def time_per_call(label: str, call: Callable[[], object], n_calls: int) -> float:
+    """Run ``call`` ``n_calls`` times and log the time per call in ns."""
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        call()
+    per_call_ns = (time.perf_counter() - start) / n_calls * 1e9
+    lg.info(f"{label}: {per_call_ns:,.0f} ns/call")
+    return per_call_ns
+
+
+@app.command()
+def main(
+    n_calls: Annotated[int, typer.Option(help="Calls per variant")] = 100_000,
+) -> None:
+    """Run the to_kw benchmark."""
+    config = EmbedderConfig()
+    frozen = FrozenEmbedderConfig()
+    for exclude_none in (False, True):
+        if config.to_kw(exclude_none=exclude_none) != previous_to_kw(
+            config, exclude_none=exclude_none
+        ):
+            msg = "to_kw differs from the previous implementation"
+            raise ValueError(msg)
+        lg.info(f"exclude_none={exclude_none}")
+        previous = time_per_call(
+            "  previous ",
+            lambda e=exclude_none: previous_to_kw(config, exclude_none=e),
+            n_calls,
+        )
+        current = time_per_call(
+            "  current  ", lambda e=exclude_none: config.to_kw(exclude_none=e), n_calls
+        )
+        memoized = time_per_call(
+            "  frozen   ", lambda e=exclude_none: frozen.to_kw(exclude_none=e), n_calls
+        )
+        lg.info(
+            f"  current {previous / current:.1f}x, "
+            f"frozen {previous / memoized:.1f}x faster than previous"
+        )
+
+    pipeline = PipelineConfig()
+    if pipeline.to_kw(recursive=True) != flatten_kwargs(pipeline.model_dump()):
+        msg = "recursive to_kw differs from model_dump plus flattening"
+        raise ValueError(msg)
+    lg.info("nested")
+    time_per_call("  model_dump only   ", pipeline.model_dump, n_calls // 10)
+    dumped = time_per_call(
+        "  model_dump+flatten",
+        lambda: flatten_kwargs(pipeline.model_dump()),
+        n_calls // 10,
+    )
+    recursive = time_per_call(
+        "  recursive to_kw   ", lambda: pipeline.to_kw(recursive=True), n_calls // 10
+    )
+    lg.info(f"  recursive is {dumped / recursive:.1f}x faster than dump+flatten")
+
+
+if __name__ == "__main__":
+    app()
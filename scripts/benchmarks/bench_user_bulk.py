@@ -0,0 +1,70 @@
+"""Benchmark bulk user import / export throughput.
+
+Reports rows/sec for NDJSON import and export on each ``UserStore`` backend.
+
+Usage:
+    uv run python scripts/benchmarks/bench_user_bulk.py --n-users 200000
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+import tempfile
+import time
+from typing import Annotated
+
+from fastapi_tools.schemas.auth import UserResponse
+from loguru import logger as lg
+import typer
+
+from project_name.webapp.services.user_service import UserService
+from project_name.webapp.services.user_store import InMemoryUserStore
+from project_name.webapp.services.user_store import SqliteUserStore
+from project_name.webapp.services.user_store import UserStore
+
+app = typer.Typer()
+
+
+def make_ndjson(n_users: int) -> Iterator[bytes]:
+    """Yield ``n_users`` synthetic NDJSON user lines."""
+    for i in range(n_users):
+        user = UserResponse(
+            id=f"user_{i:08d}",
+            email=f"user_{i}@example.com",
+            name=f"User {i}",
+            picture=f"https://example.com/{i}.jpg",
+        )
+        yield user.model_dump_json().encode() + b"\n"
+
+
+def bench_store(name: str, store: UserStore, n_users: int) -> None:
+    """Time a full import followed by a full export on one store."""
+    service = UserService(store)
+
+    start = time.perf_counter()
+    imported = service.import_ndjson(make_ndjson(n_users))
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exported = sum(1 for _ in service.export_ndjson())
+    export_s = time.perf_counter() - start
+
+    lg.info(
+        f"{name:>8}: import {imported / import_s:>10,.0f} rows/s"
+        f" | export {exported / export_s:>10,.0f} rows/s"
+    )
+
+
+@app.command()
+def main(
+    n_users: Annotated[int, typer.Option(help="Number of users to move")] = 100_000,
+) -> None:
+    """Run the bulk import / export benchmark."""
+    bench_store("memory", InMemoryUserStore(), n_users)
+    with tempfile.TemporaryDirectory() as tmp_fol:
+        store = SqliteUserStore(Path(tmp_fol) / "users.db")
+        bench_store("sqlite", store, n_users)
+        store.close()
+
+
+if __name__ == "__main__":
+    app()
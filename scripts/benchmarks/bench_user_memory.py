@@ -0,0 +1,83 @@
+"""Benchmark resident memory per user in the in-memory user store.
+
+Compares a plain ``dict[str, UserResponse]`` (the previous layout) with
+``InMemoryUserStore``, which keeps compact ``UserRecord`` objects, filled
+either in bulk with ``put_many`` or one login at a time with ``put`` and
+read back with ``get``, as the webapp does.
+
+Usage:
+    uv run python scripts/benchmarks/bench_user_memory.py --n-users 200000
+"""
+
+from collections.abc import Callable
+import tracemalloc
+from typing import Annotated
+
+from fastapi_tools.schemas.auth import UserResponse
+from loguru import logger as lg
+import typer
+
+from project_name.webapp.services.user_store import InMemoryUserStore
+
+app = typer.Typer()
+
+
+def make_users(n_users: int) -> list[UserResponse]:
+    """Build ``n_users`` synthetic users."""
+    return [
+        UserResponse(
+            id=f"user_{i:08d}",
+            email=f"user_{i}@example.com",
+            name=f"User {i}",
+            picture=f"https://example.com/{i}.jpg",
+        )
+        for i in range(n_users)
+    ]
+
+
+def measure(build: Callable[[], object]) -> tuple[int, object]:
+    """Return the bytes allocated while building a container, and the container."""
+    tracemalloc.start()
+    container = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated, container
+
+
+@app.command()
+def main(
+    n_users: Annotated[int, typer.Option(help="Number of users to store")] = 100_000,
+) -> None:
+    """Run the memory benchmark."""
+    # Users arrive as UserResponse; pay for the JSON strings only once
+    users_json = [u.model_dump_json() for u in make_users(n_users)]
+
+    def build_dict() -> dict[str, UserResponse]:
+        users = (UserResponse.model_validate_json(u) for u in users_json)
+        return {u.id: u for u in users}
+
+    def build_store() -> InMemoryUserStore:
+        store = InMemoryUserStore()
+        store.put_many(UserResponse.model_validate_json(u) for u in users_json)
+        return store
+
+    def build_store_put_get() -> InMemoryUserStore:
+        store = InMemoryUserStore()
+        for u in users_json:
+            user = UserResponse.model_validate_json(u)
+            store.put(user)
+            store.get(user.id)
+        return store
+
+    variants = [
+        ("dict", build_dict),
+        ("put_many", build_store),
+        ("put+get", build_store_put_get),
+    ]
+    for name, build in variants:
+        allocated, _ = measure(build)
+        lg.info(f"{name:>8}: {allocated / n_users:>8.1f} bytes/user")
+
+
+if __name__ == "__main__":
+    app()
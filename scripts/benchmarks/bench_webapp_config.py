@@ -0,0 +1,65 @@
+"""Benchmark the cost of ``WebappParams.to_config()``.
+
+Reports the time per call of:
+
+* validated build: the previous behavior, a validated config on every call;
+* unvalidated update: ``to_config(validate=False)`` after changing an
+  attribute, which copies the cached config with the changed field;
+* cached: ``to_config()`` with nothing changed.
+
+Usage:
+    uv run python scripts/benchmarks/bench_webapp_config.py --n-calls 20000
+"""
+
+from collections.abc import Callable
+import time
+from typing import Annotated
+
+from loguru import logger as lg
+import typer
+
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.webapp.webapp_params import WebappParams
+
+app = typer.Typer()
+
+
+def time_per_call(label: str, call: Callable[[], object], n_calls: int) -> float:
+    """Run ``call`` ``n_calls`` times and log the time per call in ns."""
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        call()
+    per_call_ns = (time.perf_counter() - start) / n_calls * 1e9
+    lg.info(f"{label}: {per_call_ns:,.0f} ns/call")
+    return per_call_ns
+
+
+@app.command()
+def main(
+    n_calls: Annotated[int, typer.Option(help="Calls per variant")] = 20_000,
+) -> None:
+    """Run the to_config benchmark."""
+    params = WebappParams(stage=EnvStageType.DEV, location=EnvLocationType.LOCAL)
+
+    def validated_build() -> None:
+        params.port += 1
+        params.to_config()
+
+    def unvalidated_update() -> None:
+        params.port += 1
+        params.to_config(validate=False)
+
+    validated = time_per_call("validated build   ", validated_build, n_calls)
+    updated = time_per_call("unvalidated update", unvalidated_update, n_calls)
+    params.to_config()
+    cached = time_per_call("cached            ", params.to_config, n_calls)
+
+    lg.info(
+        f"vs a validated build: update {validated / updated:.1f}x faster, "
+        f"cached {validated / cached:.0f}x faster"
+    )
+
+
+if __name__ == "__main__":
+    app()
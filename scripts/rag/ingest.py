@@ -0,0 +1,34 @@
+"""Ingest the data folder into the Chroma store.
+
+Embeds new and changed files of ``ProjectNamePaths.data_fol`` and writes the
+chunks to the Chroma store in ``cache/chroma``.  Unchanged files are skipped,
+so it is cheap to run again after editing a few documents.
+
+Usage:
+    uv run python scripts/rag/ingest.py
+"""
+
+from loguru import logger as lg
+import typer
+
+from project_name.params.project_name_params import get_project_name_params
+from project_name.rag.ingest import DocumentIngestor
+
+app = typer.Typer()
+
+
+@app.command()
+def main() -> None:
+    """Ingest the data folder."""
+    params = get_project_name_params().ingest
+    lg.info(f"\n{params}")
+    report = DocumentIngestor(params.to_config()).run()
+    lg.info(
+        f"{report.added} added, {report.updated} updated, "
+        f"{report.unchanged} unchanged, {report.removed} removed, "
+        f"{report.chunks} chunks written, {report.cached_chunks} from the cache"
+    )
+
+
+if __name__ == "__main__":
+    app()
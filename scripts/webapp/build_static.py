@@ -0,0 +1,35 @@
+"""Build fingerprinted, precompressed static assets.
+
+Writes content-hashed copies of every file in ``static/`` to
+``static_build/``, with ``.gz`` (and ``.br`` if the ``brotli`` package is
+installed) siblings for text assets, plus the ``manifest.json`` read by the
+webapp at startup.  Run it after changing static files and as a deploy
+build step.
+
+Usage:
+    uv run python scripts/webapp/build_static.py
+"""
+
+from loguru import logger as lg
+import typer
+
+from project_name.params.project_name_params import get_project_name_paths
+from project_name.webapp.core.assets import build_assets
+from project_name.webapp.core.page_cache import brotli_compressor
+
+app = typer.Typer()
+
+
+@app.command()
+def main() -> None:
+    """Build the static assets and their manifest."""
+    paths = get_project_name_paths()
+    brotli_compress = brotli_compressor()
+    if brotli_compress is None:
+        lg.warning("brotli is not installed, skipping .br files: uv add brotli")
+    manifest = build_assets(paths.static_fol, paths.static_build_fol, brotli_compress)
+    lg.info(f"Built {len(manifest)} assets into {paths.static_build_fol}")
+
+
+if __name__ == "__main__":
+    app()
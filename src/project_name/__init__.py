@@ -1,5 +1,12 @@
 """project_name package."""
 
-from project_name.params.load_env import load_env
+from project_name.startup_profile import profiler
+from project_name.startup_profile import startup_phase
 
-load_env()
+# Time every later import when PROJECT_NAME_STARTUP_PROFILE is set
+profiler.install_import_hook()
+
+from project_name.params.load_env import load_env  # noqa: E402
+
+with startup_phase("load_env"):
+    load_env()
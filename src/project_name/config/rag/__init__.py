@@ -0,0 +1 @@
+"""Configuration models for the RAG subsystem."""
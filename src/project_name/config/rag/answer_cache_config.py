@@ -0,0 +1,39 @@
+"""Answer cache config - shape of the semantic answer cache settings.
+
+``AnswerCacheConfig`` describes the cache ``project_name.rag.answer_cache``
+keeps of generated answers: where it is stored, how close a new question
+must be to a cached one to reuse its answer, and when entries are evicted.
+It is built by the paired ``AnswerCacheParams``; like every Config model it
+never reads the environment.
+"""
+
+from pathlib import Path
+
+from pydantic import Field
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+
+from project_name.data_models.basemodel_kwargs import BaseModelKwargs
+
+
+class AnswerCacheConfig(BaseModelKwargs):
+    """Semantic answer cache settings.
+
+    Attributes:
+        fol:
+            Folder of the cache databases, one per answer space.
+        similarity_threshold:
+            Minimum cosine similarity between the embeddings of a new
+            question and a cached one for the cached answer to be returned.
+        max_entries:
+            Answers kept per answer space; the least recently used are
+            evicted beyond it.
+        ttl:
+            Seconds an answer is served after it was generated.  Bounds how
+            long an answer can lag behind re-ingested documents.
+    """
+
+    fol: Path
+    similarity_threshold: float = Field(default=0.95, gt=0, le=1)
+    max_entries: PositiveInt = 10_000
+    ttl: PositiveFloat = 86_400.0
@@ -0,0 +1,179 @@
+"""Ingest config - shape of the document ingestion settings.
+
+``IngestConfig`` describes how ``project_name.rag.ingest`` turns the files
+of a folder into embedded chunks in a persistent Chroma store.  It is built
+by the paired ``IngestParams``; like every Config model it never reads the
+environment.
+
+The sub-configs map onto the haystack components of the pipeline, so they
+are forwarded with ``to_kw()`` where the field names match the component
+arguments.
+"""
+
+from pathlib import Path
+from typing import Literal
+
+from pydantic import Field
+from pydantic import PositiveInt
+from pydantic import SecretStr
+
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.data_models.basemodel_kwargs import BaseModelKwargs
+
+
+class ChromaStoreConfig(BaseModelKwargs):
+    """Persistent Chroma document store.
+
+    Attributes:
+        persist_fol:
+            Folder of the Chroma database.  The ingest manifest is written
+            next to it.
+        collection_name:
+            Chroma collection holding the chunks.
+        distance_function:
+            Distance used by the vector index.
+    """
+
+    persist_fol: Path
+    collection_name: str
+    distance_function: Literal["l2", "cosine", "ip"] = "cosine"
+
+
+class EmbedderConfig(BaseModelKwargs):
+    """Document embedder.
+
+    Attributes:
+        backend:
+            ``"ollama"`` or ``"openai"``: the SDK the ``LLMDocumentEmbedder``
+            and ``LLMTextEmbedder`` send their embedding requests through.
+        model:
+            Embedding model name.
+        url:
+            Server URL; the Ollama URL, or an OpenAI-compatible base URL.
+            None uses the backend default.
+        api_key:
+            API key for the ``openai`` backend.
+        batch_size:
+            Number of chunks sent in one embedding request.
+        cache_fol:
+            Root folder of the on-disk embedding cache; None embeds every
+            chunk.
+        kwargs:
+            Extra embedder arguments: ``prefix``, ``suffix``,
+            ``meta_fields_to_embed`` and ``embedding_separator`` shape the
+            text of each chunk, the others are passed to every embedding
+            request, e.g. ``dimensions``.
+    """
+
+    backend: Literal["ollama", "openai"]
+    model: str
+    url: str | None = None
+    api_key: SecretStr | None = None
+    batch_size: PositiveInt = 32
+    cache_fol: Path | None = None
+    kwargs: dict = Field(default_factory=dict)
+
+
+class SplitterConfig(BaseModelKwargs):
+    """Chunking of the converted documents, as ``DocumentSplitter`` arguments.
+
+    Attributes:
+        split_by:
+            Unit of ``split_length`` and ``split_overlap``.
+        split_length:
+            Maximum number of units per chunk.
+        split_overlap:
+            Number of units shared by consecutive chunks.
+        kwargs:
+            Extra arguments for ``DocumentSplitter``.
+    """
+
+    split_by: Literal["word", "sentence", "passage", "line", "page"] = "word"
+    split_length: PositiveInt = 200
+    split_overlap: int = Field(default=20, ge=0)
+    kwargs: dict = Field(default_factory=dict)
+
+
+class ChunkerConfig(BaseModelKwargs):
+    """Token-aware chunking, as ``TokenChunker`` arguments.
+
+    Attributes:
+        encoding:
+            tiktoken model or encoding name, e.g. ``"cl100k_base"``.
+        chunk_tokens:
+            Maximum tokens per chunk.
+        overlap_tokens:
+            Tokens shared by consecutive chunks.
+        batch_size:
+            Documents tokenized per ``encode_batch`` call.
+        workers:
+            Threads chunking batches in parallel; 1 chunks them inline.
+    """
+
+    encoding: str = "cl100k_base"
+    chunk_tokens: PositiveInt = 512
+    overlap_tokens: int = Field(default=64, ge=0)
+    batch_size: PositiveInt = 64
+    workers: PositiveInt = 1
+
+
+class BM25Config(BaseModelKwargs):
+    """Keyword index kept alongside the Chroma collection.
+
+    Attributes:
+        fol:
+            Folder of the persisted ``BM25Index``.
+        k1:
+            Term frequency saturation of the BM25 score.
+        b:
+            Weight of the document length normalization, from 0 (none) to 1.
+        save_every:
+            Pipeline runs of an ingest between two saves of the index, each
+            followed by a save of the manifest.  A save rewrites the whole
+            index; the ingest always saves at its end.
+    """
+
+    fol: Path
+    k1: float = Field(default=1.2, ge=0)
+    b: float = Field(default=0.75, ge=0, le=1)
+    save_every: PositiveInt = 16
+
+
+class IngestConfig(BaseModelKwargs):
+    """Document ingestion settings.
+
+    Attributes:
+        data_fol:
+            Folder scanned recursively for source files.
+        suffixes:
+            File suffixes to ingest, lowercase with the leading dot.
+        file_batch_size:
+            Number of files converted, split, embedded and written per
+            pipeline run.  Bounds the memory used by an ingest.
+        store:
+            Chroma store the chunks are written to.
+        embedder:
+            Embedder of the chunks.
+        splitter:
+            Chunking settings of ``DocumentSplitter``, used when
+            ``chunker`` is None.
+        chunker:
+            Token-aware chunking settings; when set, chunks are cut on
+            exact token budgets by ``TokenSplitter``.
+        bm25:
+            Keyword index the chunks are also written to, for hybrid
+            retrieval; None keeps the Chroma collection only.
+        llm:
+            Client the chunks are embedded through, with its connection
+            pool and concurrency limit.
+    """
+
+    data_fol: Path
+    suffixes: list[str] = Field(default_factory=lambda: [".md", ".txt"])
+    file_batch_size: PositiveInt = 32
+    store: ChromaStoreConfig
+    embedder: EmbedderConfig
+    splitter: SplitterConfig = Field(default_factory=SplitterConfig)
+    chunker: ChunkerConfig | None = None
+    bm25: BM25Config | None = None
+    llm: LLMClientConfig = Field(default_factory=LLMClientConfig)
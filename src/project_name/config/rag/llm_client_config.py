@@ -0,0 +1,49 @@
+"""LLM client config - shape of the shared model client settings.
+
+``LLMClientConfig`` describes how ``project_name.rag.llm_client`` talks to
+the embedding and chat servers: the size of the connection pool, the
+window over which embedding requests are merged, and the bounds of the
+adaptive concurrency limit.  It is built by the paired ``LLMClientParams``;
+like every Config model it never reads the environment.
+"""
+
+from pydantic import Field
+from pydantic import NonNegativeInt
+from pydantic import PositiveInt
+
+from project_name.data_models.basemodel_kwargs import BaseModelKwargs
+
+
+class LLMClientConfig(BaseModelKwargs):
+    """Shared embedding and chat client settings.
+
+    Attributes:
+        max_connections:
+            Connections kept open to each model server.
+        batch_window:
+            Seconds an embedding request waits for others to share its
+            batch; the batch is sent earlier once it holds
+            ``EmbedderConfig.batch_size`` texts.
+        initial_concurrency:
+            Requests in flight to each server before any feedback.
+        min_concurrency:
+            Lower bound of the adaptive limit.
+        max_concurrency:
+            Upper bound of the adaptive limit.
+        latency_tolerance:
+            A request slower than this multiple of the fastest recent one
+            lowers the limit.
+        max_retries:
+            Times a request refused with 429 is sent again.
+        retry_backoff:
+            Seconds before the first retry, doubled on each retry.
+    """
+
+    max_connections: PositiveInt = 32
+    batch_window: float = Field(default=0.005, ge=0)
+    initial_concurrency: PositiveInt = 4
+    min_concurrency: PositiveInt = 1
+    max_concurrency: PositiveInt = 32
+    latency_tolerance: float = Field(default=2.0, gt=1)
+    max_retries: NonNegativeInt = 3
+    retry_backoff: float = Field(default=0.5, ge=0)
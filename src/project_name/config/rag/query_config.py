@@ -0,0 +1,101 @@
+"""Query config - shape of the retrieval-augmented answer settings.
+
+``QueryConfig`` describes how ``project_name.rag.query`` answers a question:
+the Chroma store, keyword index and embedder used for retrieval, which must
+match the ones the documents were ingested with, the chat model generating
+the answer and the semantic cache of past answers.  It is built by the
+paired ``QueryParams``; like every Config model it never reads the
+environment.
+"""
+
+from typing import Literal
+
+from pydantic import Field
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+from pydantic import SecretStr
+
+from project_name.config.rag.answer_cache_config import AnswerCacheConfig
+from project_name.config.rag.ingest_config import BM25Config
+from project_name.config.rag.ingest_config import ChromaStoreConfig
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.data_models.basemodel_kwargs import BaseModelKwargs
+
+DEFAULT_SYSTEM_PROMPT = (
+    "Answer the question using only the numbered context passages. "
+    "Cite the passages you use as [1], [2], ... "
+    "If the context does not contain the answer, say so."
+)
+
+
+class GeneratorConfig(BaseModelKwargs):
+    """Streaming chat model.
+
+    Attributes:
+        backend:
+            ``"ollama"`` for an Ollama server, ``"openai"`` for the OpenAI
+            API or an OpenAI-compatible server.
+        model:
+            Chat model name.
+        url:
+            Server URL; the Ollama URL, or an OpenAI-compatible base URL.
+            None uses the backend default.
+        api_key:
+            API key for the ``openai`` backend.
+        timeout:
+            Seconds to wait for the server, per read.
+        kwargs:
+            Generation options, e.g. ``temperature``: ``options`` of the
+            Ollama chat call, extra arguments of the OpenAI one.
+    """
+
+    backend: Literal["ollama", "openai"]
+    model: str
+    url: str | None = None
+    api_key: SecretStr | None = None
+    timeout: PositiveFloat = 60.0
+    kwargs: dict = Field(default_factory=dict)
+
+
+class QueryConfig(BaseModelKwargs):
+    """Retrieval-augmented answer settings.
+
+    Attributes:
+        store:
+            Chroma store searched for context.
+        embedder:
+            Embedder of the question, the one the chunks were embedded with.
+        generator:
+            Chat model writing the answer.
+        top_k:
+            Default number of chunks passed as context.
+        max_concurrency:
+            Answers streamed at once by one worker process.
+        queue_timeout:
+            Seconds a request waits for a free slot before it is refused.
+        system_prompt:
+            Instructions sent before the context and the question.
+        answer_cache:
+            Semantic cache of the generated answers; None generates every
+            answer.
+        bm25:
+            Keyword index of the ingestion; when set, chunks are retrieved
+            by keyword and by embedding, and the rankings fused.
+        rrf_k:
+            Smoothing constant of the reciprocal rank fusion.
+        llm:
+            Client shared by the question embeddings and the answers.
+    """
+
+    store: ChromaStoreConfig
+    embedder: EmbedderConfig
+    generator: GeneratorConfig
+    top_k: PositiveInt = 5
+    max_concurrency: PositiveInt = 8
+    queue_timeout: float = Field(default=2.0, ge=0)
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT
+    answer_cache: AnswerCacheConfig | None = None
+    bm25: BM25Config | None = None
+    rrf_k: PositiveInt = 60
+    llm: LLMClientConfig = Field(default_factory=LLMClientConfig)
@@ -1,10 +1,141 @@
 """Base model which can be converted to dict at only the top level of attributes.
 
 Useful to send config values using **config.to_kw() to functions.
+
+``to_kw`` is built for hot factory loops:
+
+* the field names of each model class are read once and cached as a plan,
+  so a call only copies values out of the instance ``__dict__``;
+* for frozen models whose field values can never change the result is
+  memoized per instance, so repeat calls return a shallow copy of the stored
+  dict.  A value can never change if it is a str, number, bool, bytes or
+  None, a tuple or frozenset of such values, or, without ``recursive``, a
+  frozen model of such values.  A recursive result holding a nested model is
+  not memoized, since the caller gets that model as a dict it may mutate;
+* ``recursive=True`` also converts nested models, including those inside
+  lists, tuples and dicts, in the same pass, without a ``model_dump``.
 """
 
+from collections.abc import Iterator
+from functools import cache
+from typing import Any
+import weakref
+
 from pydantic import BaseModel
 
+# Memoized to_kw results of frozen models, keyed by id(model) then by options,
+# None for options whose result may change.  Kept outside the instance so
+# model_copy(update=...) never inherits a result.
+_FROZEN_KW: dict[int, dict[tuple[bool, bool], dict[str, Any] | None]] = {}
+
+# Values returned as is by recursive to_kw without further checks
+_ATOMIC_TYPES = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+@cache
+def _field_plan(model_cls: type[BaseModel]) -> tuple[tuple[str, ...], bool]:
+    """Return the field names to copy and whether the class has ``kwargs``.
+
+    Args:
+        model_cls: Model class.
+
+    Returns:
+        Field names other than ``kwargs``, in definition order, and whether
+        ``kwargs`` is a field.
+    """
+    fields = model_cls.model_fields
+    return tuple(name for name in fields if name != "kwargs"), "kwargs" in fields
+
+
+def _field_values(model: BaseModel) -> Iterator[Any]:
+    """Yield the field values of a model, extra fields included."""
+    yield from model.__dict__.values()
+    if model.__pydantic_extra__:
+        yield from model.__pydantic_extra__.values()
+
+
+def _is_immutable(value: Any, *, models: bool) -> bool:  # noqa: ANN401
+    """Return whether a value, and so its conversion, can never change.
+
+    Args:
+        value: Field value.
+        models: Whether a frozen model of immutable values counts as immutable.
+            False for recursive results, where the model becomes a dict.
+
+    Returns:
+        True if the value is atomic, a tuple or frozenset of immutable values
+        or, with ``models``, a frozen model of immutable values.
+    """
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return True
+    if value_type is tuple or value_type is frozenset:
+        return all(_is_immutable(v, models=models) for v in value)
+    if models and isinstance(value, BaseModel):
+        return bool(value.model_config.get("frozen")) and all(
+            _is_immutable(v, models=True) for v in _field_values(value)
+        )
+    return False
+
+
+def _convert(value: Any, *, exclude_none: bool) -> Any:  # noqa: ANN401
+    """Convert nested models to dicts, descending into containers."""
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if value_type is list or value_type is tuple:
+        converted = [_convert(v, exclude_none=exclude_none) for v in value]
+        return converted if value_type is list else tuple(converted)
+    if value_type is dict:
+        return {k: _convert(v, exclude_none=exclude_none) for k, v in value.items()}
+    if isinstance(value, BaseModelKwargs):
+        return value.to_kw(exclude_none=exclude_none, recursive=True)
+    if isinstance(value, BaseModel):
+        return _model_to_kw(value, exclude_none=exclude_none, recursive=True)
+    return value
+
+
+def _model_to_kw(
+    model: BaseModel,
+    *,
+    exclude_none: bool,
+    recursive: bool,
+) -> dict[str, Any]:
+    """Convert a model to a dict following the ``to_kw`` rules."""
+    names, has_kwargs = _field_plan(type(model))
+    values = model.__dict__
+    extra = model.__pydantic_extra__
+    kwargs_value = values["kwargs"] if has_kwargs else None
+
+    # Fast path: plain copy of the top level
+    if not exclude_none and not recursive:
+        result = {name: values[name] for name in names}
+        if extra:
+            result.update(extra)
+        if isinstance(kwargs_value, dict):
+            result.update(kwargs_value)
+        elif has_kwargs:
+            result["kwargs"] = kwargs_value
+        return result
+
+    items = [(name, values[name]) for name in names]
+    if extra:
+        items.extend(extra.items())
+    # Flatten kwargs if it exists and is a dict
+    if isinstance(kwargs_value, dict):
+        items.extend(kwargs_value.items())
+    elif has_kwargs:
+        # Keep kwargs as a key if it's not a dict
+        items.append(("kwargs", kwargs_value))
+
+    if not recursive:
+        return {name: value for name, value in items if value is not None}
+    return {
+        name: _convert(value, exclude_none=exclude_none)
+        for name, value in items
+        if value is not None or not exclude_none
+    }
+
 
 class BaseModelKwargs(BaseModel):
     """Base model with to_kw method."""
@@ -13,30 +144,39 @@ class BaseModelKwargs(BaseModel):
         self,
         *,
         exclude_none: bool = False,
+        recursive: bool = False,
     ) -> dict:
         """Convert the model to a dictionary, flattening any 'kwargs' attribute.
 
         Args:
             exclude_none (bool): Whether to exclude None values. Defaults to False.
+            recursive (bool): Whether to also convert nested models to dicts,
+                with the same rules. Defaults to False.
+
+        Returns:
+            A new dict.  Nested values other than converted models are shared
+            with the model, so do not mutate them.
         """
-        base_dict = (
-            {k: v for k, v in self if v is not None} if exclude_none else dict(self)
-        )
+        if not self.model_config.get("frozen"):
+            return _model_to_kw(self, exclude_none=exclude_none, recursive=recursive)
 
-        # Flatten kwargs if it exists and is a dict
-        if "kwargs" in base_dict:
-            kwargs_value = base_dict.pop("kwargs")
-            if isinstance(kwargs_value, dict):
-                # Filter None values from kwargs if exclude_none is True
-                if exclude_none:
-                    kwargs_filtered = {
-                        k: v for k, v in kwargs_value.items() if v is not None
-                    }
-                    base_dict.update(kwargs_filtered)
-                else:
-                    base_dict.update(kwargs_value)
-            else:
-                # Put kwargs back if it's not a dict
-                base_dict["kwargs"] = kwargs_value
-
-        return base_dict
+        key = id(self)
+        memo = _FROZEN_KW.get(key)
+        if memo is None:
+            memo = _FROZEN_KW[key] = {}
+            weakref.finalize(self, _FROZEN_KW.pop, key, None)
+        option = (exclude_none, recursive)
+        if option not in memo:
+            immutable = all(
+                _is_immutable(value, models=not recursive)
+                for value in _field_values(self)
+            )
+            memo[option] = (
+                _model_to_kw(self, exclude_none=exclude_none, recursive=recursive)
+                if immutable
+                else None
+            )
+        result = memo[option]
+        if result is None:
+            return _model_to_kw(self, exclude_none=exclude_none, recursive=recursive)
+        return dict(result)
@@ -0,0 +1,88 @@
+"""Lazy module attributes (PEP 562).
+
+Package ``__init__`` modules re-export names from their submodules.
+Importing those submodules eagerly means that, for example, importing any
+module under ``project_name.webapp`` also imports FastAPI and builds the
+application.  ``lazy_exports`` returns module-level ``__getattr__`` and
+``__dir__`` functions that import a submodule only when one of its names is
+first accessed, then cache the value in the package namespace.
+
+An exported name may also be the name of the submodule defining it, as
+``api_router`` in ``project_name.webapp.api.v1``.  Importing that submodule
+directly binds the package attribute to the module, after which
+``__getattr__`` is never called; the package module therefore rebinds such
+a name to the exported attribute whenever the import machinery sets it.
+
+Example:
+    In a package ``__init__.py``::
+
+        __all__ = ["app"]
+        __getattr__, __dir__ = lazy_exports(
+            __name__, {"app": "project_name.webapp.app:app"}
+        )
+"""
+
+from collections.abc import Callable
+from importlib import import_module
+import sys
+from types import ModuleType
+from typing import Any
+
+
+class _LazyModule(ModuleType):
+    """Package module rebinding submodules named like one of its exports.
+
+    Attributes:
+        _lazy_clashes: Submodule name mapped to the exported name and the
+            attribute of the submodule it resolves to.
+    """
+
+    _lazy_clashes: dict[str, tuple[str, str]]
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Store the exported attribute instead of a clashing submodule."""
+        if isinstance(value, ModuleType):
+            clash = self._lazy_clashes.get(value.__name__)
+            if clash is not None and clash[0] == name:
+                value = getattr(value, clash[1])
+        super().__setattr__(name, value)
+
+
+def lazy_exports(
+    package: str,
+    exports: dict[str, str],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build PEP 562 ``__getattr__`` and ``__dir__`` for lazy re-exports.
+
+    Args:
+        package: ``__name__`` of the package re-exporting the names.
+        exports: Public name mapped to ``"module.path:attribute"``.
+
+    Returns:
+        The ``__getattr__`` and ``__dir__`` functions for the package.
+    """
+    clashes: dict[str, tuple[str, str]] = {}
+    for name, target in exports.items():
+        module_name, _, attr = target.partition(":")
+        if module_name == f"{package}.{name}":
+            clashes[module_name] = (name, attr)
+    if clashes:
+        module = sys.modules[package]
+        module.__class__ = _LazyModule
+        module._lazy_clashes = clashes  # noqa: SLF001
+
+    def __getattr__(name: str) -> Any:  # noqa: ANN401, N807
+        target = exports.get(name)
+        if target is None:
+            msg = f"module {package!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        module_name, _, attr = target.partition(":")
+        value = getattr(import_module(module_name), attr)
+        # Cache in the package, so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
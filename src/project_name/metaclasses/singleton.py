@@ -1,18 +1,98 @@
-"""Singleton metaclass.
+"""Singleton metaclasses.
 
 https://stackoverflow.com/questions/6760685/what-is-the-best-way-of-implementing-singleton-in-python
+
+Both metaclasses are thread-safe with double-checked locking: once the
+instance exists, ``__call__`` is a single dict lookup with no lock.  The
+first construction takes a lock private to the class, so concurrent first
+calls build the instance exactly once, and classes never wait on each other.
+
+* ``Singleton``: one instance per class.
+* ``KeyedSingleton``: one instance per class and key, where the key is
+  derived from the constructor arguments by ``singleton_key``, e.g. one
+  params instance per ``EnvType``.
+
+``reset()`` drops cached instances, mainly for tests.
 """
 
+import threading
+from typing import Any
 from typing import ClassVar
 
 
 class Singleton(type):
     """Singleton metaclass."""
 
-    _instances: ClassVar = {}
+    _instances: ClassVar[dict[type, Any]] = {}
+
+    def __init__(cls, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        """Give each class its own construction lock."""
+        super().__init__(*args, **kwargs)
+        # Reentrant, so a constructor that calls its own class fails loudly
+        # with a RecursionError instead of deadlocking
+        cls._singleton_lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):  # noqa: ANN002, ANN003, ANN204
         """Singleton instance creation."""
-        if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
-        return cls._instances[cls]
+        # Fast path: no lock once the instance exists
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[cls] = instance
+            return instance
+
+    def reset(cls) -> None:
+        """Drop the cached instance, so the next call builds a new one."""
+        with cls._singleton_lock:
+            cls._instances.pop(cls, None)
+
+
+class KeyedSingleton(type):
+    """Metaclass keeping one instance per class and key.
+
+    The key defaults to the constructor arguments, so they must be hashable.
+    Override ``singleton_key`` as a classmethod to normalize them, e.g. to
+    map a missing argument to its default value.
+    """
+
+    _instances: ClassVar[dict[tuple[type, Any], Any]] = {}
+
+    def __init__(cls, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        """Give each class its own construction lock."""
+        super().__init__(*args, **kwargs)
+        cls._singleton_lock = threading.RLock()
+
+    def singleton_key(cls, *args, **kwargs) -> Any:  # noqa: ANN002, ANN003, ANN401
+        """Return the instance key for the constructor arguments."""
+        return (args, tuple(sorted(kwargs.items())))
+
+    def __call__(cls, *args, **kwargs):  # noqa: ANN002, ANN003, ANN204
+        """Keyed singleton instance creation."""
+        key = (cls, cls.singleton_key(*args, **kwargs))
+        # Fast path: no lock once the instance exists
+        instance = cls._instances.get(key)
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._instances[key] = instance
+            return instance
+
+    def reset(cls, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        """Drop cached instances.
+
+        With arguments, drop only the instance they map to; without, drop
+        every instance of the class.
+        """
+        with cls._singleton_lock:
+            if args or kwargs:
+                cls._instances.pop((cls, cls.singleton_key(*args, **kwargs)), None)
+                return
+            for key in [key for key in list(cls._instances) if key[0] is cls]:
+                del cls._instances[key]
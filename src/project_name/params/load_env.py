@@ -6,10 +6,15 @@ from dotenv import load_dotenv
 from loguru import logger as lg
 
 
+def env_fp() -> Path:
+    """Return the path of the .env file with the credentials."""
+    # standard place to store credentials outside of version control and folder
+    return Path.home() / "cred" / "python-project-template" / ".env"
+
+
 def load_env() -> None:
     """Load environment variables from .env file."""
-    # standard place to store credentials outside of version control and folder
-    cred_path = Path.home() / "cred" / "python-project-template" / ".env"
+    cred_path = env_fp()
     if cred_path.exists():
         load_dotenv(dotenv_path=cred_path)
         lg.debug(f"Loaded environment variables from {cred_path}")
@@ -0,0 +1,248 @@
+"""Immutable, versioned params snapshots with hot reload.
+
+``ParamsStore`` holds the current ``ParamsSnapshot``: a frozen view of the
+environment type, paths, webapp params and the derived ``WebappConfig``.
+Reading it is a single attribute access, so per-request dependencies such as
+``get_settings`` resolve in O(1) without allocating.
+
+``ParamsStore.reload`` rebuilds the params from the current environment,
+builds and validates the new snapshot from them, and only then swaps the
+params and the snapshot in, the snapshot with one reference assignment.  A
+request that already holds the previous snapshot keeps using it until it
+finishes, and a reload that fails leaves the previous params and snapshot in
+place.
+
+``ParamsWatcher`` polls the ``.env`` file and ``os.environ`` from a daemon
+thread and reloads the store when either changes.  Values in an edited file
+replace the ones in the environment, and a key removed from the file is
+removed from the environment if it still holds the value the file gave it.
+The env type (``ENV_STAGE_TYPE``, ``ENV_LOCATION_TYPE``) is reloaded too.
+Settings consumed when the app is built (host, port, CORS, session
+middleware) still need a restart; values read through ``get_settings`` on
+each request pick up the change.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from dotenv import dotenv_values
+from dotenv import load_dotenv
+from loguru import logger as lg
+
+from project_name.metaclasses.singleton import Singleton
+from project_name.params.load_env import env_fp
+from project_name.params.project_name_params import get_project_name_params
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from fastapi_tools.config.webapp_config import WebappConfig
+
+    from project_name.params.env_type import EnvType
+    from project_name.params.project_name_paths import ProjectNamePaths
+    from project_name.params.webapp.webapp_params import WebappParams
+
+
+@dataclass(frozen=True, slots=True)
+class ParamsSnapshot:
+    """Params as loaded at one point in time.
+
+    Attributes:
+        version: Increases by one on every successful reload.
+        env_type: Environment type the params were loaded for.
+        paths: Paths and folders.
+        webapp: Webapp params.
+        config: ``WebappConfig`` built from ``webapp``.
+        loaded_at: Unix time the snapshot was built.
+    """
+
+    version: int
+    env_type: EnvType
+    paths: ProjectNamePaths
+    webapp: WebappParams
+    config: WebappConfig
+    loaded_at: float
+
+
+class ParamsStore(metaclass=Singleton):
+    """Process-wide holder of the current params snapshot."""
+
+    def __init__(self) -> None:
+        """Initialize an empty store; the first snapshot is built on access."""
+        self._current: ParamsSnapshot | None = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> ParamsSnapshot:
+        """The current snapshot, built on first access."""
+        snapshot = self._current
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._current is None:
+                self._current = self._build()
+            return self._current
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot, 0 before the first one is built."""
+        return self._version
+
+    def _build(self) -> ParamsSnapshot:
+        """Build the next snapshot from the project params; caller holds the lock."""
+        params = get_project_name_params()
+        snapshot = self._snapshot(params.env_type, params.paths, params.webapp)
+        self._version = snapshot.version
+        return snapshot
+
+    def _snapshot(
+        self, env_type: EnvType, paths: ProjectNamePaths, webapp: WebappParams
+    ) -> ParamsSnapshot:
+        """Build the next snapshot, validating the webapp config."""
+        return ParamsSnapshot(
+            version=self._version + 1,
+            env_type=env_type,
+            paths=paths,
+            webapp=webapp,
+            config=webapp.to_config(),
+            loaded_at=time.time(),
+        )
+
+    def reload(self) -> ParamsSnapshot:
+        """Rebuild the params from the current environment and swap them in.
+
+        Returns:
+            The new snapshot.
+
+        Raises:
+            ValueError: If the new params are invalid; the previous params
+                and snapshot stay current, as on any other error.
+        """
+        params = get_project_name_params()
+        with self._lock:
+            # The snapshot needs these, so make sure they are rebuilt
+            _ = params.paths, params.webapp
+            rebuilt = params.rebuild()
+            snapshot = self._snapshot(
+                rebuilt.env_type,
+                rebuilt.paths if rebuilt.paths is not None else params.paths,
+                rebuilt.webapp if rebuilt.webapp is not None else params.webapp,
+            )
+            params.apply(rebuilt)
+            self._current = snapshot
+            self._version = snapshot.version
+            lg.info(f"Loaded params snapshot v{snapshot.version}")
+            return snapshot
+
+
+def get_params_snapshot() -> ParamsSnapshot:
+    """Get the current params snapshot."""
+    return ParamsStore().current
+
+
+class ParamsWatcher:
+    """Reload the params store when the env files or variables change.
+
+    Args:
+        store: Store to reload.
+        env_fps: Env files to watch and load on change.  Defaults to the
+            credentials ``.env`` file.
+        interval: Seconds between polls.
+    """
+
+    def __init__(
+        self,
+        store: ParamsStore,
+        env_fps: Sequence[Path] | None = None,
+        interval: float = 2.0,
+    ) -> None:
+        """Initialize the watcher and record the current state."""
+        self.store = store
+        self.env_fps = list(env_fps) if env_fps is not None else [env_fp()]
+        self.interval = interval
+        self._files = self._file_stamps()
+        self._file_values = [self._read_values(fp) for fp in self.env_fps]
+        self._environ = dict(os.environ)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _file_stamps(self) -> list[tuple[int, int] | None]:
+        """Return the modification time and size of each env file."""
+        stamps: list[tuple[int, int] | None] = []
+        for fp in self.env_fps:
+            try:
+                stat = fp.stat()
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return stamps
+
+    @staticmethod
+    def _read_values(fp: Path) -> dict[str, str | None]:
+        """Return the values set by an env file, empty if it does not exist."""
+        return dotenv_values(fp) if fp.exists() else {}
+
+    def _load_files(self) -> None:
+        """Load the env files, unsetting the keys removed from them."""
+        for i, fp in enumerate(self.env_fps):
+            values = self._read_values(fp)
+            for key, value in self._file_values[i].items():
+                # Keep a value set by anything else than this file
+                if key not in values and os.environ.get(key) == value:
+                    del os.environ[key]
+            self._file_values[i] = values
+            if values:
+                # Values in an edited file replace the ones loaded at startup
+                load_dotenv(dotenv_path=fp, override=True)
+
+    def check(self) -> ParamsSnapshot | None:
+        """Poll once and reload the store if anything changed.
+
+        Returns:
+            The new snapshot, or None if nothing changed or the reload failed.
+        """
+        files = self._file_stamps()
+        if files == self._files and os.environ == self._environ:
+            return None
+        try:
+            if files != self._files:
+                self._load_files()
+            return self.store.reload()
+        except Exception:  # noqa: BLE001
+            # The polling thread must survive any error, e.g. an unreadable file
+            lg.exception("Params reload failed, keeping the previous snapshot")
+            return None
+        finally:
+            self._files = files
+            self._environ = dict(os.environ)
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="params-watcher", daemon=True
+        )
+        self._thread.start()
+        lg.info(f"Watching {self.env_fps} for params changes")
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
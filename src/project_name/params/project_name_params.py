@@ -6,15 +6,50 @@ The class is a singleton, so it can be accessed from anywhere in the code.
 
 There is a parameter regarding the environment type (stage and location), which
 is used to load different paths and other parameters based on the environment.
+
+The sub-params (``paths``, ``sample``, ``webapp``, ``ingest``, ``query``) are
+built on first access, and their modules are imported only then, so a process
+that needs only the paths never imports the webapp stack.
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from loguru import logger as lg
 
 from project_name.metaclasses.singleton import Singleton
 from project_name.params.env_type import EnvType
-from project_name.params.project_name_paths import ProjectNamePaths
-from project_name.params.sample_params import SampleParams
-from project_name.params.webapp import WebappParams
+from project_name.startup_profile import startup_phase
+
+if TYPE_CHECKING:
+    from project_name.params.project_name_paths import ProjectNamePaths
+    from project_name.params.rag.ingest_params import IngestParams
+    from project_name.params.rag.query_params import QueryParams
+    from project_name.params.sample_params import SampleParams
+    from project_name.params.webapp.webapp_params import WebappParams
+
+
+@dataclass(frozen=True, slots=True)
+class RebuiltParams:
+    """Sub-params rebuilt by ``ProjectNameParams.rebuild``, not swapped in yet.
+
+    Attributes:
+        env_type: Environment type the sub-params were built for.
+        paths: Paths, or None if they were not built before.
+        sample: Sample params, or None if they were not built before.
+        webapp: Webapp params, or None if they were not built before.
+        ingest: Ingest params, or None if they were not built before.
+        query: Query params, or None if they were not built before.
+    """
+
+    env_type: EnvType
+    paths: ProjectNamePaths | None
+    sample: SampleParams | None
+    webapp: WebappParams | None
+    ingest: IngestParams | None
+    query: QueryParams | None
 
 
 class ProjectNameParams(metaclass=Singleton):
@@ -22,8 +57,9 @@ class ProjectNameParams(metaclass=Singleton):
 
     def __init__(self) -> None:
         """Load the ProjectName params."""
-        lg.info("Loading ProjectName params")
-        self.set_env_type()
+        with startup_phase("ProjectNameParams.__init__"):
+            lg.info("Loading ProjectName params")
+            self.set_env_type()
 
     def set_env_type(self, env_type: EnvType | None = None) -> None:
         """Set the environment type.
@@ -33,27 +69,143 @@ class ProjectNameParams(metaclass=Singleton):
                 If None, it will be set from the environment variables.
                 Defaults to None.
         """
+        # An explicit env type is kept by reload, one from the env is re-read
+        self._env_type_fixed = env_type is not None
         if env_type is not None:
             self.env_type = env_type
         else:
-            self.env_type = EnvType.from_env_var()
+            with startup_phase("EnvType.from_env_var"):
+                self.env_type = EnvType.from_env_var()
         self.load_config()
 
     def load_config(self) -> None:
-        """Load the project_name configuration."""
-        self.paths = ProjectNamePaths(env_type=self.env_type)
-        self.sample = SampleParams()
-        self.webapp = WebappParams(
-            stage=self.env_type.stage,
-            location=self.env_type.location,
+        """Load the project_name configuration.
+
+        Sub-params are reset here and built lazily on first access.
+        """
+        self._paths: ProjectNamePaths | None = None
+        self._sample: SampleParams | None = None
+        self._webapp: WebappParams | None = None
+        self._ingest: IngestParams | None = None
+        self._query: QueryParams | None = None
+
+    def rebuild(self) -> RebuiltParams:
+        """Build the sub-params already built again, from the current environment.
+
+        The env type is read again from the environment, unless it was passed
+        to ``set_env_type``.  Nothing is swapped in: pass the result to
+        ``apply`` once it is checked.
+
+        Returns:
+            The rebuilt sub-params.
+        """
+        env_type = self.env_type if self._env_type_fixed else EnvType.from_env_var()
+        return RebuiltParams(
+            env_type=env_type,
+            paths=self._build_paths(env_type) if self._paths is not None else None,
+            sample=self._build_sample() if self._sample is not None else None,
+            webapp=self._build_webapp(env_type) if self._webapp is not None else None,
+            ingest=self._build_ingest(env_type) if self._ingest is not None else None,
+            query=self._build_query(env_type) if self._query is not None else None,
         )
 
+    def apply(self, rebuilt: RebuiltParams) -> None:
+        """Swap in sub-params returned by ``rebuild``.
+
+        Sub-params that were not built stay lazy.
+        """
+        self.env_type = rebuilt.env_type
+        self._paths = rebuilt.paths
+        self._sample = rebuilt.sample
+        self._webapp = rebuilt.webapp
+        self._ingest = rebuilt.ingest
+        self._query = rebuilt.query
+
+    def reload(self) -> None:
+        """Rebuild the sub-params already built, from the current environment.
+
+        Replacements are all built before any is swapped in, so a reload that
+        fails (e.g. a production secret was removed) keeps the previous env
+        type and sub-params.
+        """
+        self.apply(self.rebuild())
+
+    def _build_paths(self, env_type: EnvType) -> ProjectNamePaths:
+        """Build the paths, importing their module."""
+        from project_name.params.project_name_paths import ProjectNamePaths  # noqa: PLC0415
+
+        return ProjectNamePaths(env_type=env_type)
+
+    def _build_sample(self) -> SampleParams:
+        """Build the sample params, importing their module."""
+        from project_name.params.sample_params import SampleParams  # noqa: PLC0415
+
+        return SampleParams()
+
+    def _build_webapp(self, env_type: EnvType) -> WebappParams:
+        """Build the webapp params, importing their module."""
+        from project_name.params.webapp.webapp_params import WebappParams  # noqa: PLC0415
+
+        return WebappParams(
+            stage=env_type.stage,
+            location=env_type.location,
+        )
+
+    def _build_ingest(self, env_type: EnvType) -> IngestParams:
+        """Build the ingest params, importing their module."""
+        from project_name.params.rag.ingest_params import IngestParams  # noqa: PLC0415
+
+        return IngestParams(env_type=env_type)
+
+    def _build_query(self, env_type: EnvType) -> QueryParams:
+        """Build the query params, importing their module."""
+        from project_name.params.rag.query_params import QueryParams  # noqa: PLC0415
+
+        return QueryParams(env_type=env_type)
+
+    @property
+    def paths(self) -> ProjectNamePaths:
+        """Paths and folders, built on first access."""
+        if self._paths is None:
+            self._paths = self._build_paths(self.env_type)
+        return self._paths
+
+    @property
+    def sample(self) -> SampleParams:
+        """Sample params, built on first access."""
+        if self._sample is None:
+            self._sample = self._build_sample()
+        return self._sample
+
+    @property
+    def webapp(self) -> WebappParams:
+        """Webapp params, built on first access."""
+        if self._webapp is None:
+            self._webapp = self._build_webapp(self.env_type)
+        return self._webapp
+
+    @property
+    def ingest(self) -> IngestParams:
+        """Document ingestion params, built on first access."""
+        if self._ingest is None:
+            self._ingest = self._build_ingest(self.env_type)
+        return self._ingest
+
+    @property
+    def query(self) -> QueryParams:
+        """Retrieval-augmented answer params, built on first access."""
+        if self._query is None:
+            self._query = self._build_query(self.env_type)
+        return self._query
+
     def __str__(self) -> str:
         """Return the string representation of the object."""
         s = "ProjectNameParams:"
         s += f"\n{self.paths}"
         s += f"\n{self.sample}"
         s += f"\n{self.webapp}"
+        s += f"\n{self.ingest}"
+        s += f"\n{self.query}"
         return s
 
     def __repr__(self) -> str:
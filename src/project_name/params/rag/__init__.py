@@ -0,0 +1 @@
+"""Params for the RAG subsystem."""
@@ -0,0 +1,135 @@
+"""Answer cache params - actual values of the semantic answer cache settings.
+
+Pairs with ``AnswerCacheConfig`` in
+``src/project_name/config/rag/answer_cache_config.py`` and follows the
+``SampleParams`` pattern: literals in ``_load_common_params()`` and
+overrides by stage then location.
+
+Answers are cached in ``ProjectNamePaths.cache_fol/answers``.  While
+developing, documents are re-ingested often, so answers expire after ten
+minutes; in production they live for a day.
+"""
+
+from project_name.config.rag.answer_cache_config import AnswerCacheConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.env_type import UnknownEnvLocationError
+from project_name.params.env_type import UnknownEnvStageError
+from project_name.params.project_name_paths import ProjectNamePaths
+
+
+class AnswerCacheParams:
+    """Semantic answer cache params.
+
+    Args:
+        env_type: Deployment environment (stage + location).  If ``None``,
+            inferred from ``ENV_STAGE_TYPE`` and ``ENV_LOCATION_TYPE``
+            environment variables (defaults: ``dev`` / ``local``).
+    """
+
+    def __init__(self, env_type: EnvType | None = None) -> None:
+        """Load answer cache params for the given environment.
+
+        Args:
+            env_type: Deployment environment (stage + location).
+                If ``None``, inferred from ``ENV_STAGE_TYPE`` and
+                ``ENV_LOCATION_TYPE`` environment variables.
+        """
+        self.env_type: EnvType = env_type or EnvType.from_env_var()
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Orchestrate loading: common first, then stage + location."""
+        self._load_common_params()
+        match self.env_type.stage:
+            case EnvStageType.DEV:
+                self._load_dev_params()
+            case EnvStageType.PROD:
+                self._load_prod_params()
+            case _:
+                raise UnknownEnvStageError(self.env_type.stage)
+
+    def _load_common_params(self) -> None:
+        """Set attributes shared across all environments."""
+        paths = ProjectNamePaths(env_type=self.env_type)
+        self.fol = paths.cache_fol / "answers"
+        self.similarity_threshold: float = 0.95
+
+    def _load_dev_params(self) -> None:
+        """Set DEV-stage attributes, then dispatch on location.
+
+        Short-lived answers, so edits to the documents show up quickly.
+        """
+        self.max_entries: int = 1_000
+        self.ttl: float = 600.0
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_dev_local_params()
+            case EnvLocationType.RENDER:
+                self._load_dev_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_dev_local_params(self) -> None:
+        """Set DEV + LOCAL overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_dev_render_params(self) -> None:
+        """Set DEV + RENDER overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_prod_params(self) -> None:
+        """Set PROD-stage attributes, then dispatch on location."""
+        self.max_entries = 20_000
+        self.ttl = 86_400.0
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_prod_local_params()
+            case EnvLocationType.RENDER:
+                self._load_prod_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_prod_local_params(self) -> None:
+        """Set PROD + LOCAL overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def _load_prod_render_params(self) -> None:
+        """Set PROD + RENDER overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def to_config(self) -> AnswerCacheConfig:
+        """Assemble and return the typed config model.
+
+        Returns:
+            AnswerCacheConfig: The answer cache settings.
+        """
+        return AnswerCacheConfig(
+            fol=self.fol,
+            similarity_threshold=self.similarity_threshold,
+            max_entries=self.max_entries,
+            ttl=self.ttl,
+        )
+
+    def __str__(self) -> str:
+        """Return a human-readable summary."""
+        s = "AnswerCacheParams:"
+        s += f"\n  env_type: {self.env_type}"
+        s += f"\n  fol: {self.fol}"
+        s += f"\n  similarity_threshold: {self.similarity_threshold}"
+        s += f"\n  max_entries: {self.max_entries}"
+        s += f"\n  ttl: {self.ttl} s"
+        return s
+
+    def __repr__(self) -> str:
+        """Return the string representation of the object."""
+        return str(self)
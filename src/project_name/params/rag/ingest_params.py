@@ -0,0 +1,212 @@
+"""Ingest params - actual values of the document ingestion settings.
+
+Pairs with ``IngestConfig`` in ``src/project_name/config/rag/ingest_config.py``
+and follows the ``SampleParams`` pattern: literals in
+``_load_common_params()``, overrides by stage then location, and secrets
+from the environment only.
+
+Sources are read from ``ProjectNamePaths.data_fol``, the Chroma store lives
+in ``cache_fol/chroma``, its BM25 keyword index in ``cache_fol/bm25`` and the
+embedding cache in ``cache_fol/embeddings``.
+Locally the chunks are embedded by an Ollama server; on Render, where no
+Ollama server runs, by the OpenAI API, which needs ``OPENAI_API_KEY``.
+Requests go through the shared client configured by ``LLMClientParams``.
+
+Documents are cut in chunks of 512 ``cl100k_base`` tokens, the tokenizer
+of the OpenAI embedding models, by the token-aware ``TokenChunker``.
+"""
+
+import os
+
+from pydantic import SecretStr
+
+from project_name.config.rag.ingest_config import BM25Config
+from project_name.config.rag.ingest_config import ChromaStoreConfig
+from project_name.config.rag.ingest_config import ChunkerConfig
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.config.rag.ingest_config import SplitterConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.env_type import UnknownEnvLocationError
+from project_name.params.env_type import UnknownEnvStageError
+from project_name.params.project_name_paths import ProjectNamePaths
+from project_name.params.rag.llm_client_params import LLMClientParams
+
+
+class IngestParams:
+    """Document ingestion params.
+
+    Args:
+        env_type: Deployment environment (stage + location).  If ``None``,
+            inferred from ``ENV_STAGE_TYPE`` and ``ENV_LOCATION_TYPE``
+            environment variables (defaults: ``dev`` / ``local``).
+    """
+
+    def __init__(self, env_type: EnvType | None = None) -> None:
+        """Load ingest params for the given environment.
+
+        Args:
+            env_type: Deployment environment (stage + location).
+                If ``None``, inferred from ``ENV_STAGE_TYPE`` and
+                ``ENV_LOCATION_TYPE`` environment variables.
+        """
+        self.env_type: EnvType = env_type or EnvType.from_env_var()
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Orchestrate loading: common first, then stage + location."""
+        self._load_common_params()
+        match self.env_type.stage:
+            case EnvStageType.DEV:
+                self._load_dev_params()
+            case EnvStageType.PROD:
+                self._load_prod_params()
+            case _:
+                raise UnknownEnvStageError(self.env_type.stage)
+
+    def _load_common_params(self) -> None:
+        """Set attributes shared across all environments."""
+        paths = ProjectNamePaths(env_type=self.env_type)
+        self.llm = LLMClientParams(env_type=self.env_type)
+        self.data_fol = paths.data_fol
+        self.suffixes: list[str] = [".md", ".txt"]
+        self.store_persist_fol = paths.cache_fol / "chroma"
+        self.store_collection_name: str = "project_name_docs"
+        self.store_distance_function: str = "cosine"
+        self.bm25_fol = paths.cache_fol / "bm25"
+        self.bm25_k1: float = 1.2
+        self.bm25_b: float = 0.75
+        self.bm25_save_every: int = 16
+        self.split_by: str = "word"
+        self.split_length: int = 200
+        self.split_overlap: int = 20
+        self.chunk_encoding: str = "cl100k_base"
+        self.chunk_tokens: int = 512
+        self.chunk_overlap_tokens: int = 64
+        self.chunk_workers: int = 1
+        self.embed_batch_size: int = 32
+        self.embedder_backend: str = "ollama"
+        self.embedder_model: str = "nomic-embed-text"
+        self.embedder_url: str | None = "http://localhost:11434"
+        self.embedder_api_key: SecretStr | None = None
+        self.embedding_cache_fol = paths.cache_fol / "embeddings"
+
+    def _load_dev_params(self) -> None:
+        """Set DEV-stage attributes, then dispatch on location.
+
+        Small file batches give quick feedback while iterating on the data.
+        """
+        self.file_batch_size: int = 8
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_dev_local_params()
+            case EnvLocationType.RENDER:
+                self._load_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_dev_local_params(self) -> None:
+        """Set DEV + LOCAL overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_prod_params(self) -> None:
+        """Set PROD-stage attributes, then dispatch on location."""
+        self.file_batch_size = 32
+        self.chunk_workers = 4
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_prod_local_params()
+            case EnvLocationType.RENDER:
+                self._load_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_prod_local_params(self) -> None:
+        """Set PROD + LOCAL overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def _load_render_params(self) -> None:
+        """Set RENDER overrides, shared by both stages: embed with OpenAI.
+
+        Raises:
+            KeyError: If ``OPENAI_API_KEY`` is not set.
+        """
+        self.embedder_backend = "openai"
+        self.embedder_model = "text-embedding-3-small"
+        self.embedder_url = None
+        self.embed_batch_size = 64
+        self.embedder_api_key = SecretStr(os.environ["OPENAI_API_KEY"])
+
+    def to_config(self) -> IngestConfig:
+        """Assemble and return the typed config model.
+
+        Returns:
+            IngestConfig: The ingestion settings.
+        """
+        return IngestConfig(
+            data_fol=self.data_fol,
+            suffixes=self.suffixes,
+            file_batch_size=self.file_batch_size,
+            store=ChromaStoreConfig(
+                persist_fol=self.store_persist_fol,
+                collection_name=self.store_collection_name,
+                distance_function=self.store_distance_function,  # type: ignore[arg-type]
+            ),
+            embedder=EmbedderConfig(
+                backend=self.embedder_backend,  # type: ignore[arg-type]
+                model=self.embedder_model,
+                url=self.embedder_url,
+                api_key=self.embedder_api_key,
+                batch_size=self.embed_batch_size,
+                cache_fol=self.embedding_cache_fol,
+            ),
+            splitter=SplitterConfig(
+                split_by=self.split_by,  # type: ignore[arg-type]
+                split_length=self.split_length,
+                split_overlap=self.split_overlap,
+            ),
+            chunker=ChunkerConfig(
+                encoding=self.chunk_encoding,
+                chunk_tokens=self.chunk_tokens,
+                overlap_tokens=self.chunk_overlap_tokens,
+                workers=self.chunk_workers,
+            ),
+            bm25=BM25Config(
+                fol=self.bm25_fol,
+                k1=self.bm25_k1,
+                b=self.bm25_b,
+                save_every=self.bm25_save_every,
+            ),
+            llm=self.llm.to_config(),
+        )
+
+    def __str__(self) -> str:
+        """Return a human-readable summary with secrets masked."""
+        s = "IngestParams:"
+        s += f"\n  env_type: {self.env_type}"
+        s += f"\n  data_fol: {self.data_fol}"
+        s += f"\n  suffixes: {self.suffixes}"
+        s += f"\n  file_batch_size: {self.file_batch_size}"
+        s += f"\n  store: {self.store_persist_fol} ({self.store_collection_name})"
+        s += f"\n  bm25: {self.bm25_fol} (k1 {self.bm25_k1}, b {self.bm25_b}"
+        s += f", saved every {self.bm25_save_every} batches)"
+        s += f"\n  chunks: {self.chunk_tokens} {self.chunk_encoding} tokens"
+        s += f" (overlap {self.chunk_overlap_tokens}, workers {self.chunk_workers})"
+        s += f"\n  embedder: {self.embedder_backend} {self.embedder_model}"
+        s += f" (batch {self.embed_batch_size})"
+        s += f"\n  embedding_cache_fol: {self.embedding_cache_fol}"
+        s += f"\n  llm: {self.llm.initial_concurrency} requests"
+        s += f" (up to {self.llm.max_concurrency})"
+        if self.embedder_api_key is not None:
+            s += "\n  embedder_api_key: [REDACTED]"
+        return s
+
+    def __repr__(self) -> str:
+        """Return the string representation of the object."""
+        return str(self)
@@ -0,0 +1,144 @@
+"""LLM client params - actual values of the shared model client settings.
+
+Pairs with ``LLMClientConfig`` in
+``src/project_name/config/rag/llm_client_config.py`` and follows the
+``SampleParams`` pattern: literals in ``_load_common_params()`` and
+overrides by stage then location.
+
+While developing, a local Ollama server handles a few requests at once, so
+the pool and the concurrency limit stay small; in production they start
+higher and grow up to 64 requests while the server keeps up.
+"""
+
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.env_type import UnknownEnvLocationError
+from project_name.params.env_type import UnknownEnvStageError
+
+
+class LLMClientParams:
+    """Shared embedding and chat client params.
+
+    Args:
+        env_type: Deployment environment (stage + location).  If ``None``,
+            inferred from ``ENV_STAGE_TYPE`` and ``ENV_LOCATION_TYPE``
+            environment variables (defaults: ``dev`` / ``local``).
+    """
+
+    def __init__(self, env_type: EnvType | None = None) -> None:
+        """Load LLM client params for the given environment.
+
+        Args:
+            env_type: Deployment environment (stage + location).
+                If ``None``, inferred from ``ENV_STAGE_TYPE`` and
+                ``ENV_LOCATION_TYPE`` environment variables.
+        """
+        self.env_type: EnvType = env_type or EnvType.from_env_var()
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Orchestrate loading: common first, then stage + location."""
+        self._load_common_params()
+        match self.env_type.stage:
+            case EnvStageType.DEV:
+                self._load_dev_params()
+            case EnvStageType.PROD:
+                self._load_prod_params()
+            case _:
+                raise UnknownEnvStageError(self.env_type.stage)
+
+    def _load_common_params(self) -> None:
+        """Set attributes shared across all environments."""
+        self.batch_window: float = 0.005
+        self.min_concurrency: int = 1
+        self.latency_tolerance: float = 2.0
+        self.max_retries: int = 3
+        self.retry_backoff: float = 0.5
+
+    def _load_dev_params(self) -> None:
+        """Set DEV-stage attributes, then dispatch on location.
+
+        A local model server handles few requests at once.
+        """
+        self.max_connections: int = 8
+        self.initial_concurrency: int = 2
+        self.max_concurrency: int = 8
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_dev_local_params()
+            case EnvLocationType.RENDER:
+                self._load_dev_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_dev_local_params(self) -> None:
+        """Set DEV + LOCAL overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_dev_render_params(self) -> None:
+        """Set DEV + RENDER overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_prod_params(self) -> None:
+        """Set PROD-stage attributes, then dispatch on location."""
+        self.max_connections = 64
+        self.initial_concurrency = 8
+        self.max_concurrency = 64
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_prod_local_params()
+            case EnvLocationType.RENDER:
+                self._load_prod_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_prod_local_params(self) -> None:
+        """Set PROD + LOCAL overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def _load_prod_render_params(self) -> None:
+        """Set PROD + RENDER overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def to_config(self) -> LLMClientConfig:
+        """Assemble and return the typed config model.
+
+        Returns:
+            LLMClientConfig: The shared client settings.
+        """
+        return LLMClientConfig(
+            max_connections=self.max_connections,
+            batch_window=self.batch_window,
+            initial_concurrency=self.initial_concurrency,
+            min_concurrency=self.min_concurrency,
+            max_concurrency=self.max_concurrency,
+            latency_tolerance=self.latency_tolerance,
+            max_retries=self.max_retries,
+            retry_backoff=self.retry_backoff,
+        )
+
+    def __str__(self) -> str:
+        """Return a human-readable summary."""
+        s = "LLMClientParams:"
+        s += f"\n  env_type: {self.env_type}"
+        s += f"\n  max_connections: {self.max_connections}"
+        s += f"\n  batch_window: {self.batch_window} s"
+        s += f"\n  concurrency: {self.initial_concurrency}"
+        s += f" ({self.min_concurrency} to {self.max_concurrency})"
+        s += f"\n  max_retries: {self.max_retries}"
+        s += f" (backoff {self.retry_backoff} s)"
+        return s
+
+    def __repr__(self) -> str:
+        """Return the string representation of the object."""
+        return str(self)
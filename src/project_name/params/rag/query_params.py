@@ -0,0 +1,170 @@
+"""Query params - actual values of the retrieval-augmented answer settings.
+
+Pairs with ``QueryConfig`` in ``src/project_name/config/rag/query_config.py``
+and follows the ``SampleParams`` pattern: literals in
+``_load_common_params()``, overrides by stage then location, and secrets
+from the environment only.
+
+Retrieval reuses the store, keyword index and embedder of ``IngestParams``,
+so questions are embedded in the same space as the ingested chunks, and
+fuses the keyword and embedding rankings.  Locally the answer is written
+by an Ollama server; on Render by the OpenAI API, which needs
+``OPENAI_API_KEY``.  Questions and answers share the model client of
+``IngestParams.llm``.  Near-duplicate questions are answered from the
+semantic cache configured by ``AnswerCacheParams``.
+"""
+
+import os
+
+from pydantic import SecretStr
+
+from project_name.config.rag.query_config import GeneratorConfig
+from project_name.config.rag.query_config import QueryConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.env_type import UnknownEnvLocationError
+from project_name.params.env_type import UnknownEnvStageError
+from project_name.params.rag.answer_cache_params import AnswerCacheParams
+from project_name.params.rag.ingest_params import IngestParams
+
+
+class QueryParams:
+    """Retrieval-augmented answer params.
+
+    Args:
+        env_type: Deployment environment (stage + location).  If ``None``,
+            inferred from ``ENV_STAGE_TYPE`` and ``ENV_LOCATION_TYPE``
+            environment variables (defaults: ``dev`` / ``local``).
+    """
+
+    def __init__(self, env_type: EnvType | None = None) -> None:
+        """Load query params for the given environment.
+
+        Args:
+            env_type: Deployment environment (stage + location).
+                If ``None``, inferred from ``ENV_STAGE_TYPE`` and
+                ``ENV_LOCATION_TYPE`` environment variables.
+        """
+        self.env_type: EnvType = env_type or EnvType.from_env_var()
+        self._load_params()
+
+    def _load_params(self) -> None:
+        """Orchestrate loading: common first, then stage + location."""
+        self._load_common_params()
+        match self.env_type.stage:
+            case EnvStageType.DEV:
+                self._load_dev_params()
+            case EnvStageType.PROD:
+                self._load_prod_params()
+            case _:
+                raise UnknownEnvStageError(self.env_type.stage)
+
+    def _load_common_params(self) -> None:
+        """Set attributes shared across all environments."""
+        self.ingest = IngestParams(env_type=self.env_type)
+        self.answer_cache = AnswerCacheParams(env_type=self.env_type)
+        self.top_k: int = 5
+        self.rrf_k: int = 60
+        self.queue_timeout: float = 2.0
+        self.generator_backend: str = "ollama"
+        self.generator_model: str = "llama3.2"
+        self.generator_url: str | None = "http://localhost:11434"
+        self.generator_api_key: SecretStr | None = None
+        self.generator_timeout: float = 60.0
+
+    def _load_dev_params(self) -> None:
+        """Set DEV-stage attributes, then dispatch on location.
+
+        A local model serves few answers at once.
+        """
+        self.max_concurrency: int = 4
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_dev_local_params()
+            case EnvLocationType.RENDER:
+                self._load_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_dev_local_params(self) -> None:
+        """Set DEV + LOCAL overrides.
+
+        No overrides needed beyond DEV stage defaults.
+        """
+
+    def _load_prod_params(self) -> None:
+        """Set PROD-stage attributes, then dispatch on location."""
+        self.max_concurrency = 16
+        match self.env_type.location:
+            case EnvLocationType.LOCAL:
+                self._load_prod_local_params()
+            case EnvLocationType.RENDER:
+                self._load_render_params()
+            case _:
+                raise UnknownEnvLocationError(self.env_type.location)
+
+    def _load_prod_local_params(self) -> None:
+        """Set PROD + LOCAL overrides.
+
+        No overrides needed beyond PROD stage defaults.
+        """
+
+    def _load_render_params(self) -> None:
+        """Set RENDER overrides, shared by both stages: answer with OpenAI.
+
+        Raises:
+            KeyError: If ``OPENAI_API_KEY`` is not set.
+        """
+        self.generator_backend = "openai"
+        self.generator_model = "gpt-4o-mini"
+        self.generator_url = None
+        self.generator_api_key = SecretStr(os.environ["OPENAI_API_KEY"])
+
+    def to_config(self) -> QueryConfig:
+        """Assemble and return the typed config model.
+
+        Returns:
+            QueryConfig: The query settings.
+        """
+        ingest_config = self.ingest.to_config()
+        return QueryConfig(
+            store=ingest_config.store,
+            embedder=ingest_config.embedder,
+            bm25=ingest_config.bm25,
+            rrf_k=self.rrf_k,
+            llm=ingest_config.llm,
+            generator=GeneratorConfig(
+                backend=self.generator_backend,  # type: ignore[arg-type]
+                model=self.generator_model,
+                url=self.generator_url,
+                api_key=self.generator_api_key,
+                timeout=self.generator_timeout,
+            ),
+            top_k=self.top_k,
+            max_concurrency=self.max_concurrency,
+            queue_timeout=self.queue_timeout,
+            answer_cache=self.answer_cache.to_config(),
+        )
+
+    def __str__(self) -> str:
+        """Return a human-readable summary with secrets masked."""
+        s = "QueryParams:"
+        s += f"\n  env_type: {self.env_type}"
+        s += f"\n  store: {self.ingest.store_persist_fol}"
+        s += f" ({self.ingest.store_collection_name})"
+        s += f"\n  embedder: {self.ingest.embedder_backend}"
+        s += f" {self.ingest.embedder_model}"
+        s += f"\n  generator: {self.generator_backend} {self.generator_model}"
+        s += f"\n  top_k: {self.top_k} (hybrid, rrf_k {self.rrf_k})"
+        s += f"\n  max_concurrency: {self.max_concurrency}"
+        s += f" (queue_timeout {self.queue_timeout} s)"
+        s += f"\n  answer_cache: {self.answer_cache.fol}"
+        s += f" (similarity >= {self.answer_cache.similarity_threshold})"
+        if self.generator_api_key is not None:
+            s += "\n  generator_api_key: [REDACTED]"
+        return s
+
+    def __repr__(self) -> str:
+        """Return the string representation of the object."""
+        return str(self)
@@ -1,5 +1,15 @@
 """Webapp parameters module."""
 
-from project_name.params.webapp.webapp_params import WebappParams
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.params.webapp.webapp_params import WebappParams
 
 __all__ = ["WebappParams"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {"WebappParams": "project_name.params.webapp.webapp_params:WebappParams"},
+)
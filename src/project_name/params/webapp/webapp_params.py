@@ -2,10 +2,17 @@
 
 Parameters are actual values loaded from environment variables.
 Supports ENV_STAGE_TYPE (dev/prod) and ENV_LOCATION_TYPE (local/render).
+
+``to_config()`` caches the built ``WebappConfig`` on the params object.
+Setting an attribute listed in ``CONFIG_FIELDS`` marks it changed, and the
+next call rebuilds the config.  Mutating a list attribute in place does not;
+assign a new list instead.
 """
 
 import os
 import secrets
+from typing import Any
+from typing import ClassVar
 
 from fastapi_tools.config.webapp_config import CORSConfig
 from fastapi_tools.config.webapp_config import GoogleOAuthConfig
@@ -16,11 +23,38 @@ from loguru import logger as lg
 
 from project_name.params.env_type import EnvLocationType
 from project_name.params.env_type import EnvStageType
+from project_name.startup_profile import startup_phase
+
+# Config field fed by each params attribute, as (section, field) where a
+# None section is a top-level field of WebappConfig
+CONFIG_FIELDS: dict[str, tuple[str | None, str]] = {
+    "host": (None, "host"),
+    "port": (None, "port"),
+    "debug": (None, "debug"),
+    "app_name": (None, "app_name"),
+    "app_version": (None, "app_version"),
+    "public_base_url": (None, "public_base_url"),
+    "cors_allowed_origins": ("cors", "allow_origins"),
+    "session_secret_key": ("session", "secret_key"),
+    "session_cookie_name": ("session", "session_cookie_name"),
+    "session_max_age": ("session", "max_age"),
+    "session_same_site": ("session", "same_site"),
+    "session_https_only": ("session", "https_only"),
+    "rate_limit_requests_per_minute": ("rate_limit", "requests_per_minute"),
+    "rate_limit_burst_size": ("rate_limit", "burst_size"),
+    "rate_limit_auth_requests_per_minute": ("rate_limit", "auth_requests_per_minute"),
+    "google_client_id": ("google_oauth", "client_id"),
+    "google_client_secret": ("google_oauth", "client_secret"),
+    "google_redirect_uri": ("google_oauth", "redirect_uri"),
+}
 
 
 class WebappParams:
     """Webapp parameters loaded from environment variables."""
 
+    # Generated once per process, so reloading the params keeps sessions valid
+    _dev_secret: ClassVar[str | None] = None
+
     def __init__(
         self,
         stage: EnvStageType | None = None,
@@ -33,11 +67,15 @@ class WebappParams:
             location: Environment location (local/render). Loaded from env if None.
         """
         lg.info("Loading WebappParams")
+        self._config: WebappConfig | None = None
+        self._config_validated = False
+        self._changed: set[str] = set()
 
         self.stage = stage or EnvStageType.from_env_var()
         self.location = location or EnvLocationType.from_env_var()
 
-        self._load_params()
+        with startup_phase("WebappParams._load_params"):
+            self._load_params()
 
     def _load_params(self) -> None:
         """Load all parameters from environment."""
@@ -56,6 +94,11 @@ class WebappParams:
         self.session_cookie_name: str = os.getenv("SESSION_COOKIE_NAME", "session")
         self.session_max_age: int = int(os.getenv("SESSION_MAX_AGE", "86400"))
         self.session_same_site: str = os.getenv("SESSION_SAME_SITE", "lax")
+        # Session storage backend: "memory" (per process) or "redis" (shared)
+        self.session_backend: str = os.getenv("SESSION_BACKEND", "memory")
+        self.session_redis_url: str = os.getenv(
+            "SESSION_REDIS_URL", "redis://localhost:6379/0"
+        )
 
         # CORS settings
         cors_origins_str = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000")
@@ -63,6 +106,14 @@ class WebappParams:
             origin.strip() for origin in cors_origins_str.split(",")
         ]
 
+        # Emails allowed to bulk import and export users
+        admin_emails_str = os.getenv("ADMIN_EMAILS", "")
+        self.admin_emails: list[str] = [
+            email.strip().lower()
+            for email in admin_emails_str.split(",")
+            if email.strip()
+        ]
+
         # Rate limit settings
         self.rate_limit_requests_per_minute: int = int(
             os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "100")
@@ -71,6 +122,16 @@ class WebappParams:
         self.rate_limit_auth_requests_per_minute: int = int(
             os.getenv("RATE_LIMIT_AUTH_REQUESTS_PER_MINUTE", "10")
         )
+        # Shared limiter backend: "local" (per process), "shm" (node) or "redis"
+        self.rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "local")
+        self.rate_limit_redis_url: str = os.getenv(
+            "RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"
+        )
+
+        # Seconds between polls of the .env file for hot reload; 0 disables it
+        self.params_reload_interval: float = float(
+            os.getenv("PARAMS_RELOAD_INTERVAL", "0")
+        )
 
         # Public base URL for building absolute links (not used for OAuth)
         self.public_base_url: str | None = os.getenv("PUBLIC_BASE_URL") or None
@@ -87,12 +148,14 @@ class WebappParams:
         self._apply_overrides()
 
     def _generate_dev_secret(self) -> str:
-        """Generate a development-only secret key with warning."""
-        lg.warning(
-            "SESSION_SECRET_KEY not set, generating random key. "
-            "This is only acceptable in development!"
-        )
-        return secrets.token_hex(32)
+        """Generate a development-only secret key with warning, once per process."""
+        if WebappParams._dev_secret is None:
+            lg.warning(
+                "SESSION_SECRET_KEY not set, generating random key. "
+                "This is only acceptable in development!"
+            )
+            WebappParams._dev_secret = secrets.token_hex(32)
+        return WebappParams._dev_secret
 
     def _get_default_redirect_uri(self) -> str:
         """Get default redirect URI based on location."""
@@ -126,8 +189,41 @@ class WebappParams:
             if render_port:
                 self.port = int(render_port)
 
-    def to_config(self) -> WebappConfig:
-        """Convert params to WebappConfig."""
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        """Set an attribute, marking it changed if it feeds the config."""
+        super().__setattr__(name, value)
+        if name in CONFIG_FIELDS:
+            self._changed.add(name)
+
+    def to_config(self, *, validate: bool = True) -> WebappConfig:
+        """Convert params to WebappConfig.
+
+        The config is built once and cached until an attribute in
+        ``CONFIG_FIELDS`` changes.  Treat it as read-only, as every caller
+        shares it.
+
+        Args:
+            validate: Whether to run full Pydantic validation.  Pass False
+                when the changed values are known to be valid: the cached
+                config is then copied with only the changed fields, skipping
+                validation.  Without a cached config the build is validated.
+
+        Returns:
+            The cached WebappConfig.
+        """
+        config = self._config
+        fresh = not self._changed and (self._config_validated or not validate)
+        if config is not None and fresh:
+            return config
+        validated = config is None or validate
+        config = self._build_config() if validated else self._update_config(config)
+        self._config = config
+        self._config_validated = validated
+        self._changed.clear()
+        return config
+
+    def _build_config(self) -> WebappConfig:
+        """Build the config with full validation."""
         return WebappConfig(
             host=self.host,
             port=self.port,
@@ -157,6 +253,24 @@ class WebappParams:
             ),
         )
 
+    def _update_config(self, config: WebappConfig) -> WebappConfig:
+        """Copy a config with the changed attributes, skipping validation.
+
+        Only the sections holding a changed field are copied.  Lists are
+        copied too, so the config never aliases the params' lists.
+        """
+        updates: dict[str | None, dict[str, Any]] = {}
+        for name in self._changed:
+            section, field = CONFIG_FIELDS[name]
+            value = getattr(self, name)
+            if isinstance(value, list):
+                value = list(value)
+            updates.setdefault(section, {})[field] = value
+        top = updates.pop(None, {})
+        for section, fields in updates.items():
+            top[section] = getattr(config, section).model_copy(update=fields)
+        return config.model_copy(update=top)
+
     def __str__(self) -> str:
         """Return string representation."""
         s = "WebappParams:"
@@ -165,6 +279,10 @@ class WebappParams:
         s += f"\n  host: {self.host}"
         s += f"\n  port: {self.port}"
         s += f"\n  debug: {self.debug}"
+        s += f"\n  session_backend: {self.session_backend}"
+        s += f"\n  rate_limit_backend: {self.rate_limit_backend}"
+        s += f"\n  params_reload_interval: {self.params_reload_interval}"
+        s += f"\n  admin_emails: {len(self.admin_emails)}"
         s += (
             f"\n  google_client_id: {'[SET]' if self.google_client_id else '[NOT SET]'}"
         )
@@ -0,0 +1,38 @@
+"""Retrieval-augmented generation subsystem.
+
+Built on haystack and Chroma.  Importing the package is cheap: haystack is
+imported only when one of the names below is first used.
+"""
+
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.rag.bm25 import BM25Index
+    from project_name.rag.hybrid import HybridRetriever
+    from project_name.rag.ingest import DocumentIngestor
+    from project_name.rag.ingest import IngestReport
+    from project_name.rag.llm_client import LLMClient
+    from project_name.rag.query import QueryService
+
+__all__ = [
+    "BM25Index",
+    "DocumentIngestor",
+    "HybridRetriever",
+    "IngestReport",
+    "LLMClient",
+    "QueryService",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BM25Index": "project_name.rag.bm25:BM25Index",
+        "DocumentIngestor": "project_name.rag.ingest:DocumentIngestor",
+        "HybridRetriever": "project_name.rag.hybrid:HybridRetriever",
+        "IngestReport": "project_name.rag.ingest:IngestReport",
+        "LLMClient": "project_name.rag.llm_client:LLMClient",
+        "QueryService": "project_name.rag.query:QueryService",
+    },
+)
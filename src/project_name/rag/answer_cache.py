@@ -0,0 +1,427 @@
+"""Semantic cache of generated answers.
+
+Many questions are near-duplicates of earlier ones ("How do I install it?",
+"how to install this?").  ``SemanticAnswerCache`` stores each generated
+answer with the embedding of its question and returns it for a later
+question whose embedding is close enough, skipping retrieval and generation.
+
+Lookup:
+
+* Embeddings are normalized on the way in, so the cosine similarity of a
+  question with every cached one is a single matrix-vector product over an
+  in-memory float32 matrix.  Scanning 10k rows of 768 floats takes under
+  two milliseconds, far less than the embedding call before it, so no
+  approximate index is needed.
+* The closest entry is returned if its similarity reaches
+  ``similarity_threshold``, it was answered with the same ``top_k`` and it
+  is younger than ``ttl`` seconds.
+
+Storage:
+
+* Entries live in a SQLite database in WAL mode, one per answer space.  The
+  answer space hashes the settings an answer depends on (embedder, chat
+  model and options, system prompt, store and keyword retrieval), so
+  changing any of them starts an empty cache instead of serving answers of
+  another model.
+* The database records a hash of the ingest manifest next to the store.
+  When an ingest rewrites the manifest, the first lookup that sees it
+  deletes every answer, so no answer outlives the documents it was drawn
+  from by more than the answers in flight.  Checking costs one ``stat`` per
+  lookup; the manifest is read only when it changed.
+* The database is shared by the worker processes; the matrix is a copy per
+  process.  Row ids only grow, so before each lookup the matrix reads the
+  rows added since the last id it has seen.
+* A hit refreshes the ``used_at`` of its row.  Each insert deletes the
+  expired rows and the least recently used beyond ``max_entries``.  Rows
+  another process evicted are dropped from the matrix when they would be
+  hit, and the matrix is reloaded once it holds twice ``max_entries`` rows.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+from loguru import logger as lg
+import numpy as np
+
+from project_name.rag.embedding_cache import CacheStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from project_name.config.rag.answer_cache_config import AnswerCacheConfig
+    from project_name.config.rag.query_config import QueryConfig
+
+# Rows allocated by the first sync, doubled as the matrix grows
+_MIN_CAPACITY = 64
+# ``top_k`` of a matrix row whose database row was deleted
+_TOMBSTONE = 0
+
+
+def answer_space(config: QueryConfig) -> str:
+    """Return a database name identifying the answers a query config gives.
+
+    Args:
+        config: Query settings.
+
+    Returns:
+        The chat model name made path-safe, followed by a short hash of the
+        settings that change the answers.
+    """
+    settings = {
+        "embedder": [config.embedder.backend, config.embedder.model],
+        "generator": [
+            config.generator.backend,
+            config.generator.model,
+            config.generator.kwargs,
+        ],
+        "system_prompt": config.system_prompt,
+        "store": [str(config.store.persist_fol), config.store.collection_name],
+        "hybrid": None if config.bm25 is None else config.rrf_k,
+    }
+    digest = hashlib.blake2b(
+        json.dumps(settings, sort_keys=True, default=str).encode(), digest_size=4
+    ).hexdigest()
+    model = re.sub(r"[^A-Za-z0-9._-]+", "_", config.generator.model)
+    return f"{model}-{digest}"
+
+
+@dataclass(slots=True)
+class CachedAnswer:
+    """An answer served from the cache.
+
+    Attributes:
+        question: Question the answer was generated for.
+        answer: Full answer text.
+        sources: Context chunks of the answer, as sent in ``sources``.
+        similarity: Cosine similarity of the new question with ``question``.
+        created_at: Unix time the answer was generated.
+    """
+
+    question: str
+    answer: str
+    sources: list[dict[str, Any]]
+    similarity: float
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """Answers keyed by the embedding of their question, in SQLite.
+
+    Args:
+        db_fp: Path of the SQLite database.  Parent folders are created.
+        similarity_threshold: Minimum cosine similarity of a hit.
+        max_entries: Rows kept; the least recently used are evicted beyond.
+        ttl: Seconds an answer is served after it was generated.
+        clock: Source of the current Unix time.
+        generation_fp: File whose content identifies the indexed documents,
+            the ingest manifest.  Every answer is dropped when it changes.
+            None keeps the answers across ingests.
+    """
+
+    _SCHEMA = (
+        (
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " top_k INTEGER NOT NULL,"
+            " question TEXT NOT NULL,"
+            " answer TEXT NOT NULL,"
+            " sources TEXT NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL"
+            ")"
+        ),
+        "CREATE INDEX IF NOT EXISTS answers_used_at_idx ON answers (used_at)",
+        "CREATE INDEX IF NOT EXISTS answers_created_at_idx ON answers (created_at)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+    # Records the generation, returning a row only if it was another one
+    _SET_GENERATION = (
+        "INSERT INTO meta (key, value) VALUES ('generation', ?)"
+        " ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+        " WHERE value != excluded.value"
+        " RETURNING value"
+    )
+    _INSERT = (
+        "INSERT INTO answers"
+        " (top_k, question, answer, sources, embedding, created_at, used_at)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)"
+    )
+    _EVICT_EXPIRED = "DELETE FROM answers WHERE created_at < ? RETURNING id"
+    _EVICT_LRU = (
+        "DELETE FROM answers WHERE id IN"
+        " (SELECT id FROM answers ORDER BY used_at DESC LIMIT -1 OFFSET ?)"
+        " RETURNING id"
+    )
+
+    def __init__(
+        self,
+        db_fp: Path,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 10_000,
+        ttl: float = 86_400.0,
+        clock: Callable[[], float] = time.time,
+        generation_fp: Path | None = None,
+    ) -> None:
+        """Open the database and load the embeddings of its rows."""
+        self.db_fp = db_fp
+        self.generation_fp = generation_fp
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self.db_fp.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_fp, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # A crash may lose the last answers, never corrupt the database
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in self._SCHEMA:
+                self._conn.execute(statement)
+        self._lock = threading.Lock()
+        # Modification time and size of generation_fp when last checked,
+        # None if it did not exist; the first sync always checks it
+        self._generation_stamp: tuple[int, int] | None = (-1, -1)
+        self._reset()
+        self._sync()
+
+    @classmethod
+    def from_config(
+        cls, config: AnswerCacheConfig, query_config: QueryConfig
+    ) -> SemanticAnswerCache:
+        """Open the cache of the answer space of ``query_config``.
+
+        Args:
+            config: Answer cache settings.
+            query_config: Query settings the cached answers depend on.
+
+        Returns:
+            The cache, in ``config.fol``, dropping its answers when the store
+            is ingested again.
+        """
+        from project_name.rag.ingest import MANIFEST_NAME  # noqa: PLC0415
+
+        return cls(
+            config.fol / f"{answer_space(query_config)}.sqlite",
+            similarity_threshold=config.similarity_threshold,
+            max_entries=config.max_entries,
+            ttl=config.ttl,
+            generation_fp=query_config.store.persist_fol / MANIFEST_NAME,
+        )
+
+    def _reset(self) -> None:
+        """Empty the matrix, so the next sync reads every row."""
+        self._last_id = 0
+        self._n = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._top_ks = np.empty(0, dtype=np.int32)
+        self._created = np.empty(0, dtype=np.float64)
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+
+    def _append(self, rows: list[tuple[int, int, float, bytes]]) -> None:
+        """Append database rows to the matrix, growing it if needed."""
+        vectors = np.frombuffer(b"".join(row[3] for row in rows), dtype=np.float32)
+        vectors = vectors.reshape(len(rows), -1)
+        end = self._n + len(rows)
+        if end > len(self._ids):
+            capacity = max(_MIN_CAPACITY, 2 * len(self._ids), end)
+            self._ids = np.resize(self._ids, capacity)
+            self._top_ks = np.resize(self._top_ks, capacity)
+            self._created = np.resize(self._created, capacity)
+            grown = np.empty((capacity, vectors.shape[1]), dtype=np.float32)
+            if self._n:
+                grown[: self._n] = self._vectors[: self._n]
+            self._vectors = grown
+        self._ids[self._n : end] = [row[0] for row in rows]
+        self._top_ks[self._n : end] = [row[1] for row in rows]
+        self._created[self._n : end] = [row[2] for row in rows]
+        self._vectors[self._n : end] = vectors
+        self._n = end
+
+    def _check_generation(self) -> None:
+        """Drop every answer if the documents were ingested again."""
+        if self.generation_fp is None:
+            return
+        try:
+            stat = self.generation_fp.stat()
+        except FileNotFoundError:
+            stamp = None
+        else:
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._generation_stamp:
+            return
+        self._generation_stamp = stamp
+        try:
+            content = self.generation_fp.read_bytes()
+        except FileNotFoundError:
+            content = b""
+        generation = hashlib.blake2b(content, digest_size=16).hexdigest()
+        dropped = 0
+        with self._conn:
+            if self._conn.execute(self._SET_GENERATION, (generation,)).fetchall():
+                dropped = self._conn.execute("DELETE FROM answers").rowcount
+        if dropped:
+            lg.info(f"Documents were ingested again, dropped {dropped} answers")
+        self._reset()
+
+    def _sync(self) -> None:
+        """Read the rows added since the last sync, by any process."""
+        self._check_generation()
+        if self._n > 2 * self.max_entries:
+            self._reset()
+        rows = self._conn.execute(
+            "SELECT id, top_k, created_at, embedding FROM answers"
+            " WHERE id > ? ORDER BY id",
+            (self._last_id,),
+        ).fetchall()
+        if rows:
+            self._append(rows)
+            self._last_id = rows[-1][0]
+
+    def _drop(self, ids: Sequence[int]) -> None:
+        """Stop matching the matrix rows of deleted database rows."""
+        if ids:
+            self._top_ks[: self._n][np.isin(self._ids[: self._n], ids)] = _TOMBSTONE
+
+    def _unit(self, embedding: Sequence[float]) -> np.ndarray:
+        """Return ``embedding`` normalized, checking its dimension.
+
+        Raises:
+            ValueError: If the embedding does not match the cached ones.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._n and vector.shape[0] != self._vectors.shape[1]:
+            msg = (
+                f"Expected embeddings of dimension {self._vectors.shape[1]}, "
+                f"got {vector.shape[0]}"
+            )
+            raise ValueError(msg)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _closest(
+        self, vector: np.ndarray, top_k: int, now: float
+    ) -> tuple[int, float] | None:
+        """Return the matrix row and similarity of the best live match."""
+        if not self._n:
+            return None
+        scores = self._vectors[: self._n] @ vector
+        stale = (self._top_ks[: self._n] != top_k) | (
+            self._created[: self._n] < now - self.ttl
+        )
+        scores[stale] = -np.inf
+        row = int(np.argmax(scores))
+        similarity = float(scores[row])
+        if similarity < self.similarity_threshold:
+            return None
+        return row, similarity
+
+    def get(self, embedding: Sequence[float], top_k: int) -> CachedAnswer | None:
+        """Return the cached answer of the closest question, if close enough.
+
+        Args:
+            embedding: Embedding of the new question.
+            top_k: Context chunks the answer must have been generated with.
+
+        Returns:
+            The answer, or None on a miss.
+        """
+        now = self.clock()
+        with self._lock:
+            self._sync()
+            vector = self._unit(embedding)
+            while (match := self._closest(vector, top_k, now)) is not None:
+                row, similarity = match
+                entry_id = int(self._ids[row])
+                with self._conn:
+                    entry = self._conn.execute(
+                        "UPDATE answers SET used_at = ? WHERE id = ?"
+                        " RETURNING question, answer, sources, created_at",
+                        (now, entry_id),
+                    ).fetchone()
+                if entry is None:
+                    # Evicted by another process
+                    self._drop([entry_id])
+                    continue
+                self.stats.hits += 1
+                question, answer, sources, created_at = entry
+                lg.debug(f"Answer cache hit at similarity {similarity:.3f}")
+                return CachedAnswer(
+                    question, answer, json.loads(sources), similarity, created_at
+                )
+            self.stats.misses += 1
+            return None
+
+    def put(
+        self,
+        embedding: Sequence[float],
+        top_k: int,
+        question: str,
+        answer: str,
+        sources: list[dict[str, Any]],
+    ) -> bool:
+        """Cache an answer, evicting expired and least recently used ones.
+
+        Args:
+            embedding: Embedding of the question.
+            top_k: Context chunks the answer was generated with.
+            question: Question text.
+            answer: Full answer text.
+            sources: Context chunks of the answer.
+
+        Returns:
+            False if a close enough answer was cached meanwhile, e.g. by a
+            concurrent request for the same question, True otherwise.
+        """
+        now = self.clock()
+        with self._lock:
+            self._sync()
+            vector = self._unit(embedding)
+            if self._closest(vector, top_k, now) is not None:
+                return False
+            with self._conn:
+                self._conn.execute(
+                    self._INSERT,
+                    (
+                        top_k,
+                        question,
+                        answer,
+                        json.dumps(sources),
+                        vector.tobytes(),
+                        now,
+                        now,
+                    ),
+                )
+                evicted = self._conn.execute(
+                    self._EVICT_EXPIRED, (now - self.ttl,)
+                ).fetchall()
+                evicted += self._conn.execute(
+                    self._EVICT_LRU, (self.max_entries,)
+                ).fetchall()
+            self._sync()
+            self._drop([row[0] for row in evicted])
+        if evicted:
+            lg.debug(f"Answer cache evicted {len(evicted)} answers")
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of cached answers, expired ones included."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
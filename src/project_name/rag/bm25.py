@@ -0,0 +1,559 @@
+"""In-process BM25 keyword index, kept alongside the Chroma collection.
+
+Embeddings capture meaning but blur exact strings: a question about
+``ERR_CONN_RESET`` or ``E1234`` often retrieves chunks about similar errors
+instead of the one naming it.  ``BM25Index`` scores chunks by the terms
+they share with the question, and ``HybridRetriever`` in
+``project_name.rag.hybrid`` fuses both rankings.
+
+Terms:
+
+* ``tokenize`` lowercases the text and keeps identifiers whole: dotted,
+  dashed, slashed, coloned or snake case runs such as ``os.path.join``,
+  ``HTTP-429`` or ``ERR_CONN_RESET`` are one term, followed by each of
+  their alphanumeric parts.
+
+Layout:
+
+* Postings are compressed sparse rows: ``offsets[t]:offsets[t + 1]`` slices
+  ``postings_docs`` (int32 document numbers) and ``postings_tfs`` (uint16
+  term frequencies) of term ``t``.  With the document lengths, they are
+  saved as ``.npy`` files and opened with ``mmap_mode="r"``, so opening an
+  index reads no postings and the OS pages in only the terms searched.
+* The chunks are JSON lines in ``docs.jsonl``, memory-mapped too and sliced
+  by ``doc_offsets.npy``: a search parses only the chunks it returns.  Each
+  process holds the chunk ids and a source number per chunk, never the
+  texts, and the id lookup table is built only by the writer.
+* Chunks added since the last save go to in-memory postings lists; deleted
+  chunks are only marked dead.  ``save`` merges both into new arrays with
+  a few vectorized numpy passes, dropping dead chunks and unused terms.
+* Each save writes a new generation folder and then points the ``CURRENT``
+  file at it, so a reader never sees half-written arrays.  Readers in other
+  processes, e.g. the web workers while an ingest runs, pick up the new
+  generation on their next search.  The previous generation is kept until
+  the next save, and a reader loads a generation completely before
+  replacing its own, so a generation removed while it is being opened
+  leaves the reader on the one it had.
+* A save rewrites every array, so the ingestion saves every
+  ``BM25Config.save_every`` batches and at its end, not after each batch.
+
+The index has a single writer: the ingestion, through ``BM25IndexWriter``
+and ``delete_sources``.  Searches are safe from any thread.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+import json
+import math
+import re
+import shutil
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+
+from haystack import Document
+from haystack import component
+from loguru import logger as lg
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from project_name.config.rag.ingest_config import BM25Config
+
+CURRENT_NAME = "CURRENT"
+TERMS_NAME = "terms.json"
+DOCS_NAME = "docs.jsonl"
+IDS_NAME = "ids.json"
+SOURCES_NAME = "sources.json"
+_ARRAYS = (
+    "offsets",
+    "postings_docs",
+    "postings_tfs",
+    "doc_lens",
+    "doc_offsets",
+    "doc_sources",
+)
+# Term frequencies are stored as uint16
+_MAX_TF = np.iinfo(np.uint16).max
+
+_TERM_RE = re.compile(r"\w+(?:[.\-:/]\w+)*")
+_PART_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split ``text`` into lowercase terms, keeping identifiers whole.
+
+    Args:
+        text: Text to split.
+
+    Returns:
+        The terms in order; a compound term is followed by its parts.
+    """
+    terms = []
+    for term in _TERM_RE.findall(text.lower()):
+        terms.append(term)
+        if not term.isalnum():
+            parts = _PART_RE.findall(term)
+            if len(parts) > 1:
+                terms.extend(parts)
+    return terms
+
+
+class BM25Index:
+    """BM25 inverted index over haystack documents.
+
+    Args:
+        fol: Folder the index is persisted in; None keeps it in memory.
+        k1: Term frequency saturation.
+        b: Weight of the document length normalization.
+    """
+
+    def __init__(
+        self, fol: Path | None = None, k1: float = 1.2, b: float = 0.75
+    ) -> None:
+        """Open the index saved in ``fol``, or start an empty one."""
+        self.fol = fol
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._generation: str | None = None
+        self._clear()
+        if fol is not None:
+            fol.mkdir(parents=True, exist_ok=True)
+            self.refresh()
+
+    @classmethod
+    def from_config(cls, config: BM25Config) -> BM25Index:
+        """Open the index of ``config.fol``."""
+        return cls(config.fol, k1=config.k1, b=config.b)
+
+    def _clear(self) -> None:
+        """Reset to an empty index."""
+        self._terms: dict[str, int] = {}
+        self._term_list: list[str] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings_docs = np.empty(0, dtype=np.int32)
+        self._postings_tfs = np.empty(0, dtype=np.uint16)
+        # Postings of the chunks added since the last save, in chunk order
+        self._new_terms = array("i")
+        self._new_docs = array("i")
+        self._new_tfs = array("H")
+        self._new_by_term: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+        self._doc_lens = np.empty(0, dtype=np.uint32)
+        self._alive = np.empty(0, dtype=bool)
+        # Saved chunks: JSON lines sliced by offset, and their ids and sources
+        self._docs = np.empty(0, dtype=np.uint8)
+        self._doc_offsets = np.zeros(1, dtype=np.int64)
+        self._base_ids: list[str] = []
+        self._doc_sources = np.empty(0, dtype=np.int32)
+        self._source_names: list[str | None] = []
+        # Chunks added since the last save, as (id, content, meta)
+        self._new_chunks: list[tuple[str, str, dict[str, Any]]] = []
+        # Number of each live chunk id, built when first written to
+        self._by_id: dict[str, int] | None = {}
+        self._n_alive = 0
+        self._total_len = 0
+        self._dirty = False
+
+    def __len__(self) -> int:
+        """Return the number of live chunks."""
+        return self._n_alive
+
+    # Persistence
+
+    def refresh(self) -> bool:
+        """Load the generation saved last, if it is not the one in memory.
+
+        Unsaved changes are kept: the process writing the index is the one
+        that saved it.  A generation that cannot be read, e.g. one removed
+        by two quick saves of the writer, leaves the index as it was.
+
+        Returns:
+            True if a new generation was loaded.
+        """
+        if self.fol is None or self._dirty:
+            return False
+        current_fp = self.fol / CURRENT_NAME
+        if not current_fp.exists():
+            return False
+        generation = current_fp.read_text().strip()
+        if generation == self._generation:
+            return False
+        try:
+            state = self._read(self.fol / generation)
+        except (OSError, ValueError) as exc:
+            lg.warning(f"Could not open BM25 index {generation}, keeping it: {exc}")
+            return False
+        with self._lock:
+            if self._dirty:
+                return False
+            self._install(state, generation)
+        return True
+
+    @staticmethod
+    def _read(gen_fol: Path) -> dict[str, Any]:
+        """Map the arrays and chunks of a generation and read its terms and ids."""
+        state: dict[str, Any] = {
+            name: np.load(gen_fol / f"{name}.npy", mmap_mode="r") for name in _ARRAYS
+        }
+        state["doc_lens"] = np.array(state["doc_lens"])
+        docs_fp = gen_fol / DOCS_NAME
+        state["docs"] = (
+            np.memmap(docs_fp, dtype=np.uint8, mode="r")
+            if docs_fp.stat().st_size
+            else np.empty(0, dtype=np.uint8)
+        )
+        state["terms"] = json.loads((gen_fol / TERMS_NAME).read_text())
+        state["ids"] = json.loads((gen_fol / IDS_NAME).read_text())
+        state["sources"] = json.loads((gen_fol / SOURCES_NAME).read_text())
+        return state
+
+    def _install(self, state: dict[str, Any], generation: str) -> None:
+        """Replace the index with a generation read by ``_read``."""
+        self._clear()
+        self._offsets = state["offsets"]
+        self._postings_docs = state["postings_docs"]
+        self._postings_tfs = state["postings_tfs"]
+        self._doc_lens = state["doc_lens"]
+        self._term_list = state["terms"]
+        self._terms = {term: i for i, term in enumerate(self._term_list)}
+        self._docs = state["docs"]
+        self._doc_offsets = state["doc_offsets"]
+        self._base_ids = state["ids"]
+        self._doc_sources = state["doc_sources"]
+        self._source_names = state["sources"]
+        self._by_id = None
+        self._alive = np.ones(len(self._base_ids), dtype=bool)
+        self._n_alive = len(self._base_ids)
+        self._total_len = int(self._doc_lens.sum())
+        self._generation = generation
+        lg.debug(f"Opened BM25 index {generation}: {len(self)} chunks")
+
+    def save(self) -> None:
+        """Merge the changes into new arrays and write them as a generation."""
+        fol = self.fol
+        if fol is None:
+            return
+        with self._lock:
+            if not self._dirty and self._generation is not None:
+                return
+            terms, docs, tfs = self._merged_postings()
+            # Renumber the live chunks and the used terms densely
+            new_doc = np.cumsum(self._alive) - 1
+            docs = new_doc[docs].astype(np.int32)
+            used, terms = np.unique(terms, return_inverse=True)
+            order = np.lexsort((docs, terms))
+            counts = np.bincount(terms, minlength=len(used))
+            offsets = np.zeros(len(used) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            live = np.flatnonzero(self._alive)
+
+            previous = self._generation
+            number = int(previous.removeprefix("gen-")) + 1 if previous else 0
+            generation = f"gen-{number:06d}"
+            gen_fol = fol / generation
+            gen_fol.mkdir(parents=True, exist_ok=True)
+            arrays = {
+                "offsets": offsets,
+                "postings_docs": docs[order],
+                "postings_tfs": tfs[order],
+                "doc_lens": self._doc_lens[live],
+            }
+            for name, array in arrays.items():
+                np.save(gen_fol / f"{name}.npy", array)
+            (gen_fol / TERMS_NAME).write_text(
+                json.dumps([self._term_list[i] for i in used.tolist()])
+            )
+            self._save_chunks(gen_fol, live.tolist())
+            tmp_fp = fol / f"{CURRENT_NAME}.tmp"
+            tmp_fp.write_text(generation)
+            tmp_fp.replace(fol / CURRENT_NAME)
+            self._dirty = False
+            self._install(self._read(gen_fol), generation)
+            # Keep the previous generation for readers that are opening it;
+            # open maps of the older files stay valid until unmapped
+            for old_fol in fol.glob("gen-*"):
+                if old_fol.name not in {generation, previous}:
+                    shutil.rmtree(old_fol, ignore_errors=True)
+        lg.debug(f"Saved BM25 index {gen_fol}: {len(self)} chunks")
+
+    def _save_chunks(self, gen_fol: Path, live: list[int]) -> None:
+        """Write the live chunks, their offsets, ids and sources to a generation.
+
+        Saved chunks are copied as the bytes of their line, without parsing.
+        """
+        doc_offsets = np.zeros(len(live) + 1, dtype=np.int64)
+        doc_sources = np.empty(len(live), dtype=np.int32)
+        source_numbers: dict[str | None, int] = {}
+        n_base = len(self._base_ids)
+        with (gen_fol / DOCS_NAME).open("wb") as f:
+            for row, number in enumerate(live):
+                if number < n_base:
+                    start, end = self._doc_offsets[number : number + 2]
+                    line = self._docs[start:end].tobytes()
+                    source = self._source_names[self._doc_sources[number]]
+                else:
+                    doc_id, content, meta = self._new_chunks[number - n_base]
+                    record = {"id": doc_id, "content": content, "meta": meta}
+                    line = (json.dumps(record, default=str) + "\n").encode()
+                    source = meta.get("source")
+                f.write(line)
+                doc_offsets[row + 1] = doc_offsets[row] + len(line)
+                doc_sources[row] = source_numbers.setdefault(
+                    source, len(source_numbers)
+                )
+        np.save(gen_fol / "doc_offsets.npy", doc_offsets)
+        np.save(gen_fol / "doc_sources.npy", doc_sources)
+        (gen_fol / IDS_NAME).write_text(
+            json.dumps([self._chunk_id(number) for number in live])
+        )
+        (gen_fol / SOURCES_NAME).write_text(json.dumps(list(source_numbers)))
+
+    def _chunk_id(self, number: int) -> str:
+        """Return the id of a chunk by number."""
+        n_base = len(self._base_ids)
+        if number < n_base:
+            return self._base_ids[number]
+        return self._new_chunks[number - n_base][0]
+
+    def _chunk(self, number: int) -> tuple[str, str, dict[str, Any]]:
+        """Return the id, content and meta of a chunk by number."""
+        n_base = len(self._base_ids)
+        if number >= n_base:
+            return self._new_chunks[number - n_base]
+        start, end = self._doc_offsets[number : number + 2]
+        record = json.loads(self._docs[start:end].tobytes())
+        return record["id"], record["content"], record["meta"]
+
+    def _id_map(self) -> dict[str, int]:
+        """Return the number of each live chunk id, building it if needed."""
+        if self._by_id is None:
+            self._by_id = {
+                doc_id: number
+                for number, doc_id in enumerate(self._base_ids)
+                if self._alive[number]
+            }
+        return self._by_id
+
+    def _merged_postings(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the term, chunk and frequency of every live posting."""
+        n_base = len(self._offsets) - 1
+        base_terms = np.repeat(
+            np.arange(n_base, dtype=np.int32), np.diff(self._offsets)
+        )
+        terms = np.concatenate([base_terms, np.frombuffer(self._new_terms, np.int32)])
+        docs = np.concatenate(
+            [self._postings_docs, np.frombuffer(self._new_docs, np.int32)]
+        )
+        tfs = np.concatenate(
+            [self._postings_tfs, np.frombuffer(self._new_tfs, np.uint16)]
+        )
+        keep = self._alive[docs]
+        return terms[keep], docs[keep], tfs[keep]
+
+    # Writes
+
+    def add(self, documents: list[Document]) -> int:
+        """Index chunks; a chunk with the id of an indexed one replaces it.
+
+        Args:
+            documents: Chunks to index.
+
+        Returns:
+            The number of chunks indexed.
+        """
+        # The last chunk of an id wins, as with DuplicatePolicy.OVERWRITE
+        documents = list({doc.id: doc for doc in documents}.values())
+        with self._lock:
+            by_id = self._id_map()
+            self._delete_numbers([by_id[d.id] for d in documents if d.id in by_id])
+            self._new_by_term = None
+            lens = []
+            for doc in documents:
+                number = len(self._base_ids) + len(self._new_chunks)
+                terms = tokenize(doc.content or "")
+                counts = Counter(terms)
+                for term in counts:
+                    term_id = self._terms.setdefault(term, len(self._term_list))
+                    if term_id == len(self._term_list):
+                        self._term_list.append(term)
+                    self._new_terms.append(term_id)
+                self._new_docs.extend([number] * len(counts))
+                self._new_tfs.extend([min(tf, _MAX_TF) for tf in counts.values()])
+                by_id[doc.id] = number
+                self._new_chunks.append((doc.id, doc.content or "", dict(doc.meta)))
+                lens.append(len(terms))
+            self._doc_lens = np.concatenate(
+                [self._doc_lens, np.asarray(lens, dtype=np.uint32)]
+            )
+            self._alive = np.concatenate(
+                [self._alive, np.ones(len(documents), dtype=bool)]
+            )
+            self._n_alive += len(documents)
+            self._total_len += sum(lens)
+            self._dirty = self._dirty or bool(documents)
+        return len(documents)
+
+    def _delete_numbers(self, numbers: list[int]) -> None:
+        """Mark chunks dead by number."""
+        by_id = self._id_map()
+        for number in numbers:
+            if self._alive[number]:
+                self._alive[number] = False
+                self._n_alive -= 1
+                self._total_len -= int(self._doc_lens[number])
+                del by_id[self._chunk_id(number)]
+                self._dirty = True
+
+    def delete_sources(self, sources: list[str]) -> int:
+        """Delete the chunks whose ``meta["source"]`` is in ``sources``.
+
+        Args:
+            sources: Source files whose chunks are deleted.
+
+        Returns:
+            The number of chunks deleted.
+        """
+        wanted = set(sources)
+        with self._lock:
+            n_base = len(self._base_ids)
+            wanted_numbers = [
+                i for i, name in enumerate(self._source_names) if name in wanted
+            ]
+            base = np.isin(self._doc_sources, wanted_numbers) & self._alive[:n_base]
+            numbers = np.flatnonzero(base).tolist()
+            numbers += [
+                number
+                for number, (_, _, meta) in enumerate(self._new_chunks, n_base)
+                if self._alive[number] and meta.get("source") in wanted
+            ]
+            self._delete_numbers(numbers)
+        return len(numbers)
+
+    # Search
+
+    def _postings(self, term_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the chunk numbers and frequencies of a term."""
+        docs = np.empty(0, dtype=np.int32)
+        tfs = np.empty(0, dtype=np.uint16)
+        if term_id < len(self._offsets) - 1:
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            docs, tfs = self._postings_docs[start:end], self._postings_tfs[start:end]
+        if self._new_terms:
+            if self._new_by_term is None:
+                new_terms = np.frombuffer(self._new_terms, np.int32)
+                order = np.argsort(new_terms, kind="stable")
+                self._new_by_term = (
+                    new_terms[order],
+                    np.frombuffer(self._new_docs, np.int32)[order],
+                    np.frombuffer(self._new_tfs, np.uint16)[order],
+                )
+            new_terms, new_docs, new_tfs = self._new_by_term
+            start, end = np.searchsorted(new_terms, [term_id, term_id + 1])
+            docs = np.concatenate([docs, new_docs[start:end]])
+            tfs = np.concatenate([tfs, new_tfs[start:end]])
+        return docs, tfs
+
+    def search(self, query: str, top_k: int) -> list[Document]:
+        """Return the ``top_k`` chunks with the highest BM25 score.
+
+        Args:
+            query: Question, split with ``tokenize``.
+            top_k: Maximum number of chunks.
+
+        Returns:
+            Chunks sharing at least one term with ``query``, best first,
+            with their BM25 score.
+        """
+        self.refresh()
+        with self._lock:
+            if not self._n_alive:
+                return []
+            term_ids = {self._terms[t] for t in tokenize(query) if t in self._terms}
+            avg_len = max(self._total_len / self._n_alive, 1.0)
+            scores = np.zeros(len(self._alive), dtype=np.float32)
+            for term_id in term_ids:
+                docs, tfs = self._postings(term_id)
+                live = self._alive[docs]
+                docs, tfs = docs[live], tfs[live].astype(np.float32)
+                if not len(docs):
+                    continue
+                idf = math.log1p((self._n_alive - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lens[docs] / avg_len)
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+            hits = np.flatnonzero(scores)
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            documents = []
+            for i in hits.tolist():
+                doc_id, content, meta = self._chunk(i)
+                documents.append(
+                    Document(
+                        id=doc_id,
+                        content=content,
+                        meta=dict(meta),
+                        score=float(scores[i]),
+                    )
+                )
+            return documents
+
+
+@component
+class BM25Retriever:
+    """Retrieve chunks from a ``BM25Index`` by keyword.
+
+    Args:
+        index: Index to search.
+        top_k: Default number of chunks returned.
+    """
+
+    def __init__(self, index: BM25Index, top_k: int = 10) -> None:
+        """Store the index."""
+        self.index = index
+        self.top_k = top_k
+
+    @component.output_types(documents=list[Document])
+    def run(self, query: str, top_k: int | None = None) -> dict[str, Any]:
+        """Search the index.
+
+        Args:
+            query: Question.
+            top_k: Number of chunks; None uses the default.
+
+        Returns:
+            ``documents``, best first, scored by BM25.
+        """
+        return {"documents": self.index.search(query, top_k or self.top_k)}
+
+
+@component
+class BM25IndexWriter:
+    """Add chunks to a ``BM25Index``.
+
+    The chunks are searchable in this process at once; call
+    ``BM25Index.save`` to persist them, since a save rewrites the whole
+    index.
+
+    Args:
+        index: Index to write to.
+    """
+
+    def __init__(self, index: BM25Index) -> None:
+        """Store the index."""
+        self.index = index
+
+    @component.output_types(documents_written=int)
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Index the chunks, replacing chunks of the same id.
+
+        Args:
+            documents: Chunks to index.
+
+        Returns:
+            ``documents_written``, the number of chunks indexed.
+        """
+        return {"documents_written": self.index.add(documents)}
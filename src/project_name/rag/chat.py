@@ -0,0 +1,295 @@
+"""Streaming chat backends for the answer generation.
+
+A ``ChatBackend`` streams the text of a chat completion as it is generated,
+so the first words reach the user while the model is still writing.  Two
+implementations wrap the async clients of the declared dependencies:
+
+* ``OpenAIChatBackend`` - ``openai.AsyncOpenAI``, for the OpenAI API and any
+  OpenAI-compatible server;
+* ``OllamaChatBackend`` - ``ollama.AsyncClient``, the client under
+  ``ollama-haystack``.
+
+Both keep one pooled HTTP client for their lifetime, so answers reuse warm
+keep-alive connections instead of paying a TCP and TLS handshake each; the
+connections in use are bounded by the answer slots of ``QueryService``.
+Closing the stream early, as a cancelled request does, closes the HTTP
+response, which tells the server to stop generating.
+
+``build_chat_backend`` builds the backend of a ``GeneratorConfig``.  Its
+``url`` can point to any server speaking the backend's protocol, such as a
+local fake server in tests.  ``build_client`` builds the SDK client alone,
+so ``project_name.rag.llm_client`` can share one between the chat and the
+embedding requests to the same server.
+"""
+
+from __future__ import annotations
+
+from contextlib import aclosing
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    import ollama
+    import openai
+    from pydantic import SecretStr
+
+    from project_name.config.rag.query_config import GeneratorConfig
+
+# Connecting is quick on a healthy server; reads wait for the model
+CONNECT_TIMEOUT = 5.0
+
+
+class ChatBackend(Protocol):
+    """Streaming chat completion."""
+
+    def stream(self, messages: list[dict[str, str]]) -> AsyncGenerator[str]:
+        """Stream the text of the completion of ``messages``.
+
+        Args:
+            messages: Chat messages, dicts with ``role`` and ``content``.
+
+        Returns:
+            Async generator of text fragments, in order; closing it aborts
+            the request.
+
+        Raises:
+            ChatBackendError: If the server fails or cannot be reached.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        ...
+
+
+class ChatBackendError(Exception):
+    """Raised when the chat server fails or cannot be reached.
+
+    Args:
+        backend (str): the backend that failed
+        reason (str): what went wrong
+        status_code (int | None): HTTP status of the failed response, if any
+    """
+
+    def __init__(
+        self, backend: str, reason: str, status_code: int | None = None
+    ) -> None:
+        """Initialize with the backend name and the failure reason.
+
+        Args:
+            backend: The backend that failed
+            reason: What went wrong
+            status_code: HTTP status of the failed response, if any
+        """
+        self.backend = backend
+        self.reason = reason
+        self.status_code = status_code
+        message = f"The {backend} chat backend failed: {reason}"
+        super().__init__(message)
+
+
+def status_of(exc: Exception) -> int | None:
+    """Return the HTTP status of a failed SDK call, if the server answered.
+
+    Args:
+        exc: Error raised by the ``openai``, ``ollama`` or ``httpx`` client.
+
+    Returns:
+        The status code, or None for connection errors and timeouts.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    return status if isinstance(status, int) and status > 0 else None
+
+
+class OpenAIChatBackend:
+    """Chat backend on the OpenAI API or an OpenAI-compatible server.
+
+    Args:
+        client: Async OpenAI client, owning the pooled connections.
+        model: Chat model name.
+        generation_kwargs: Extra arguments of the completion call.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        model: str,
+        generation_kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """Store the client and the model."""
+        self.client = client
+        self.model = model
+        self.generation_kwargs = generation_kwargs or {}
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncGenerator[str]:
+        """Stream the text of the completion of ``messages``."""
+        import openai  # noqa: PLC0415
+
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,  # type: ignore[arg-type]
+                stream=True,
+                **self.generation_kwargs,
+            )
+            async with response:
+                async for chunk in response:
+                    if chunk.choices and (text := chunk.choices[0].delta.content):
+                        yield text
+        except openai.APIError as exc:
+            raise ChatBackendError(self.name, str(exc), status_of(exc)) from exc
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.close()
+
+
+class OllamaChatBackend:
+    """Chat backend on an Ollama server.
+
+    Args:
+        client: Async Ollama client, owning the pooled connections.
+        model: Chat model name.
+        options: Generation options, e.g. ``{"temperature": 0}``.
+    """
+
+    name = "ollama"
+
+    def __init__(
+        self,
+        client: ollama.AsyncClient,
+        model: str,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """Store the client and the model."""
+        self.client = client
+        self.model = model
+        self.options = options or None
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncGenerator[str]:
+        """Stream the text of the completion of ``messages``."""
+        import ollama  # noqa: PLC0415
+
+        try:
+            response = await self.client.chat(
+                self.model, messages, stream=True, options=self.options
+            )
+            async with aclosing(response) as parts:  # type: ignore[type-var]
+                async for part in parts:
+                    if text := part.message.content:
+                        yield text
+        except (ollama.ResponseError, httpx.HTTPError) as exc:
+            raise ChatBackendError(self.name, str(exc), status_of(exc)) from exc
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.close()
+
+
+def build_chat_backend(
+    config: GeneratorConfig,
+) -> OpenAIChatBackend | OllamaChatBackend:
+    """Build the chat backend of the configured server.
+
+    Args:
+        config: Generator settings.
+
+    Returns:
+        The backend, owning its pooled HTTP client.
+
+    Raises:
+        MissingApiKeyError: If the ``openai`` backend has no API key.
+    """
+    client = build_client(
+        config.backend, config.url, config.api_key, config.timeout, role="generator"
+    )
+    return chat_backend_on(client, config)
+
+
+def chat_backend_on(
+    client: ollama.AsyncClient | openai.AsyncOpenAI, config: GeneratorConfig
+) -> OpenAIChatBackend | OllamaChatBackend:
+    """Build the chat backend of ``config`` on an existing client.
+
+    Args:
+        client: Client of ``config.backend``, from ``build_client``.
+        config: Generator settings.
+
+    Returns:
+        The backend, sharing the connections of ``client``.
+    """
+    if config.backend == "ollama":
+        return OllamaChatBackend(client, config.model, options=config.kwargs)  # type: ignore[arg-type]
+    return OpenAIChatBackend(client, config.model, config.kwargs)  # type: ignore[arg-type]
+
+
+def build_client(
+    backend: str,
+    url: str | None,
+    api_key: SecretStr | None,
+    timeout: float,
+    *,
+    role: str,
+    max_connections: int | None = None,
+    max_retries: int = 2,
+) -> ollama.AsyncClient | openai.AsyncOpenAI:
+    """Build the pooled async client of a model server.
+
+    Args:
+        backend: ``"ollama"`` or ``"openai"``.
+        url: Server URL; None uses the backend default.
+        api_key: API key, needed by the ``openai`` backend.
+        timeout: Seconds to wait for the server, per read.
+        role: What the client is for, named in the missing key error.
+        max_connections: Connections kept in the pool of an Ollama client;
+            None uses the ``httpx`` default.  The ``openai`` client keeps
+            its own pool.
+        max_retries: Retries of the ``openai`` client on its own; 0 lets
+            the caller see every 429.
+
+    Returns:
+        ``ollama.AsyncClient`` or ``openai.AsyncOpenAI``.
+
+    Raises:
+        MissingApiKeyError: If the ``openai`` backend has no API key.
+    """
+    if backend == "ollama":
+        import ollama  # noqa: PLC0415
+
+        limits = (
+            {}
+            if max_connections is None
+            else {
+                "limits": httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                )
+            }
+        )
+        return ollama.AsyncClient(
+            host=url,
+            timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+            **limits,
+        )
+
+    import openai  # noqa: PLC0415
+
+    from project_name.rag.components import MissingApiKeyError  # noqa: PLC0415
+
+    if api_key is None:
+        raise MissingApiKeyError(backend, role)
+    return openai.AsyncOpenAI(
+        api_key=api_key.get_secret_value(),
+        base_url=url,
+        timeout=timeout,
+        max_retries=max_retries,
+    )
@@ -0,0 +1,268 @@
+"""Token-aware chunking with tiktoken.
+
+Character or word counts only approximate what a model sees, so chunks
+split on them over- or under-fill the context window.  ``TokenChunker``
+splits on exact token budgets instead:
+
+* texts are consumed lazily, ``batch_size`` at a time, and tokenized with
+  one ``encode_batch`` call per batch;
+* each text is cut in windows of at most ``chunk_tokens`` tokens, where
+  consecutive windows share ``overlap_tokens`` tokens, and the windows are
+  decoded in the same pass;
+* chunks are yielded as soon as their batch is done, so memory is bounded
+  by one batch whatever the corpus size.
+
+Byte-level BPE can split a multi-byte character across tokens.  Windows of
+non-ASCII texts are moved to the nearest character boundary, so no chunk
+starts or ends inside a character and nothing is lost at the seams.
+
+With ``workers`` above 1, batches are processed on a thread pool, a few
+batches ahead of the consumer, and still yielded in order.  tiktoken
+releases the GIL while encoding and decoding, which is most of the work.
+
+Encoders are cached per model or encoding name by ``get_encoding``.
+``TokenSplitter`` wraps a chunker as a haystack component, a drop-in
+replacement for ``DocumentSplitter`` in the ingestion pipeline.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from itertools import batched
+from typing import TYPE_CHECKING
+from typing import Any
+
+from haystack import Document
+from haystack import component
+import tiktoken
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from concurrent.futures import Future
+
+    from project_name.config.rag.ingest_config import ChunkerConfig
+
+# UTF-8 continuation bytes are 0b10xxxxxx
+_CONTINUATION_MASK = 0b1100_0000
+_CONTINUATION_BITS = 0b1000_0000
+
+
+@cache
+def get_encoding(name: str) -> tiktoken.Encoding:
+    """Return the tiktoken encoding of a model or an encoding name, cached.
+
+    Args:
+        name: Model name, e.g. ``"gpt-4o"``, or encoding name, e.g.
+            ``"cl100k_base"``.
+
+    Returns:
+        The encoding, loaded once per process.
+    """
+    try:
+        return tiktoken.encoding_for_model(name)
+    except KeyError:
+        return tiktoken.get_encoding(name)
+
+
+@dataclass(frozen=True, slots=True)
+class TokenChunk:
+    """One chunk of a text.
+
+    Attributes:
+        text: Decoded chunk text.
+        doc_index: Position of the source text in the input.
+        chunk_index: Position of the chunk in its source text.
+        start_token: Index of the first token of the chunk in its source.
+        n_tokens: Number of tokens of the chunk, at most ``chunk_tokens``.
+    """
+
+    text: str
+    doc_index: int
+    chunk_index: int
+    start_token: int
+    n_tokens: int
+
+
+class TokenChunker:
+    """Split texts in chunks of at most ``chunk_tokens`` tokens.
+
+    Args:
+        encoding: tiktoken encoding, or the model or encoding name to load
+            with ``get_encoding``.
+        chunk_tokens: Maximum tokens per chunk.
+        overlap_tokens: Tokens shared by consecutive chunks of a text.
+        batch_size: Texts tokenized per ``encode_batch`` call.
+        workers: Threads processing batches; 1 processes them inline.
+    """
+
+    def __init__(
+        self,
+        encoding: str | tiktoken.Encoding,
+        chunk_tokens: int = 512,
+        overlap_tokens: int = 64,
+        batch_size: int = 64,
+        workers: int = 1,
+    ) -> None:
+        """Validate the budgets and load the encoding."""
+        if not 0 <= overlap_tokens < chunk_tokens:
+            msg = (
+                f"overlap_tokens ({overlap_tokens}) must be at least 0 and below "
+                f"chunk_tokens ({chunk_tokens})"
+            )
+            raise ValueError(msg)
+        if isinstance(encoding, str):
+            encoding = get_encoding(encoding)
+        self.encoding = encoding
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.batch_size = batch_size
+        self.workers = workers
+
+    @classmethod
+    def from_config(cls, config: ChunkerConfig) -> TokenChunker:
+        """Build a chunker from its config."""
+        return cls(**config.to_kw())
+
+    def _starts_char(self, tokens: list[int], index: int) -> bool:
+        """Tell whether a character starts at token ``index``, or it is the end."""
+        if index == len(tokens):
+            return True
+        token_bytes = self.encoding.decode_single_token_bytes(tokens[index])
+        return not token_bytes or (
+            token_bytes[0] & _CONTINUATION_MASK != _CONTINUATION_BITS
+        )
+
+    def spans(self, tokens: list[int], text: str) -> list[tuple[int, int]]:
+        """Return the ``(start, end)`` token windows of one text.
+
+        Only the tokens at window edges are inspected for character
+        boundaries, so the check costs a few lookups per chunk.
+
+        Args:
+            tokens: Tokens of ``text``.
+            text: Source text, checked for non-ASCII characters.
+
+        Returns:
+            Windows of at most ``chunk_tokens`` tokens covering all tokens.
+        """
+        n = len(tokens)
+        check = not text.isascii()
+        spans: list[tuple[int, int]] = []
+        start = 0
+        while start < n:
+            end = min(start + self.chunk_tokens, n)
+            if check:
+                safe_end = end
+                while safe_end > start and not self._starts_char(tokens, safe_end):
+                    safe_end -= 1
+                # A character longer than the budget is cut where it must be
+                end = safe_end if safe_end > start else end
+            spans.append((start, end))
+            if end == n:
+                break
+            next_start = max(end - self.overlap_tokens, start + 1)
+            if check:
+                while next_start < end and not self._starts_char(tokens, next_start):
+                    next_start += 1
+            start = next_start
+        return spans
+
+    def _chunk_batch(self, offset: int, texts: tuple[str, ...]) -> list[TokenChunk]:
+        """Tokenize, window and decode one batch of texts."""
+        num_threads = 1 if self.workers > 1 else 8
+        batch_tokens = self.encoding.encode_batch(
+            list(texts), num_threads=num_threads, disallowed_special=()
+        )
+        keys: list[tuple[int, int, int, int]] = []
+        windows: list[list[int]] = []
+        for i, (text, tokens) in enumerate(zip(texts, batch_tokens, strict=True)):
+            for j, (start, end) in enumerate(self.spans(tokens, text)):
+                keys.append((offset + i, j, start, end - start))
+                windows.append(tokens[start:end])
+        # Decoding a window is cheaper than dispatching it to a thread, which
+        # decode_batch does once per window
+        decode = self.encoding.decode
+        decoded = [decode(window) for window in windows]
+        return [
+            TokenChunk(text, doc_index, chunk_index, start, n_tokens)
+            for text, (doc_index, chunk_index, start, n_tokens) in zip(
+                decoded, keys, strict=True
+            )
+        ]
+
+    def iter_chunks(self, texts: Iterable[str]) -> Iterator[TokenChunk]:
+        """Chunk texts lazily, in input order.
+
+        Args:
+            texts: Texts to split; consumed ``batch_size`` at a time.
+
+        Yields:
+            The chunks of each text in order; empty texts yield none.
+        """
+        batches = batched(texts, self.batch_size, strict=False)
+        if self.workers <= 1:
+            for index, batch in enumerate(batches):
+                yield from self._chunk_batch(index * self.batch_size, batch)
+            return
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending: deque[Future[list[TokenChunk]]] = deque()
+            for index, batch in enumerate(batches):
+                offset = index * self.batch_size
+                pending.append(pool.submit(self._chunk_batch, offset, batch))
+                # Keep a bounded number of batches in flight
+                if len(pending) >= 2 * self.workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def count_tokens(self, text: str) -> int:
+        """Return the number of tokens of ``text``."""
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+@component
+class TokenSplitter:
+    """Haystack component splitting documents with a ``TokenChunker``.
+
+    Each chunk keeps the meta of its document, plus ``source_id``,
+    ``split_id``, ``split_token_start`` and ``n_tokens``.
+
+    Args:
+        chunker: Chunker to split with.
+    """
+
+    def __init__(self, chunker: TokenChunker) -> None:
+        """Wrap the chunker."""
+        self.chunker = chunker
+
+    @component.output_types(documents=list[Document])
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Split the documents.
+
+        Args:
+            documents: Documents to split; those without content are skipped.
+
+        Returns:
+            ``documents``, the chunks in input order.
+        """
+        documents = [doc for doc in documents if doc.content]
+        chunks = self.chunker.iter_chunks(doc.content or "" for doc in documents)
+        return {
+            "documents": [
+                Document(
+                    content=chunk.text,
+                    meta={
+                        **documents[chunk.doc_index].meta,
+                        "source_id": documents[chunk.doc_index].id,
+                        "split_id": chunk.chunk_index,
+                        "split_token_start": chunk.start_token,
+                        "n_tokens": chunk.n_tokens,
+                    },
+                )
+                for chunk in chunks
+            ]
+        }
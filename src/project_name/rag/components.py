@@ -0,0 +1,108 @@
+"""Factories of the haystack components configured by the RAG configs."""
+
+from haystack_integrations.components.retrievers.chroma import ChromaEmbeddingRetriever
+from haystack_integrations.document_stores.chroma import ChromaDocumentStore
+
+from project_name.config.rag.ingest_config import ChromaStoreConfig
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.rag.embedding_cache import CachedDocumentEmbedder
+from project_name.rag.embedding_cache import CachedTextEmbedder
+from project_name.rag.llm_client import TEXT_KWARGS
+from project_name.rag.llm_client import LLMClient
+from project_name.rag.llm_client import LLMDocumentEmbedder
+from project_name.rag.llm_client import LLMTextEmbedder
+from project_name.rag.llm_client import build_llm_client
+
+
+class MissingApiKeyError(ValueError):
+    """Raised when a backend that needs an API key has none configured."""
+
+    def __init__(self, backend: str, role: str = "embedder") -> None:
+        """Initialize the error with the backend name and its role."""
+        super().__init__(f"The {backend!r} {role} backend needs an api_key")
+
+
+def build_document_store(config: ChromaStoreConfig) -> ChromaDocumentStore:
+    """Build the persistent Chroma store.
+
+    Args:
+        config: Store settings.
+
+    Returns:
+        The document store; the collection is created on first use.
+    """
+    config.persist_fol.mkdir(parents=True, exist_ok=True)
+    return ChromaDocumentStore(
+        collection_name=config.collection_name,
+        persist_path=str(config.persist_fol),
+        distance_function=config.distance_function,
+    )
+
+
+def build_document_embedder(
+    config: EmbedderConfig,
+    llm: LLMClientConfig | None = None,
+) -> LLMDocumentEmbedder | CachedDocumentEmbedder:
+    """Build the document embedder of the configured backend.
+
+    Args:
+        config: Embedder settings.
+        llm: Settings of the client the requests go through; None uses the
+            defaults.
+
+    Returns:
+        A haystack document embedder sending ``config.batch_size`` chunks
+        per request through its own ``LLMClient``, behind the embedding
+        cache if ``config.cache_fol`` is set.
+
+    Raises:
+        MissingApiKeyError: If the ``openai`` backend has no API key.
+    """
+    client = build_llm_client(config, config=llm)
+    text_kwargs = {k: v for k, v in config.kwargs.items() if k in TEXT_KWARGS}
+    embedder = LLMDocumentEmbedder(client, **text_kwargs)
+    if config.cache_fol is None:
+        return embedder
+    return CachedDocumentEmbedder(embedder, cache_fol=config.cache_fol)
+
+
+def build_text_embedder(
+    config: EmbedderConfig,
+    client: LLMClient | None = None,
+) -> LLMTextEmbedder | CachedTextEmbedder:
+    """Build the query embedder matching the configured document embedder.
+
+    ``config.kwargs`` are document embedder arguments and are not forwarded.
+
+    Args:
+        config: Embedder settings, the ones the documents were embedded with.
+        client: Client the requests go through, e.g. the one shared with
+            the chat backend; None builds one for ``config``.
+
+    Returns:
+        A haystack text embedder, behind the embedding cache if
+        ``config.cache_fol`` is set.
+
+    Raises:
+        MissingApiKeyError: If the ``openai`` backend has no API key.
+    """
+    embedder = LLMTextEmbedder(client or build_llm_client(config))
+    if config.cache_fol is None:
+        return embedder
+    return CachedTextEmbedder(embedder, cache_fol=config.cache_fol)
+
+
+def build_retriever(
+    document_store: ChromaDocumentStore, top_k: int
+) -> ChromaEmbeddingRetriever:
+    """Build the embedding retriever of the Chroma store.
+
+    Args:
+        document_store: Store to search.
+        top_k: Default number of documents returned.
+
+    Returns:
+        The retriever.
+    """
+    return ChromaEmbeddingRetriever(document_store=document_store, top_k=top_k)
@@ -0,0 +1,445 @@
+"""On-disk embedding cache for the haystack embedders.
+
+Re-embedding identical text costs an embedding call every time, e.g. when a
+changed file is re-ingested and most of its chunks did not change, or when
+the Chroma store is rebuilt.  ``CachedDocumentEmbedder`` and
+``CachedTextEmbedder`` wrap any haystack document or text embedder and only
+send it the texts the cache has not seen.
+
+Storage:
+
+* ``EmbeddingCache`` keeps one folder per embedding space, with
+  ``vectors.f32``, an append-only array of float32 rows read through
+  ``numpy.memmap``, and ``index.bin``, the 16-byte key of each row in the
+  same order.  The index is loaded into a dict on open; a vector is read
+  from the memmap only on a hit.
+* Keys are the blake2b digest of the model name and the exact text sent to
+  the model, so a document embedder keys on its meta fields as well.
+* The folder name is derived from the embedder settings that change the
+  vectors (model, dimensions, prefix, suffix, meta fields), so changing any
+  of them starts a new cache instead of returning stale vectors.
+
+Rows are appended vectors first and index second, and a torn tail is
+dropped on open, so a crash never maps a key to a missing row.  The cache is
+safe to share between threads and between processes, e.g. the web workers
+and the ingestion CLI: appends hold an ``flock`` on ``.lock`` in the folder
+and first read the rows other processes appended, and a lookup miss reads
+them too, so row numbers always match the files.
+
+Each cache counts hits and misses; the wrappers log them per run and return
+them in their ``meta`` output.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import replace
+import hashlib
+import json
+import re
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+
+from haystack import Document
+from haystack import component
+from loguru import logger as lg
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+    from pathlib import Path
+
+KEY_SIZE = 16
+VECTORS_NAME = "vectors.f32"
+INDEX_NAME = "index.bin"
+META_NAME = "meta.json"
+LOCK_NAME = ".lock"
+
+# Embedder attributes that change the vectors it returns
+_SPACE_ATTRS = (
+    "model",
+    "dimensions",
+    "prefix",
+    "suffix",
+    "meta_fields_to_embed",
+    "embedding_separator",
+)
+
+
+def embedding_key(model: str, text: str) -> bytes:
+    """Return the cache key of ``text`` embedded by ``model``."""
+    h = hashlib.blake2b(model.encode(), digest_size=KEY_SIZE)
+    h.update(b"\0")
+    h.update(text.encode())
+    return h.digest()
+
+
+def embedding_space(embedder: Any) -> str:  # noqa: ANN401
+    """Return a folder name identifying the vectors an embedder produces.
+
+    Args:
+        embedder: Haystack embedder component.
+
+    Returns:
+        The model name made path-safe, followed by a short hash of the
+        settings that change the vectors.
+    """
+    settings = {name: getattr(embedder, name, None) for name in _SPACE_ATTRS}
+    digest = hashlib.blake2b(
+        json.dumps(settings, sort_keys=True, default=str).encode(), digest_size=4
+    ).hexdigest()
+    model = re.sub(r"[^A-Za-z0-9._-]+", "_", str(settings["model"]))
+    return f"{model}-{digest}"
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Hit and miss counts of a cache.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that needed the embedder.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache, 0 before any."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EmbeddingCache:
+    """Persistent map from embedding key to float32 vector.
+
+    Args:
+        fol: Folder of the cache files, created if missing.
+    """
+
+    def __init__(self, fol: Path) -> None:
+        """Open the cache and load its index."""
+        # fcntl is POSIX only: import here so the module stays importable
+        import fcntl  # noqa: PLC0415
+
+        self._fcntl = fcntl
+        self.fol = fol
+        self.fol.mkdir(parents=True, exist_ok=True)
+        self.vectors_fp = fol / VECTORS_NAME
+        self.index_fp = fol / INDEX_NAME
+        self.meta_fp = fol / META_NAME
+        self.stats = CacheStats()
+        self.dim: int | None = None
+        self._rows: dict[bytes, int] = {}
+        self._n_rows = 0
+        self._memmap: np.memmap | None = None
+        self._lock = threading.Lock()
+        self._lock_file = (fol / LOCK_NAME).open("a+b")
+        with self._locked(self._fcntl.LOCK_EX):
+            self._load()
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        """Hold the cache file lock, shared or exclusive, across processes."""
+        self._fcntl.flock(self._lock_file, operation)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._lock_file, self._fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        """Read the index, dropping rows a crash left half written.
+
+        Called with the exclusive file lock held.
+        """
+        if not self.meta_fp.exists():
+            return
+        self.dim = json.loads(self.meta_fp.read_text())["dim"]
+        self.index_fp.touch()
+        self.vectors_fp.touch()
+        keys = self.index_fp.read_bytes()
+        row_size = 4 * self.dim
+        vectors_size = self.vectors_fp.stat().st_size
+        n = min(len(keys) // KEY_SIZE, vectors_size // row_size)
+        if n * KEY_SIZE != len(keys) or n * row_size != vectors_size:
+            lg.warning(f"Embedding cache {self.fol}: dropping a torn tail")
+            with self.index_fp.open("r+b") as f:
+                f.truncate(n * KEY_SIZE)
+            with self.vectors_fp.open("r+b") as f:
+                f.truncate(n * row_size)
+        self._rows = {}
+        self._n_rows = 0
+        self._add_keys(keys[: n * KEY_SIZE])
+
+    def _add_keys(self, keys: bytes) -> None:
+        """Index the rows of ``keys``, read from the index file after the last.
+
+        A key written twice, e.g. by two processes missing it at once, keeps
+        its first row.
+        """
+        for i in range(len(keys) // KEY_SIZE):
+            key = keys[i * KEY_SIZE : (i + 1) * KEY_SIZE]
+            self._rows.setdefault(key, self._n_rows + i)
+        self._n_rows += len(keys) // KEY_SIZE
+
+    def _refresh(self) -> None:
+        """Index the rows other processes appended since the last read.
+
+        Called with the file lock held.  Rows are appended vectors first, so
+        every complete key in the index has its vector on disk.
+        """
+        if self.dim is None:
+            if not self.meta_fp.exists():
+                return
+            self.dim = json.loads(self.meta_fp.read_text())["dim"]
+        if not self.index_fp.exists():
+            return
+        with self.index_fp.open("rb") as f:
+            f.seek(self._n_rows * KEY_SIZE)
+            tail = f.read()
+        self._add_keys(tail[: len(tail) - len(tail) % KEY_SIZE])
+
+    def __len__(self) -> int:
+        """Return the number of cached vectors."""
+        return len(self._rows)
+
+    def _vectors(self) -> np.memmap:
+        """Return the memmap of all rows, mapped again after appends."""
+        if self._memmap is None or len(self._memmap) != self._n_rows:
+            self._memmap = np.memmap(
+                self.vectors_fp,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._n_rows, self.dim),
+            )
+        return self._memmap
+
+    def get_many(self, keys: Sequence[bytes]) -> list[list[float] | None]:
+        """Look up vectors, counting hits and misses.
+
+        A miss first reads the rows other processes sharing the folder
+        appended since the last lookup.
+
+        Args:
+            keys: Keys from ``embedding_key``.
+
+        Returns:
+            The vector of each key, or None where it is not cached.
+        """
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                with self._locked(self._fcntl.LOCK_SH):
+                    self._refresh()
+            rows = [self._rows.get(key) for key in keys]
+            found = [row for row in rows if row is not None]
+            self.stats.hits += len(found)
+            self.stats.misses += len(rows) - len(found)
+            if not found:
+                return [None] * len(rows)
+            vectors = self._vectors()
+            return [None if row is None else vectors[row].tolist() for row in rows]
+
+    def put_many(self, keys: Sequence[bytes], vectors: Sequence[list[float]]) -> None:
+        """Append vectors; keys already cached are skipped.
+
+        The rows are appended under the exclusive file lock, after reading
+        the rows other processes appended, so row numbers stay those of the
+        files.
+
+        Args:
+            keys: Keys from ``embedding_key``.
+            vectors: One vector per key, all of the same dimension.
+
+        Raises:
+            ValueError: If a vector does not match the cache dimension.
+        """
+        with self._lock, self._locked(self._fcntl.LOCK_EX):
+            self._refresh()
+            new = {
+                key: vector
+                for key, vector in zip(keys, vectors, strict=True)
+                if key not in self._rows
+            }
+            if not new:
+                return
+            array = np.asarray(list(new.values()), dtype=np.float32)
+            if self.dim is None:
+                self.dim = array.shape[1]
+                self.meta_fp.write_text(json.dumps({"dim": self.dim}))
+            if array.shape[1] != self.dim:
+                msg = f"Expected vectors of dimension {self.dim}, got {array.shape[1]}"
+                raise ValueError(msg)
+            with self.vectors_fp.open("ab") as f:
+                f.write(array.tobytes())
+            with self.index_fp.open("ab") as f:
+                f.write(b"".join(new))
+            self._add_keys(b"".join(new))
+
+    def close(self) -> None:
+        """Close the lock file."""
+        self._lock_file.close()
+
+
+def document_text(embedder: Any, doc: Document) -> str:  # noqa: ANN401
+    """Return the text a haystack document embedder sends for ``doc``."""
+    meta_fields = getattr(embedder, "meta_fields_to_embed", None) or []
+    separator = getattr(embedder, "embedding_separator", "\n")
+    values = [
+        str(doc.meta[field])
+        for field in meta_fields
+        if field in doc.meta and doc.meta[field] is not None
+    ]
+    return separator.join([*values, doc.content or ""])
+
+
+def _open_cache(embedder: Any, cache_fol: Path | None) -> EmbeddingCache:  # noqa: ANN401
+    """Open the cache of the embedder's embedding space under ``cache_fol``.
+
+    Raises:
+        ValueError: If ``cache_fol`` is None.
+    """
+    if cache_fol is None:
+        msg = "Pass either cache or cache_fol"
+        raise ValueError(msg)
+    return EmbeddingCache(cache_fol / embedding_space(embedder))
+
+
+def _log_stats(name: str, cache: EmbeddingCache, hits: int, total: int) -> None:
+    """Log the hits of one run and the lifetime hit rate."""
+    lg.debug(
+        f"{name}: {hits}/{total} cached, "
+        f"hit rate {cache.stats.hit_rate:.1%} over {cache.fol.name}"
+    )
+
+
+@component
+class CachedDocumentEmbedder:
+    """Document embedder that only embeds documents it has not seen.
+
+    Args:
+        embedder: Haystack document embedder to wrap.
+        cache: Cache to use.  Defaults to a cache in ``cache_fol``, in the
+            folder of the embedder's embedding space.
+        cache_fol: Root folder of the embedding caches, used when ``cache``
+            is None.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,  # noqa: ANN401
+        cache: EmbeddingCache | None = None,
+        cache_fol: Path | None = None,
+    ) -> None:
+        """Wrap the embedder."""
+        self.embedder = embedder
+        self.cache = cache if cache is not None else _open_cache(embedder, cache_fol)
+        self.model = str(getattr(embedder, "model", ""))
+
+    def warm_up(self) -> None:
+        """Warm up the wrapped embedder, if it needs it."""
+        if hasattr(self.embedder, "warm_up"):
+            self.embedder.warm_up()
+
+    @component.output_types(documents=list[Document], meta=dict[str, Any])
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Embed the documents, reading cached vectors where possible.
+
+        Args:
+            documents: Documents to embed.
+
+        Returns:
+            ``documents`` with their embeddings, and ``meta`` with the
+            ``cache_hits`` and ``cache_misses`` of this run, merged with the
+            wrapped embedder's meta if it was called.
+        """
+        keys = [
+            embedding_key(self.model, document_text(self.embedder, doc))
+            for doc in documents
+        ]
+        cached = self.cache.get_many(keys)
+        # First document of each missing key; duplicates are embedded once
+        missing: dict[bytes, int] = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(keys[i], i)
+        meta: dict[str, Any] = {}
+        if missing:
+            result = self.embedder.run(
+                documents=[documents[i] for i in missing.values()]
+            )
+            meta = dict(result.get("meta") or {})
+            vectors = {
+                key: doc.embedding
+                for key, doc in zip(missing, result["documents"], strict=True)
+            }
+            self.cache.put_many(list(vectors), list(vectors.values()))
+            cached = [
+                vectors[key] if vector is None else vector
+                for key, vector in zip(keys, cached, strict=True)
+            ]
+        hits = sum(key not in missing for key in keys)
+        meta.update(cache_hits=hits, cache_misses=len(keys) - hits)
+        _log_stats(type(self).__name__, self.cache, hits, len(keys))
+        return {
+            "documents": [
+                replace(doc, embedding=vector)
+                for doc, vector in zip(documents, cached, strict=True)
+            ],
+            "meta": meta,
+        }
+
+
+@component
+class CachedTextEmbedder:
+    """Text embedder that reads the vectors of texts it has seen from disk.
+
+    Args:
+        embedder: Haystack text embedder to wrap.
+        cache: Cache to use.  Defaults to a cache in ``cache_fol``, in the
+            folder of the embedder's embedding space.
+        cache_fol: Root folder of the embedding caches, used when ``cache``
+            is None.
+    """
+
+    def __init__(
+        self,
+        embedder: Any,  # noqa: ANN401
+        cache: EmbeddingCache | None = None,
+        cache_fol: Path | None = None,
+    ) -> None:
+        """Wrap the embedder."""
+        self.embedder = embedder
+        self.cache = cache if cache is not None else _open_cache(embedder, cache_fol)
+        self.model = str(getattr(embedder, "model", ""))
+
+    def warm_up(self) -> None:
+        """Warm up the wrapped embedder, if it needs it."""
+        if hasattr(self.embedder, "warm_up"):
+            self.embedder.warm_up()
+
+    @component.output_types(embedding=list[float], meta=dict[str, Any])
+    def run(self, text: str) -> dict[str, Any]:
+        """Embed the text, reading the cached vector if there is one.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            ``embedding``, and ``meta`` with ``cache_hit``, merged with the
+            wrapped embedder's meta if it was called.
+        """
+        key = embedding_key(self.model, text)
+        (vector,) = self.cache.get_many([key])
+        if vector is not None:
+            _log_stats(type(self).__name__, self.cache, 1, 1)
+            return {"embedding": vector, "meta": {"cache_hit": True}}
+        result = self.embedder.run(text=text)
+        self.cache.put_many([key], [result["embedding"]])
+        _log_stats(type(self).__name__, self.cache, 0, 1)
+        meta = dict(result.get("meta") or {})
+        meta["cache_hit"] = False
+        return {"embedding": result["embedding"], "meta": meta}
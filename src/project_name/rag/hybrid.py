@@ -0,0 +1,111 @@
+"""Hybrid retrieval: BM25 and embedding rankings fused by reciprocal rank.
+
+``HybridRetriever`` runs a keyword retriever, ``BM25Retriever`` over the
+``BM25Index`` kept alongside the Chroma collection, and an embedding
+retriever, each for ``candidate_factor * top_k`` chunks, and merges the
+two rankings with reciprocal rank fusion: a chunk scores
+``sum(1 / (rrf_k + rank))`` over the rankings it appears in, with ranks
+from 1.
+
+RRF needs no score calibration: BM25 scores are unbounded and cosine
+similarities are not, but only the ranks are used.  A chunk found by both
+retrievers beats one found by either alone, and the exact identifiers
+BM25 finds reach the context even when the embeddings miss them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import TYPE_CHECKING
+from typing import Any
+
+from haystack import Document
+from haystack import component
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# Smoothing constant of the original RRF paper
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Document]],
+    top_k: int,
+    rrf_k: int = DEFAULT_RRF_K,
+) -> list[Document]:
+    """Merge rankings by the sum of the reciprocal ranks of each chunk.
+
+    Args:
+        rankings: Chunks of each retriever, best first.
+        top_k: Maximum number of chunks returned.
+        rrf_k: Smoothing constant; larger values flatten the rank weights.
+
+    Returns:
+        The best ``top_k`` chunks, each the first copy seen, with the fused
+        score as ``score``.  Ties keep the order of first appearance.
+    """
+    scores: dict[str, float] = {}
+    first: dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            scores[doc.id] = scores.get(doc.id, 0.0) + 1 / (rrf_k + rank)
+            first.setdefault(doc.id, doc)
+    best = sorted(scores, key=scores.__getitem__, reverse=True)[:top_k]
+    return [replace(first[doc_id], score=scores[doc_id]) for doc_id in best]
+
+
+@component
+class HybridRetriever:
+    """Fuse a keyword and an embedding retriever with reciprocal rank fusion.
+
+    Args:
+        bm25_retriever: Keyword retriever, run with ``query`` and ``top_k``.
+        embedding_retriever: Haystack embedding retriever, run with
+            ``query_embedding`` and ``top_k``.
+        top_k: Default number of chunks returned.
+        rrf_k: Smoothing constant of the fusion.
+        candidate_factor: Each retriever returns this many times ``top_k``
+            chunks, so a chunk ranked low by one can still be fused in.
+    """
+
+    def __init__(
+        self,
+        bm25_retriever: Any,  # noqa: ANN401
+        embedding_retriever: Any,  # noqa: ANN401
+        top_k: int = 10,
+        rrf_k: int = DEFAULT_RRF_K,
+        candidate_factor: int = 4,
+    ) -> None:
+        """Store the retrievers."""
+        self.bm25_retriever = bm25_retriever
+        self.embedding_retriever = embedding_retriever
+        self.top_k = top_k
+        self.rrf_k = rrf_k
+        self.candidate_factor = candidate_factor
+
+    @component.output_types(documents=list[Document])
+    def run(
+        self, query: str, query_embedding: list[float], top_k: int | None = None
+    ) -> dict[str, Any]:
+        """Retrieve by keyword and by embedding, and fuse the rankings.
+
+        Args:
+            query: Question text, searched by keyword.
+            query_embedding: Embedding of the question.
+            top_k: Number of chunks; None uses the default.
+
+        Returns:
+            ``documents``, best first, scored by reciprocal rank fusion.
+        """
+        top_k = top_k or self.top_k
+        n_candidates = top_k * self.candidate_factor
+        dense = self.embedding_retriever.run(
+            query_embedding=query_embedding, top_k=n_candidates
+        )["documents"]
+        sparse = self.bm25_retriever.run(query=query, top_k=n_candidates)["documents"]
+        return {
+            "documents": reciprocal_rank_fusion(
+                [dense, sparse], top_k=top_k, rrf_k=self.rrf_k
+            )
+        }
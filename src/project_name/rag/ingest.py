@@ -0,0 +1,341 @@
+"""Streaming document ingestion into the Chroma store.
+
+``DocumentIngestor`` walks ``IngestConfig.data_fol`` lazily and feeds the
+files, ``file_batch_size`` at a time, through a haystack pipeline::
+
+    TextFileToDocument -> splitter -> embedder -> DocumentWriter
+
+so at most one batch of files and their chunks is in memory, and the
+embedder sends ``EmbedderConfig.batch_size`` chunks per request, through an
+``LLMClient`` that sends the requests of a batch concurrently within its
+adaptive limit.  The
+splitter is a ``TokenSplitter`` cutting exact token budgets when
+``IngestConfig.chunker`` is set, else a ``DocumentSplitter``.
+
+Each file is hashed before it is converted.  The manifest,
+``ingest_manifest.json`` next to the Chroma database, maps the path of every
+ingested file to its content hash:
+
+* a file with the recorded hash is skipped, so a re-ingest only embeds the
+  files that changed;
+* a changed file has its old chunks deleted before the new ones are written;
+* a file that disappeared has its chunks deleted.
+
+The manifest is saved as the batches are written, so an interrupted ingest
+resumes where it stopped.  Every chunk carries ``source`` and
+``content_hash`` in its meta.  A new file is listed in
+``ingest_pending.json`` before its chunks are written and until the manifest
+records it: the next run deletes the chunks of pending files the manifest
+does not know, so a file removed after an interrupted ingest leaves none
+behind.
+
+With ``EmbedderConfig.cache_fol`` set, the embedder is wrapped in a
+``CachedDocumentEmbedder``: the unchanged chunks of a changed file, or of a
+rebuilt store, are read from the embedding cache instead of embedded again.
+
+With ``IngestConfig.bm25`` set, the embedded chunks are also written to a
+``BM25Index`` by a ``BM25IndexWriter``, and the chunks of changed and
+removed files are deleted from both.  A save rewrites the whole index, so
+it is saved every ``BM25Config.save_every`` batches and at the end of the
+run, each time followed by the manifest: an interrupted ingest then redoes
+the batches since the last save.  An empty index next to an ingested store
+is filled from the store first.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+from typing import TYPE_CHECKING
+from typing import Any
+
+from haystack import Pipeline
+from haystack.components.converters import TextFileToDocument
+from haystack.components.preprocessors import DocumentSplitter
+from haystack.components.writers import DocumentWriter
+from haystack.document_stores.types import DuplicatePolicy
+from loguru import logger as lg
+
+from project_name.rag.bm25 import BM25Index
+from project_name.rag.bm25 import BM25IndexWriter
+from project_name.rag.chunking import TokenChunker
+from project_name.rag.chunking import TokenSplitter
+from project_name.rag.components import build_document_embedder
+from project_name.rag.components import build_document_store
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from haystack.document_stores.types import DocumentStore
+
+    from project_name.config.rag.ingest_config import IngestConfig
+
+MANIFEST_NAME = "ingest_manifest.json"
+PENDING_NAME = "ingest_pending.json"
+
+
+def content_hash(fp: Path) -> str:
+    """Return the hex blake2b digest of a file's content."""
+    with fp.open("rb") as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+    return digest.hexdigest()
+
+
+def iter_source_files(data_fol: Path, suffixes: list[str]) -> Iterator[Path]:
+    """Yield the files to ingest under ``data_fol``, in path order.
+
+    Args:
+        data_fol: Folder scanned recursively.
+        suffixes: Suffixes to keep, compared lowercase.
+
+    Yields:
+        Paths of the matching files.
+    """
+    keep = {s.lower() for s in suffixes}
+    for fp in sorted(data_fol.rglob("*")):
+        if fp.suffix.lower() in keep and fp.is_file():
+            yield fp
+
+
+@dataclass(slots=True)
+class IngestReport:
+    """Outcome of one ingest.
+
+    Attributes:
+        added: Files ingested for the first time.
+        updated: Files whose content changed and were ingested again.
+        unchanged: Files skipped because their hash is in the manifest.
+        removed: Files gone from the data folder, whose chunks were deleted.
+        chunks: Chunks written to the store.
+        cached_chunks: Chunks whose embedding came from the embedding cache.
+    """
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks: int = 0
+    cached_chunks: int = 0
+
+
+class DocumentIngestor:
+    """Ingest the files of a folder into a document store.
+
+    Args:
+        config: Ingestion settings.
+        document_store: Store to write to.  Defaults to the Chroma store of
+            ``config.store``.
+        embedder: Haystack document embedder component.  Defaults to the
+            one of ``config.embedder``.
+        bm25_index: Keyword index kept alongside the store.  Defaults to
+            the index of ``config.bm25``, if set.
+    """
+
+    def __init__(
+        self,
+        config: IngestConfig,
+        document_store: DocumentStore | None = None,
+        embedder: Any = None,  # noqa: ANN401
+        bm25_index: BM25Index | None = None,
+    ) -> None:
+        """Build the ingestion pipeline."""
+        self.config = config
+        self.document_store = document_store or build_document_store(config.store)
+        self.embedder = embedder or build_document_embedder(config.embedder, config.llm)
+        if bm25_index is None and config.bm25 is not None:
+            bm25_index = BM25Index.from_config(config.bm25)
+        self.bm25_index = bm25_index
+        self.manifest_fp = config.store.persist_fol / MANIFEST_NAME
+        self.pending_fp = config.store.persist_fol / PENDING_NAME
+        self.pipeline = self._build_pipeline()
+
+    def _build_pipeline(self) -> Pipeline:
+        """Connect converter, splitter, embedder and writer."""
+        pipeline = Pipeline()
+        pipeline.add_component("converter", TextFileToDocument())
+        if self.config.chunker is not None:
+            chunker = TokenChunker.from_config(self.config.chunker)
+            pipeline.add_component("splitter", TokenSplitter(chunker))
+        else:
+            pipeline.add_component(
+                "splitter", DocumentSplitter(**self.config.splitter.to_kw())
+            )
+        pipeline.add_component("embedder", self.embedder)
+        pipeline.add_component(
+            "writer",
+            DocumentWriter(self.document_store, policy=DuplicatePolicy.OVERWRITE),
+        )
+        pipeline.connect("converter.documents", "splitter.documents")
+        pipeline.connect("splitter.documents", "embedder.documents")
+        pipeline.connect("embedder.documents", "writer.documents")
+        if self.bm25_index is not None:
+            pipeline.add_component("bm25_writer", BM25IndexWriter(self.bm25_index))
+            pipeline.connect("embedder.documents", "bm25_writer.documents")
+        return pipeline
+
+    def load_manifest(self) -> dict[str, str]:
+        """Return the content hash of every ingested file, by relative path."""
+        if not self.manifest_fp.exists():
+            return {}
+        return json.loads(self.manifest_fp.read_text())
+
+    def save_manifest(self, manifest: dict[str, str]) -> None:
+        """Write the manifest, replacing the previous one atomically."""
+        self.manifest_fp.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fp = self.manifest_fp.with_suffix(".tmp")
+        tmp_fp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        tmp_fp.replace(self.manifest_fp)
+
+    def load_pending(self) -> set[str]:
+        """Return the new files written since the manifest was last saved."""
+        if not self.pending_fp.exists():
+            return set()
+        return set(json.loads(self.pending_fp.read_text()))
+
+    def save_pending(self, pending: set[str]) -> None:
+        """Write the pending files atomically, or remove the list when empty."""
+        if not pending:
+            self.pending_fp.unlink(missing_ok=True)
+            return
+        self.pending_fp.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fp = self.pending_fp.with_suffix(".tmp")
+        tmp_fp.write_text(json.dumps(sorted(pending), indent=2) + "\n")
+        tmp_fp.replace(self.pending_fp)
+
+    def delete_sources(self, sources: list[str]) -> None:
+        """Delete the chunks of the given source files from the store.
+
+        The keyword index is saved by ``checkpoint``.
+        """
+        if sources:
+            self.document_store.delete_by_filter(  # type: ignore[attr-defined]
+                {"field": "meta.source", "operator": "in", "value": sources}
+            )
+            if self.bm25_index is not None:
+                self.bm25_index.delete_sources(sources)
+
+    def _backfill_bm25(self, manifest: dict[str, str]) -> None:
+        """Fill an empty keyword index from an already ingested store."""
+        if self.bm25_index is None or len(self.bm25_index) or not manifest:
+            return
+        documents = self.document_store.filter_documents()
+        self.bm25_index.add(documents)
+        self.bm25_index.save()
+        lg.info(f"Filled the BM25 index with {len(documents)} chunks of the store")
+
+    def _ingest_batch(
+        self,
+        batch: list[tuple[Path, str, str]],
+        manifest: dict[str, str],
+        pending: set[str],
+        report: IngestReport,
+    ) -> None:
+        """Ingest one batch of ``(path, source, hash)`` and record it.
+
+        The new files of the batch are saved as pending before their chunks
+        are written.
+        """
+        self.delete_sources([source for _, source, _ in batch if source in manifest])
+        new = {source for _, source, _ in batch if source not in manifest}
+        if not new <= pending:
+            pending |= new
+            self.save_pending(pending)
+        result = self.pipeline.run(
+            {
+                "converter": {
+                    "sources": [fp for fp, _, _ in batch],
+                    "meta": [
+                        {"source": source, "content_hash": digest}
+                        for _, source, digest in batch
+                    ],
+                }
+            },
+            include_outputs_from={"embedder"},
+        )
+        report.chunks += result["writer"]["documents_written"]
+        embedder_meta = result.get("embedder", {}).get("meta", {})
+        report.cached_chunks += embedder_meta.get("cache_hits", 0)
+        for _, source, digest in batch:
+            if source in manifest:
+                report.updated += 1
+            else:
+                report.added += 1
+            manifest[source] = digest
+
+    def checkpoint(self, manifest: dict[str, str], pending: set[str]) -> None:
+        """Save the keyword index, then the manifest recording its files.
+
+        The pending files are recorded by the manifest, so their list is
+        cleared.
+        """
+        if self.bm25_index is not None:
+            self.bm25_index.save()
+        self.save_manifest(manifest)
+        pending.clear()
+        self.save_pending(pending)
+
+    def _delete_orphans(self, manifest: dict[str, str]) -> set[str]:
+        """Delete the chunks of the pending files the manifest does not record.
+
+        They were written by an interrupted ingest; a file still there is
+        ingested again.
+
+        Returns:
+            The pending files, still to be cleared by a checkpoint.
+        """
+        pending = self.load_pending()
+        orphans = sorted(pending - manifest.keys())
+        if orphans:
+            self.delete_sources(orphans)
+            lg.info(
+                f"Deleted the chunks of {len(orphans)} files of an interrupted ingest"
+            )
+        return pending
+
+    def run(self) -> IngestReport:
+        """Ingest new and changed files and drop the chunks of removed ones.
+
+        Returns:
+            Counts of files per outcome and of chunks written.
+        """
+        data_fol = self.config.data_fol
+        manifest = self.load_manifest()
+        pending = self._delete_orphans(manifest)
+        self._backfill_bm25(manifest)
+        bm25 = self.config.bm25
+        save_every = bm25.save_every if bm25 is not None else 1
+        report = IngestReport()
+        seen: set[str] = set()
+        batch: list[tuple[Path, str, str]] = []
+        unsaved = 0
+        for fp in iter_source_files(data_fol, self.config.suffixes):
+            source = fp.relative_to(data_fol).as_posix()
+            seen.add(source)
+            digest = content_hash(fp)
+            if manifest.get(source) == digest:
+                report.unchanged += 1
+                continue
+            batch.append((fp, source, digest))
+            if len(batch) >= self.config.file_batch_size:
+                self._ingest_batch(batch, manifest, pending, report)
+                batch = []
+                unsaved += 1
+                if unsaved >= save_every:
+                    self.checkpoint(manifest, pending)
+                    unsaved = 0
+        if batch:
+            self._ingest_batch(batch, manifest, pending, report)
+            unsaved += 1
+
+        removed = sorted(manifest.keys() - seen)
+        if removed:
+            self.delete_sources(removed)
+            for source in removed:
+                del manifest[source]
+            report.removed = len(removed)
+        if unsaved or removed or pending:
+            self.checkpoint(manifest, pending)
+        lg.info(f"Ingested {data_fol}: {report}")
+        return report
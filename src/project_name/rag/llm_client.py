@@ -0,0 +1,881 @@
+"""Shared async client of the embedding and chat models.
+
+Every model call of the RAG code goes through an ``LLMClient``:
+
+* one pooled SDK client per server, shared by the embedding and chat
+  requests when both go to the same server, so requests reuse warm
+  keep-alive connections;
+* embedding requests are micro-batched: texts requested within
+  ``batch_window`` seconds of each other are sent in one request of up to
+  ``batch_size`` texts, so concurrent questions share a round trip and a
+  large ingest batch is split into requests sent concurrently;
+* identical requests in flight are deduplicated: a text already queued or
+  being embedded waits for the same vector, and a chat prompt already being
+  answered streams the same answer, replayed from its first fragment;
+* each server has an ``AdaptiveLimiter``, an additive-increase,
+  multiplicative-decrease bound on the requests in flight: it grows by one
+  request per round of fast responses while saturated, halves on a 429 and
+  shrinks by a tenth when a response is ``latency_tolerance`` times slower
+  than the fastest recent one.  Refused embedding requests, and chat
+  requests refused before their first fragment, are retried with
+  exponential backoff; the SDK clients do not retry on their own, so the
+  limiter sees every 429.
+
+The client is bound to the event loop it is first used on.  The haystack
+components ``LLMDocumentEmbedder`` and ``LLMTextEmbedder`` call it from
+synchronous code with ``run_sync``: on the client's loop if it runs in
+another thread, else on a private loop, as in the ingestion CLI.
+
+``build_llm_client`` builds the client of an ``EmbedderConfig`` and a
+``GeneratorConfig``; it implements the ``ChatBackend`` protocol, so
+``QueryService`` streams answers through it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from dataclasses import dataclass
+from dataclasses import replace
+import json
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+from haystack import Document
+from haystack import component
+import httpx
+from loguru import logger as lg
+
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.rag.chat import ChatBackendError
+from project_name.rag.chat import build_client
+from project_name.rag.chat import chat_backend_on
+from project_name.rag.chat import status_of
+from project_name.rag.embedding_cache import document_text
+from project_name.rag.embedding_cache import embedding_key
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+    from collections.abc import Coroutine
+    from collections.abc import Sequence
+
+    import ollama
+    import openai
+
+    from project_name.config.rag.ingest_config import EmbedderConfig
+    from project_name.config.rag.query_config import GeneratorConfig
+    from project_name.rag.chat import ChatBackend
+    from project_name.rag.embedding_cache import EmbeddingCache
+
+# Embedder arguments shaping the text of a chunk, not sent with the request
+TEXT_KWARGS = ("prefix", "suffix", "meta_fields_to_embed", "embedding_separator")
+
+# Read timeout of a server only used for embeddings
+EMBED_TIMEOUT = 60.0
+
+# Fraction of the gap to a slower response the latency baseline moves by,
+# so the baseline follows a server that became slower for good
+BASELINE_DRIFT = 0.01
+
+
+class EmbeddingBackendError(Exception):
+    """Raised when the embedding server fails or cannot be reached.
+
+    Args:
+        backend (str): the backend that failed
+        reason (str): what went wrong
+        status_code (int | None): HTTP status of the failed response, if any
+    """
+
+    def __init__(
+        self, backend: str, reason: str, status_code: int | None = None
+    ) -> None:
+        """Initialize with the backend name and the failure reason.
+
+        Args:
+            backend: The backend that failed
+            reason: What went wrong
+            status_code: HTTP status of the failed response, if any
+        """
+        self.backend = backend
+        self.reason = reason
+        self.status_code = status_code
+        message = f"The {backend} embedding backend failed: {reason}"
+        super().__init__(message)
+
+
+class EmbeddingBackend(Protocol):
+    """Batch embedding requests to one model."""
+
+    model: str
+    kwargs: dict[str, Any]
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts`` in one request.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            One vector per text, in order.
+
+        Raises:
+            EmbeddingBackendError: If the server fails or cannot be reached.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        ...
+
+
+class OpenAIEmbeddingBackend:
+    """Embeddings from the OpenAI API or an OpenAI-compatible server.
+
+    Args:
+        client: Async OpenAI client, owning the pooled connections.
+        model: Embedding model name.
+        kwargs: Extra arguments of every request, e.g. ``dimensions``.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        model: str,
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """Store the client and the model."""
+        self.client = client
+        self.model = model
+        self.kwargs = kwargs or {}
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts`` in one request."""
+        import openai  # noqa: PLC0415
+
+        try:
+            response = await self.client.embeddings.create(
+                model=self.model, input=texts, **self.kwargs
+            )
+        except openai.APIError as exc:
+            raise EmbeddingBackendError(self.name, str(exc), status_of(exc)) from exc
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.close()
+
+
+class OllamaEmbeddingBackend:
+    """Embeddings from an Ollama server.
+
+    Args:
+        client: Async Ollama client, owning the pooled connections.
+        model: Embedding model name.
+        kwargs: Extra arguments of every request, e.g. ``options``.
+    """
+
+    name = "ollama"
+
+    def __init__(
+        self,
+        client: ollama.AsyncClient,
+        model: str,
+        kwargs: dict[str, Any] | None = None,
+    ) -> None:
+        """Store the client and the model."""
+        self.client = client
+        self.model = model
+        self.kwargs = kwargs or {}
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts`` in one request."""
+        import ollama  # noqa: PLC0415
+
+        try:
+            response = await self.client.embed(self.model, texts, **self.kwargs)
+        except (ollama.ResponseError, httpx.HTTPError) as exc:
+            raise EmbeddingBackendError(self.name, str(exc), status_of(exc)) from exc
+        return [list(vector) for vector in response.embeddings]
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.client.close()
+
+
+class AdaptiveLimiter:
+    """Bound on the requests in flight to a server, adapted to its responses.
+
+    The limit grows by about one request per ``limit`` fast responses while
+    every slot is taken, halves when the server refuses a request with 429
+    and shrinks by a tenth when a response takes more than
+    ``latency_tolerance`` times the baseline, the fastest recent one.  It
+    decreases at most once per round trip: responses to requests sent
+    before the last decrease do not decrease it again.
+
+    Args:
+        initial: Limit before any feedback.
+        min_limit: Lower bound of the limit.
+        max_limit: Upper bound of the limit.
+        latency_tolerance: Slowdown over the baseline that lowers the limit.
+        name: Server name in the logs.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        latency_tolerance: float = 2.0,
+        name: str = "",
+    ) -> None:
+        """Start at the initial limit with no request in flight."""
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.baseline: float | None = None
+        self._in_flight = 0
+        self._decreased_at = float("-inf")
+        self._waiters: list[asyncio.Future[None]] = []
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests holding a slot."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot and take it."""
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Woken and cancelled at once: pass the wake-up on
+                    self._wake()
+                raise
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """Give back the slot taken by ``acquire``."""
+        self._in_flight -= 1
+        self._wake()
+
+    def record(
+        self,
+        started_at: float,
+        *,
+        throttled: bool = False,
+        ended_at: float | None = None,
+    ) -> None:
+        """Adapt the limit to the response of a request.
+
+        Call it before ``release``, so a saturated limit can be told apart.
+
+        Args:
+            started_at: ``time.monotonic()`` when the request was sent.
+            throttled: The server refused the request with 429.
+            ended_at: ``time.monotonic()`` when the response arrived; None
+                is now.
+        """
+        ended_at = time.monotonic() if ended_at is None else ended_at
+        latency = ended_at - started_at
+        slow = False
+        if not throttled:
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (latency - self.baseline) * BASELINE_DRIFT
+            slow = latency > self.baseline * self.latency_tolerance
+        if throttled or slow:
+            if started_at >= self._decreased_at:
+                self.limit = max(
+                    self.min_limit, self.limit * (0.5 if throttled else 0.9)
+                )
+                self._decreased_at = ended_at
+                reason = "429" if throttled else f"{latency * 1000:.0f} ms"
+                lg.debug(f"{self.name} limit down to {self.limit:.1f} ({reason})")
+        elif self._in_flight >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many waiters as there are free slots."""
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Request counts of an ``LLMClient``.
+
+    Attributes:
+        embedding_requests: Embedding requests sent, retries included.
+        embedded_texts: Texts sent in them.
+        deduplicated: Texts and prompts that joined a request in flight.
+        throttled: Requests refused with 429.
+    """
+
+    embedding_requests: int = 0
+    embedded_texts: int = 0
+    deduplicated: int = 0
+    throttled: int = 0
+
+
+class _SharedStream:
+    """One chat generation streamed to every subscriber, each from the start.
+
+    The generation runs in its own task, so it outlives the subscriber that
+    started it; it is cancelled, closing the upstream request, once every
+    subscriber is gone.  Any error of the generation, e.g. a raw ``httpx``
+    read error raised while iterating the SDK stream, is raised to every
+    subscriber as a ``ChatBackendError``, so a truncated answer never ends
+    like a complete one.
+    """
+
+    def __init__(
+        self,
+        source: AsyncGenerator[str],
+        on_done: Callable[[], None],
+        backend: str = "chat",
+    ) -> None:
+        """Start consuming ``source``."""
+        self.backend = backend
+        self.parts: list[str] = []
+        self.error: ChatBackendError | None = None
+        self.done = False
+        self._on_done = on_done
+        self._subscribers = 0
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._drive(source))
+
+    async def _drive(self, source: AsyncGenerator[str]) -> None:
+        """Buffer the fragments of ``source`` and wake the subscribers."""
+        try:
+            async with aclosing(source) as parts:
+                async for text in parts:
+                    self.parts.append(text)
+                    self._notify()
+        except ChatBackendError as exc:
+            self.error = exc
+        except Exception as exc:  # noqa: BLE001
+            reason = str(exc) or type(exc).__name__
+            self.error = ChatBackendError(self.backend, reason)
+        finally:
+            self.done = True
+            self._notify()
+            self._on_done()
+
+    def _notify(self) -> None:
+        """Wake the subscribers waiting for a change."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncGenerator[str]:
+        """Yield every fragment, buffered ones first, then as they arrive.
+
+        Raises:
+            ChatBackendError: If the generation failed.
+        """
+        self._subscribers += 1
+        try:
+            sent = 0
+            while True:
+                while sent < len(self.parts):
+                    yield self.parts[sent]
+                    sent += 1
+                if self.done:
+                    break
+                await self._changed.wait()
+            if self.error is not None:
+                error = self.error
+                raise ChatBackendError(error.backend, error.reason, error.status_code)
+        finally:
+            self._subscribers -= 1
+            if not self._subscribers and not self.done:
+                self._task.cancel()
+                self._on_done()
+
+
+class LLMClient:
+    """Batching, deduplicating, rate-adaptive client of the model servers.
+
+    Args:
+        embedding_backend: Embedding requests; None for a chat-only client.
+        chat_backend: Streaming chat requests; None for an embedding-only
+            client.
+        config: Batching, retry and concurrency settings.
+        batch_size: Texts per embedding request.
+        embedding_cache: Disk cache of the vectors, read before queueing a
+            text; None embeds every text.
+    """
+
+    def __init__(
+        self,
+        embedding_backend: EmbeddingBackend | None = None,
+        chat_backend: ChatBackend | None = None,
+        config: LLMClientConfig | None = None,
+        batch_size: int = 32,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
+        """Store the backends and create the limiters."""
+        self.config = config or LLMClientConfig()
+        self.embedding_backend = embedding_backend
+        self.chat_backend = chat_backend
+        self.batch_size = batch_size
+        self.embedding_cache = embedding_cache
+        self.embedding_limiter = self._limiter("embedding")
+        self.chat_limiter = self._limiter("chat")
+        self.stats = ClientStats()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._runner: asyncio.Runner | None = None
+        self._queue: list[str] = []
+        self._pending: dict[str, asyncio.Future[list[float]]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._streams: dict[str, _SharedStream] = {}
+
+    def _limiter(self, name: str) -> AdaptiveLimiter:
+        """Return a limiter with the configured bounds."""
+        return AdaptiveLimiter(
+            initial=self.config.initial_concurrency,
+            min_limit=self.config.min_concurrency,
+            max_limit=self.config.max_concurrency,
+            latency_tolerance=self.config.latency_tolerance,
+            name=name,
+        )
+
+    def _bind(self) -> None:
+        """Bind the client to the running loop on first use.
+
+        Raises:
+            RuntimeError: If the client is already bound to another loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None or self._loop.is_closed():
+            self._loop = loop
+        elif self._loop is not loop:
+            msg = "An LLMClient can only be used from the event loop it started on"
+            raise RuntimeError(msg)
+
+    def run_sync[T](self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine of the client from synchronous code.
+
+        Args:
+            coro: Coroutine of this client, e.g. ``embed_many(texts)``.
+
+        Returns:
+            Its result.
+
+        Raises:
+            RuntimeError: If called from the thread running the client's
+                loop, which would block it; await the coroutine instead.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                coro.close()
+                msg = "run_sync would block the client's event loop, await instead"
+                raise RuntimeError(msg)
+            return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        if self._runner is None:
+            self._runner = asyncio.Runner()
+        return self._runner.run(coro)
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text, batched with the other texts requested meanwhile.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            Its vector.
+
+        Raises:
+            EmbeddingBackendError: If the server fails, or refuses the
+                request more than ``max_retries`` times.
+        """
+        (vector,) = await self.embed_many([text])
+        return vector
+
+    async def embed_many(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts in batches of ``batch_size``, sent concurrently.
+
+        Args:
+            texts: Texts to embed; repeated texts are sent once.
+
+        Returns:
+            One vector per text, in order.
+
+        Raises:
+            EmbeddingBackendError: If the server fails, or refuses a
+                request more than ``max_retries`` times.
+        """
+        if self.embedding_backend is None:
+            msg = "This LLMClient has no embedding backend"
+            raise RuntimeError(msg)
+        self._bind()
+        cached: list[list[float] | None] = [None] * len(texts)
+        keys: list[bytes] = []
+        if self.embedding_cache is not None:
+            model = self.embedding_backend.model
+            keys = [embedding_key(model, text) for text in texts]
+            cached = self.embedding_cache.get_many(keys)
+        futures = {
+            i: self._future_of(text)
+            for i, text in enumerate(texts)
+            if cached[i] is None
+        }
+        if len(self._queue) >= self.batch_size:
+            self._flush()
+        elif self._queue and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.config.batch_window, self._flush)
+        vectors = await asyncio.gather(*map(asyncio.shield, futures.values()))
+        new = dict(zip(futures, vectors, strict=True))
+        if self.embedding_cache is not None and new:
+            self.embedding_cache.put_many([keys[i] for i in new], list(new.values()))
+        return [new[i] if vector is None else vector for i, vector in enumerate(cached)]
+
+    def _future_of(self, text: str) -> asyncio.Future[list[float]]:
+        """Return the future of ``text``, queueing it unless already pending."""
+        future = self._pending.get(text)
+        if future is not None:
+            self.stats.deduplicated += 1
+            return future
+        future = self._pending[text] = asyncio.get_running_loop().create_future()
+        # Waiters may all be gone when it fails; do not log it as unretrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._queue.append(text)
+        return future
+
+    def _flush(self) -> None:
+        """Send the queued texts, ``batch_size`` per request."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.batch_size):
+            task = asyncio.create_task(
+                self._send(queue[start : start + self.batch_size])
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, texts: list[str]) -> None:
+        """Embed one batch and resolve the futures of its texts."""
+        backend = self.embedding_backend
+        assert backend is not None  # noqa: S101
+        try:
+            vectors = await self._call(
+                self.embedding_limiter, lambda: self._embed_batch(backend, texts)
+            )
+        except Exception as exc:  # noqa: BLE001
+            for text in texts:
+                future = self._pending.pop(text)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for text, vector in zip(texts, vectors, strict=True):
+            future = self._pending.pop(text)
+            if not future.done():
+                future.set_result(vector)
+
+    async def _embed_batch(
+        self, backend: EmbeddingBackend, texts: list[str]
+    ) -> list[list[float]]:
+        """Send one embedding request, counting it."""
+        self.stats.embedding_requests += 1
+        self.stats.embedded_texts += len(texts)
+        return await backend.embed(texts)
+
+    async def _call[T](
+        self, limiter: AdaptiveLimiter, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Send a request within the limit, retrying it while refused."""
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            started_at = time.monotonic()
+            try:
+                result = await call()
+            except EmbeddingBackendError as exc:
+                if exc.status_code != 429:  # noqa: PLR2004
+                    raise
+                self.stats.throttled += 1
+                limiter.record(started_at, throttled=True)
+                if attempt >= self.config.max_retries:
+                    raise
+            else:
+                limiter.record(started_at)
+                return result
+            finally:
+                limiter.release()
+            await asyncio.sleep(self.config.retry_backoff * 2**attempt)
+            attempt += 1
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncGenerator[str]:
+        """Stream the answer to ``messages``, shared with identical prompts.
+
+        Args:
+            messages: Chat messages, dicts with ``role`` and ``content``.
+
+        Yields:
+            Text fragments, in order; a prompt already being answered gets
+            the fragments generated so far first.  Closing the generator
+            aborts the request once no other prompt shares it.
+
+        Raises:
+            ChatBackendError: If the server fails, or refuses the request
+                more than ``max_retries`` times.
+        """
+        if self.chat_backend is None:
+            msg = "This LLMClient has no chat backend"
+            raise RuntimeError(msg)
+        self._bind()
+        key = json.dumps(messages, sort_keys=True)
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = _SharedStream(
+                self._generate(messages),
+                lambda: self._forget(key, shared),
+                backend=getattr(self.chat_backend, "name", "chat"),
+            )
+            self._streams[key] = shared
+        else:
+            self.stats.deduplicated += 1
+        async with aclosing(shared.subscribe()) as parts:
+            async for text in parts:
+                yield text
+
+    def _forget(self, key: str, shared: _SharedStream | None) -> None:
+        """Stop sharing a finished or abandoned generation."""
+        if self._streams.get(key) is shared:
+            del self._streams[key]
+
+    async def _generate(self, messages: list[dict[str, str]]) -> AsyncGenerator[str]:
+        """Stream one generation within the limit, retrying it while refused."""
+        backend = self.chat_backend
+        assert backend is not None  # noqa: S101
+        limiter = self.chat_limiter
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            started_at = time.monotonic()
+            first_at: float | None = None
+            try:
+                async with aclosing(backend.stream(messages)) as stream:
+                    async for text in stream:
+                        if first_at is None:
+                            first_at = time.monotonic()
+                            limiter.record(started_at, ended_at=first_at)
+                        yield text
+            except ChatBackendError as exc:
+                if exc.status_code != 429 or first_at is not None:  # noqa: PLR2004
+                    raise
+                self.stats.throttled += 1
+                limiter.record(started_at, throttled=True)
+                if attempt >= self.config.max_retries:
+                    raise
+            else:
+                return
+            finally:
+                limiter.release()
+            await asyncio.sleep(self.config.retry_backoff * 2**attempt)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of both backends."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        closed: set[int] = set()
+        for backend in (self.embedding_backend, self.chat_backend):
+            if backend is None:
+                continue
+            client = getattr(backend, "client", backend)
+            if id(client) not in closed:
+                closed.add(id(client))
+                await backend.aclose()
+
+    def close(self) -> None:
+        """Close the connections and the private loop of ``run_sync``."""
+        if self._runner is None:
+            return
+        self._runner.run(self.aclose())
+        self._runner.close()
+        self._runner = None
+
+
+def build_llm_client(
+    embedder: EmbedderConfig | None,
+    generator: GeneratorConfig | None = None,
+    config: LLMClientConfig | None = None,
+) -> LLMClient:
+    """Build the client of the configured embedding and chat servers.
+
+    The two share one pooled SDK client when they use the same backend,
+    URL and key.
+
+    Args:
+        embedder: Embedding settings; None for a chat-only client.
+        generator: Chat settings; None for an embedding-only client.
+        config: Client settings; None uses the defaults.
+
+    Returns:
+        The client, not bound to any loop yet.
+
+    Raises:
+        MissingApiKeyError: If an ``openai`` backend has no API key.
+    """
+    config = config or LLMClientConfig()
+    clients: dict[tuple[str, str | None, str | None], Any] = {}
+
+    def client_of(settings: EmbedderConfig | GeneratorConfig, role: str) -> Any:  # noqa: ANN401
+        key = (
+            settings.backend,
+            settings.url,
+            None if settings.api_key is None else settings.api_key.get_secret_value(),
+        )
+        if key not in clients:
+            clients[key] = build_client(
+                settings.backend,
+                settings.url,
+                settings.api_key,
+                getattr(settings, "timeout", EMBED_TIMEOUT),
+                role=role,
+                max_connections=config.max_connections,
+                max_retries=0,
+            )
+        return clients[key]
+
+    chat_backend = (
+        None
+        if generator is None
+        else chat_backend_on(client_of(generator, "generator"), generator)
+    )
+    embedding_backend: EmbeddingBackend | None = None
+    batch_size = 32
+    if embedder is not None:
+        kwargs = {k: v for k, v in embedder.kwargs.items() if k not in TEXT_KWARGS}
+        backend_cls = (
+            OllamaEmbeddingBackend
+            if embedder.backend == "ollama"
+            else OpenAIEmbeddingBackend
+        )
+        embedding_backend = backend_cls(
+            client_of(embedder, "embedder"), embedder.model, kwargs
+        )
+        batch_size = embedder.batch_size
+    return LLMClient(embedding_backend, chat_backend, config, batch_size=batch_size)
+
+
+@component
+class LLMDocumentEmbedder:
+    """Haystack document embedder sending its requests through an ``LLMClient``.
+
+    The attributes match the haystack embedders, so the embedding cache
+    keys its folder on the same settings.
+
+    Args:
+        client: Client with an embedding backend.
+        prefix: Text added before each chunk.
+        suffix: Text added after each chunk.
+        meta_fields_to_embed: Meta fields embedded with the content.
+        embedding_separator: Separator of the meta fields and the content.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        prefix: str = "",
+        suffix: str = "",
+        meta_fields_to_embed: list[str] | None = None,
+        embedding_separator: str = "\n",
+    ) -> None:
+        """Store the client and the text settings."""
+        backend = client.embedding_backend
+        self.client = client
+        self.model = "" if backend is None else backend.model
+        self.dimensions = None if backend is None else backend.kwargs.get("dimensions")
+        self.prefix = prefix
+        self.suffix = suffix
+        self.meta_fields_to_embed = meta_fields_to_embed or []
+        self.embedding_separator = embedding_separator
+
+    @component.output_types(documents=list[Document], meta=dict[str, Any])
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Embed the documents.
+
+        Args:
+            documents: Documents to embed.
+
+        Returns:
+            ``documents`` with their embeddings, and ``meta`` with the
+            ``model``.
+        """
+        texts = [
+            self.prefix + document_text(self, doc) + self.suffix for doc in documents
+        ]
+        vectors = self.client.run_sync(self.client.embed_many(texts))
+        return {
+            "documents": [
+                replace(doc, embedding=vector)
+                for doc, vector in zip(documents, vectors, strict=True)
+            ],
+            "meta": {"model": self.model},
+        }
+
+
+@component
+class LLMTextEmbedder:
+    """Haystack text embedder sending its requests through an ``LLMClient``.
+
+    Args:
+        client: Client with an embedding backend.
+        prefix: Text added before the text.
+        suffix: Text added after the text.
+    """
+
+    def __init__(self, client: LLMClient, prefix: str = "", suffix: str = "") -> None:
+        """Store the client and the text settings."""
+        backend = client.embedding_backend
+        self.client = client
+        self.model = "" if backend is None else backend.model
+        self.dimensions = None if backend is None else backend.kwargs.get("dimensions")
+        self.prefix = prefix
+        self.suffix = suffix
+
+    @component.output_types(embedding=list[float], meta=dict[str, Any])
+    def run(self, text: str) -> dict[str, Any]:
+        """Embed the text.
+
+        Args:
+            text: Text to embed.
+
+        Returns:
+            ``embedding``, and ``meta`` with the ``model``.
+        """
+        vector = self.client.run_sync(
+            self.client.embed(self.prefix + text + self.suffix)
+        )
+        return {"embedding": vector, "meta": {"model": self.model}}
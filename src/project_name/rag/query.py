@@ -0,0 +1,441 @@
+"""Retrieval-augmented answers, streamed as they are generated.
+
+``QueryService`` answers a question in two steps:
+
+1. ``retrieve`` embeds the question and fetches the ``top_k`` closest chunks
+   from the store, fused with the best BM25 matches when a keyword index is
+   configured, on a worker thread since the haystack components are
+   synchronous;
+2. ``stream_answer`` sends the chunks and the question to a ``ChatBackend``
+   and yields ``(event, data)`` pairs as the text arrives: one ``sources``
+   event, one ``token`` event per text fragment and a final ``done`` event
+   with the timings.  A backend failure mid-answer yields an ``error``
+   event instead of raising, since the response has already started.
+
+Time-to-first-token is what users feel, so nothing is buffered: each
+fragment is yielded as soon as the backend produces it, and the sources go
+out before generation starts.  The time to the first fragment is logged and
+returned in the ``done`` event.
+
+Each service bounds the answers in flight with a semaphore: ``acquire``
+waits up to ``queue_timeout`` seconds for a slot and raises
+``QueryBusyError`` otherwise, so an overloaded worker refuses requests
+quickly instead of queueing them behind slow generations.
+
+With a ``SemanticAnswerCache``, a question is embedded once by ``embed``:
+``cached_answer`` looks the embedding up among past questions and
+``replay`` streams a hit as the same events, without taking a slot;
+otherwise the embedding is passed on to ``retrieve``, and ``stream_answer``
+caches the answer once it completes.
+
+``from_config`` sends the question embeddings and the answers through one
+``LLMClient``: concurrent questions are embedded in shared batches, and
+identical prompts in flight share one generation.
+
+The retriever and the chat backend are plain protocols, so tests swap in
+fakes without a store or a model server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+import inspect
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+from loguru import logger as lg
+
+from project_name.config.rag.query_config import DEFAULT_SYSTEM_PROMPT
+from project_name.rag.chat import ChatBackendError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from haystack import Document
+
+    from project_name.config.rag.query_config import QueryConfig
+    from project_name.rag.answer_cache import CachedAnswer
+    from project_name.rag.answer_cache import SemanticAnswerCache
+    from project_name.rag.chat import ChatBackend
+    from project_name.rag.llm_client import LLMClient
+
+
+class Retriever(Protocol):
+    """Synchronous document retrieval."""
+
+    def embed(self, query: str) -> list[float]:
+        """Return the embedding of ``query``."""
+        ...
+
+    def retrieve(
+        self, query: str, top_k: int, embedding: list[float] | None = None
+    ) -> list[Document]:
+        """Return the ``top_k`` documents closest to ``query``.
+
+        ``embedding`` is the embedding of ``query``, if already computed.
+        """
+        ...
+
+
+class QueryBusyError(Exception):
+    """Raised when no answer slot frees up within the queue timeout.
+
+    Args:
+        max_concurrency (int): the answers in flight that kept the slots busy
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        """Initialize with the number of slots.
+
+        Args:
+            max_concurrency: The answers in flight that kept the slots busy
+        """
+        self.max_concurrency = max_concurrency
+        message = f"All {max_concurrency} answer slots are busy"
+        super().__init__(message)
+
+
+class HaystackRetriever:
+    """Retriever made of a haystack text embedder and embedding retriever.
+
+    Args:
+        embedder: Haystack text embedder, returning ``embedding``.
+        retriever: Haystack embedding retriever, returning ``documents``.
+            A retriever whose ``run`` takes a ``query``, like
+            ``HybridRetriever``, gets the question text as well.
+    """
+
+    def __init__(self, embedder: Any, retriever: Any) -> None:  # noqa: ANN401
+        """Store the components."""
+        self.embedder = embedder
+        self.retriever = retriever
+        self._takes_query = "query" in inspect.signature(retriever.run).parameters
+        if hasattr(embedder, "warm_up"):
+            embedder.warm_up()
+
+    def embed(self, query: str) -> list[float]:
+        """Return the embedding of ``query``."""
+        return self.embedder.run(text=query)["embedding"]
+
+    def retrieve(
+        self, query: str, top_k: int, embedding: list[float] | None = None
+    ) -> list[Document]:
+        """Return the ``top_k`` documents closest to ``query``.
+
+        ``embedding`` is the embedding of ``query``, if already computed.
+        """
+        if embedding is None:
+            embedding = self.embed(query)
+        inputs: dict[str, Any] = {"query_embedding": embedding, "top_k": top_k}
+        if self._takes_query:
+            inputs["query"] = query
+        return self.retriever.run(**inputs)["documents"]
+
+
+def build_messages(
+    question: str, documents: list[Document], system_prompt: str
+) -> list[dict[str, str]]:
+    """Build the chat messages of a question and its context.
+
+    Args:
+        question: User question.
+        documents: Context chunks, numbered from 1 in the prompt.
+        system_prompt: Instructions sent first.
+
+    Returns:
+        The system message, then the user message with the context.
+    """
+    context = "\n\n".join(
+        f"[{i}] {doc.content or ''}" for i, doc in enumerate(documents, start=1)
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Context:\n{context}\n\nQuestion: {question}"},
+    ]
+
+
+def source_of(document: Document) -> dict[str, Any]:
+    """Return the JSON-ready description of a context chunk."""
+    return {
+        "id": document.id,
+        "source": document.meta.get("source"),
+        "score": document.score,
+    }
+
+
+class QueryService:
+    """Answer questions from the store, streaming the generated text.
+
+    Args:
+        retriever: Retrieval of the context chunks.
+        backend: Streaming chat backend.
+        top_k: Default number of context chunks.
+        max_concurrency: Answers in flight at once.
+        queue_timeout: Seconds ``acquire`` waits for a free slot.
+        system_prompt: Instructions sent before the context.
+        answer_cache: Cache of past answers; None generates every answer.
+        llm: Client embedding the questions, batched with the other
+            questions in flight; None embeds them with the retriever.
+    """
+
+    def __init__(
+        self,
+        retriever: Retriever,
+        backend: ChatBackend,
+        top_k: int = 5,
+        max_concurrency: int = 8,
+        queue_timeout: float = 2.0,
+        system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        answer_cache: SemanticAnswerCache | None = None,
+        llm: LLMClient | None = None,
+    ) -> None:
+        """Store the components and create the slots."""
+        self.retriever = retriever
+        self.backend = backend
+        self.top_k = top_k
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.system_prompt = system_prompt
+        self.answer_cache = answer_cache
+        self.llm = llm
+        self._slots = asyncio.BoundedSemaphore(max_concurrency)
+        self._in_flight = 0
+
+    @classmethod
+    def from_config(cls, config: QueryConfig) -> QueryService:
+        """Build the service on the Chroma store and the configured servers.
+
+        Args:
+            config: Query settings.
+
+        Returns:
+            The service, with its answer cache and one ``LLMClient`` for the
+            question embeddings and the answers, retrieving by keyword and
+            embedding if ``config.bm25`` is set.
+        """
+        from project_name.rag.answer_cache import SemanticAnswerCache  # noqa: PLC0415
+        from project_name.rag.bm25 import BM25Index  # noqa: PLC0415
+        from project_name.rag.bm25 import BM25Retriever  # noqa: PLC0415
+        from project_name.rag.components import build_document_store  # noqa: PLC0415
+        from project_name.rag.components import build_retriever  # noqa: PLC0415
+        from project_name.rag.components import build_text_embedder  # noqa: PLC0415
+        from project_name.rag.hybrid import HybridRetriever  # noqa: PLC0415
+        from project_name.rag.llm_client import build_llm_client  # noqa: PLC0415
+
+        embedding_retriever = build_retriever(
+            build_document_store(config.store), config.top_k
+        )
+        if config.bm25 is not None:
+            embedding_retriever = HybridRetriever(
+                BM25Retriever(BM25Index.from_config(config.bm25)),
+                embedding_retriever,
+                top_k=config.top_k,
+                rrf_k=config.rrf_k,
+            )
+        llm = build_llm_client(config.embedder, config.generator, config.llm)
+        text_embedder = build_text_embedder(config.embedder, llm)
+        # Questions embedded by the client read the cache of the embedder
+        llm.embedding_cache = getattr(text_embedder, "cache", None)
+        return cls(
+            HaystackRetriever(text_embedder, embedding_retriever),
+            llm,
+            top_k=config.top_k,
+            max_concurrency=config.max_concurrency,
+            queue_timeout=config.queue_timeout,
+            system_prompt=config.system_prompt,
+            answer_cache=(
+                None
+                if config.answer_cache is None
+                else SemanticAnswerCache.from_config(config.answer_cache, config)
+            ),
+            llm=llm,
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Number of slots currently held."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Take an answer slot, waiting up to ``queue_timeout`` seconds.
+
+        Raises:
+            QueryBusyError: If no slot frees up in time.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except TimeoutError:
+            raise QueryBusyError(self.max_concurrency) from None
+        self._in_flight += 1
+
+    def release(self) -> None:
+        """Give back the slot taken by ``acquire``."""
+        self._slots.release()
+        self._in_flight -= 1
+
+    async def embed(self, question: str) -> list[float]:
+        """Embed ``question`` through the client, or on a worker thread.
+
+        Args:
+            question: User question.
+
+        Returns:
+            The embedding, to pass to ``cached_answer`` and ``retrieve``.
+        """
+        if self.llm is not None:
+            return await self.llm.embed(question)
+        return await asyncio.to_thread(self.retriever.embed, question)
+
+    async def cached_answer(
+        self, embedding: list[float], top_k: int | None = None
+    ) -> CachedAnswer | None:
+        """Look up the answer of a close enough past question.
+
+        Args:
+            embedding: Embedding of the question, from ``embed``.
+            top_k: Number of chunks; None uses the service default.
+
+        Returns:
+            The cached answer, or None on a miss or without a cache.
+        """
+        if self.answer_cache is None:
+            return None
+        return await asyncio.to_thread(
+            self.answer_cache.get, embedding, top_k or self.top_k
+        )
+
+    async def retrieve(
+        self,
+        question: str,
+        top_k: int | None = None,
+        embedding: list[float] | None = None,
+    ) -> list[Document]:
+        """Fetch the context chunks of ``question`` on a worker thread.
+
+        Args:
+            question: User question.
+            top_k: Number of chunks; None uses the service default.
+            embedding: Embedding of the question from ``embed``; None
+                embeds it here.
+
+        Returns:
+            The closest chunks, best first.
+        """
+        if embedding is None and self.llm is not None:
+            embedding = await self.llm.embed(question)
+        return await asyncio.to_thread(
+            self.retriever.retrieve, question, top_k or self.top_k, embedding
+        )
+
+    async def replay(
+        self, cached: CachedAnswer, started_at: float | None = None
+    ) -> AsyncGenerator[tuple[str, dict[str, Any]]]:
+        """Stream a cached answer as the events of ``stream_answer``.
+
+        Args:
+            cached: Answer from ``cached_answer``.
+            started_at: ``time.perf_counter()`` when the request arrived;
+                None times from this call.
+
+        Yields:
+            ``sources``, a single ``token`` with the whole answer, then
+            ``done`` with ``cached`` set and the ``similarity`` of the hit.
+        """
+        start = time.perf_counter() if started_at is None else started_at
+        yield "sources", {"sources": cached.sources}
+        ttft_ms = (time.perf_counter() - start) * 1000
+        yield "token", {"text": cached.answer}
+        total_ms = (time.perf_counter() - start) * 1000
+        lg.info(f"Answered from the cache in {total_ms:.0f} ms")
+        yield (
+            "done",
+            {
+                "ttft_ms": ttft_ms,
+                "total_ms": total_ms,
+                "tokens": 1,
+                "cached": True,
+                "similarity": cached.similarity,
+            },
+        )
+
+    async def stream_answer(
+        self,
+        question: str,
+        documents: list[Document],
+        started_at: float | None = None,
+        embedding: list[float] | None = None,
+        top_k: int | None = None,
+    ) -> AsyncGenerator[tuple[str, dict[str, Any]]]:
+        """Generate the answer, yielding events as the text arrives.
+
+        A complete answer is added to the answer cache before ``done``, if
+        the service has one and ``embedding`` is given.
+
+        Args:
+            question: User question.
+            documents: Context chunks from ``retrieve``.
+            started_at: ``time.perf_counter()`` when the request arrived, the
+                origin of the timings; None times from this call.
+            embedding: Embedding of the question from ``embed``, the key of
+                the answer in the cache.
+            top_k: Chunks requested from ``retrieve``; None uses the service
+                default.
+
+        Yields:
+            ``(event, data)`` pairs: ``sources``, then ``token`` per text
+            fragment, then ``done`` with ``ttft_ms``, ``total_ms``,
+            ``tokens`` and ``cached``, or ``error`` if the backend fails.
+        """
+        start = time.perf_counter() if started_at is None else started_at
+        sources = [source_of(doc) for doc in documents]
+        yield "sources", {"sources": sources}
+        messages = build_messages(question, documents, self.system_prompt)
+        ttft_ms: float | None = None
+        n_tokens = 0
+        parts: list[str] = []
+        try:
+            # Closing this generator must close the backend stream at once,
+            # which aborts the upstream request
+            async with aclosing(self.backend.stream(messages)) as stream:
+                async for text in stream:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - start) * 1000
+                        lg.debug(f"First token after {ttft_ms:.0f} ms")
+                    n_tokens += 1
+                    parts.append(text)
+                    yield "token", {"text": text}
+        except ChatBackendError as exc:
+            lg.warning(f"Answer interrupted after {n_tokens} tokens: {exc}")
+            yield "error", {"detail": str(exc)}
+            return
+        total_ms = (time.perf_counter() - start) * 1000
+        lg.info(f"Answered in {total_ms:.0f} ms, first token {ttft_ms or 0:.0f} ms")
+        if self.answer_cache is not None and embedding is not None and parts:
+            await asyncio.to_thread(
+                self.answer_cache.put,
+                embedding,
+                top_k or self.top_k,
+                question,
+                "".join(parts),
+                sources,
+            )
+        yield (
+            "done",
+            {
+                "ttft_ms": ttft_ms,
+                "total_ms": total_ms,
+                "tokens": n_tokens,
+                "cached": False,
+            },
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the backend and the answer cache."""
+        await self.backend.aclose()
+        if self.llm is not None and self.llm is not self.backend:
+            await self.llm.aclose()
+        if self.answer_cache is not None:
+            self.answer_cache.close()
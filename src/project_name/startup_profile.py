@@ -0,0 +1,277 @@
+"""Opt-in startup profiler.
+
+Set ``PROJECT_NAME_STARTUP_PROFILE`` to record where boot time goes:
+
+* ``1`` (or ``true``) writes the report to ``cache/startup_profile.json``;
+* any other value is used as the report path.
+
+When enabled, the profiler records:
+
+* phase timings: code wrapped in ``with startup_phase("name"):``, e.g.
+  ``load_env``, ``EnvType.from_env_var``, ``ProjectNameParams.__init__``,
+  ``WebappParams._load_params``, ``create_app`` and template loading.
+  Phases may nest; each records its depth and parent.
+* module import costs: a wrapper around ``builtins.__import__``, installed
+  when ``project_name`` is imported, times every first import of a module
+  and derives its self time.
+
+``build_app`` writes the report once the app is built.  When disabled,
+``startup_phase`` costs a single flag check and no import hook is installed.
+
+This module only uses the standard library, as it is imported first.
+"""
+
+from __future__ import annotations
+
+import builtins
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+import json
+import os
+from pathlib import Path
+import sys
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+
+STARTUP_PROFILE_ENV_VAR = "PROJECT_NAME_STARTUP_PROFILE"
+REPORT_NAME = "startup_profile.json"
+
+# Phase budgets in milliseconds, checked by ``check_budgets``
+PHASE_BUDGETS_MS: dict[str, float] = {
+    "load_env": 50.0,
+    "EnvType.from_env_var": 10.0,
+    "ProjectNameParams.__init__": 50.0,
+    "WebappParams._load_params": 50.0,
+    "create_app": 1000.0,
+    "configure_templates": 500.0,
+    "build_app": 2000.0,
+}
+
+
+@dataclass(slots=True)
+class PhaseTiming:
+    """Duration of one startup phase.
+
+    Attributes:
+        name: Phase name.
+        start_ms: Start time relative to the profiler start.
+        duration_ms: Wall-clock duration.
+        depth: Nesting depth; top-level phases have depth 0.
+        parent: Name of the enclosing phase, if any.
+    """
+
+    name: str
+    start_ms: float
+    duration_ms: float
+    depth: int
+    parent: str | None
+
+
+@dataclass(slots=True)
+class ImportTiming:
+    """Cost of the first import of one module.
+
+    Attributes:
+        module: Dotted module name.
+        cumulative_ms: Time including the imports it triggered.
+        self_ms: Time excluding the imports it triggered.
+    """
+
+    module: str
+    cumulative_ms: float
+    self_ms: float
+
+
+@dataclass
+class StartupProfiler:
+    """Collects phase and import timings for one process.
+
+    Attributes:
+        enabled: Whether anything is recorded.
+        report_fp: Where ``write_report`` writes by default, or None for
+            ``cache/startup_profile.json``.
+        phases: Finished phases, in completion order.
+        imports: First imports of modules, in completion order.
+    """
+
+    enabled: bool = False
+    report_fp: Path | None = None
+    phases: list[PhaseTiming] = field(default_factory=list)
+    imports: list[ImportTiming] = field(default_factory=list)
+    _t0: float = field(default_factory=time.perf_counter)
+    _stack: list[str] = field(default_factory=list)
+    _import_stack: list[float] = field(default_factory=list)
+    _original_import: Any = None
+
+    @classmethod
+    def from_env(cls) -> StartupProfiler:
+        """Build a profiler configured by ``PROJECT_NAME_STARTUP_PROFILE``.
+
+        Returns:
+            An enabled profiler if the variable is set, else a disabled one.
+        """
+        value = os.getenv(STARTUP_PROFILE_ENV_VAR, "").strip()
+        if value.lower() in {"", "0", "false"}:
+            return cls()
+        report_fp = None if value.lower() in {"1", "true"} else Path(value)
+        return cls(enabled=True, report_fp=report_fp)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a named phase.
+
+        Args:
+            name: Phase name, used as the budget key.
+
+        Yields:
+            None.
+        """
+        if not self.enabled:
+            yield
+            return
+        parent = self._stack[-1] if self._stack else None
+        depth = len(self._stack)
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            self.phases.append(
+                PhaseTiming(
+                    name=name,
+                    start_ms=(start - self._t0) * 1000,
+                    duration_ms=(end - start) * 1000,
+                    depth=depth,
+                    parent=parent,
+                )
+            )
+
+    def install_import_hook(self) -> None:
+        """Start timing first imports of modules."""
+        if not self.enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        original = self._original_import
+
+        def timed_import(name: str, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+            level = args[3] if len(args) > 3 else kwargs.get("level", 0)  # noqa: PLR2004
+            if level or name in sys.modules:
+                return original(name, *args, **kwargs)
+            self._import_stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, *args, **kwargs)
+            finally:
+                cumulative = time.perf_counter() - start
+                children = self._import_stack.pop()
+                if self._import_stack:
+                    self._import_stack[-1] += cumulative
+                self.imports.append(
+                    ImportTiming(
+                        module=name,
+                        cumulative_ms=cumulative * 1000,
+                        self_ms=(cumulative - children) * 1000,
+                    )
+                )
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self) -> None:
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def report(self, top_imports: int = 30) -> dict[str, Any]:
+        """Return the collected timings as a JSON-serializable dict.
+
+        Args:
+            top_imports: Number of most expensive imports to include.
+
+        Returns:
+            Report with ``phases``, ``imports`` and ``budget_violations``.
+        """
+        imports = sorted(self.imports, key=lambda i: i.self_ms, reverse=True)
+        report: dict[str, Any] = {
+            "created_at": time.time(),
+            "python": sys.version.split()[0],
+            "total_ms": (time.perf_counter() - self._t0) * 1000,
+            "phases": [
+                asdict(p) for p in sorted(self.phases, key=lambda p: p.start_ms)
+            ],
+            "imports": {
+                "count": len(self.imports),
+                "total_self_ms": sum(i.self_ms for i in self.imports),
+                "top": [asdict(i) for i in imports[:top_imports]],
+            },
+        }
+        report["budget_violations"] = check_budgets(report)
+        return report
+
+    def write_report(self, default_fol: Path) -> Path | None:
+        """Write the report as JSON if profiling is enabled.
+
+        Args:
+            default_fol: Folder for the report when no explicit path is set,
+                usually ``ProjectNamePaths.cache_fol``.
+
+        Returns:
+            The report path, or None if profiling is disabled.
+        """
+        if not self.enabled:
+            return None
+        fp = self.report_fp or default_fol / REPORT_NAME
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.write_text(json.dumps(self.report(), indent=2) + "\n")
+        return fp
+
+
+def check_budgets(
+    report: dict[str, Any],
+    budgets: dict[str, float] | None = None,
+) -> list[str]:
+    """List the phases of a report that exceed their budget.
+
+    A phase recorded several times is checked on its total duration.
+
+    Args:
+        report: Report from ``StartupProfiler.report``.
+        budgets: Budget in milliseconds per phase name.  Defaults to
+            ``PHASE_BUDGETS_MS``.
+
+    Returns:
+        One message per phase over budget; empty if all are within budget.
+    """
+    budgets = PHASE_BUDGETS_MS if budgets is None else budgets
+    totals: dict[str, float] = {}
+    for phase in report["phases"]:
+        totals[phase["name"]] = totals.get(phase["name"], 0.0) + phase["duration_ms"]
+    return [
+        f"{name}: {totals[name]:.1f} ms > {budget:.1f} ms"
+        for name, budget in budgets.items()
+        if totals.get(name, 0.0) > budget
+    ]
+
+
+profiler = StartupProfiler.from_env()
+
+
+def startup_phase(name: str) -> AbstractContextManager[None]:
+    """Time a block as a phase of the process-wide profiler.
+
+    Args:
+        name: Phase name, used as the budget key.
+
+    Returns:
+        A context manager; a no-op unless profiling is enabled.
+    """
+    return profiler.phase(name)
@@ -1,5 +1,16 @@
-"""Webapp package for FastAPI web application."""
+"""Webapp package for FastAPI web application.
 
-from project_name.webapp.app import app
+``app`` is imported lazily: importing a submodule such as
+``project_name.webapp.core.assets`` does not build the application.
+"""
+
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.webapp.app import app
 
 __all__ = ["app"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {"app": "project_name.webapp.app:app"})
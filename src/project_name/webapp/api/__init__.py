@@ -1,5 +1,14 @@
 """Webapp API module."""
 
-from project_name.webapp.api.v1 import api_router as v1_router
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.webapp.api.v1 import api_router as v1_router
 
 __all__ = ["v1_router"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"v1_router": "project_name.webapp.api.v1.api_router:router"}
+)
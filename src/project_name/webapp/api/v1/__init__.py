@@ -1,5 +1,14 @@
 """API v1 module."""
 
-from project_name.webapp.api.v1.api_router import router as api_router
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.webapp.api.v1.api_router import router as api_router
 
 __all__ = ["api_router"]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, {"api_router": "project_name.webapp.api.v1.api_router:router"}
+)
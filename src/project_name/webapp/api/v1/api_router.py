@@ -8,6 +8,9 @@ from fastapi_tools.dependencies import get_current_user
 from fastapi_tools.schemas.auth import SessionData
 from fastapi_tools.schemas.common import MessageResponse
 
+from project_name.webapp.api.v1.query_router import router as query_router
+from project_name.webapp.api.v1.users_router import router as users_router
+
 router = APIRouter(prefix="/api/v1", tags=["api-v1"])
 
 
@@ -45,3 +48,5 @@ async def protected_endpoint(
 
 
 # To add more API routers as the application grows, import and include them here.
+router.include_router(users_router)
+router.include_router(query_router)
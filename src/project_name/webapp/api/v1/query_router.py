@@ -0,0 +1,97 @@
+"""Retrieval-augmented question answering route.
+
+``GET /api/v1/query`` answers a question from the ingested documents and
+streams the answer as Server-Sent Events, so browsers can consume it with
+``EventSource``:
+
+* ``sources`` - the context chunks, sent before generation starts;
+* ``token`` - one per generated text fragment, ``{"text": ...}``;
+* ``done`` - ``{"ttft_ms", "total_ms", "tokens", "cached"}``, timed from
+  the arrival of the request, with the ``similarity`` of the cached
+  question when ``cached`` is true;
+* ``error`` - ``{"detail": ...}`` if the model fails mid-answer.
+
+Each worker streams at most ``QueryConfig.max_concurrency`` answers; a
+request that gets no slot within ``queue_timeout`` seconds is refused with
+``503`` and ``Retry-After``.  When the client disconnects, the generation is
+cancelled and its slot freed.
+
+Questions close enough to a past one are answered from the semantic answer
+cache, as a single ``token`` event, without taking a slot.
+"""
+
+import time
+from typing import Annotated
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from fastapi import status
+from fastapi_tools.dependencies import get_current_user
+from fastapi_tools.schemas.auth import SessionData
+from loguru import logger as lg
+
+from project_name.rag.query import QueryBusyError
+from project_name.rag.query import QueryService
+from project_name.webapp.core.dependencies import get_query_service
+from project_name.webapp.core.sse import EventStreamResponse
+
+# Seconds a refused client is asked to wait before retrying
+BUSY_RETRY_AFTER = 1
+
+router = APIRouter(tags=["query"])
+
+
+@router.get(
+    "/query",
+    summary="Ask the documents",
+    description="Stream a retrieval-augmented answer as Server-Sent Events.",
+    response_class=EventStreamResponse,
+)
+async def query(
+    q: Annotated[str, Query(min_length=1, max_length=2000, description="Question")],
+    session: Annotated[SessionData, Depends(get_current_user)],
+    service: Annotated[QueryService, Depends(get_query_service)],
+    top_k: Annotated[int | None, Query(ge=1, le=50)] = None,
+) -> EventStreamResponse:
+    """Answer a question, streaming the generated text.
+
+    Args:
+        q: Question.
+        session: Current user session (requires authentication).
+        service: Query service of the worker.
+        top_k: Context chunks; None uses the configured default.
+
+    Returns:
+        Event stream of the sources, the answer tokens and the timings.
+
+    Raises:
+        HTTPException: 503 if every answer slot stays busy.
+    """
+    started_at = time.perf_counter()
+    embedding = await service.embed(q)
+    cached = await service.cached_answer(embedding, top_k)
+    if cached is not None:
+        lg.debug(f"Query from {session.email}: answered from the cache")
+        return EventStreamResponse(service.replay(cached, started_at=started_at))
+    try:
+        await service.acquire()
+    except QueryBusyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(BUSY_RETRY_AFTER)},
+        ) from exc
+    try:
+        documents = await service.retrieve(q, top_k, embedding=embedding)
+    except BaseException:
+        service.release()
+        raise
+    lg.debug(f"Query from {session.email}: {len(documents)} chunks retrieved")
+    return EventStreamResponse(
+        service.stream_answer(
+            q, documents, started_at=started_at, embedding=embedding, top_k=top_k
+        ),
+        on_close=service.release,
+    )
@@ -0,0 +1,117 @@
+"""Bulk user import / export routes.
+
+Both directions stream NDJSON (one user JSON object per line) so that
+hundreds of thousands of users can be moved without buffering the whole
+payload in memory.  Both routes are restricted to the ``ADMIN_EMAILS`` of
+the webapp params.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Annotated
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi import status
+from fastapi.responses import StreamingResponse
+from fastapi_tools.schemas.auth import SessionData
+from fastapi_tools.schemas.common import MessageResponse
+from loguru import logger as lg
+
+from project_name.webapp.core.dependencies import get_user_service
+from project_name.webapp.core.dependencies import require_admin
+from project_name.webapp.services.user_service import UserImportError
+from project_name.webapp.services.user_service import UserService
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Longest accepted NDJSON line, so a body without newlines is not buffered
+MAX_LINE_BYTES = 64 * 1024
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+async def _aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering the whole body.
+
+    Raises:
+        HTTPException: 413 if a line is longer than ``MAX_LINE_BYTES``.
+    """
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        longest = max(len(line) for line in [*lines, pending])
+        if longest > MAX_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=f"NDJSON line longer than {MAX_LINE_BYTES} bytes",
+            )
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+@router.get(
+    "/export",
+    summary="Export users",
+    description="Stream every stored user as NDJSON.",
+    response_class=StreamingResponse,
+)
+async def export_users(
+    session: Annotated[SessionData, Depends(require_admin)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+) -> StreamingResponse:
+    """Stream all users as NDJSON.
+
+    Args:
+        session: Current admin session.
+        user_service: User service to export from.
+
+    Returns:
+        Streaming NDJSON response, one user per line.
+    """
+    lg.info(f"User export requested by {session.email}")
+    return StreamingResponse(
+        user_service.export_ndjson(),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.post(
+    "/import",
+    summary="Import users",
+    description="Upsert users from an NDJSON request body, one user per line.",
+)
+async def import_users(
+    request: Request,
+    session: Annotated[SessionData, Depends(require_admin)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+) -> MessageResponse:
+    """Import users from a streamed NDJSON body.
+
+    The body is split into lines as it arrives and streamed to
+    ``UserService.aimport_ndjson``, which writes them in batches.
+
+    Args:
+        request: Incoming request carrying the NDJSON body.
+        session: Current admin session.
+        user_service: User service to import into.
+
+    Returns:
+        MessageResponse with the number of imported users.
+
+    Raises:
+        HTTPException: 422 if a line is not a valid user, 413 if a line is
+            longer than ``MAX_LINE_BYTES``.
+    """
+    lg.info(f"User import requested by {session.email}")
+    try:
+        imported = await user_service.aimport_ndjson(_aiter_lines(request.stream()))
+    except UserImportError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)
+        ) from exc
+    return MessageResponse(message=f"Imported {imported} users.")
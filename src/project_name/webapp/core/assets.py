@@ -0,0 +1,234 @@
+"""Fingerprinted, precompressed static assets.
+
+``build_assets`` copies every file of the static folder to a build folder
+under a content-hashed name (``css/app.css`` becomes
+``css/app.<hash>.css``) and writes ``.gz`` and ``.br`` siblings for text
+assets.  A ``manifest.json`` maps each source name to its hashed file and
+available encodings.  Run it with ``scripts/webapp/build_static.py``.
+
+At runtime ``install_assets`` loads the manifest and registers the
+``asset_url`` Jinja global, so templates link assets with
+``{{ asset_url('css/app.css') }}``.  Hashed files are served under
+``/assets/`` by ``assets_router`` with far-future immutable caching: a
+changed file gets a new name, so browsers never need to revalidate.  The
+encoding is picked from ``Accept-Encoding`` among the prebuilt siblings,
+so nothing is compressed per request.
+
+Without a build, ``asset_url`` falls back to the plain ``/static/`` URL.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+import hashlib
+import json
+from typing import TYPE_CHECKING
+
+from loguru import logger as lg
+
+from project_name.webapp.core.page_cache import choose_encoding
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from fastapi import FastAPI
+
+ASSETS_URL_PREFIX = "/assets"
+STATIC_URL_PREFIX = "/static"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Only text formats benefit from compression; images are already compressed
+COMPRESSIBLE_SUFFIXES = frozenset(
+    {".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".html"}
+)
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass(slots=True, frozen=True)
+class AssetEntry:
+    """A built asset.
+
+    Attributes:
+        path: Hashed path relative to the build folder.
+        encodings: Precompressed siblings available, e.g. ``("br", "gzip")``.
+    """
+
+    path: str
+    encodings: tuple[str, ...] = ()
+
+    def choose_encoding(self, accept_encoding: str | None) -> str:
+        """Pick the smallest prebuilt encoding the client accepts.
+
+        Args:
+            accept_encoding: Raw ``Accept-Encoding`` header.
+
+        Returns:
+            ``"br"``, ``"gzip"`` or ``"identity"``.
+        """
+        return choose_encoding(self.encodings, accept_encoding)
+
+
+class AssetManifest:
+    """Mapping from source asset names to their fingerprinted builds.
+
+    Args:
+        entries: Built assets keyed by source name, e.g. ``css/app.css``.
+    """
+
+    def __init__(self, entries: dict[str, AssetEntry] | None = None) -> None:
+        """Initialize the manifest and its reverse index."""
+        self.entries = entries or {}
+        self._by_path = {entry.path: entry for entry in self.entries.values()}
+
+    def __len__(self) -> int:
+        """Return the number of built assets."""
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, fp: Path) -> AssetManifest:
+        """Load a manifest file, or return an empty manifest if missing.
+
+        Args:
+            fp: Path of ``manifest.json``.
+
+        Returns:
+            The loaded manifest.
+        """
+        if not fp.exists():
+            lg.warning(f"No asset manifest at {fp}, serving unversioned assets")
+            return cls()
+        raw = json.loads(fp.read_text())
+        return cls(
+            {
+                name: AssetEntry(path=item["path"], encodings=tuple(item["encodings"]))
+                for name, item in raw.items()
+            }
+        )
+
+    def save(self, fp: Path) -> None:
+        """Write the manifest as JSON.
+
+        Args:
+            fp: Path of ``manifest.json``.
+        """
+        raw = {
+            name: {"path": entry.path, "encodings": list(entry.encodings)}
+            for name, entry in sorted(self.entries.items())
+        }
+        fp.write_text(json.dumps(raw, indent=2) + "\n")
+
+    def url(self, name: str) -> str:
+        """Return the URL of an asset, fingerprinted if it was built.
+
+        Args:
+            name: Source name relative to the static folder.
+
+        Returns:
+            ``/assets/<hashed path>`` or, if not built, ``/static/<name>``.
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return f"{STATIC_URL_PREFIX}/{name}"
+        return f"{ASSETS_URL_PREFIX}/{entry.path}"
+
+    def resolve(self, path: str) -> AssetEntry | None:
+        """Return the entry for a hashed path, or None if unknown.
+
+        Only paths listed in the manifest resolve, which also rules out
+        path traversal.
+
+        Args:
+            path: Hashed path relative to the build folder.
+
+        Returns:
+            The matching entry, or None.
+        """
+        return self._by_path.get(path)
+
+
+def fingerprint_name(name: str, data: bytes) -> str:
+    """Insert a content hash before the suffix of a relative asset name.
+
+    Args:
+        name: Relative POSIX path, e.g. ``css/app.css``.
+        data: File content.
+
+    Returns:
+        Hashed name, e.g. ``css/app.1a2b3c4d5e6f7a8b.css``.
+    """
+    digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+    head, dot, suffix = name.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{name}.{digest}"
+    return f"{head}.{digest}.{suffix}"
+
+
+def build_assets(
+    src_fol: Path,
+    out_fol: Path,
+    brotli_compress: Callable[[bytes], bytes] | None = None,
+) -> AssetManifest:
+    """Build fingerprinted and precompressed copies of every static asset.
+
+    Hidden files are skipped.  Compressed siblings are only kept when they
+    are smaller than the original.
+
+    Args:
+        src_fol: Static source folder.
+        out_fol: Build folder; created if missing.
+        brotli_compress: Brotli compressor, or None to skip ``.br`` files.
+
+    Returns:
+        The manifest, also written to ``out_fol / "manifest.json"``.
+    """
+    entries: dict[str, AssetEntry] = {}
+    for src_fp in sorted(src_fol.rglob("*")):
+        rel = src_fp.relative_to(src_fol)
+        if not src_fp.is_file() or any(p.startswith(".") for p in rel.parts):
+            continue
+        name = rel.as_posix()
+        data = src_fp.read_bytes()
+        hashed = fingerprint_name(name, data)
+        out_fp = out_fol / hashed
+        out_fp.parent.mkdir(parents=True, exist_ok=True)
+        out_fp.write_bytes(data)
+
+        encodings: list[str] = []
+        if src_fp.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+            packed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli_compress is not None:
+                packed["br"] = brotli_compress(data)
+            for coding in ("br", "gzip"):
+                body = packed.get(coding)
+                if body is not None and len(body) < len(data):
+                    suffix = ENCODING_SUFFIXES[coding]
+                    (out_fol / f"{hashed}{suffix}").write_bytes(body)
+                    encodings.append(coding)
+        entries[name] = AssetEntry(path=hashed, encodings=tuple(encodings))
+        lg.debug(f"Built {name} -> {hashed} {encodings}")
+
+    manifest = AssetManifest(entries)
+    out_fol.mkdir(parents=True, exist_ok=True)
+    manifest.save(out_fol / MANIFEST_NAME)
+    return manifest
+
+
+def install_assets(app: FastAPI, build_fol: Path) -> AssetManifest:
+    """Load the asset manifest and expose ``asset_url`` to templates.
+
+    ``assets_router`` must be included in the app to serve the built files.
+
+    Args:
+        app: The application; ``app.state.templates`` must be set.
+        build_fol: Build folder written by ``build_assets``.
+
+    Returns:
+        The loaded manifest, also stored on ``app.state.asset_manifest``.
+    """
+    manifest = AssetManifest.load(build_fol / MANIFEST_NAME)
+    app.state.asset_manifest = manifest
+    app.state.assets_build_fol = build_fol
+    app.state.templates.env.globals["asset_url"] = manifest.url
+    return manifest
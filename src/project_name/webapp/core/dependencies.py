@@ -4,18 +4,139 @@ from __future__ import annotations
 
 from functools import lru_cache
 from typing import TYPE_CHECKING
+from typing import Annotated
 
-from project_name.params.project_name_params import get_webapp_params
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi import status
+from fastapi_tools.dependencies import get_current_user
+
+# SessionData is resolved at runtime by FastAPI dependency injection
+from fastapi_tools.schemas.auth import SessionData  # noqa: TC002
+
+from project_name.params.params_snapshot import ParamsStore
+from project_name.params.project_name_params import get_project_name_params
+from project_name.webapp.core.page_cache import PageCache
+from project_name.webapp.core.render_cache import RenderCache
+from project_name.webapp.services.user_service import UserService
 
 if TYPE_CHECKING:
     from fastapi_tools.config.webapp_config import WebappConfig
 
+    from project_name.rag.query import QueryService
+
 
-@lru_cache
 def get_settings() -> WebappConfig:
     """Get webapp configuration settings.
 
+    The config comes from the current params snapshot, so it follows params
+    reloads; resolving it allocates nothing.
+
     Returns:
         WebappConfig instance.
     """
-    return get_webapp_params().to_config()
+    return ParamsStore().current.config
+
+
+def get_admin_emails() -> frozenset[str]:
+    """Get the lowercased emails allowed to administer users.
+
+    Returns:
+        The ``ADMIN_EMAILS`` of the current params snapshot.
+    """
+    return frozenset(ParamsStore().current.webapp.admin_emails)
+
+
+def require_admin(
+    session: Annotated[SessionData, Depends(get_current_user)],
+    admin_emails: Annotated[frozenset[str], Depends(get_admin_emails)],
+) -> SessionData:
+    """Require an authenticated session of an admin.
+
+    Args:
+        session: Current user session (requires authentication).
+        admin_emails: Emails allowed to administer users.
+
+    Returns:
+        The admin's session.
+
+    Raises:
+        HTTPException: 403 if the session email is not an admin email.
+    """
+    if session.email.lower() not in admin_emails:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return session
+
+
+@lru_cache
+def get_user_service() -> UserService:
+    """Get the process-wide user service.
+
+    Returns:
+        UserService instance backed by the default in-memory store.
+    """
+    return UserService()
+
+
+@lru_cache
+def get_render_cache() -> RenderCache:
+    """Get the process-wide fragment render cache.
+
+    The cache is subscribed to ``get_user_service`` updates, so fragments
+    owned by a user are dropped when that user changes.
+
+    Returns:
+        RenderCache instance.
+    """
+    cache = RenderCache()
+    get_user_service().add_update_listener(cache.invalidate_owner)
+    return cache
+
+
+@lru_cache
+def get_query_service() -> QueryService:
+    """Get the process-wide query service.
+
+    Built on first use, so workers that never answer a question never import
+    haystack; its pooled chat client and answer slots are then shared by all
+    the requests of the worker.
+
+    Returns:
+        QueryService instance configured by the query params.
+    """
+    from project_name.rag.query import QueryService  # noqa: PLC0415
+
+    return QueryService.from_config(get_project_name_params().query.to_config())
+
+
+async def close_query_service() -> None:
+    """Close the process-wide query service, if it was built, and forget it.
+
+    Registered as a shutdown hook by ``build_app``, so the pooled clients and
+    the answer cache database are closed when the worker exits.
+    """
+    if get_query_service.cache_info().currsize:
+        await get_query_service().aclose()
+        get_query_service.cache_clear()
+
+
+def get_page_cache(request: Request) -> PageCache:
+    """Get the application's cache of anonymous pages.
+
+    The cache lives on ``app.state`` rather than in the process, because the
+    cached pages embed the application's template globals.
+
+    Args:
+        request: Incoming request.
+
+    Returns:
+        PageCache instance, created on first use.
+    """
+    state = request.app.state
+    if getattr(state, "page_cache", None) is None:
+        state.page_cache = PageCache()
+    return state.page_cache
@@ -0,0 +1,43 @@
+"""Shutdown hooks for resources the app starts.
+
+``create_app`` from ``fastapi-tools`` sets up the application lifespan, and
+Starlette no longer accepts ``on_shutdown`` handlers.  ``add_shutdown_hook``
+wraps whatever lifespan the app has, so a hook runs once the server stops,
+after the lifespan it wraps has started, and also when the app fails while
+serving.  Hooks run in the reverse order they were added.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+import inspect
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from collections.abc import Callable
+
+    from fastapi import FastAPI
+
+
+def add_shutdown_hook(app: FastAPI, hook: Callable[[], object]) -> None:
+    """Run ``hook`` when the application shuts down.
+
+    Args:
+        app: The application.
+        hook: Called without arguments; awaited if it returns an awaitable.
+    """
+    inner = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[Any]:
+        async with inner(app) as state:
+            try:
+                yield state
+            finally:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+
+    app.router.lifespan_context = lifespan
@@ -0,0 +1,138 @@
+"""In-process stand-in for a Redis server.
+
+``LocalRedis`` implements the small subset of the ``redis.Redis`` client API
+used by the Redis-backed stores in this package: string ``get`` / ``set``
+with expiry, ``delete``, ``expire``, ``ttl`` and non-transactional
+pipelines.  It lets tests and single-process dev runs exercise the Redis
+code paths without a server or the ``redis`` package.
+
+Values are stored as ``bytes``, matching ``redis.Redis`` with the default
+``decode_responses=False``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class LocalRedis:
+    """Thread-safe in-memory key-value store with Redis-style expiry."""
+
+    def __init__(self) -> None:
+        """Initialize an empty keyspace."""
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(value: bytes | str | float) -> bytes:
+        """Encode a value the way redis-py does."""
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    def _live(self, name: str) -> tuple[bytes, float | None] | None:
+        """Return the entry for ``name``, dropping it if expired."""
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        _, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    def get(self, name: str) -> bytes | None:
+        """Return the value of ``name``, or None if missing or expired."""
+        with self._lock:
+            entry = self._live(name)
+            return entry[0] if entry is not None else None
+
+    def set(
+        self,
+        name: str,
+        value: bytes | str | float,
+        ex: int | None = None,
+    ) -> bool:
+        """Set ``name`` to ``value`` with an optional expiry in seconds."""
+        expires_at = time.monotonic() + ex if ex is not None else None
+        with self._lock:
+            self._data[name] = (self._encode(value), expires_at)
+        return True
+
+    def delete(self, *names: str) -> int:
+        """Delete keys, returning how many existed."""
+        with self._lock:
+            deleted = 0
+            for name in names:
+                if self._live(name) is not None:
+                    del self._data[name]
+                    deleted += 1
+            return deleted
+
+    def expire(self, name: str, time_s: int) -> bool:
+        """Set a key's time to live in seconds, returning False if missing."""
+        with self._lock:
+            entry = self._live(name)
+            if entry is None:
+                return False
+            self._data[name] = (entry[0], time.monotonic() + time_s)
+            return True
+
+    def ttl(self, name: str) -> int:
+        """Return the remaining TTL in seconds, -1 if none, -2 if missing."""
+        with self._lock:
+            entry = self._live(name)
+            if entry is None:
+                return -2
+            if entry[1] is None:
+                return -1
+            return max(0, round(entry[1] - time.monotonic()))
+
+    def pipeline(self, *, transaction: bool = True) -> LocalPipeline:  # noqa: ARG002
+        """Return a pipeline that buffers commands until ``execute``."""
+        return LocalPipeline(self)
+
+
+class LocalPipeline:
+    """Buffered command pipeline for ``LocalRedis``."""
+
+    def __init__(self, client: LocalRedis) -> None:
+        """Initialize an empty command buffer."""
+        self._client = client
+        self._commands: list[Callable[[], Any]] = []
+
+    def get(self, name: str) -> LocalPipeline:
+        """Queue a ``get``."""
+        self._commands.append(lambda: self._client.get(name))
+        return self
+
+    def set(
+        self,
+        name: str,
+        value: bytes | str | float,
+        ex: int | None = None,
+    ) -> LocalPipeline:
+        """Queue a ``set``."""
+        self._commands.append(lambda: self._client.set(name, value, ex=ex))
+        return self
+
+    def delete(self, *names: str) -> LocalPipeline:
+        """Queue a ``delete``."""
+        self._commands.append(lambda: self._client.delete(*names))
+        return self
+
+    def expire(self, name: str, time_s: int) -> LocalPipeline:
+        """Queue an ``expire``."""
+        self._commands.append(lambda: self._client.expire(name, time_s))
+        return self
+
+    def execute(self) -> list[Any]:
+        """Run the queued commands and return their results in order."""
+        commands, self._commands = self._commands, []
+        return [command() for command in commands]
@@ -0,0 +1,239 @@
+"""Full-page cache for anonymous HTML pages.
+
+For visitors without a session, the landing and error pages depend only on
+the ``error`` query or the status code.  ``PageCache`` renders such a page
+once and keeps it as ready-to-send bytes: identity, gzip and, when the
+optional ``brotli`` package is installed, brotli.  Each request then only
+picks the encoding from ``Accept-Encoding`` and sends the stored bytes.
+
+Every encoding has its own strong ETag, so a matching ``If-None-Match`` is
+answered with ``304 Not Modified``.  Responses carry ``Vary: Accept-Encoding,
+Cookie`` so shared caches never hand the anonymous page to a signed-in user.
+
+Pages are rendered without request context processors: a cached page is
+shared by all anonymous visitors and must not embed per-request values such
+as CSRF tokens.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import gzip
+import hashlib
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+
+from fastapi.responses import Response
+
+from project_name.webapp.core.render_cache import context_key
+from project_name.webapp.core.render_cache import etag_matches
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Collection
+    from collections.abc import Mapping
+
+    from fastapi import Request
+    from fastapi.templating import Jinja2Templates
+
+
+def brotli_compressor() -> Callable[[bytes], bytes] | None:
+    """Return ``brotli.compress`` if the optional package is installed."""
+    try:
+        import brotli  # noqa: PLC0415
+    except ImportError:
+        return None
+    return lambda data: brotli.compress(data, quality=11)
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Parse an ``Accept-Encoding`` header into the accepted codings.
+
+    Codings with ``q=0`` are excluded.
+
+    Args:
+        accept_encoding: Raw header value.
+
+    Returns:
+        Lower-case coding names, e.g. ``{"gzip", "br"}``.
+    """
+    if not accept_encoding:
+        return set()
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        if params and quality.replace(".", "").strip("0") == "":
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(available: Collection[str], accept_encoding: str | None) -> str:
+    """Pick the smallest available coding the client accepts.
+
+    Args:
+        available: Precompressed codings on hand, e.g. ``{"br", "gzip"}``.
+        accept_encoding: Raw ``Accept-Encoding`` header.
+
+    Returns:
+        ``"br"``, ``"gzip"`` or ``"identity"``.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding in available and (coding in accepted or "*" in accepted):
+            return coding
+    return "identity"
+
+
+@dataclass(slots=True)
+class CachedPage:
+    """A rendered page stored in every available encoding.
+
+    Attributes:
+        status_code: HTTP status of the page.
+        bodies: Encoded body per coding; ``"identity"`` is always present.
+        etags: Strong, quoted ETag per coding.
+    """
+
+    status_code: int
+    bodies: dict[str, bytes]
+    etags: dict[str, str]
+
+    @classmethod
+    def from_html(
+        cls,
+        html: str,
+        status_code: int = 200,
+        brotli_compress: Callable[[bytes], bytes] | None = None,
+    ) -> CachedPage:
+        """Encode a rendered page once in every supported coding.
+
+        Args:
+            html: Rendered page.
+            status_code: HTTP status of the page.
+            brotli_compress: Brotli compressor, or None to skip brotli.
+
+        Returns:
+            The encoded page.
+        """
+        raw = html.encode()
+        bodies = {"identity": raw, "gzip": gzip.compress(raw, mtime=0)}
+        if brotli_compress is not None:
+            bodies["br"] = brotli_compress(raw)
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in bodies
+        }
+        return cls(status_code=status_code, bodies=bodies, etags=etags)
+
+    def choose_encoding(self, accept_encoding: str | None) -> str:
+        """Pick the smallest stored coding the client accepts.
+
+        Args:
+            accept_encoding: Raw ``Accept-Encoding`` header.
+
+        Returns:
+            ``"br"``, ``"gzip"`` or ``"identity"``.
+        """
+        return choose_encoding(self.bodies, accept_encoding)
+
+
+class PageCache:
+    """Bounded LRU of anonymous pages stored as precompressed bytes.
+
+    Args:
+        max_entries: Maximum pages kept.  Bounds memory when a page is keyed
+            by a client-controlled value such as the ``error`` query.
+        max_age: ``Cache-Control`` max-age sent with cached pages, in seconds.
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: int = 300) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._pages: OrderedDict[str, CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+        self._brotli = brotli_compressor()
+
+    def __len__(self) -> int:
+        """Return the number of cached pages."""
+        return len(self._pages)
+
+    def get_page(
+        self,
+        templates: Jinja2Templates,
+        template_name: str,
+        context: Mapping[str, Any],
+        status_code: int = 200,
+    ) -> CachedPage:
+        """Return the cached page, rendering and encoding it on a miss.
+
+        Args:
+            templates: The application's template renderer.
+            template_name: Template to render.
+            context: Context values; the cache key is derived from them.
+            status_code: HTTP status of the page.
+
+        Returns:
+            The encoded page.
+        """
+        key = f"{status_code}:{context_key(template_name, context)}"
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+                return page
+        html = templates.env.get_template(template_name).render(context)
+        page = CachedPage.from_html(html, status_code, self._brotli)
+        with self._lock:
+            self._pages[key] = page
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+        return page
+
+    def respond(
+        self,
+        request: Request,
+        template_name: str,
+        context: Mapping[str, Any],
+        status_code: int = 200,
+    ) -> Response:
+        """Serve a cached page in the best encoding the client accepts.
+
+        Args:
+            request: Incoming request, for its app templates and headers.
+            template_name: Template to render.
+            context: Context values; the cache key is derived from them.
+            status_code: HTTP status of the page.
+
+        Returns:
+            The page, or an empty 304 if the client's copy is current.
+        """
+        page = self.get_page(
+            request.app.state.templates, template_name, context, status_code
+        )
+        coding = page.choose_encoding(request.headers.get("accept-encoding"))
+        headers = {
+            "ETag": page.etags[coding],
+            "Cache-Control": f"public, max-age={self.max_age}",
+            "Vary": "Accept-Encoding, Cookie",
+        }
+        if etag_matches(request.headers.get("if-none-match"), page.etags[coding]):
+            return Response(status_code=304, headers=headers)
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(
+            content=page.bodies[coding],
+            status_code=page.status_code,
+            headers=headers,
+            media_type="text/html; charset=utf-8",
+        )
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._pages.clear()
@@ -0,0 +1,441 @@
+"""Token-bucket rate limiting shared across workers.
+
+The rate limiter bundled with ``fastapi-tools`` keeps its counters in process
+memory, so with N uvicorn workers a client effectively gets N times the
+configured limit.  This module enforces the limit against shared state:
+
+* ``SharedMemoryBucketStore`` - a memory-mapped file of fixed-size bucket
+  slots guarded by ``flock``.  Every worker process on one node sees the
+  same buckets.
+* ``RedisBucketStore`` - buckets in a Redis-protocol server, updated by an
+  atomic Lua script, for limits shared across several nodes.
+* ``LocalBucketStore`` - an in-process store, useful for tests.
+
+To keep the shared store off the hot path, ``TokenBucketLimiter`` leases
+tokens in small batches: a worker takes ``lease_size`` tokens at once and
+spends them locally, so most requests never touch the shared store.  Unused
+leased tokens expire after ``lease_ttl`` seconds.  The cost is that up to
+``lease_size`` tokens per worker can be held back from other workers.  The
+middleware calls ``TokenBucketLimiter.aallow``, which runs the round trips
+to the store (a blocking ``flock`` or Redis call) in a worker thread, so a
+contended file or a slow Redis never stalls the event loop.
+
+``SharedRateLimitMiddleware`` applies the limiter per client address, with
+the stricter auth limit on ``/auth/`` paths.  It is installed by
+``build_app`` when ``WebappParams.rate_limit_backend`` is ``"shm"`` or
+``"redis"``.  The per-process ``fastapi-tools`` limiter stays active and,
+being N times looser, only acts as a backstop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from hashlib import blake2b
+import json
+import math
+import mmap
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+from loguru import logger as lg
+
+from project_name.webapp.core.local_redis import LocalRedis
+from project_name.webapp.core.session_store import redis_client_from_url
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from fastapi import FastAPI
+    from starlette.types import ASGIApp
+    from starlette.types import Receive
+    from starlette.types import Scope
+    from starlette.types import Send
+
+    from project_name.params.project_name_paths import ProjectNamePaths
+    from project_name.params.webapp import WebappParams
+
+
+class BucketStore(Protocol):
+    """Shared token-bucket state."""
+
+    def take(self, key: str, n: int, rate: float, capacity: int) -> int:
+        """Atomically refill the bucket and take up to ``n`` tokens.
+
+        Args:
+            key: Bucket identifier.
+            n: Tokens requested.
+            rate: Refill rate in tokens per second.
+            capacity: Maximum tokens the bucket holds.
+
+        Returns:
+            Number of tokens granted, between 0 and ``n``.
+        """
+        ...
+
+
+class UnknownRateLimitBackendError(Exception):
+    """Raised when ``WebappParams.rate_limit_backend`` names no known backend.
+
+    Args:
+        backend (str): the backend name that caused the error
+    """
+
+    def __init__(self, backend: str) -> None:
+        """Initialize with the invalid backend name.
+
+        Args:
+            backend: The unknown rate limit backend
+        """
+        self.backend = backend
+        message = f"Unknown rate limit backend: {backend}"
+        super().__init__(message)
+
+
+def _refill_and_take(
+    tokens: float,
+    updated_at: float,
+    now: float,
+    n: int,
+    rate: float,
+    capacity: int,
+) -> tuple[float, int]:
+    """Apply token-bucket refill, then take up to ``n`` whole tokens."""
+    tokens = min(float(capacity), tokens + max(0.0, now - updated_at) * rate)
+    granted = min(n, int(tokens))
+    return tokens - granted, granted
+
+
+class LocalBucketStore:
+    """In-process bucket store, shared only by threads of one process."""
+
+    def __init__(self) -> None:
+        """Initialize an empty bucket table."""
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, n: int, rate: float, capacity: int) -> int:
+        """Atomically refill the bucket and take up to ``n`` tokens."""
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(capacity), now))
+            tokens, granted = _refill_and_take(
+                tokens, updated_at, now, n, rate, capacity
+            )
+            self._buckets[key] = (tokens, now)
+        return granted
+
+
+class SharedMemoryBucketStore:
+    """Bucket store in a memory-mapped file shared by all local processes.
+
+    The file holds ``n_slots`` fixed-size slots, each storing a key hash, the
+    token count, the last update time and the time the bucket is full
+    again.  A key is hashed to a slot and, when another key holds it, probes
+    the next ``_PROBES`` slots.  A slot is reused only once its bucket has
+    refilled, since forgetting a full bucket changes nothing; when every
+    probed slot holds a bucket still refilling, the request is denied
+    rather than given a fresh bucket.
+
+    Args:
+        fp: Backing file.  Created and sized on first use.
+        n_slots: Number of bucket slots.
+    """
+
+    _SLOT = struct.Struct("<Qddd")
+    _PROBES = 8
+
+    def __init__(self, fp: Path, n_slots: int = 65536) -> None:
+        """Open or create the shared bucket file."""
+        # fcntl is POSIX only: import here so the module stays importable
+        import fcntl  # noqa: PLC0415
+
+        self._fcntl = fcntl
+        self.fp = fp
+        self.n_slots = n_slots
+        size = self._SLOT.size * n_slots
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        self._file = fp.open("a+b")
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            if fp.stat().st_size < size:
+                self._file.truncate(size)
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._lock = threading.Lock()
+
+    def _find_slot(self, key_hash: int, now: float) -> tuple[int, bool] | None:
+        """Return the offset of the key's slot and whether it holds its bucket.
+
+        Called with the file lock held.  Returns None when every probed slot
+        holds another key's bucket that has not refilled yet.
+        """
+        home = key_hash % self.n_slots
+        free = None
+        for probe in range(min(self._PROBES, self.n_slots)):
+            offset = ((home + probe) % self.n_slots) * self._SLOT.size
+            slot_hash, _, _, full_at = self._SLOT.unpack_from(self._map, offset)
+            if slot_hash == key_hash:
+                return offset, True
+            if free is None and (slot_hash == 0 or full_at <= now):
+                free = offset
+        return None if free is None else (free, False)
+
+    def take(self, key: str, n: int, rate: float, capacity: int) -> int:
+        """Atomically refill the bucket and take up to ``n`` tokens."""
+        # Zero marks an empty slot
+        key_hash = int.from_bytes(blake2b(key.encode(), digest_size=8).digest()) or 1
+        now = time.time()
+        with self._lock:
+            self._fcntl.flock(self._file, self._fcntl.LOCK_EX)
+            try:
+                found = self._find_slot(key_hash, now)
+                if found is None:
+                    return 0
+                offset, own = found
+                tokens, updated_at = float(capacity), now
+                if own:
+                    _, tokens, updated_at, _ = self._SLOT.unpack_from(self._map, offset)
+                tokens, granted = _refill_and_take(
+                    tokens, updated_at, now, n, rate, capacity
+                )
+                full_at = now + (capacity - tokens) / rate if rate > 0 else math.inf
+                self._SLOT.pack_into(self._map, offset, key_hash, tokens, now, full_at)
+            finally:
+                self._fcntl.flock(self._file, self._fcntl.LOCK_UN)
+        return granted
+
+    def close(self) -> None:
+        """Unmap and close the backing file."""
+        self._map.close()
+        self._file.close()
+
+
+class RedisBucketStore:
+    """Bucket store in a Redis-protocol server, updated by a Lua script.
+
+    The script reads the bucket, refills it using the server clock, takes
+    the tokens and writes it back in one atomic step, so concurrent workers
+    on any node never double-spend.
+
+    Args:
+        client: A ``redis.Redis`` client.
+        key_prefix: Prefix for bucket keys.
+    """
+
+    _TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local n = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(n, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return granted
+"""
+
+    def __init__(self, client: Any, key_prefix: str = "ratelimit:") -> None:  # noqa: ANN401
+        """Register the take script on the client."""
+        self.key_prefix = key_prefix
+        self._take = client.register_script(self._TAKE_SCRIPT)
+
+    def take(self, key: str, n: int, rate: float, capacity: int) -> int:
+        """Atomically refill the bucket and take up to ``n`` tokens."""
+        return int(
+            self._take(keys=[f"{self.key_prefix}{key}"], args=[rate, capacity, n])
+        )
+
+
+class TokenBucketLimiter:
+    """Token-bucket limiter with locally leased tokens.
+
+    Args:
+        store: Shared bucket state.
+        requests_per_minute: Sustained rate.
+        burst_size: Bucket capacity.
+        lease_size: Tokens taken from the store per round trip.
+        lease_ttl: Seconds after which unused leased tokens are dropped.
+    """
+
+    def __init__(
+        self,
+        store: BucketStore,
+        requests_per_minute: int,
+        burst_size: int,
+        lease_size: int = 4,
+        lease_ttl: float = 1.0,
+    ) -> None:
+        """Initialize the limiter."""
+        self.store = store
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1, burst_size)
+        self.lease_size = max(1, min(lease_size, self.capacity))
+        self.lease_ttl = lease_ttl
+        self._leases: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def _spend_leased(self, key: str, now: float) -> bool:
+        """Spend one leased token for ``key``, returning False if none is left."""
+        with self._lock:
+            tokens, leased_at = self._leases.get(key, (0, now))
+            if tokens > 0 and now - leased_at <= self.lease_ttl:
+                self._leases[key] = (tokens - 1, leased_at)
+                return True
+        return False
+
+    def _keep_lease(self, key: str, granted: int, now: float) -> bool:
+        """Spend one of the ``granted`` tokens and lease the rest locally."""
+        if granted == 0:
+            return False
+        with self._lock:
+            self._leases[key] = (granted - 1, now)
+        return True
+
+    def allow(self, key: str) -> bool:
+        """Spend one token for ``key``, leasing more from the store if needed.
+
+        Args:
+            key: Client identifier, e.g. its address.
+
+        Returns:
+            True if the request is within the limit.
+        """
+        now = time.monotonic()
+        if self._spend_leased(key, now):
+            return True
+        granted = self.store.take(key, self.lease_size, self.rate, self.capacity)
+        return self._keep_lease(key, granted, now)
+
+    async def aallow(self, key: str) -> bool:
+        """Async variant of ``allow``.
+
+        Leased tokens are spent on the event loop; the store is asked from a
+        worker thread.
+
+        Args:
+            key: Client identifier, e.g. its address.
+
+        Returns:
+            True if the request is within the limit.
+        """
+        now = time.monotonic()
+        if self._spend_leased(key, now):
+            return True
+        granted = await asyncio.to_thread(
+            self.store.take, key, self.lease_size, self.rate, self.capacity
+        )
+        return self._keep_lease(key, granted, now)
+
+
+class SharedRateLimitMiddleware:
+    """ASGI middleware enforcing shared per-client rate limits.
+
+    Args:
+        app: Downstream ASGI application.
+        limiter: Limiter for regular requests.
+        auth_limiter: Limiter for ``/auth/`` requests.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: TokenBucketLimiter,
+        auth_limiter: TokenBucketLimiter,
+    ) -> None:
+        """Wrap the downstream application."""
+        self.app = app
+        self.limiter = limiter
+        self.auth_limiter = auth_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Reject the request with 429 if the client is over its limit."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        host = client[0] if client else "unknown"
+        if scope["path"].startswith("/auth/"):
+            allowed = await self.auth_limiter.aallow(f"auth:{host}")
+        else:
+            allowed = await self.limiter.aallow(f"req:{host}")
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def install_rate_limiter(
+    app: FastAPI,
+    params: WebappParams,
+    paths: ProjectNamePaths,
+) -> None:
+    """Add the shared rate limit middleware according to ``rate_limit_backend``.
+
+    Args:
+        app: The application to wrap.
+        params: Webapp params selecting the backend and the limits.
+        paths: Project paths; the shared-memory file lives in ``cache_fol``.
+
+    Raises:
+        UnknownRateLimitBackendError: If the backend name is not recognised.
+    """
+    store: BucketStore
+    match params.rate_limit_backend:
+        case "local":
+            return
+        case "shm":
+            store = SharedMemoryBucketStore(paths.cache_fol / "rate_limit.shm")
+        case "redis":
+            client = redis_client_from_url(params.rate_limit_redis_url)
+            # The in-process stand-in cannot run Lua scripts
+            if isinstance(client, LocalRedis):
+                lg.warning(
+                    f"{params.rate_limit_redis_url} is an in-process Redis: "
+                    "the rate limit is per worker, not shared"
+                )
+                store = LocalBucketStore()
+            else:
+                store = RedisBucketStore(client)
+        case _:
+            raise UnknownRateLimitBackendError(params.rate_limit_backend)
+    lg.info(f"Using shared rate limiter: {params.rate_limit_backend}")
+    app.add_middleware(
+        SharedRateLimitMiddleware,
+        limiter=TokenBucketLimiter(
+            store,
+            requests_per_minute=params.rate_limit_requests_per_minute,
+            burst_size=params.rate_limit_burst_size,
+        ),
+        auth_limiter=TokenBucketLimiter(
+            store,
+            requests_per_minute=params.rate_limit_auth_requests_per_minute,
+            burst_size=params.rate_limit_burst_size,
+            lease_size=1,
+        ),
+    )
@@ -0,0 +1,211 @@
+"""Render cache for HTML fragments.
+
+HTMX partials such as ``partials/user_card.html`` are re-fetched on every
+swap, although their output depends only on a few context values.
+``RenderCache`` keeps rendered fragments in a bounded LRU keyed by the
+template name and a stable hash of the context, so a repeat swap skips
+template rendering entirely.
+
+Each entry carries a strong ETag derived from the rendered HTML.  Routes
+answer a matching ``If-None-Match`` with ``304 Not Modified``, so the browser
+reuses its copy and no body is sent.
+
+Entries can be tagged with an owner (e.g. a user id).  ``invalidate_owner``
+drops every fragment of that owner; ``get_render_cache`` wires it to
+``UserService`` update notifications.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from fastapi.templating import Jinja2Templates
+
+
+def context_key(template_name: str, context: Mapping[str, Any]) -> str:
+    """Return a stable cache key for a template and its context.
+
+    Args:
+        template_name: Template path relative to the templates folder.
+        context: JSON-serializable context values the output depends on.
+
+    Returns:
+        Hex digest identifying the rendered output.
+    """
+    payload = json.dumps(
+        [template_name, context],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header matches an ETag.
+
+    Args:
+        if_none_match: Raw header value, possibly a comma-separated list or
+            ``*``.
+        etag: Quoted ETag of the current representation.
+
+    Returns:
+        True if the client already holds this representation.
+    """
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@dataclass(slots=True)
+class RenderedFragment:
+    """A cached fragment.
+
+    Attributes:
+        html: Rendered HTML.
+        etag: Strong ETag of ``html``, quoted.
+        owner: Optional owner tag used for invalidation.
+        stored_at: Monotonic time the fragment was rendered.
+    """
+
+    html: str
+    etag: str
+    owner: str | None
+    stored_at: float
+
+
+class RenderCache:
+    """Bounded LRU of rendered fragments with TTL and owner invalidation.
+
+    Args:
+        max_entries: Maximum fragments kept; the least recently used is
+            evicted first.
+        ttl_seconds: Seconds a fragment is served before being re-rendered.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, RenderedFragment] = OrderedDict()
+        self._by_owner: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached fragments."""
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        """Remove an entry and its owner index; caller holds the lock."""
+        fragment = self._entries.pop(key, None)
+        if fragment is None or fragment.owner is None:
+            return
+        keys = self._by_owner.get(fragment.owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_owner[fragment.owner]
+
+    def get(self, key: str) -> RenderedFragment | None:
+        """Return a live fragment, or None if missing or expired.
+
+        Args:
+            key: Key from ``context_key``.
+
+        Returns:
+            The cached fragment, or None.
+        """
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is None:
+                return None
+            if time.monotonic() - fragment.stored_at > self.ttl_seconds:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return fragment
+
+    def put(self, key: str, html: str, owner: str | None = None) -> RenderedFragment:
+        """Store a rendered fragment.
+
+        Args:
+            key: Key from ``context_key``.
+            html: Rendered HTML.
+            owner: Optional owner tag for ``invalidate_owner``.
+
+        Returns:
+            The stored fragment, with its ETag.
+        """
+        digest = hashlib.blake2b(html.encode(), digest_size=16).hexdigest()
+        fragment = RenderedFragment(
+            html=html,
+            etag=f'"{digest}"',
+            owner=owner,
+            stored_at=time.monotonic(),
+        )
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = fragment
+            if owner is not None:
+                self._by_owner.setdefault(owner, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+        return fragment
+
+    def render(
+        self,
+        templates: Jinja2Templates,
+        template_name: str,
+        context: Mapping[str, Any],
+        owner: str | None = None,
+    ) -> RenderedFragment:
+        """Return the cached fragment, rendering it on a miss.
+
+        Args:
+            templates: The application's template renderer.
+            template_name: Template to render.
+            context: Context values; the cache key is derived from them, so
+                include everything the output depends on.
+            owner: Optional owner tag for ``invalidate_owner``.
+
+        Returns:
+            The rendered fragment.
+        """
+        key = context_key(template_name, context)
+        fragment = self.get(key)
+        if fragment is not None:
+            return fragment
+        html = templates.env.get_template(template_name).render(context)
+        return self.put(key, html, owner=owner)
+
+    def invalidate_owner(self, owner: str) -> int:
+        """Drop every fragment tagged with ``owner``.
+
+        Args:
+            owner: Owner tag, e.g. a user id.
+
+        Returns:
+            Number of fragments dropped.
+        """
+        with self._lock:
+            keys = self._by_owner.pop(owner, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every fragment."""
+        with self._lock:
+            self._entries.clear()
+            self._by_owner.clear()
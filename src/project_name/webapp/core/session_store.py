@@ -0,0 +1,309 @@
+"""Redis-backed session store shared across workers.
+
+The default ``fastapi-tools`` session store lives in process memory, so with
+several uvicorn workers a session created by one worker is unknown to the
+others.  ``RedisSessionStore`` keeps sessions in a Redis-protocol server
+instead, so any worker can serve any request without sticky routing.
+
+Design:
+
+* Sessions are stored as JSON under ``<prefix><session_id>`` with a TTL.
+  The TTL slides on access but never outlives ``SessionData.expires_at``.
+* TTL refreshes are not sent per read: accessed ids are collected and sent
+  as one pipeline of ``EXPIRE`` commands every ``refresh_interval`` seconds.
+* A small local LRU caches decoded sessions for ``local_cache_ttl`` seconds,
+  so hot sessions are served without a network round trip.  A logout on
+  another worker is therefore seen here after at most ``local_cache_ttl``.
+* Connections come from a shared ``redis.ConnectionPool``.
+
+The store exposes the same synchronous ``create_session`` / ``get_session``
+/ ``delete_session`` methods as the in-memory store and is installed on
+``app.state.session_store`` by ``build_app`` when
+``WebappParams.session_backend`` is ``"redis"``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import UTC
+from datetime import datetime
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+from fastapi_tools.schemas.auth import SessionData
+from loguru import logger as lg
+
+from project_name.webapp.core.local_redis import LocalRedis
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+    from project_name.params.webapp import WebappParams
+
+
+class RedisPipelineLike(Protocol):
+    """Subset of the redis-py pipeline API used by the stores."""
+
+    def expire(self, name: str, time_s: int) -> Any:  # noqa: ANN401
+        """Queue an ``EXPIRE``."""
+        ...
+
+    def execute(self) -> list[Any]:
+        """Send the queued commands."""
+        ...
+
+
+class RedisLike(Protocol):
+    """Subset of the ``redis.Redis`` client API used by the stores."""
+
+    def get(self, name: str) -> bytes | None:
+        """Return the value of a key."""
+        ...
+
+    def set(self, name: str, value: bytes, ex: int | None = None) -> Any:  # noqa: ANN401
+        """Set a key with an optional expiry in seconds."""
+        ...
+
+    def delete(self, *names: str) -> int:
+        """Delete keys."""
+        ...
+
+    def pipeline(self, *, transaction: bool = True) -> RedisPipelineLike:
+        """Return a command pipeline."""
+        ...
+
+
+class UnknownSessionBackendError(Exception):
+    """Raised when ``WebappParams.session_backend`` names no known backend.
+
+    Args:
+        backend (str): the backend name that caused the error
+    """
+
+    def __init__(self, backend: str) -> None:
+        """Initialize with the invalid backend name.
+
+        Args:
+            backend: The unknown session backend
+        """
+        self.backend = backend
+        message = f"Unknown session backend: {backend}"
+        super().__init__(message)
+
+
+class RedisNotInstalledError(ImportError):
+    """Raised when a Redis backend is selected but ``redis`` is not installed."""
+
+    def __init__(self) -> None:
+        """Initialize with an install hint."""
+        super().__init__(
+            "The 'redis' package is required for Redis-backed stores: uv add redis"
+        )
+
+
+def redis_client_from_url(url: str, max_connections: int = 50) -> RedisLike:
+    """Create a pooled ``redis.Redis`` client.
+
+    The URL ``local://`` returns an in-process ``LocalRedis`` instead, which
+    is handy for tests and single-worker development.
+
+    Args:
+        url: Redis URL, e.g. ``redis://localhost:6379/0``, or ``local://``.
+        max_connections: Size of the shared connection pool.
+
+    Returns:
+        A Redis-protocol client.
+
+    Raises:
+        RedisNotInstalledError: If ``redis`` is needed but not installed.
+    """
+    if url.startswith("local://"):
+        return LocalRedis()
+    try:
+        import redis  # noqa: PLC0415
+    except ImportError as exc:
+        raise RedisNotInstalledError from exc
+    pool = redis.ConnectionPool.from_url(url, max_connections=max_connections)
+    return redis.Redis(connection_pool=pool)
+
+
+class RedisSessionStore:
+    """Session store backed by a Redis-protocol server.
+
+    Args:
+        client: Redis-protocol client, e.g. ``redis.Redis`` or ``LocalRedis``.
+        ttl_seconds: Idle lifetime of a session; refreshed on access.
+        key_prefix: Prefix for session keys.
+        refresh_interval: Seconds between pipelined TTL refresh flushes.
+        local_cache_size: Maximum sessions kept in the local LRU.
+        local_cache_ttl: Seconds a locally cached session is trusted.
+            Use 0 to disable the local cache.
+    """
+
+    def __init__(
+        self,
+        client: RedisLike,
+        ttl_seconds: int,
+        key_prefix: str = "session:",
+        refresh_interval: float = 5.0,
+        local_cache_size: int = 1024,
+        local_cache_ttl: float = 2.0,
+    ) -> None:
+        """Initialize the store."""
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.refresh_interval = refresh_interval
+        self.local_cache_size = local_cache_size
+        self.local_cache_ttl = local_cache_ttl
+        self._cache: OrderedDict[str, tuple[SessionData, float]] = OrderedDict()
+        self._pending_refresh: dict[str, int] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_params(cls, params: WebappParams) -> RedisSessionStore:
+        """Build a store from webapp params.
+
+        Args:
+            params: Webapp params carrying the Redis URL and session max age.
+
+        Returns:
+            A configured ``RedisSessionStore``.
+        """
+        client = redis_client_from_url(params.session_redis_url)
+        lg.info("Using Redis session store")
+        return cls(client=client, ttl_seconds=params.session_max_age)
+
+    def _key(self, session_id: str) -> str:
+        """Return the Redis key for a session id."""
+        return f"{self.key_prefix}{session_id}"
+
+    def _ttl_for(self, session: SessionData) -> int:
+        """Return the TTL to apply, capped at the absolute session expiry."""
+        remaining = int((session.expires_at - datetime.now(UTC)).total_seconds())
+        return max(1, min(self.ttl_seconds, remaining))
+
+    def _cache_put(self, session: SessionData) -> None:
+        """Insert a session in the local LRU, evicting the oldest if full."""
+        if self.local_cache_ttl <= 0:
+            return
+        with self._lock:
+            self._cache[session.session_id] = (session, time.monotonic())
+            self._cache.move_to_end(session.session_id)
+            while len(self._cache) > self.local_cache_size:
+                self._cache.popitem(last=False)
+
+    def _cache_get(self, session_id: str) -> SessionData | None:
+        """Return a fresh locally cached session, or None."""
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is None:
+                return None
+            session, cached_at = entry
+            if time.monotonic() - cached_at > self.local_cache_ttl:
+                del self._cache[session_id]
+                return None
+            self._cache.move_to_end(session_id)
+            return session
+
+    def _schedule_refresh(self, session: SessionData) -> None:
+        """Queue a TTL refresh and flush the queue if the interval elapsed."""
+        with self._lock:
+            self._pending_refresh[session.session_id] = self._ttl_for(session)
+            if time.monotonic() - self._last_flush < self.refresh_interval:
+                return
+            pending, self._pending_refresh = self._pending_refresh, {}
+            self._last_flush = time.monotonic()
+        self._flush(pending)
+
+    def _flush(self, pending: dict[str, int]) -> None:
+        """Send queued TTL refreshes in one pipeline."""
+        if not pending:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for session_id, ttl in pending.items():
+            pipe.expire(self._key(session_id), ttl)
+        pipe.execute()
+
+    def flush_refreshes(self) -> None:
+        """Send any queued TTL refreshes now."""
+        with self._lock:
+            pending, self._pending_refresh = self._pending_refresh, {}
+            self._last_flush = time.monotonic()
+        self._flush(pending)
+
+    def create_session(self, session_data: SessionData) -> SessionData:
+        """Store a new session.
+
+        Args:
+            session_data: Session to store.
+
+        Returns:
+            The stored session.
+        """
+        self.client.set(
+            self._key(session_data.session_id),
+            session_data.model_dump_json().encode(),
+            ex=self._ttl_for(session_data),
+        )
+        self._cache_put(session_data)
+        return session_data
+
+    def get_session(self, session_id: str) -> SessionData | None:
+        """Return a live session, or None if missing or expired.
+
+        Args:
+            session_id: Session identifier from the cookie.
+
+        Returns:
+            The session, or None.
+        """
+        session = self._cache_get(session_id)
+        if session is None:
+            raw = self.client.get(self._key(session_id))
+            if raw is None:
+                return None
+            session = SessionData.model_validate_json(raw)
+            self._cache_put(session)
+        if session.expires_at <= datetime.now(UTC):
+            self.delete_session(session_id)
+            return None
+        self._schedule_refresh(session)
+        return session
+
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session.
+
+        Args:
+            session_id: Session identifier.
+
+        Returns:
+            True if the session existed.
+        """
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._pending_refresh.pop(session_id, None)
+        return self.client.delete(self._key(session_id)) > 0
+
+
+def install_session_store(app: FastAPI, params: WebappParams) -> None:
+    """Replace the default session store according to ``session_backend``.
+
+    Args:
+        app: The application whose ``state.session_store`` is replaced.
+        params: Webapp params selecting the backend.
+
+    Raises:
+        UnknownSessionBackendError: If the backend name is not recognised.
+    """
+    match params.session_backend:
+        case "memory":
+            return
+        case "redis":
+            app.state.session_store = RedisSessionStore.from_params(params)
+        case _:
+            raise UnknownSessionBackendError(params.session_backend)
@@ -0,0 +1,114 @@
+"""Server-Sent Events responses that stop work when the client leaves.
+
+``EventStreamResponse`` streams an async generator of ``(event, data)``
+pairs as ``text/event-stream``.  Each event is sent as soon as it is
+yielded, and the headers disable proxy buffering, so the first event reaches
+the client without waiting for the next ones.
+
+Starlette only notices a disconnected client the next time it sends a
+chunk, which can be long while a model is still thinking about its first
+token.  This response listens for ``http.disconnect`` during the whole
+stream instead, and cancels the generator as soon as the client is gone.
+The generator is then closed, so the ``finally`` blocks and context
+managers under it run and upstream requests are aborted, and ``on_close``
+is called whether the stream finished, failed or was cancelled.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from typing import Any
+
+import anyio
+from fastapi.responses import StreamingResponse
+from loguru import logger as lg
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from collections.abc import Callable
+
+    from starlette.types import Receive
+    from starlette.types import Scope
+    from starlette.types import Send
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+
+EVENT_STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Tell nginx and similar proxies not to buffer the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(event: str, data: Any) -> bytes:  # noqa: ANN401
+    """Encode one Server-Sent Event with a JSON payload.
+
+    Args:
+        event: Event name.
+        data: JSON-serializable payload, sent on a single ``data`` line.
+
+    Returns:
+        The encoded event, terminated by a blank line.
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {payload}\n\n".encode()
+
+
+class EventStreamResponse(StreamingResponse):
+    """Stream ``(event, data)`` pairs as Server-Sent Events.
+
+    Args:
+        events: Async generator of ``(event, data)`` pairs.
+        on_close: Called once the stream is over, however it ended.
+        headers: Extra response headers.
+    """
+
+    media_type = EVENT_STREAM_MEDIA_TYPE
+
+    def __init__(
+        self,
+        events: AsyncGenerator[tuple[str, Any]],
+        on_close: Callable[[], None] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Wrap the event generator."""
+        self.events = events
+        self.on_close = on_close
+        self._body = self._encode()
+        super().__init__(
+            self._body, headers={**EVENT_STREAM_HEADERS, **(headers or {})}
+        )
+
+    async def _encode(self) -> AsyncGenerator[bytes]:
+        """Encode the events, opening with a comment to flush the headers."""
+        yield b": stream\n\n"
+        async for event, data in self.events:
+            yield format_event(event, data)
+
+    async def __call__(
+        self,
+        scope: Scope,  # noqa: ARG002
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Stream the events until they end or the client disconnects."""
+        try:
+            async with anyio.create_task_group() as task_group:
+
+                async def stream() -> None:
+                    try:
+                        await self.stream_response(send)
+                    except OSError:
+                        lg.debug("Event stream client went away")
+                    task_group.cancel_scope.cancel()
+
+                task_group.start_soon(stream)
+                await self.listen_for_disconnect(receive)
+                task_group.cancel_scope.cancel()
+        finally:
+            with anyio.CancelScope(shield=True):
+                await self._body.aclose()
+                await self.events.aclose()
+            if self.on_close is not None:
+                self.on_close()
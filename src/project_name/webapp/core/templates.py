@@ -0,0 +1,75 @@
+"""Jinja2 template environment tuning.
+
+``fastapi-tools`` creates ``app.state.templates`` with a default Jinja2
+environment: every template is compiled from source on its first use in each
+worker process, and every render stats the source file to check for changes.
+
+``configure_templates`` adds:
+
+* a ``FileSystemBytecodeCache`` under ``cache_fol``, so compiled templates
+  persist across restarts and are shared by all workers on a node;
+* precompilation of every template at startup, so the first request after a
+  deploy is served from the in-memory template cache;
+* optionally, disabling ``auto_reload`` outside debug mode, which skips the
+  per-render ``stat`` of the template source.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from jinja2 import FileSystemBytecodeCache
+from loguru import logger as lg
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from fastapi.templating import Jinja2Templates
+
+
+def configure_templates(
+    templates: Jinja2Templates,
+    cache_fol: Path,
+    *,
+    auto_reload: bool = True,
+    precompile: bool = True,
+) -> int:
+    """Attach a persistent bytecode cache and precompile all templates.
+
+    Args:
+        templates: The application's template renderer.
+        cache_fol: Folder for the compiled bytecode files.  Created if missing.
+        auto_reload: Whether Jinja2 checks template sources for changes on
+            each render.  Disable in production.
+        precompile: Whether to load every template now.
+
+    Returns:
+        Number of templates precompiled.
+    """
+    env = templates.env
+    cache_fol.mkdir(parents=True, exist_ok=True)
+    env.bytecode_cache = FileSystemBytecodeCache(str(cache_fol))
+    env.auto_reload = auto_reload
+    if not precompile:
+        return 0
+    return precompile_templates(templates)
+
+
+def precompile_templates(templates: Jinja2Templates) -> int:
+    """Load every template so it is compiled and cached before the first request.
+
+    Args:
+        templates: The application's template renderer.
+
+    Returns:
+        Number of templates compiled.
+    """
+    env = templates.env
+    start = time.perf_counter()
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    lg.debug(f"Precompiled {len(names)} templates in {elapsed_ms:.1f} ms")
+    return len(names)
@@ -2,25 +2,65 @@
 
 from fastapi import FastAPI
 from fastapi_tools import create_app
+from loguru import logger as lg
 
-from project_name.params.project_name_params import get_project_name_paths
-from project_name.params.project_name_params import get_webapp_params
+from project_name.params.params_snapshot import ParamsStore
+from project_name.params.params_snapshot import ParamsWatcher
+from project_name.startup_profile import profiler
+from project_name.startup_profile import startup_phase
+from project_name.webapp.api.v1.api_router import router as api_v1_router
+from project_name.webapp.core.assets import install_assets
+from project_name.webapp.core.dependencies import close_query_service
+from project_name.webapp.core.lifespan import add_shutdown_hook
+from project_name.webapp.core.rate_limit import install_rate_limiter
+from project_name.webapp.core.session_store import install_session_store
+from project_name.webapp.core.templates import configure_templates
+from project_name.webapp.routers.assets_router import router as assets_router
 from project_name.webapp.routers.pages_router import router as pages_router
 
 
 def build_app() -> FastAPI:
     """Build the FastAPI application using fastapi-tools.
 
+    With ``PROJECT_NAME_STARTUP_PROFILE`` set, the startup profile report is
+    written once the app is built.  With ``PARAMS_RELOAD_INTERVAL`` set, a
+    ``ParamsWatcher`` reloads the params snapshot when the ``.env`` changes;
+    it is stopped when the app shuts down.
+
     Returns:
         Configured FastAPI application instance.
     """
-    params = get_webapp_params()
-    config = params.to_config()
-    paths = get_project_name_paths()
+    with startup_phase("build_app"):
+        store = ParamsStore()
+        snapshot = store.current
+        params = snapshot.webapp
+        config = snapshot.config
+        paths = snapshot.paths
 
-    return create_app(
-        config=config,
-        extra_routers=[pages_router],
-        static_dir=paths.static_fol,
-        templates_dir=paths.templates_fol,
-    )
+        with startup_phase("create_app"):
+            app = create_app(
+                config=config,
+                extra_routers=[pages_router, api_v1_router, assets_router],
+                static_dir=paths.static_fol,
+                templates_dir=paths.templates_fol,
+            )
+        install_assets(app, paths.static_build_fol)
+        with startup_phase("configure_templates"):
+            configure_templates(
+                app.state.templates,
+                paths.cache_fol / "jinja",
+                auto_reload=params.debug,
+            )
+        install_session_store(app, params)
+        install_rate_limiter(app, params, paths)
+        add_shutdown_hook(app, close_query_service)
+        if params.params_reload_interval > 0:
+            watcher = ParamsWatcher(store, interval=params.params_reload_interval)
+            watcher.start()
+            app.state.params_watcher = watcher
+            add_shutdown_hook(app, watcher.stop)
+    report_fp = profiler.write_report(paths.cache_fol)
+    if report_fp is not None:
+        profiler.uninstall_import_hook()
+        lg.info(f"Startup profile written to {report_fp}")
+    return app
@@ -1,7 +1,22 @@
 """Webapp routers module."""
 
-from project_name.webapp.routers.pages_router import router as pages_router
+from typing import TYPE_CHECKING
+
+from project_name.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from project_name.webapp.routers.assets_router import router as assets_router
+    from project_name.webapp.routers.pages_router import router as pages_router
 
 __all__ = [
+    "assets_router",
     "pages_router",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "assets_router": "project_name.webapp.routers.assets_router:router",
+        "pages_router": "project_name.webapp.routers.pages_router:router",
+    },
+)
@@ -0,0 +1,53 @@
+"""Fingerprinted static asset routes.
+
+Serves the files written by ``build_assets`` under ``/assets/`` with
+immutable caching, picking a prebuilt ``.br`` / ``.gz`` sibling from
+``Accept-Encoding``.
+"""
+
+import mimetypes
+
+from fastapi import APIRouter
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi import status
+from fastapi.responses import FileResponse
+
+from project_name.webapp.core.assets import ASSETS_URL_PREFIX
+from project_name.webapp.core.assets import ENCODING_SUFFIXES
+from project_name.webapp.core.assets import IMMUTABLE_CACHE_CONTROL
+
+router = APIRouter(prefix=ASSETS_URL_PREFIX, tags=["assets"])
+
+
+@router.get("/{asset_path:path}", include_in_schema=False)
+async def asset(request: Request, asset_path: str) -> FileResponse:
+    """Serve a fingerprinted asset in the best prebuilt encoding.
+
+    Args:
+        request: Incoming request.
+        asset_path: Hashed path relative to the build folder.
+
+    Returns:
+        The asset file.
+
+    Raises:
+        HTTPException: 404 if the path is not in the asset manifest.
+    """
+    manifest = getattr(request.app.state, "asset_manifest", None)
+    entry = manifest.resolve(asset_path) if manifest is not None else None
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    coding = entry.choose_encoding(request.headers.get("accept-encoding"))
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    file_name = entry.path
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+        file_name += ENCODING_SUFFIXES[coding]
+    media_type, _ = mimetypes.guess_type(entry.path)
+    return FileResponse(
+        request.app.state.assets_build_fol / file_name,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -11,10 +11,17 @@ from fastapi import Query
 from fastapi import Request
 from fastapi.responses import HTMLResponse
 from fastapi.responses import RedirectResponse
+from fastapi.responses import Response
 from fastapi_tools.dependencies import get_current_user
 from fastapi_tools.dependencies import get_optional_user
 from fastapi_tools.schemas.auth import SessionData
 
+from project_name.webapp.core.dependencies import get_page_cache
+from project_name.webapp.core.dependencies import get_render_cache
+from project_name.webapp.core.page_cache import PageCache
+from project_name.webapp.core.render_cache import RenderCache
+from project_name.webapp.core.render_cache import etag_matches
+
 # Map OAuth error codes to user-friendly messages
 _ERROR_MESSAGES: dict[str, str] = {
     "access_denied": "Access was denied. Please try again.",
@@ -34,13 +41,18 @@ router = APIRouter(tags=["pages"])
 async def landing(
     request: Request,
     user: Annotated[SessionData | None, Depends(get_optional_user)],
+    page_cache: Annotated[PageCache, Depends(get_page_cache)],
     error: Annotated[str | None, Query()] = None,
-) -> HTMLResponse | RedirectResponse:
+) -> Response:
     """Render public landing page or redirect authenticated users.
 
+    The page is only shown to anonymous visitors, so it is served from the
+    precompressed page cache.
+
     Args:
         request: Incoming request.
         user: Current user session, if any.
+        page_cache: Application cache of anonymous pages.
         error: OAuth error code from callback redirect.
 
     Returns:
@@ -56,8 +68,7 @@ async def landing(
             "message": _ERROR_MESSAGES.get(error, f"An error occurred: {error}"),
         }
 
-    templates = request.app.state.templates
-    return templates.TemplateResponse(
+    return page_cache.respond(
         request,
         "pages/landing.html",
         {"user": None, "flash": flash, "active_page": "landing"},
@@ -88,32 +99,57 @@ async def dashboard(
 
 @router.get(
     "/pages/partials/user-card",
+    response_model=None,
     response_class=HTMLResponse,
     include_in_schema=False,
 )
 async def user_card_partial(
     request: Request,
     user: Annotated[SessionData, Depends(get_current_user)],
-) -> HTMLResponse:
+    render_cache: Annotated[RenderCache, Depends(get_render_cache)],
+) -> HTMLResponse | Response:
     """Return user card HTML fragment for HTMX swap.
 
+    The fragment depends only on the user profile, so it is served from the
+    render cache.  A request whose ``If-None-Match`` matches the fragment
+    ETag gets an empty ``304 Not Modified``.
+
     Args:
         request: Incoming request.
         user: Authenticated user session.
+        render_cache: Process-wide fragment cache.
 
     Returns:
-        User card partial HTML (no base layout).
+        User card partial HTML (no base layout), or 304 if unchanged.
     """
-    templates = request.app.state.templates
-    return templates.TemplateResponse(
-        request,
+    context = {
+        "user": {
+            "id": user.user_id,
+            "email": user.email,
+            "name": user.name,
+            "picture": user.picture,
+        },
+    }
+    fragment = render_cache.render(
+        request.app.state.templates,
         "partials/user_card.html",
-        {"user": user},
+        context,
+        owner=user.user_id,
     )
+    headers = {
+        "ETag": fragment.etag,
+        # The card is per user: only the browser may keep it, and must revalidate
+        "Cache-Control": "private, no-cache",
+        "Vary": "Cookie",
+    }
+    if etag_matches(request.headers.get("if-none-match"), fragment.etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(fragment.html, headers=headers)
 
 
 @router.get(
     "/error/{status_code}",
+    response_model=None,
     response_class=HTMLResponse,
     include_in_schema=False,
 )
@@ -121,13 +157,17 @@ async def error_page(
     request: Request,
     status_code: int,
     user: Annotated[SessionData | None, Depends(get_optional_user)],
-) -> HTMLResponse:
+    page_cache: Annotated[PageCache, Depends(get_page_cache)],
+) -> Response:
     """Render a generic error page.
 
+    Anonymous visitors are served from the precompressed page cache.
+
     Args:
         request: Incoming request.
         status_code: HTTP status code to display.
         user: Current user session, if any.
+        page_cache: Application cache of anonymous pages.
 
     Returns:
         Error page HTML.
@@ -141,6 +181,14 @@ async def error_page(
     }
     message = messages.get(status_code, "An unexpected error occurred.")
 
+    if user is None:
+        return page_cache.respond(
+            request,
+            "pages/error.html",
+            {"user": None, "status_code": status_code, "message": message},
+            status_code=status_code,
+        )
+
     templates = request.app.state.templates
     return templates.TemplateResponse(
         request,
@@ -1,27 +1,121 @@
 """User service for user management.
 
-Placeholder for future user persistence and management.
+Users are kept in a pluggable ``UserStore`` backend.  The in-memory store is
+the default; pass a ``SqliteUserStore`` for persistence across restarts.
+
+Repeat logins with an unchanged Google profile are coalesced: the store
+compares the profile fields with the stored user without building a model
+(``UserStore.matches``), and the service returns the stored user without
+writing it when they match.  The store is asked on every login, so a profile
+another process wrote is seen.
+
+Bulk import and export stream users as NDJSON (one JSON object per line)
+through generators, so memory stays bounded regardless of the user count.
+
+Other components can subscribe to user writes with ``add_update_listener``;
+listeners receive the id of every user that is created, changed, imported
+or deleted, e.g. to invalidate cached renders of that user.
 """
 
+import asyncio
+from collections.abc import AsyncIterable
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import batched
+import threading
+
 from fastapi_tools.schemas.auth import GoogleUserInfo
 from fastapi_tools.schemas.auth import UserResponse
 from loguru import logger as lg
+from pydantic import ValidationError
+
+from project_name.webapp.services.user_store import InMemoryUserStore
+from project_name.webapp.services.user_store import UserStore
+
+# Users written to the store per batch by ``import_users`` and
+# ``aimport_ndjson``
+IMPORT_BATCH_SIZE = 1000
+
+
+class UserImportError(ValueError):
+    """Raised when an imported NDJSON line is not a valid user.
+
+    Args:
+        imported (int): the number of users written before the invalid line
+        error (ValidationError): the validation error of the line
+    """
+
+    def __init__(self, imported: int, error: ValidationError) -> None:
+        """Initialize with the users written so far and the line error.
+
+        Args:
+            imported: The number of users written before the invalid line
+            error: The validation error of the line
+        """
+        self.imported = imported
+        message = f"Invalid user line after {imported} imported users: {error}"
+        super().__init__(message)
+
+
+@dataclass
+class UserWriteStats:
+    """Counters for write coalescing in ``get_or_create_user``.
+
+    Attributes:
+        hits:
+            Logins whose profile was unchanged, so the write was skipped.
+        misses:
+            Logins that created a user or wrote a changed profile.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def record(self, *, hit: bool) -> None:
+        """Count a login, safely from the worker threads of ``to_thread``."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
 
 
 class UserService:
     """Service for user management.
 
-    Currently a placeholder - users are stored only in session.
-    Extend this for persistent user storage with a database.
+    Args:
+        store: Storage backend.  Defaults to a new ``InMemoryUserStore``.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, store: UserStore | None = None) -> None:
         """Initialize user service.
 
-        In a real implementation, this would accept a database session.
+        Args:
+            store: Storage backend.  Defaults to a new ``InMemoryUserStore``.
+        """
+        self._store: UserStore = store if store is not None else InMemoryUserStore()
+        self.stats = UserWriteStats()
+        self._listeners: list[Callable[[str], object]] = []
+
+    def add_update_listener(self, listener: Callable[[str], object]) -> None:
+        """Register a callback invoked with the user id after each user write.
+
+        Args:
+            listener: Called with the id of a created, changed, imported or
+                deleted user.
         """
-        # In-memory user store (placeholder for database)
-        self._users: dict[str, UserResponse] = {}
+        self._listeners.append(listener)
+
+    def _notify(self, user_id: str) -> None:
+        """Tell the update listeners that a user changed."""
+        for listener in self._listeners:
+            listener(user_id)
 
     def get_or_create_user(self, google_user_info: GoogleUserInfo) -> UserResponse:
         """Get existing user or create new one from Google info.
@@ -33,26 +127,48 @@ class UserService:
             UserResponse for the user.
         """
         user_id = google_user_info.sub
+        unchanged = self._store.matches(
+            user_id,
+            google_user_info.email,
+            google_user_info.name,
+            google_user_info.picture,
+        )
+        if unchanged:
+            existing = self._store.get(user_id)
+            # None only if another process deleted the user in between
+            if existing is not None:
+                self.stats.record(hit=True)
+                return existing
+        lg.debug(f"Writing user profile: {google_user_info.email}")
+
+        # Update user info from Google (may have changed)
+        self.stats.record(hit=False)
+        user = UserResponse(
+            id=user_id,
+            email=google_user_info.email,
+            name=google_user_info.name,
+            picture=google_user_info.picture,
+        )
+        self._store.put(user)
+        self._notify(user_id)
+        return user
+
+    async def aget_or_create_user(
+        self,
+        google_user_info: GoogleUserInfo,
+    ) -> UserResponse:
+        """Async variant of ``get_or_create_user``.
+
+        Runs the store access in a worker thread so blocking backends such as
+        ``SqliteUserStore`` never stall the event loop.
 
-        if user_id in self._users:
-            lg.debug(f"Found existing user: {google_user_info.email}")
-            # Update user info from Google (may have changed)
-            self._users[user_id] = UserResponse(
-                id=user_id,
-                email=google_user_info.email,
-                name=google_user_info.name,
-                picture=google_user_info.picture,
-            )
-        else:
-            lg.info(f"Creating new user: {google_user_info.email}")
-            self._users[user_id] = UserResponse(
-                id=user_id,
-                email=google_user_info.email,
-                name=google_user_info.name,
-                picture=google_user_info.picture,
-            )
-
-        return self._users[user_id]
+        Args:
+            google_user_info: User info from Google OAuth.
+
+        Returns:
+            UserResponse for the user.
+        """
+        return await asyncio.to_thread(self.get_or_create_user, google_user_info)
 
     def get_user_by_id(self, user_id: str) -> UserResponse | None:
         """Get user by ID.
@@ -63,7 +179,7 @@ class UserService:
         Returns:
             UserResponse if found, None otherwise.
         """
-        return self._users.get(user_id)
+        return self._store.get(user_id)
 
     def get_user_by_email(self, email: str) -> UserResponse | None:
         """Get user by email.
@@ -74,10 +190,90 @@ class UserService:
         Returns:
             UserResponse if found, None otherwise.
         """
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        return self._store.get_by_email(email)
+
+    def export_users(self) -> Iterator[UserResponse]:
+        """Lazily yield every stored user.
+
+        Returns:
+            Iterator over all users in the store.
+        """
+        return self._store.iter_users()
+
+    def export_ndjson(self) -> Iterator[bytes]:
+        """Yield every stored user as one NDJSON line.
+
+        Returns:
+            Iterator of UTF-8 encoded JSON lines, each ending with a newline.
+        """
+        for user in self._store.iter_users():
+            yield user.model_dump_json().encode() + b"\n"
+
+    def import_users(self, users: Iterable[UserResponse]) -> int:
+        """Insert or replace many users in one streaming pass.
+
+        Users are written in batches of ``IMPORT_BATCH_SIZE``; the update
+        listeners hear of a batch once it is stored.
+
+        Args:
+            users: Users to write.  Consumed lazily.
+
+        Returns:
+            Number of users written.
+        """
+        count = 0
+        for batch in batched(users, IMPORT_BATCH_SIZE, strict=False):
+            count += self._store.put_many(batch)
+            for user in batch:
+                self._notify(user.id)
+        lg.info(f"Imported {count} users")
+        return count
+
+    def import_ndjson(self, lines: Iterable[bytes | str]) -> int:
+        """Import users from NDJSON lines, skipping blank lines.
+
+        Args:
+            lines: JSON documents, one user per line.  Consumed lazily.
+
+        Returns:
+            Number of users written.
+
+        Raises:
+            pydantic.ValidationError: If a line is not a valid user.
+        """
+        return self.import_users(
+            UserResponse.model_validate_json(line) for line in lines if line.strip()
+        )
+
+    async def aimport_ndjson(self, lines: AsyncIterable[bytes | str]) -> int:
+        """Import users from a stream of NDJSON lines, e.g. a request body.
+
+        Lines are collected in batches of ``IMPORT_BATCH_SIZE``, each written
+        by ``import_ndjson`` on a worker thread.  Batches written before an
+        invalid line are kept.
+
+        Args:
+            lines: JSON documents, one user per line.
+
+        Returns:
+            Number of users written.
+
+        Raises:
+            UserImportError: If a line is not a valid user.
+        """
+        count = 0
+        batch: list[bytes | str] = []
+        try:
+            async for line in lines:
+                batch.append(line)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    count += await asyncio.to_thread(self.import_ndjson, batch)
+                    batch = []
+            if batch:
+                count += await asyncio.to_thread(self.import_ndjson, batch)
+        except ValidationError as exc:
+            raise UserImportError(count, exc) from exc
+        return count
 
     def delete_user(self, user_id: str) -> bool:
         """Delete a user.
@@ -88,8 +284,8 @@ class UserService:
         Returns:
             True if deleted, False if not found.
         """
-        if user_id in self._users:
-            del self._users[user_id]
+        if self._store.delete(user_id):
+            self._notify(user_id)
             lg.info(f"Deleted user {user_id}")
             return True
         return False
@@ -0,0 +1,329 @@
+"""Storage backends for ``UserService``.
+
+``UserService`` talks to its storage through the ``UserStore`` protocol so
+that the backend can be swapped without touching the service logic.
+
+Two implementations are provided:
+
+* ``InMemoryUserStore`` - the default.  A plain dict of compact
+  ``UserRecord`` objects keyed by user id plus a secondary ``email -> id``
+  index, so both lookups are O(1).
+* ``SqliteUserStore`` - persistent storage in a single SQLite file.  Users
+  survive process restarts, the ``email`` column is indexed, connections are
+  pooled and bulk writes are batched into a single upsert per chunk.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from queue import Empty
+from queue import Full
+from queue import Queue
+import sqlite3
+from typing import TYPE_CHECKING
+from typing import Protocol
+
+from fastapi_tools.schemas.auth import UserResponse
+from loguru import logger as lg
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class UserStore(Protocol):
+    """Storage protocol used by ``UserService``."""
+
+    def get(self, user_id: str) -> UserResponse | None:
+        """Return the user with the given id, or None."""
+        ...
+
+    def get_by_email(self, email: str) -> UserResponse | None:
+        """Return the user with the given email, or None."""
+        ...
+
+    def matches(self, user_id: str, email: str, name: str, picture: str | None) -> bool:
+        """Return whether the user is stored with exactly this profile."""
+        ...
+
+    def put(self, user: UserResponse) -> None:
+        """Insert or replace a user."""
+        ...
+
+    def put_many(self, users: Iterable[UserResponse]) -> int:
+        """Insert or replace many users, returning how many were written."""
+        ...
+
+    def delete(self, user_id: str) -> bool:
+        """Delete a user, returning True if it existed."""
+        ...
+
+    def iter_users(self) -> Iterator[UserResponse]:
+        """Lazily yield every stored user."""
+        ...
+
+    def __len__(self) -> int:
+        """Return the number of stored users."""
+        ...
+
+
+@dataclass(slots=True)
+class UserRecord:
+    """Compact internal user record used by ``InMemoryUserStore``.
+
+    A slotted dataclass takes a fraction of the memory of a Pydantic
+    ``UserResponse``.  Records are converted to ``UserResponse`` only when a
+    user leaves the store, and every caller gets a response of its own.
+    """
+
+    id: str
+    email: str
+    name: str
+    picture: str | None
+
+    @classmethod
+    def from_response(cls, user: UserResponse) -> UserRecord:
+        """Build a record from a validated ``UserResponse``."""
+        return cls(user.id, user.email, user.name, user.picture)
+
+    def to_response(self) -> UserResponse:
+        """Return the record as a new ``UserResponse``.
+
+        Uses ``model_construct`` since the values were validated on the way in.
+        """
+        return UserResponse.model_construct(
+            id=self.id,
+            email=self.email,
+            name=self.name,
+            picture=self.picture,
+        )
+
+    def matches(self, email: str, name: str, picture: str | None) -> bool:
+        """Return whether the record holds exactly this profile."""
+        return self.email == email and self.name == name and self.picture == picture
+
+
+class InMemoryUserStore:
+    """Dict-backed user store with a secondary email index.
+
+    Users are held as compact ``UserRecord`` objects.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty primary and email indexes."""
+        self._users: dict[str, UserRecord] = {}
+        self._email_index: dict[str, str] = {}
+
+    def get(self, user_id: str) -> UserResponse | None:
+        """Return the user with the given id, or None."""
+        record = self._users.get(user_id)
+        return record.to_response() if record is not None else None
+
+    def get_by_email(self, email: str) -> UserResponse | None:
+        """Return the user with the given email, or None."""
+        user_id = self._email_index.get(email)
+        if user_id is None:
+            return None
+        return self.get(user_id)
+
+    def matches(self, user_id: str, email: str, name: str, picture: str | None) -> bool:
+        """Return whether the user is stored with exactly this profile."""
+        record = self._users.get(user_id)
+        return record is not None and record.matches(email, name, picture)
+
+    def put(self, user: UserResponse) -> None:
+        """Insert or replace a user, keeping the email index in sync."""
+        old = self._users.get(user.id)
+        if old is not None and old.email != user.email:
+            self._email_index.pop(old.email, None)
+        record = UserRecord.from_response(user)
+        self._users[record.id] = record
+        self._email_index[record.email] = record.id
+
+    def put_many(self, users: Iterable[UserResponse]) -> int:
+        """Insert or replace many users."""
+        count = 0
+        for user in users:
+            self.put(user)
+            count += 1
+        return count
+
+    def delete(self, user_id: str) -> bool:
+        """Delete a user, returning True if it existed."""
+        record = self._users.pop(user_id, None)
+        if record is None:
+            return False
+        if self._email_index.get(record.email) == user_id:
+            del self._email_index[record.email]
+        return True
+
+    def iter_users(self) -> Iterator[UserResponse]:
+        """Lazily yield every stored user.
+
+        Iterates over a snapshot of the ids so concurrent writes do not break
+        the iteration; users deleted meanwhile are skipped.
+        """
+        for user_id in list(self._users):
+            record = self._users.get(user_id)
+            if record is not None:
+                yield record.to_response()
+
+    def __len__(self) -> int:
+        """Return the number of stored users."""
+        return len(self._users)
+
+
+class SqliteUserStore:
+    """Persistent user store backed by a SQLite database file.
+
+    The database runs in WAL mode so readers never block the writer.
+    Connections are kept in a small pool and handed out per call, which
+    makes the store safe to use from ``asyncio.to_thread`` workers.
+
+    The email index is not unique on purpose: users are keyed by their Google
+    account id, and Google lets an address move to another account, so two
+    stored users can share an email until the older one logs in again.
+    ``get_by_email`` then returns one of them.
+
+    Args:
+        db_fp: Path to the SQLite database file.  Parent folders are created.
+        pool_size: Maximum number of idle connections kept open.
+        batch_size: Number of rows written per ``executemany`` in ``put_many``.
+    """
+
+    _SCHEMA = (
+        (
+            "CREATE TABLE IF NOT EXISTS users ("
+            " id TEXT PRIMARY KEY,"
+            " email TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " picture TEXT"
+            ")"
+        ),
+        "CREATE INDEX IF NOT EXISTS users_email_idx ON users (email)",
+    )
+    _UPSERT = (
+        "INSERT INTO users (id, email, name, picture) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET "
+        "email = excluded.email, name = excluded.name, picture = excluded.picture"
+    )
+    _SELECT = "SELECT id, email, name, picture FROM users"
+
+    def __init__(
+        self,
+        db_fp: Path,
+        pool_size: int = 4,
+        batch_size: int = 1000,
+    ) -> None:
+        """Open the database and create the schema if needed."""
+        self.db_fp = db_fp
+        self.batch_size = batch_size
+        self._pool: Queue[sqlite3.Connection] = Queue(maxsize=pool_size)
+        self.db_fp.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+        lg.debug(f"Opened SQLite user store at {self.db_fp}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection to the database."""
+        conn = sqlite3.connect(self.db_fp, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection, committing on success."""
+        try:
+            conn = self._pool.get_nowait()
+        except Empty:
+            conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except Full:
+                conn.close()
+
+    @staticmethod
+    def _row_to_user(
+        row: tuple[str, str, str, str | None] | None,
+    ) -> UserResponse | None:
+        """Convert a database row to a ``UserResponse``."""
+        if row is None:
+            return None
+        user_id, email, name, picture = row
+        return UserResponse(id=user_id, email=email, name=name, picture=picture)
+
+    def get(self, user_id: str) -> UserResponse | None:
+        """Return the user with the given id, or None."""
+        with self._connection() as conn:
+            row = conn.execute(f"{self._SELECT} WHERE id = ?", (user_id,)).fetchone()
+        return self._row_to_user(row)
+
+    def get_by_email(self, email: str) -> UserResponse | None:
+        """Return the user with the given email, or None."""
+        with self._connection() as conn:
+            row = conn.execute(f"{self._SELECT} WHERE email = ?", (email,)).fetchone()
+        return self._row_to_user(row)
+
+    def matches(self, user_id: str, email: str, name: str, picture: str | None) -> bool:
+        """Return whether the user is stored with exactly this profile."""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM users"
+                " WHERE id = ? AND email = ? AND name = ? AND picture IS ?",
+                (user_id, email, name, picture),
+            ).fetchone()
+        return row is not None
+
+    def put(self, user: UserResponse) -> None:
+        """Insert or replace a user."""
+        with self._connection() as conn:
+            conn.execute(self._UPSERT, (user.id, user.email, user.name, user.picture))
+
+    def put_many(self, users: Iterable[UserResponse]) -> int:
+        """Upsert many users, one transaction per ``batch_size`` rows."""
+        rows = ((u.id, u.email, u.name, u.picture) for u in users)
+        count = 0
+        while batch := list(islice(rows, self.batch_size)):
+            with self._connection() as conn:
+                conn.executemany(self._UPSERT, batch)
+            count += len(batch)
+        return count
+
+    def delete(self, user_id: str) -> bool:
+        """Delete a user, returning True if it existed."""
+        with self._connection() as conn:
+            cursor = conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+        return cursor.rowcount > 0
+
+    def iter_users(self) -> Iterator[UserResponse]:
+        """Lazily yield every stored user, fetching ``batch_size`` rows at a time."""
+        with self._connection() as conn:
+            cursor = conn.execute(f"{self._SELECT} ORDER BY id")
+            while rows := cursor.fetchmany(self.batch_size):
+                for row in rows:
+                    user = self._row_to_user(row)
+                    if user is not None:
+                        yield user
+
+    def __len__(self) -> int:
+        """Return the number of stored users."""
+        with self._connection() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        return count
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
@@ -8,6 +8,7 @@ import pytest
 from project_name.params.env_type import EnvLocationType
 from project_name.params.env_type import EnvStageType
 from project_name.params.webapp import WebappParams
+from project_name.params.webapp.webapp_params import CONFIG_FIELDS
 
 
 @pytest.fixture
@@ -21,6 +22,10 @@ def clean_env() -> Generator[None]:
         "GOOGLE_CLIENT_ID",
         "GOOGLE_CLIENT_SECRET",
         "CORS_ALLOWED_ORIGINS",
+        "SESSION_BACKEND",
+        "SESSION_REDIS_URL",
+        "RATE_LIMIT_BACKEND",
+        "RATE_LIMIT_REDIS_URL",
     ]
     original = {k: os.environ.get(k) for k in webapp_vars}
 
@@ -82,6 +87,40 @@ def test_webapp_params_cors_from_env(clean_env: None) -> None:
     assert "https://example.com" in params.cors_allowed_origins
 
 
+def test_webapp_params_session_backend(clean_env: None) -> None:
+    """Test session backend defaults to memory and can select Redis."""
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    assert params.session_backend == "memory"
+
+    os.environ["SESSION_BACKEND"] = "redis"
+    os.environ["SESSION_REDIS_URL"] = "redis://cache:6379/1"
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    assert params.session_backend == "redis"
+    assert params.session_redis_url == "redis://cache:6379/1"
+
+
+def test_webapp_params_rate_limit_backend(clean_env: None) -> None:
+    """Test rate limit backend defaults to local and can select shared memory."""
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    assert params.rate_limit_backend == "local"
+
+    os.environ["RATE_LIMIT_BACKEND"] = "shm"
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    assert params.rate_limit_backend == "shm"
+
+
 def test_webapp_params_prod_requires_secrets(clean_env: None) -> None:
     """Test WebappParams raises error in prod without required secrets."""
     with pytest.raises(ValueError, match="SESSION_SECRET_KEY"):
@@ -149,3 +188,61 @@ def test_webapp_params_str(clean_env: None) -> None:
     assert "WebappParams" in s
     assert "dev" in s
     assert "local" in s
+
+
+def test_webapp_params_to_config_cached(clean_env: None) -> None:
+    """Test to_config() is cached until a public attribute changes."""
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+
+    config = params.to_config()
+    assert params.to_config() is config
+
+    params.app_name = "Renamed"
+    renamed = params.to_config()
+    assert renamed is not config
+    assert renamed.app_name == "Renamed"
+    assert params.to_config() is renamed
+
+
+def test_webapp_params_to_config_fast_path(clean_env: None) -> None:
+    """Test the unvalidated update path matches a validated rebuild."""
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    validated = params.to_config()
+
+    params.port = 9000
+    params.session_max_age = 60
+    params.cors_allowed_origins = ["https://example.com"]
+    updated = params.to_config(validate=False)
+    assert updated is not validated
+    assert updated.rate_limit is validated.rate_limit
+    assert updated.cors.allow_origins is not params.cors_allowed_origins
+    assert params.to_config(validate=False) is updated
+
+    # A validated call rebuilds an unvalidated config, then is reused by both
+    revalidated = params.to_config()
+    assert revalidated is not updated
+    assert revalidated.model_dump() == updated.model_dump()
+    assert params.to_config(validate=False) is revalidated
+
+
+def test_webapp_params_config_fields(clean_env: None) -> None:
+    """Test CONFIG_FIELDS maps every attribute to the config field it feeds."""
+    params = WebappParams(
+        stage=EnvStageType.DEV,
+        location=EnvLocationType.LOCAL,
+    )
+    config = params.to_config()
+
+    for name, (section, field) in CONFIG_FIELDS.items():
+        holder = config if section is None else getattr(config, section)
+        assert getattr(holder, field) == getattr(params, name), name
+
+    # Attributes that do not feed the config keep it cached
+    params.session_backend = "redis"
+    assert params.to_config() is config
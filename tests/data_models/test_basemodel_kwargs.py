@@ -1,5 +1,9 @@
 """Test the BaseModelKwargs data model."""
 
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+
 from project_name.data_models.basemodel_kwargs import BaseModelKwargs
 
 
@@ -51,3 +55,117 @@ def test_to_kw_kwargs_not_dict() -> None:
 
     model = ModelForTestBadKwargs(a=1, kwargs=5)
     assert model.to_kw() == {"a": 1, "kwargs": 5}
+
+
+class InnerForTest(BaseModelKwargs):
+    """Nested model for recursive to_kw."""
+
+    x: int
+    y: str | None = None
+    kwargs: dict | None = None
+
+
+class PlainInnerForTest(BaseModel):
+    """Nested model not deriving from BaseModelKwargs."""
+
+    z: int
+
+
+class OuterForTest(BaseModelKwargs):
+    """Model holding nested models directly and in containers."""
+
+    inner: InnerForTest
+    items: list[InnerForTest] = Field(default_factory=list)
+    plain: PlainInnerForTest | None = None
+    kwargs: dict | None = None
+
+
+class FrozenForTest(BaseModelKwargs):
+    """Frozen model, whose to_kw result is memoized."""
+
+    model_config = ConfigDict(frozen=True)
+
+    a: int
+    b: str | None = None
+    kwargs: dict | None = None
+
+
+def test_to_kw_extra_fields() -> None:
+    """Test extra fields are included, as when iterating the model."""
+
+    class ModelForTestExtra(BaseModelKwargs):
+        model_config = ConfigDict(extra="allow")
+
+        a: int
+
+    model = ModelForTestExtra(a=1, c=3)  # type: ignore[call-arg]
+    assert model.to_kw() == {"a": 1, "c": 3}
+
+
+def test_to_kw_recursive() -> None:
+    """Test recursive mode converts nested models in a single call."""
+    model = OuterForTest(
+        inner=InnerForTest(x=1, kwargs={"k": 2}),
+        items=[InnerForTest(x=3, y="y")],
+        plain=PlainInnerForTest(z=4),
+        kwargs={"extra": InnerForTest(x=5)},
+    )
+
+    assert model.to_kw()["inner"] is model.inner
+    assert model.to_kw(recursive=True) == {
+        "inner": {"x": 1, "y": None, "k": 2},
+        "items": [{"x": 3, "y": "y", "kwargs": None}],
+        "plain": {"z": 4},
+        "extra": {"x": 5, "y": None, "kwargs": None},
+    }
+    assert model.to_kw(recursive=True, exclude_none=True) == {
+        "inner": {"x": 1, "k": 2},
+        "items": [{"x": 3, "y": "y"}],
+        "plain": {"z": 4},
+        "extra": {"x": 5},
+    }
+
+
+def test_to_kw_frozen_memoized() -> None:
+    """Test frozen models return a fresh copy of a memoized result."""
+    model = FrozenForTest(a=1, b="b")
+
+    first = model.to_kw()
+    assert first == {"a": 1, "b": "b", "kwargs": None}
+    first["a"] = 99
+    assert model.to_kw() == {"a": 1, "b": "b", "kwargs": None}
+    assert model.to_kw() is not model.to_kw()
+    assert model.to_kw(exclude_none=True) == {"a": 1, "b": "b"}
+
+    # A copy with updated fields gets its own result
+    copy = model.model_copy(update={"a": 2})
+    assert copy.to_kw() == {"a": 2, "b": "b", "kwargs": None}
+
+
+class FrozenOuterForTest(BaseModelKwargs):
+    """Frozen model holding a nested model."""
+
+    model_config = ConfigDict(frozen=True)
+
+    inner: InnerForTest | FrozenForTest
+    kwargs: dict | None = None
+
+
+def test_to_kw_frozen_follows_mutable_values() -> None:
+    """Test frozen models holding mutable values are not memoized."""
+    model = FrozenForTest(a=1, kwargs={"c": None})
+    assert model.to_kw() == {"a": 1, "b": None, "c": None}
+    model.kwargs["c"] = 3  # type: ignore[index]
+    assert model.to_kw() == {"a": 1, "b": None, "c": 3}
+
+    outer = FrozenOuterForTest(inner=InnerForTest(x=1))
+    assert outer.to_kw(recursive=True)["inner"] == {"x": 1, "y": None, "kwargs": None}
+    outer.inner.x = 2
+    assert outer.to_kw(recursive=True)["inner"] == {"x": 2, "y": None, "kwargs": None}
+
+
+def test_to_kw_frozen_recursive_not_shared() -> None:
+    """Test nested dicts of a recursive result are never shared between calls."""
+    outer = FrozenOuterForTest(inner=FrozenForTest(a=1))
+    outer.to_kw(recursive=True)["inner"]["a"] = 99
+    assert outer.to_kw(recursive=True)["inner"] == {"a": 1, "b": None, "kwargs": None}
@@ -0,0 +1,205 @@
+"""Tests for the rename_project script."""
+
+import json
+import os
+from pathlib import Path
+import stat
+
+import pytest
+import typer
+
+from meta import rename_project
+from meta.rename_project import MANIFEST_NAME
+from meta.rename_project import NameReplacer
+from meta.rename_project import Rename
+from meta.rename_project import diff_file
+from meta.rename_project import replace_in_str
+from meta.rename_project import sync_file
+
+NAME_MAP = {
+    "project_name": "my_app",
+    "PROJECT_NAME": "MY_APP",
+    "ProjectName": "MyApp",
+    "python-project-template": "my-app",
+}
+
+
+@pytest.fixture
+def rename(tmp_path: Path) -> Rename:
+    """Rename from a small template tree in tmp_path/template."""
+    old_root = tmp_path / "template"
+    files = {
+        "src/project_name/__init__.py": '"""project_name package."""\n',
+        "src/project_name/params.py": "class ProjectNameParams:\n    pass\n",
+        "README.md": "template readme, not copied\n",
+        "tests/meta/test_rename.py": "not copied\n",
+        "docs/notes.md": "nothing to replace\n",
+    }
+    for rel, content in files.items():
+        fp = old_root / rel
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        fp.write_text(content)
+    (old_root / "static").mkdir()
+    (old_root / "static/logo.png").write_bytes(b"\x89PNG\x00project_name")
+
+    rename = Rename("my_app", None, None)
+    rename.old_root_fol = old_root
+    rename.new_root_fol = tmp_path / "my-app"
+    return rename
+
+
+def test_replace_single_pass() -> None:
+    """Test replaced text is not replaced again and longer keys win."""
+    assert replace_in_str("ab", {"a": "b", "b": "c"}) == "bc"
+    assert replace_in_str("project_names", {"project_name": "x", "p": "y"}) == "xs"
+    replacer = NameReplacer(NAME_MAP)
+    text = "project_name PROJECT_NAME ProjectName python-project-template"
+    assert replacer.replace_str(text) == "my_app MY_APP MyApp my-app"
+    assert replacer.replace_bytes(text.encode()) == b"my_app MY_APP MyApp my-app"
+
+
+def test_sync_file(tmp_path: Path) -> None:
+    """Test text files are rewritten, binary files copied, modes kept."""
+    replacer = NameReplacer(NAME_MAP)
+    script = tmp_path / "run.sh"
+    script.write_text("echo project_name\n")
+    script.chmod(0o755)
+    binary = tmp_path / "data.bin"
+    binary.write_bytes(b"\x00project_name")
+    plain = tmp_path / "plain.txt"
+    plain.write_text("nothing\n")
+
+    out = tmp_path / "out"
+    assert sync_file(script, out / "run.sh", replacer) == "rewritten"
+    assert (out / "run.sh").read_text() == "echo my_app\n"
+    assert (out / "run.sh").stat().st_mode & stat.S_IXUSR
+    assert sync_file(binary, out / "data.bin", replacer) == "binary"
+    assert (out / "data.bin").read_bytes() == b"\x00project_name"
+    assert sync_file(plain, out / "plain.txt", replacer) == "copied"
+
+
+def test_sync_large_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test files over the mmap threshold are streamed with the same result."""
+    monkeypatch.setattr(rename_project, "MMAP_THRESHOLD", 16)
+    replacer = NameReplacer(NAME_MAP)
+    src = tmp_path / "big.txt"
+    src.write_text("ProjectName\n" * 100 + "tail project_name")
+    plain = tmp_path / "plain.txt"
+    plain.write_text("x" * 100)
+
+    assert sync_file(src, tmp_path / "big_out.txt", replacer) == "rewritten"
+    expected = "MyApp\n" * 100 + "tail my_app"
+    assert (tmp_path / "big_out.txt").read_text() == expected
+    assert sync_file(plain, tmp_path / "plain_out.txt", replacer) == "copied"
+
+
+def test_diff_file(tmp_path: Path) -> None:
+    """Test the dry-run diff of a file."""
+    replacer = NameReplacer(NAME_MAP)
+    fp = tmp_path / "a.py"
+    fp.write_text("import project_name\nx = 1")
+
+    diff = diff_file(fp, "project_name/a.py", "my_app/a.py", replacer)
+    assert diff.startswith("--- a/project_name/a.py\n+++ b/my_app/a.py\n")
+    assert "-import project_name\n+import my_app\n" in diff
+    assert diff.endswith("x = 1\n\\ No newline at end of file\n")
+
+    fp.write_text("x = 1\n")
+    assert diff_file(fp, "a.py", "a.py", replacer) == ""
+    assert diff_file(fp, "a.py", "b.py", replacer) == "Renamed a.py to b.py\n"
+
+
+def test_copy_files(rename: Rename) -> None:
+    """Test the fused copy renames paths and rewrites contents in one pass."""
+    actions = rename.copy_files(workers=2)
+
+    new_root = rename.new_root_fol
+    assert actions == {"rewritten": 2, "copied": 1, "binary": 1}
+    assert (new_root / "src/my_app/__init__.py").read_text() == (
+        '"""my_app package."""\n'
+    )
+    assert (new_root / "src/my_app/params.py").read_text().startswith("class MyApp")
+    assert (new_root / "static/logo.png").read_bytes() == b"\x89PNG\x00project_name"
+    assert not (new_root / "README.md").exists()
+    assert not (new_root / "tests/meta").exists()
+
+
+def test_diff_files_writes_nothing(
+    rename: Rename, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test the dry run streams diffs and leaves the new root absent."""
+    n_changed = rename.diff_files(workers=2)
+
+    out = capsys.readouterr().out
+    assert n_changed == 3
+    assert "+++ b/src/my_app/params.py\n" in out
+    assert "+class MyAppParams:\n" in out
+    assert "Binary file static/logo.png copied to static/logo.png\n" in out
+    assert not rename.new_root_fol.exists()
+
+
+def test_copy_files_writes_manifest(rename: Rename) -> None:
+    """Test the full copy records every file in the manifest."""
+    rename.copy_files(workers=2)
+
+    raw = json.loads((rename.new_root_fol / MANIFEST_NAME).read_text())
+    assert raw["name_map"] == rename.name_map
+    assert sorted(raw["files"]) == [
+        "docs/notes.md",
+        "src/my_app/__init__.py",
+        "src/my_app/params.py",
+        "static/logo.png",
+    ]
+    assert raw["files"]["src/my_app/params.py"]["source"] == (
+        "src/project_name/params.py"
+    )
+
+
+def test_sync_files(rename: Rename) -> None:
+    """Test sync copies changed sources only and reports local edits."""
+    rename.copy_files(workers=2)
+    old_root, new_root = rename.old_root_fol, rename.new_root_fol
+
+    assert rename.sync_files(workers=2) == {"unchanged": 4}
+
+    # Changed upstream only: updated
+    (old_root / "docs/notes.md").write_text("project_name notes\n")
+    # Changed upstream and edited locally: conflict, local edit kept
+    (old_root / "src/project_name/params.py").write_text("x = 1\n")
+    (new_root / "src/my_app/params.py").write_text("local edit\n")
+    # Touched upstream without a change: unchanged
+    init_fp = old_root / "src/project_name/__init__.py"
+    os.utime(init_fp, ns=(0, 1))
+    # Added and removed upstream
+    (old_root / "src/project_name/new.py").write_text("import project_name\n")
+    (old_root / "static/logo.png").unlink()
+
+    statuses = rename.sync_files(workers=2)
+
+    assert statuses == {
+        "updated": 1,
+        "conflict": 1,
+        "unchanged": 1,
+        "added": 1,
+        "removed": 1,
+    }
+    assert (new_root / "docs/notes.md").read_text() == "my_app notes\n"
+    assert (new_root / "src/my_app/params.py").read_text() == "local edit\n"
+    assert (new_root / "src/my_app/new.py").read_text() == "import my_app\n"
+
+    # The conflict is reported again until forced
+    assert rename.sync_files(workers=2)["conflict"] == 1
+    assert rename.sync_files(workers=2, force=True)["updated"] == 1
+    assert (new_root / "src/my_app/params.py").read_text() == "x = 1\n"
+    assert rename.sync_files(workers=2) == {"unchanged": 4}
+
+
+def test_sync_files_requires_manifest(rename: Rename) -> None:
+    """Test sync refuses to run without a manifest or with other names."""
+    with pytest.raises(typer.Exit):
+        rename.sync_files()
+
+    rename.copy_files()
+    rename.name_map = {**rename.name_map, "project_name": "other_app"}
+    with pytest.raises(typer.Exit):
+        rename.sync_files()
@@ -1,5 +1,10 @@
 """Test the Singleton metaclass."""
 
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+from project_name.metaclasses.singleton import KeyedSingleton
 from project_name.metaclasses.singleton import Singleton
 
 
@@ -27,3 +32,73 @@ def test_singleton_state() -> None:
 
     instance2 = SingletonClass()
     assert instance2.value == 42
+
+
+def test_singleton_reset() -> None:
+    """Reset drops the instance, so the next call builds a new one."""
+    instance1 = SingletonClass()
+    SingletonClass.reset()
+    instance2 = SingletonClass()
+
+    assert instance1 is not instance2
+
+
+def test_singleton_concurrent_first_call() -> None:
+    """Concurrent first calls build the instance exactly once."""
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    built: list[int] = []
+
+    class SlowSingleton(metaclass=Singleton):
+        def __init__(self) -> None:
+            built.append(1)
+            time.sleep(0.05)
+
+    def first_call() -> SlowSingleton:
+        barrier.wait()
+        return SlowSingleton()
+
+    with ThreadPoolExecutor(n_threads) as pool:
+        instances = list(pool.map(lambda _: first_call(), range(n_threads)))
+
+    assert len(built) == 1
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_singleton_locks_are_per_class() -> None:
+    """Each class has its own construction lock."""
+
+    class Other(metaclass=Singleton):
+        pass
+
+    assert Other._singleton_lock is not SingletonClass._singleton_lock  # noqa: SLF001
+
+
+class KeyedClass(metaclass=KeyedSingleton):
+    """A test class with one instance per stage."""
+
+    def __init__(self, stage: str = "dev") -> None:
+        """Initialize the class."""
+        self.stage = stage
+
+    @classmethod
+    def singleton_key(cls, stage: str = "dev") -> str:
+        """Key instances by stage, so the default and explicit dev match."""
+        return stage
+
+
+def test_keyed_singleton() -> None:
+    """Keyed singletons keep one instance per key."""
+    dev = KeyedClass()
+    assert KeyedClass("dev") is dev
+    assert KeyedClass(stage="dev") is dev
+    prod = KeyedClass("prod")
+    assert prod is not dev
+    assert prod.stage == "prod"
+
+    KeyedClass.reset("prod")
+    assert KeyedClass("prod") is not prod
+    assert KeyedClass() is dev
+
+    KeyedClass.reset()
+    assert KeyedClass() is not dev
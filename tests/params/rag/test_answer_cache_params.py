@@ -0,0 +1,36 @@
+"""Test the AnswerCacheParams class."""
+
+from project_name.config.rag.answer_cache_config import AnswerCacheConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.rag.answer_cache_params import AnswerCacheParams
+
+_DEV_LOCAL = EnvType(stage=EnvStageType.DEV, location=EnvLocationType.LOCAL)
+_PROD_RENDER = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.RENDER)
+
+
+def test_answer_cache_params_dev_local() -> None:
+    """Test DEV caches few short-lived answers in the cache folder."""
+    params = AnswerCacheParams(env_type=_DEV_LOCAL)
+    assert params.fol.name == "answers"
+    assert params.fol.parent.name == "cache"
+    assert params.max_entries == 1_000
+    assert params.ttl == 600.0
+
+
+def test_answer_cache_params_prod_render() -> None:
+    """Test PROD keeps more answers for a day, without any secret."""
+    params = AnswerCacheParams(env_type=_PROD_RENDER)
+    assert params.max_entries == 20_000
+    assert params.ttl == 86_400.0
+
+
+def test_answer_cache_params_to_config() -> None:
+    """Test to_config returns a validated AnswerCacheConfig."""
+    params = AnswerCacheParams(env_type=_DEV_LOCAL)
+    config = params.to_config()
+    assert isinstance(config, AnswerCacheConfig)
+    assert config.fol == params.fol
+    assert config.similarity_threshold == 0.95
+    assert "similarity_threshold: 0.95" in str(params)
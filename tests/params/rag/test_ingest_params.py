@@ -0,0 +1,67 @@
+"""Test the IngestParams class."""
+
+import pytest
+
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.rag.ingest_params import IngestParams
+
+_DEV_LOCAL = EnvType(stage=EnvStageType.DEV, location=EnvLocationType.LOCAL)
+_PROD_LOCAL = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.LOCAL)
+_PROD_RENDER = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.RENDER)
+
+
+def test_ingest_params_dev_local() -> None:
+    """Test DEV + LOCAL embeds with Ollama into the cache folder."""
+    params = IngestParams(env_type=_DEV_LOCAL)
+    assert params.embedder_backend == "ollama"
+    assert params.embedder_api_key is None
+    assert params.file_batch_size == 8
+    assert params.store_persist_fol.name == "chroma"
+    assert params.store_persist_fol.parent.name == "cache"
+    assert params.bm25_fol == params.store_persist_fol.parent / "bm25"
+    assert params.data_fol.name == "data"
+
+
+def test_ingest_params_prod_local() -> None:
+    """Test PROD + LOCAL uses larger file batches and chunking threads."""
+    params = IngestParams(env_type=_PROD_LOCAL)
+    assert params.embedder_backend == "ollama"
+    assert params.file_batch_size == 32
+    assert params.chunk_workers == 4
+
+
+def test_ingest_params_render_needs_openai_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test RENDER embeds with OpenAI and requires its API key."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with pytest.raises(KeyError, match="OPENAI_API_KEY"):
+        IngestParams(env_type=_PROD_RENDER)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
+    params = IngestParams(env_type=_PROD_RENDER)
+    assert params.embedder_backend == "openai"
+    assert params.embedder_url is None
+    s = str(params)
+    assert "[REDACTED]" in s
+    assert "test-openai-key" not in s
+
+
+def test_ingest_params_to_config() -> None:
+    """Test conversion to IngestConfig."""
+    config = IngestParams(env_type=_DEV_LOCAL).to_config()
+    assert isinstance(config, IngestConfig)
+    assert config.embedder.batch_size == 32
+    assert config.store.distance_function == "cosine"
+    assert config.llm.max_concurrency == 8
+    assert config.chunker is not None
+    assert config.chunker.to_kw() == {
+        "encoding": "cl100k_base",
+        "chunk_tokens": 512,
+        "overlap_tokens": 64,
+        "batch_size": 64,
+        "workers": 1,
+    }
@@ -0,0 +1,35 @@
+"""Test the LLMClientParams class."""
+
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.rag.llm_client_params import LLMClientParams
+
+_DEV_LOCAL = EnvType(stage=EnvStageType.DEV, location=EnvLocationType.LOCAL)
+_PROD_RENDER = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.RENDER)
+
+
+def test_llm_client_params_dev_local() -> None:
+    """Test DEV keeps the pool and the concurrency small."""
+    params = LLMClientParams(env_type=_DEV_LOCAL)
+    assert params.max_connections == 8
+    assert params.initial_concurrency == 2
+    assert params.max_concurrency == 8
+
+
+def test_llm_client_params_prod_render() -> None:
+    """Test PROD allows more requests in flight, without any secret."""
+    params = LLMClientParams(env_type=_PROD_RENDER)
+    assert params.max_connections == 64
+    assert params.max_concurrency == 64
+
+
+def test_llm_client_params_to_config() -> None:
+    """Test to_config returns a validated LLMClientConfig."""
+    params = LLMClientParams(env_type=_DEV_LOCAL)
+    config = params.to_config()
+    assert isinstance(config, LLMClientConfig)
+    assert config.batch_window == params.batch_window
+    assert config.min_concurrency <= config.initial_concurrency
+    assert "concurrency: 2 (1 to 8)" in str(params)
@@ -0,0 +1,61 @@
+"""Test the QueryParams class."""
+
+import pytest
+
+from project_name.config.rag.query_config import QueryConfig
+from project_name.params.env_type import EnvLocationType
+from project_name.params.env_type import EnvStageType
+from project_name.params.env_type import EnvType
+from project_name.params.rag.ingest_params import IngestParams
+from project_name.params.rag.query_params import QueryParams
+
+_DEV_LOCAL = EnvType(stage=EnvStageType.DEV, location=EnvLocationType.LOCAL)
+_PROD_LOCAL = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.LOCAL)
+_PROD_RENDER = EnvType(stage=EnvStageType.PROD, location=EnvLocationType.RENDER)
+
+
+def test_query_params_dev_local() -> None:
+    """Test DEV + LOCAL answers with Ollama, a few answers at once."""
+    params = QueryParams(env_type=_DEV_LOCAL)
+    assert params.generator_backend == "ollama"
+    assert params.generator_api_key is None
+    assert params.max_concurrency == 4
+
+
+def test_query_params_prod_local() -> None:
+    """Test PROD + LOCAL streams more answers at once."""
+    params = QueryParams(env_type=_PROD_LOCAL)
+    assert params.generator_backend == "ollama"
+    assert params.max_concurrency == 16
+
+
+def test_query_params_render_needs_openai_key(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test RENDER answers with OpenAI and requires its API key."""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with pytest.raises(KeyError, match="OPENAI_API_KEY"):
+        QueryParams(env_type=_PROD_RENDER)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai-key")
+    params = QueryParams(env_type=_PROD_RENDER)
+    assert params.generator_backend == "openai"
+    assert params.generator_url is None
+    s = str(params)
+    assert "[REDACTED]" in s
+    assert "test-openai-key" not in s
+
+
+def test_query_params_to_config() -> None:
+    """Test retrieval uses the store and embedder of the ingestion."""
+    config = QueryParams(env_type=_DEV_LOCAL).to_config()
+    assert isinstance(config, QueryConfig)
+    ingest_config = IngestParams(env_type=_DEV_LOCAL).to_config()
+    assert config.store == ingest_config.store
+    assert config.embedder == ingest_config.embedder
+    assert config.bm25 is not None
+    assert config.bm25 == ingest_config.bm25
+    assert config.llm == ingest_config.llm
+    assert config.max_concurrency == 4
+    assert config.answer_cache is not None
+    assert config.answer_cache.fol.name == "answers"
@@ -0,0 +1,174 @@
+"""Tests for the params snapshot store and watcher."""
+
+from collections.abc import Generator
+import dataclasses
+from pathlib import Path
+
+import pytest
+
+from project_name.params.env_type import EnvLocationType
+from project_name.params.params_snapshot import ParamsStore
+from project_name.params.params_snapshot import ParamsWatcher
+from project_name.params.params_snapshot import get_params_snapshot
+from project_name.params.project_name_params import get_project_name_params
+from project_name.params.project_name_params import get_webapp_params
+from project_name.params.webapp.webapp_params import WebappParams
+from project_name.webapp.core.dependencies import get_settings
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> Generator[ParamsStore]:
+    """Yield a fresh store, then drop it and the params it loaded."""
+    monkeypatch.setenv("WEBAPP_APP_NAME", "Before")
+    params = get_project_name_params()
+    env_type = params.env_type
+    ParamsStore.reset()
+    params.load_config()
+    yield ParamsStore()
+    ParamsStore.reset()
+    params.env_type = env_type
+    params.load_config()
+
+
+def test_snapshot_is_immutable_and_stable(store: ParamsStore) -> None:
+    """Test the snapshot is built once, frozen and shared."""
+    snapshot = store.current
+    assert snapshot.version == 1
+    assert store.current is snapshot
+    assert get_params_snapshot() is snapshot
+    assert get_settings() is snapshot.config
+    assert snapshot.webapp is get_webapp_params()
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.version = 2  # type: ignore[misc]
+
+
+def test_reload_swaps_snapshot(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reload picks up env changes and leaves old snapshots untouched."""
+    old = store.current
+    secret = old.webapp.session_secret_key
+    monkeypatch.setenv("WEBAPP_APP_NAME", "After")
+
+    new = store.reload()
+
+    assert new.version == old.version + 1
+    assert store.current is new
+    assert new.config.app_name == "After"
+    assert get_settings().app_name == "After"
+    assert get_webapp_params() is new.webapp
+    assert old.config.app_name == "Before"
+    # The generated dev secret survives reloads, so sessions stay valid
+    assert new.webapp.session_secret_key == secret
+
+
+def test_failed_reload_keeps_snapshot(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test invalid params leave the previous snapshot current."""
+    old = store.current
+    monkeypatch.setenv("WEBAPP_PORT", "not-a-port")
+
+    with pytest.raises(ValueError, match="not-a-port"):
+        store.reload()
+
+    assert store.current is old
+    assert get_webapp_params() is old.webapp
+
+
+def test_invalid_config_keeps_params(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a config failing validation swaps in neither params nor snapshot."""
+    old = store.current
+    params = get_project_name_params()
+
+    def invalid_config(self: WebappParams) -> None:
+        msg = "invalid config"
+        raise ValueError(msg)
+
+    monkeypatch.setattr(WebappParams, "to_config", invalid_config)
+    monkeypatch.setenv("WEBAPP_APP_NAME", "After")
+    with pytest.raises(ValueError, match="invalid config"):
+        store.reload()
+
+    assert store.current is old
+    assert params.webapp is old.webapp
+    assert params.paths is old.paths
+
+
+def test_reload_reads_env_type(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reload picks up the env type, and keeps it if the reload fails."""
+    old = store.current
+    monkeypatch.setenv("ENV_LOCATION_TYPE", "render")
+    new = store.reload()
+    assert new.env_type.location == EnvLocationType.RENDER
+    assert new.webapp.location == EnvLocationType.RENDER
+
+    monkeypatch.delenv("SESSION_SECRET_KEY", raising=False)
+    monkeypatch.setenv("ENV_STAGE_TYPE", "prod")
+    with pytest.raises(ValueError, match="SESSION_SECRET_KEY"):
+        store.reload()
+    assert get_project_name_params().env_type == new.env_type
+    assert new.env_type.stage == old.env_type.stage
+
+
+def test_watcher_reloads_on_file_change(
+    store: ParamsStore, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the watcher loads an edited env file and reloads the store."""
+    env_fp = tmp_path / ".env"
+    old = store.current
+    watcher = ParamsWatcher(store, env_fps=[env_fp])
+    assert watcher.check() is None
+
+    monkeypatch.setenv("WEBAPP_APP_NAME", "Before")
+    env_fp.write_text("WEBAPP_APP_NAME=From file\n")
+    new = watcher.check()
+
+    assert new is not None
+    assert new.version == old.version + 1
+    assert new.config.app_name == "From file"
+    assert watcher.check() is None
+
+    # A key removed from the file is removed from the environment
+    env_fp.write_text("# no app name\n")
+    new = watcher.check()
+    assert new is not None
+    assert new.config.app_name == "Project Name API"
+
+
+def test_watcher_keeps_snapshot_on_bad_env(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test a failing reload is logged and the watcher keeps polling."""
+    old = store.current
+    watcher = ParamsWatcher(store, env_fps=[tmp_path / ".env"])
+
+    monkeypatch.setenv("WEBAPP_PORT", "not-a-port")
+    assert watcher.check() is None
+    assert store.current is old
+
+    monkeypatch.setenv("WEBAPP_PORT", "9000")
+    new = watcher.check()
+    assert new is not None
+    assert new.config.port == 9000
+
+
+def test_watcher_survives_any_reload_error(
+    store: ParamsStore, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test an unexpected reload error keeps the snapshot and the watcher."""
+    old = store.current
+    watcher = ParamsWatcher(store, env_fps=[tmp_path / ".env"])
+
+    def broken_reload() -> None:
+        msg = "disk on fire"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(store, "reload", broken_reload)
+    monkeypatch.setenv("WEBAPP_APP_NAME", "After")
+    assert watcher.check() is None
+    assert store.current is old
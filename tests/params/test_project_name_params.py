@@ -3,6 +3,8 @@
 from project_name.params.project_name_params import ProjectNameParams
 from project_name.params.project_name_params import get_project_name_params
 from project_name.params.project_name_paths import ProjectNamePaths
+from project_name.params.rag.ingest_params import IngestParams
+from project_name.params.rag.query_params import QueryParams
 from project_name.params.sample_params import SampleParams
 
 
@@ -19,6 +21,8 @@ def test_project_name_params_init() -> None:
     params = ProjectNameParams()
     assert isinstance(params.paths, ProjectNamePaths)
     assert isinstance(params.sample, SampleParams)
+    assert isinstance(params.ingest, IngestParams)
+    assert isinstance(params.query, QueryParams)
 
 
 def test_project_name_params_str() -> None:
@@ -28,3 +32,13 @@ def test_project_name_params_str() -> None:
     assert "ProjectNameParams:" in s
     assert "ProjectNamePaths:" in s
     assert "SampleParams:" in s
+
+
+def test_project_name_params_reload() -> None:
+    """Test reload rebuilds built sub-params and keeps the others lazy."""
+    params = ProjectNameParams()
+    params.load_config()
+    paths = params.paths
+    params.reload()
+    assert params.paths is not paths
+    assert params._sample is None  # noqa: SLF001
@@ -0,0 +1,311 @@
+"""Shared test fixtures for RAG tests."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from collections.abc import Generator
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+from pathlib import Path
+from string import ascii_lowercase
+from threading import Thread
+from typing import Any
+
+from haystack import Document
+from haystack import component
+import pytest
+import tiktoken
+
+from project_name.config.rag.ingest_config import ChromaStoreConfig
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.config.rag.ingest_config import SplitterConfig
+from project_name.rag.chat import ChatBackendError
+from project_name.rag.llm_client import EmbeddingBackendError
+
+
+@component
+class FakeEmbedder:
+    """Embed documents with their length, recording the embedded chunks."""
+
+    model = "fake"
+
+    def __init__(self) -> None:
+        """Start with no embedded chunks."""
+        self.embedded: list[str] = []
+
+    @component.output_types(documents=list[Document], meta=dict[str, Any])
+    def run(self, documents: list[Document]) -> dict[str, Any]:
+        """Set a two-dimensional embedding on every document."""
+        self.embedded.extend(doc.meta.get("source", "") for doc in documents)
+        return {
+            "documents": [
+                replace(doc, embedding=[float(len(doc.content or "")), 1.0])
+                for doc in documents
+            ],
+            "meta": {"model": self.model},
+        }
+
+
+class FakeRetriever:
+    """Return fixed documents, recording the queries.
+
+    Texts are embedded as their letter counts, so questions differing only
+    in case and punctuation get the same embedding.
+    """
+
+    def __init__(self, documents: list[Document]) -> None:
+        """Set the documents to return."""
+        self.documents = documents
+        self.queries: list[tuple[str, int]] = []
+        self.embedded: list[str] = []
+
+    def embed(self, query: str) -> list[float]:
+        """Return the count of each letter of ``query``."""
+        self.embedded.append(query)
+        text = query.lower()
+        return [float(text.count(letter)) for letter in ascii_lowercase]
+
+    def retrieve(
+        self, query: str, top_k: int, embedding: list[float] | None = None
+    ) -> list[Document]:
+        """Return the first ``top_k`` documents."""
+        if embedding is None:
+            self.embed(query)
+        self.queries.append((query, top_k))
+        return self.documents[:top_k]
+
+
+class FakeChatBackend:
+    """Stream fixed tokens, optionally failing or hanging after them.
+
+    Args:
+        tokens: Text fragments to stream.
+        delay: Seconds to wait before each fragment.
+        fail: Raise ``ChatBackendError`` after the fragments.
+        hang: Wait forever after the fragments, until cancelled.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        tokens: list[str],
+        delay: float = 0.0,
+        *,
+        fail: bool = False,
+        hang: bool = False,
+    ) -> None:
+        """Set the stream to play."""
+        self.tokens = tokens
+        self.delay = delay
+        self.fail = fail
+        self.hang = hang
+        self.messages: list[list[dict[str, str]]] = []
+        self.finished = 0
+        self.closed = False
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        """Stream the tokens, recording the messages."""
+        self.messages.append(messages)
+        try:
+            for token in self.tokens:
+                await asyncio.sleep(self.delay)
+                yield token
+            if self.fail:
+                raise ChatBackendError(self.name, "boom")
+            if self.hang:
+                await asyncio.Event().wait()
+        finally:
+            self.finished += 1
+
+    async def aclose(self) -> None:
+        """Record the close."""
+        self.closed = True
+
+
+FAKE_LLM_TOKENS = ["Hel", "lo", " world"]
+
+
+def fake_vector(text: str) -> list[float]:
+    """Return the embedding of ``text`` by the fakes."""
+    return [float(len(text)), 1.0]
+
+
+class FakeEmbeddingBackend:
+    """Embed texts with ``fake_vector``, recording each request.
+
+    Args:
+        delay: Seconds each request takes.
+        throttle: Requests refused with 429 before the first answered.
+    """
+
+    model = "fake"
+
+    def __init__(self, delay: float = 0.0, throttle: int = 0) -> None:
+        """Start with no request."""
+        self.kwargs: dict = {}
+        self.delay = delay
+        self.throttle = throttle
+        self.batches: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed ``texts``, or refuse them while throttling."""
+        self.batches.append(texts)
+        if self.throttle:
+            self.throttle -= 1
+            raise EmbeddingBackendError(self.model, "slow down", 429)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return [fake_vector(text) for text in texts]
+
+    async def aclose(self) -> None:
+        """Nothing to close."""
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """Fake OpenAI and Ollama endpoints.
+
+    Chats stream ``FAKE_LLM_TOKENS``, embeddings are ``fake_vector``.  The
+    ``broken`` model is refused with 400.
+    """
+
+    def do_POST(self) -> None:
+        """Answer a chat or embedding request in the protocol of the path."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if body["model"] == "broken":
+            self.send_error(400, "model exploded")
+            return
+        if self.path in {"/v1/embeddings", "/api/embed"}:
+            self._send_embeddings(body)
+            return
+        if self.path == "/v1/chat/completions":
+            content_type, lines = "text/event-stream", self._openai_lines(body)
+        elif self.path == "/api/chat":
+            content_type, lines = "application/x-ndjson", self._ollama_lines(body)
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for line in lines:
+            self.wfile.write(line.encode())
+            self.wfile.flush()
+
+    def _send_embeddings(self, body: dict[str, Any]) -> None:
+        """Send the embeddings of ``body["input"]``."""
+        vectors = [fake_vector(text) for text in body["input"]]
+        if self.path == "/api/embed":
+            payload = {"model": body["model"], "embeddings": vectors}
+        else:
+            payload = {
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": vector}
+                    for i, vector in enumerate(vectors)
+                ],
+                "usage": {"prompt_tokens": 0, "total_tokens": 0},
+            }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _openai_lines(self, body: dict[str, Any]) -> list[str]:
+        """Return the SSE chunks of a streamed OpenAI completion."""
+        chunks = [
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {"index": 0, "delta": {"content": text}, "finish_reason": None}
+                ],
+            }
+            for text in FAKE_LLM_TOKENS
+        ]
+        return [f"data: {json.dumps(c)}\n\n" for c in chunks] + ["data: [DONE]\n\n"]
+
+    def _ollama_lines(self, body: dict[str, Any]) -> list[str]:
+        """Return the NDJSON parts of a streamed Ollama chat."""
+        parts = [
+            {
+                "model": body["model"],
+                "created_at": "2026-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": text},
+                "done": not text,
+            }
+            for text in [*FAKE_LLM_TOKENS, ""]
+        ]
+        return [json.dumps(part) + "\n" for part in parts]
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def fake_llm_url() -> Generator[str]:
+    """Serve ``FakeLLMHandler`` on a free local port and return its URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeLLMHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def byte_encoding(monkeypatch: pytest.MonkeyPatch) -> tiktoken.Encoding:
+    """Tiny offline byte-level encoding, registered as ``"test_bytes"``.
+
+    Every byte is a token and a few merges make multi-byte tokens, so
+    ``"hello world"`` is two tokens and ``"é"`` is split in two.
+    """
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in [b"he", b"ll", b"hell", b"hello", b" w", b"or", b" wor", b" world"]:
+        ranks[merge] = len(ranks)
+    encoding = tiktoken.Encoding(
+        "test_bytes",
+        pat_str=r"\s?\S+|\s+",
+        mergeable_ranks=ranks,
+        special_tokens={},
+    )
+    monkeypatch.setitem(tiktoken.registry.ENCODINGS, "test_bytes", encoding)
+    return encoding
+
+
+@pytest.fixture
+def make_embedder() -> type[FakeEmbedder]:
+    """Return the fake embedder class; a pipeline needs its own instance."""
+    return FakeEmbedder
+
+
+@pytest.fixture
+def ingest_config(tmp_path: Path) -> IngestConfig:
+    """Ingest config over a small data folder, two files per batch."""
+    data_fol = tmp_path / "data"
+    (data_fol / "sub").mkdir(parents=True)
+    (data_fol / "a.md").write_text("alpha " * 30)
+    (data_fol / "b.txt").write_text("bravo " * 5)
+    (data_fol / "sub" / "c.md").write_text("charlie " * 5)
+    (data_fol / "skip.bin").write_bytes(b"\x00\x01")
+    return IngestConfig(
+        data_fol=data_fol,
+        file_batch_size=2,
+        store=ChromaStoreConfig(
+            persist_fol=tmp_path / "chroma", collection_name="test_docs"
+        ),
+        embedder=EmbedderConfig(backend="ollama", model="fake"),
+        splitter=SplitterConfig(split_length=10, split_overlap=2),
+    )
@@ -0,0 +1,174 @@
+"""Tests for the semantic answer cache."""
+
+from pathlib import Path
+
+import pytest
+
+from project_name.config.rag.answer_cache_config import AnswerCacheConfig
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.config.rag.query_config import GeneratorConfig
+from project_name.config.rag.query_config import QueryConfig
+from project_name.rag.answer_cache import SemanticAnswerCache
+from project_name.rag.answer_cache import answer_space
+from project_name.rag.ingest import MANIFEST_NAME
+
+SOURCES = [{"id": "a", "source": "a.md", "score": 0.9}]
+
+
+class FakeClock:
+    """Unix time that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path: Path, clock: FakeClock) -> SemanticAnswerCache:
+    """Return an empty cache of three answers living ten seconds."""
+    return SemanticAnswerCache(
+        tmp_path / "answers.sqlite",
+        similarity_threshold=0.9,
+        max_entries=3,
+        ttl=10.0,
+        clock=clock,
+    )
+
+
+def test_near_duplicate_hits(cache: SemanticAnswerCache) -> None:
+    """Test a close question gets the answer and a distant one misses."""
+    assert cache.get([1.0, 0.0], top_k=5) is None
+    assert cache.put([1.0, 0.0], 5, "How?", "Like this.", SOURCES)
+
+    hit = cache.get([0.99, 0.05], top_k=5)
+    assert hit is not None
+    assert (hit.question, hit.answer, hit.sources) == ("How?", "Like this.", SOURCES)
+    assert hit.similarity == pytest.approx(0.9987, abs=1e-4)
+    # Scale does not matter, only the direction
+    assert cache.get([3.0, 0.0], top_k=5) is not None
+    assert cache.get([0.6, 0.8], top_k=5) is None
+    assert cache.get([1.0, 0.0], top_k=3) is None
+    assert (cache.stats.hits, cache.stats.misses) == (2, 3)
+
+
+def test_put_skips_cached_questions(cache: SemanticAnswerCache) -> None:
+    """Test a second answer to the same question is not stored."""
+    assert cache.put([1.0, 0.0], 5, "How?", "First.", SOURCES)
+    assert not cache.put([1.0, 0.01], 5, "How?", "Second.", SOURCES)
+    assert len(cache) == 1
+
+
+def test_dimension_mismatch(cache: SemanticAnswerCache) -> None:
+    """Test an embedding of another dimension is refused."""
+    cache.put([1.0, 0.0], 5, "How?", "Like this.", SOURCES)
+    with pytest.raises(ValueError, match="dimension 2, got 3"):
+        cache.get([1.0, 0.0, 0.0], top_k=5)
+
+
+def test_ttl_expiry(cache: SemanticAnswerCache, clock: FakeClock) -> None:
+    """Test answers are not served after the TTL and evicted on insert."""
+    cache.put([1.0, 0.0], 5, "How?", "Like this.", SOURCES)
+    clock.now += 9
+    assert cache.get([1.0, 0.0], top_k=5) is not None
+    clock.now += 2
+    assert cache.get([1.0, 0.0], top_k=5) is None
+
+    cache.put([0.0, 1.0], 5, "Why?", "Because.", SOURCES)
+    assert len(cache) == 1
+
+
+def test_lru_eviction(cache: SemanticAnswerCache, clock: FakeClock) -> None:
+    """Test the least recently used answer is evicted beyond max_entries."""
+    for i, embedding in enumerate([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]):
+        clock.now += 1
+        cache.put(embedding, 5, f"Q{i}", f"A{i}", SOURCES)
+    clock.now += 1
+    # Q0 becomes the most recently used, Q1 the least
+    assert cache.get([1.0, 0.0, 0.0], top_k=5) is not None
+    clock.now += 1
+    cache.put([1.0, 1.0, 1.0], 5, "Q3", "A3", SOURCES)
+
+    assert len(cache) == 3
+    assert cache.get([0.0, 1.0, 0.0], top_k=5) is None
+    for embedding in ([1.0, 0.0, 0.0], [0.0, 0.0, 1.0], [1.0, 1.0, 1.0]):
+        assert cache.get(embedding, top_k=5) is not None
+
+
+def test_shared_between_instances(tmp_path: Path, clock: FakeClock) -> None:
+    """Test answers persist and are seen by other processes of the database."""
+    db_fp = tmp_path / "answers.sqlite"
+    first = SemanticAnswerCache(db_fp, max_entries=1, clock=clock)
+    second = SemanticAnswerCache(db_fp, max_entries=1, clock=clock)
+
+    first.put([1.0, 0.0], 5, "How?", "Like this.", SOURCES)
+    assert second.get([1.0, 0.0], top_k=5) is not None
+
+    # The first answer is evicted by the second instance
+    clock.now += 1
+    second.put([0.0, 1.0], 5, "Why?", "Because.", SOURCES)
+    assert first.get([1.0, 0.0], top_k=5) is None
+    assert first.get([0.0, 1.0], top_k=5) is not None
+    first.close()
+    second.close()
+
+    reopened = SemanticAnswerCache(db_fp, clock=clock)
+    hit = reopened.get([0.0, 1.0], top_k=5)
+    assert hit is not None
+    assert hit.answer == "Because."
+
+
+def test_ingest_drops_answers(tmp_path: Path, clock: FakeClock) -> None:
+    """Test a changed ingest manifest drops the answers of every instance."""
+    db_fp = tmp_path / "answers.sqlite"
+    manifest_fp = tmp_path / "chroma" / "ingest_manifest.json"
+    first = SemanticAnswerCache(db_fp, clock=clock, generation_fp=manifest_fp)
+    second = SemanticAnswerCache(db_fp, clock=clock, generation_fp=manifest_fp)
+    first.put([1.0, 0.0], 5, "How?", "Like this.", SOURCES)
+    assert second.get([1.0, 0.0], top_k=5) is not None
+
+    manifest_fp.parent.mkdir()
+    manifest_fp.write_text('{"a.md": "0123"}\n')
+    assert second.get([1.0, 0.0], top_k=5) is None
+    assert first.get([1.0, 0.0], top_k=5) is None
+    assert len(first) == 0
+
+    # Answers to the new documents are kept until the next ingest
+    first.put([0.0, 1.0], 5, "Why?", "Because.", SOURCES)
+    assert second.get([0.0, 1.0], top_k=5) is not None
+    first.close()
+    second.close()
+    reopened = SemanticAnswerCache(db_fp, clock=clock, generation_fp=manifest_fp)
+    assert reopened.get([0.0, 1.0], top_k=5) is not None
+    manifest_fp.write_text('{"a.md": "4567", "b.md": "89ab"}\n')
+    assert reopened.get([0.0, 1.0], top_k=5) is None
+    reopened.close()
+
+
+def test_answer_space(tmp_path: Path, ingest_config: IngestConfig) -> None:
+    """Test the answer space changes with the settings of the answers."""
+    config = QueryConfig(
+        store=ingest_config.store,
+        embedder=ingest_config.embedder,
+        generator=GeneratorConfig(backend="ollama", model="llama3.2:3b"),
+        answer_cache=AnswerCacheConfig(fol=tmp_path / "answers"),
+    )
+    space = answer_space(config)
+    assert space.startswith("llama3.2_3b-")
+    assert answer_space(config.model_copy(update={"top_k": 9})) == space
+    assert answer_space(config.model_copy(update={"system_prompt": "Hi."})) != space
+
+    assert config.answer_cache is not None
+    cache = SemanticAnswerCache.from_config(config.answer_cache, config)
+    assert cache.db_fp == tmp_path / "answers" / f"{space}.sqlite"
+    assert cache.generation_fp == ingest_config.store.persist_fol / MANIFEST_NAME
+    cache.close()
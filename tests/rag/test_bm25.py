@@ -0,0 +1,195 @@
+"""Tests for the BM25 keyword index."""
+
+import json
+from pathlib import Path
+
+from haystack import Document
+from haystack import Pipeline
+import numpy as np
+import pytest
+
+from project_name.rag.bm25 import BM25Index
+from project_name.rag.bm25 import BM25IndexWriter
+from project_name.rag.bm25 import BM25Retriever
+from project_name.rag.bm25 import tokenize
+
+DOCS = [
+    Document(
+        id="a", content="Retry on ERR_CONN_RESET errors.", meta={"source": "a.md"}
+    ),
+    Document(
+        id="b",
+        content="Errors are logged, errors are retried.",
+        meta={"source": "b.md"},
+    ),
+    Document(id="c", content="Call os.path.join for paths.", meta={"source": "c.md"}),
+]
+
+
+def ids(documents: list[Document]) -> list[str]:
+    """Return the ids of the documents."""
+    return [doc.id for doc in documents]
+
+
+def test_tokenize_keeps_identifiers() -> None:
+    """Test identifiers are one term followed by their parts."""
+    assert tokenize("Use os.path.join, not E1234!") == [
+        "use",
+        "os.path.join",
+        "os",
+        "path",
+        "join",
+        "not",
+        "e1234",
+    ]
+    assert tokenize("ERR_CONN_RESET") == ["err_conn_reset", "err", "conn", "reset"]
+
+
+def test_search_ranks_by_bm25() -> None:
+    """Test exact identifiers win and term frequency raises the score."""
+    index = BM25Index()
+    index.add(DOCS)
+    assert ids(index.search("What is ERR_CONN_RESET?", top_k=3)) == ["a"]
+    hits = index.search("errors", top_k=3)
+    assert ids(hits) == ["b", "a"]
+    assert hits[0].score is not None
+    assert hits[1].score is not None
+    assert hits[0].score > hits[1].score > 0
+    assert hits[0].meta == {"source": "b.md"}
+    assert ids(index.search("errors", top_k=1)) == ["b"]
+    assert index.search("nothing matches", top_k=3) == []
+
+
+def test_bm25_score() -> None:
+    """Test the score of a single-term query against the BM25 formula."""
+    index = BM25Index(k1=1.2, b=0.75)
+    index.add(DOCS)
+    (hit,) = index.search("join", top_k=1)
+    n, df, tf = 3, 1, 1
+    lens = [len(tokenize(doc.content or "")) for doc in DOCS]
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = 1.2 * (1 - 0.75 + 0.75 * lens[2] / np.mean(lens))
+    assert hit.score == pytest.approx(idf * tf * 2.2 / (tf + norm), rel=1e-5)
+
+
+def test_replace_and_delete() -> None:
+    """Test re-added ids replace their chunk and sources can be deleted."""
+    index = BM25Index()
+    index.add(DOCS)
+    index.add(
+        [Document(id="a", content="Now about timeouts.", meta={"source": "a.md"})]
+    )
+    assert len(index) == 3
+    assert index.search("ERR_CONN_RESET", top_k=3) == []
+    assert ids(index.search("timeouts", top_k=3)) == ["a"]
+
+    assert index.delete_sources(["a.md", "c.md"]) == 2
+    assert len(index) == 1
+    assert index.search("timeouts", top_k=3) == []
+
+
+def test_save_and_reopen(tmp_path: Path) -> None:
+    """Test a saved index is reopened with the same scores."""
+    fol = tmp_path / "bm25"
+    index = BM25Index(fol)
+    index.add(DOCS)
+    index.delete_sources(["c.md"])
+    index.save()
+    before = index.search("errors", top_k=3)
+
+    reopened = BM25Index(fol)
+    assert len(reopened) == 2
+    assert [(d.id, d.score) for d in reopened.search("errors", top_k=3)] == [
+        (d.id, d.score) for d in before
+    ]
+    assert reopened.search("join", top_k=3) == []
+    # The merge dropped the terms of the deleted chunk
+    generation = (fol / "CURRENT").read_text()
+    assert "os.path.join" not in json.loads(
+        (fol / generation / "terms.json").read_text()
+    )
+
+    # Unsaved additions are searched with the saved postings
+    reopened.add([Document(id="d", content="More errors.", meta={"source": "d.md"})])
+    assert ids(reopened.search("errors", top_k=3)) == ["d", "b", "a"]
+    reopened.save()
+    reopened.add(DOCS[2:])
+    reopened.save()
+    # The previous generation is kept for readers opening it
+    assert sorted(p.name for p in fol.iterdir()) == [
+        "CURRENT",
+        "gen-000001",
+        "gen-000002",
+    ]
+
+
+def test_saved_chunks_stay_on_disk(tmp_path: Path) -> None:
+    """Test a reopened index reads chunk texts from the mapped file on search."""
+    fol = tmp_path / "bm25"
+    index = BM25Index(fol)
+    index.add(DOCS)
+    index.save()
+
+    reopened = BM25Index(fol)
+    assert isinstance(reopened._docs, np.memmap)  # noqa: SLF001
+    assert reopened._new_chunks == []  # noqa: SLF001
+    # Readers never build the id lookup table
+    assert reopened._by_id is None  # noqa: SLF001
+    (hit,) = reopened.search("join", top_k=1)
+    assert (hit.id, hit.content, hit.meta) == ("c", DOCS[2].content, {"source": "c.md"})
+
+    # Saved chunks are deleted by source, replaced by id and copied on save
+    assert reopened.delete_sources(["a.md"]) == 1
+    reopened.add(
+        [Document(id="b", content="Now about os.path.join.", meta={"source": "b.md"})]
+    )
+    reopened.save()
+    again = BM25Index(fol)
+    assert len(again) == 2
+    assert [(d.id, d.content) for d in again.search("join", top_k=3)] == [
+        ("b", "Now about os.path.join."),
+        ("c", DOCS[2].content),
+    ]
+    assert again.search("errors", top_k=3) == []
+
+
+def test_reader_picks_up_new_generation(tmp_path: Path) -> None:
+    """Test a reader sees what another process saved on its next search."""
+    fol = tmp_path / "bm25"
+    writer = BM25Index(fol)
+    writer.add(DOCS[:1])
+    writer.save()
+    reader = BM25Index(fol)
+    assert ids(reader.search("errors", top_k=3)) == ["a"]
+
+    writer.add(DOCS[1:])
+    writer.save()
+    assert ids(reader.search("errors", top_k=3)) == ["b", "a"]
+
+
+def test_removed_generation_keeps_the_loaded_one(tmp_path: Path) -> None:
+    """Test a reader keeps its index when the new generation cannot be read."""
+    fol = tmp_path / "bm25"
+    writer = BM25Index(fol)
+    writer.add(DOCS[:1])
+    writer.save()
+    reader = BM25Index(fol)
+    writer.add(DOCS[1:])
+    writer.save()
+    (fol / (fol / "CURRENT").read_text() / "docs.jsonl").unlink()
+
+    assert ids(reader.search("errors", top_k=3)) == ["a"]
+
+
+def test_components_in_a_pipeline(tmp_path: Path) -> None:
+    """Test the writer indexes without saving, and the retriever searches."""
+    index = BM25Index(tmp_path / "bm25")
+    pipeline = Pipeline()
+    pipeline.add_component("writer", BM25IndexWriter(index))
+    result = pipeline.run({"writer": {"documents": DOCS}})
+    assert result["writer"]["documents_written"] == 3
+    assert not (tmp_path / "bm25" / "CURRENT").exists()
+    index.save()
+
+    retriever = BM25Retriever(BM25Index(tmp_path / "bm25"), top_k=1)
+    assert ids(retriever.run(query="errors")["documents"]) == ["b"]
@@ -0,0 +1,52 @@
+"""Tests for the streaming chat backends, against a local fake server."""
+
+from pydantic import SecretStr
+import pytest
+
+from project_name.config.rag.query_config import GeneratorConfig
+from project_name.rag.chat import ChatBackendError
+from project_name.rag.chat import build_chat_backend
+from project_name.rag.components import MissingApiKeyError
+from tests.rag.conftest import FAKE_LLM_TOKENS
+
+MESSAGES = [{"role": "user", "content": "Say hello"}]
+
+
+def generator_config(backend: str, url: str, model: str = "fake") -> GeneratorConfig:
+    """Return the config of a backend on the fake server."""
+    if backend == "openai":
+        return GeneratorConfig(
+            backend="openai",
+            model=model,
+            url=f"{url}/v1",
+            api_key=SecretStr("test-key"),
+        )
+    return GeneratorConfig(backend="ollama", model=model, url=url)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["openai", "ollama"])
+async def test_backend_streams_tokens(backend: str, fake_llm_url: str) -> None:
+    """Test the backend yields the fragments of the server in order."""
+    chat = build_chat_backend(generator_config(backend, fake_llm_url))
+    assert [text async for text in chat.stream(MESSAGES)] == FAKE_LLM_TOKENS
+    # The pooled client serves a second answer
+    assert [text async for text in chat.stream(MESSAGES)] == FAKE_LLM_TOKENS
+    await chat.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["openai", "ollama"])
+async def test_backend_error(backend: str, fake_llm_url: str) -> None:
+    """Test server failures are raised as ChatBackendError."""
+    chat = build_chat_backend(generator_config(backend, fake_llm_url, "broken"))
+    with pytest.raises(ChatBackendError, match=f"The {backend} chat backend failed"):
+        [text async for text in chat.stream(MESSAGES)]
+    await chat.aclose()
+
+
+def test_openai_backend_needs_api_key() -> None:
+    """Test the openai backend refuses to start without an API key."""
+    config = GeneratorConfig(backend="openai", model="fake")
+    with pytest.raises(MissingApiKeyError, match="generator"):
+        build_chat_backend(config)
@@ -0,0 +1,138 @@
+"""Tests for the token-aware chunker."""
+
+from collections.abc import Iterator
+
+from haystack import Document
+from haystack.document_stores.in_memory import InMemoryDocumentStore
+import pytest
+import tiktoken
+
+from project_name.config.rag.ingest_config import ChunkerConfig
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.rag.chunking import TokenChunker
+from project_name.rag.chunking import TokenSplitter
+from project_name.rag.chunking import get_encoding
+from project_name.rag.ingest import DocumentIngestor
+from project_name.rag.ingest import IngestReport
+from tests.rag.conftest import FakeEmbedder
+
+
+def test_chunks_respect_budget_and_overlap(byte_encoding: tiktoken.Encoding) -> None:
+    """Test windows hold at most chunk_tokens and share overlap_tokens."""
+    chunker = TokenChunker(byte_encoding, chunk_tokens=4, overlap_tokens=1)
+    text = "abcdefghij"
+
+    chunks = list(chunker.iter_chunks([text]))
+
+    assert [c.text for c in chunks] == ["abcd", "defg", "ghij"]
+    assert [c.start_token for c in chunks] == [0, 3, 6]
+    assert all(c.n_tokens <= 4 for c in chunks)
+    assert [c.chunk_index for c in chunks] == [0, 1, 2]
+
+
+def test_chunks_count_tokens_not_characters(byte_encoding: tiktoken.Encoding) -> None:
+    """Test merged tokens fill a budget that characters would overflow."""
+    chunker = TokenChunker(byte_encoding, chunk_tokens=2, overlap_tokens=0)
+    chunks = list(chunker.iter_chunks(["hello world hello world"]))
+    # " hello" has no merge for its leading space: [hello][ world][ ][hello][ world]
+    assert [c.text for c in chunks] == ["hello world", " hello", " world"]
+    assert chunker.count_tokens("hello world") == 2
+
+
+def test_chunks_never_split_a_character(byte_encoding: tiktoken.Encoding) -> None:
+    """Test windows move to character boundaries on multi-byte characters."""
+    chunker = TokenChunker(byte_encoding, chunk_tokens=3, overlap_tokens=0)
+    text = "abéécd"
+    assert len(byte_encoding.encode(text)) == 8
+
+    chunks = list(chunker.iter_chunks([text]))
+
+    assert "".join(c.text for c in chunks) == text
+    assert "�" not in "".join(c.text for c in chunks)
+    assert all(c.n_tokens <= 3 for c in chunks)
+
+
+def test_iter_chunks_is_lazy_and_ordered(byte_encoding: tiktoken.Encoding) -> None:
+    """Test texts are pulled one batch at a time and chunks keep input order."""
+    pulled: list[int] = []
+
+    def texts() -> Iterator[str]:
+        for i in range(10):
+            pulled.append(i)
+            yield f"text number {i}"
+
+    chunker = TokenChunker(
+        byte_encoding, chunk_tokens=8, overlap_tokens=0, batch_size=3
+    )
+    chunks = chunker.iter_chunks(texts())
+    first = next(chunks)
+    assert first.doc_index == 0
+    assert pulled == [0, 1, 2]
+
+    doc_indices = [first.doc_index] + [c.doc_index for c in chunks]
+    assert doc_indices == sorted(doc_indices)
+    assert set(doc_indices) == set(range(10))
+
+
+def test_thread_pool_matches_inline(byte_encoding: tiktoken.Encoding) -> None:
+    """Test the thread-pool path yields the same chunks in the same order."""
+    texts = [f"hello world {i} " * (i % 7 + 1) + "é" * (i % 3) for i in range(200)]
+    inline = TokenChunker(byte_encoding, chunk_tokens=5, overlap_tokens=2, batch_size=8)
+    pooled = TokenChunker(
+        byte_encoding, chunk_tokens=5, overlap_tokens=2, batch_size=8, workers=4
+    )
+    assert list(pooled.iter_chunks(texts)) == list(inline.iter_chunks(texts))
+
+
+def test_invalid_overlap(byte_encoding: tiktoken.Encoding) -> None:
+    """Test an overlap as large as the budget is refused."""
+    with pytest.raises(ValueError, match="overlap_tokens"):
+        TokenChunker(byte_encoding, chunk_tokens=4, overlap_tokens=4)
+
+
+def test_encoding_is_cached(byte_encoding: tiktoken.Encoding) -> None:
+    """Test encodings are loaded once per name."""
+    assert get_encoding("test_bytes") is get_encoding("test_bytes")
+    chunker = TokenChunker.from_config(ChunkerConfig(encoding="test_bytes"))
+    assert chunker.encoding.name == "test_bytes"
+
+
+def test_token_splitter_component(byte_encoding: tiktoken.Encoding) -> None:
+    """Test the component keeps the meta and records the chunk position."""
+    splitter = TokenSplitter(
+        TokenChunker(byte_encoding, chunk_tokens=4, overlap_tokens=0)
+    )
+    doc = Document(content="abcdefgh", meta={"source": "a.md"})
+
+    chunks = splitter.run(documents=[doc, Document(content="")])["documents"]
+
+    assert [c.content for c in chunks] == ["abcd", "efgh"]
+    assert chunks[1].meta == {
+        "source": "a.md",
+        "source_id": doc.id,
+        "split_id": 1,
+        "split_token_start": 4,
+        "n_tokens": 4,
+    }
+
+
+def test_ingest_with_token_chunker(
+    ingest_config: IngestConfig,
+    make_embedder: type[FakeEmbedder],
+    byte_encoding: tiktoken.Encoding,
+) -> None:
+    """Test the ingestor splits with the token chunker when configured."""
+    config = ingest_config.model_copy(
+        update={
+            "chunker": ChunkerConfig(
+                encoding=byte_encoding.name, chunk_tokens=64, overlap_tokens=8
+            )
+        }
+    )
+    store = InMemoryDocumentStore()
+
+    report = DocumentIngestor(config, store, make_embedder()).run()
+
+    # a.md is 180 single-byte tokens: windows start at 0, 56, 112 and 168
+    assert report == IngestReport(added=3, chunks=6)
+    assert all(doc.meta["n_tokens"] <= 64 for doc in store.filter_documents())
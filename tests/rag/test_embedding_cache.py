@@ -0,0 +1,138 @@
+"""Tests for the on-disk embedding cache."""
+
+from pathlib import Path
+from typing import Any
+
+from haystack import Document
+from haystack import component
+import numpy as np
+import pytest
+
+from project_name.rag.embedding_cache import CachedDocumentEmbedder
+from project_name.rag.embedding_cache import CachedTextEmbedder
+from project_name.rag.embedding_cache import EmbeddingCache
+from project_name.rag.embedding_cache import embedding_key
+from project_name.rag.embedding_cache import embedding_space
+from tests.rag.conftest import FakeEmbedder
+
+
+@component
+class FakeTextEmbedder:
+    """Embed a text with its length, counting the calls."""
+
+    model = "fake"
+
+    def __init__(self) -> None:
+        """Start with no calls."""
+        self.calls = 0
+
+    @component.output_types(embedding=list[float], meta=dict[str, Any])
+    def run(self, text: str) -> dict[str, Any]:
+        """Return a two-dimensional embedding."""
+        self.calls += 1
+        return {"embedding": [float(len(text)), 0.5], "meta": {}}
+
+
+def test_cache_round_trip_and_persistence(tmp_path: Path) -> None:
+    """Test vectors survive reopening and are stored as float32 rows."""
+    cache = EmbeddingCache(tmp_path)
+    keys = [embedding_key("m", "a"), embedding_key("m", "b")]
+    assert cache.get_many(keys) == [None, None]
+
+    cache.put_many(keys, [[1.0, 2.0], [3.0, 4.0]])
+    cache.put_many(keys[:1], [[9.0, 9.0]])
+    assert cache.get_many(keys) == [[1.0, 2.0], [3.0, 4.0]]
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 2
+    assert cache.stats.hit_rate == 0.5
+
+    reopened = EmbeddingCache(tmp_path)
+    assert len(reopened) == 2
+    assert reopened.get_many(keys[::-1]) == [[3.0, 4.0], [1.0, 2.0]]
+    raw = np.fromfile(tmp_path / "vectors.f32", dtype=np.float32)
+    assert raw.tolist() == [1.0, 2.0, 3.0, 4.0]
+
+
+def test_cache_drops_torn_tail(tmp_path: Path) -> None:
+    """Test a half-written row is dropped when the cache is opened."""
+    cache = EmbeddingCache(tmp_path)
+    keys = [embedding_key("m", "a"), embedding_key("m", "b")]
+    cache.put_many(keys, [[1.0, 2.0], [3.0, 4.0]])
+    with (tmp_path / "index.bin").open("r+b") as f:
+        f.truncate(20)
+
+    reopened = EmbeddingCache(tmp_path)
+    assert len(reopened) == 1
+    assert reopened.get_many(keys) == [[1.0, 2.0], None]
+    reopened.put_many(keys[1:], [[5.0, 6.0]])
+    assert EmbeddingCache(tmp_path).get_many(keys) == [[1.0, 2.0], [5.0, 6.0]]
+
+
+def test_cache_shared_between_processes(tmp_path: Path) -> None:
+    """Test two caches on one folder read each other's appended rows."""
+    first = EmbeddingCache(tmp_path)
+    second = EmbeddingCache(tmp_path)
+    a, b, c = (embedding_key("m", text) for text in "abc")
+    first.put_many([a], [[1.0, 1.0]])
+    second.put_many([b], [[2.0, 2.0]])
+    first.put_many([c, b], [[3.0, 3.0], [9.0, 9.0]])
+    assert second.get_many([b, a, c]) == [[2.0, 2.0], [1.0, 1.0], [3.0, 3.0]]
+    assert first.get_many([b, a, c]) == [[2.0, 2.0], [1.0, 1.0], [3.0, 3.0]]
+    assert len(EmbeddingCache(tmp_path)) == 3
+
+
+def test_cache_rejects_other_dimension(tmp_path: Path) -> None:
+    """Test vectors of another dimension are refused."""
+    cache = EmbeddingCache(tmp_path)
+    cache.put_many([embedding_key("m", "a")], [[1.0, 2.0]])
+    with pytest.raises(ValueError, match="dimension 2"):
+        cache.put_many([embedding_key("m", "b")], [[1.0, 2.0, 3.0]])
+
+
+def test_embedding_space_tracks_settings() -> None:
+    """Test settings that change the vectors change the cache folder."""
+    embedder = FakeEmbedder()
+    space = embedding_space(embedder)
+    assert space.startswith("fake-")
+    embedder.prefix = "search_document: "  # type: ignore[attr-defined]
+    assert embedding_space(embedder) != space
+
+
+def test_cached_document_embedder(tmp_path: Path) -> None:
+    """Test only unseen texts reach the wrapped embedder, once each."""
+    inner = FakeEmbedder()
+    embedder = CachedDocumentEmbedder(inner, cache_fol=tmp_path)
+    docs = [Document(content=text, meta={"source": text}) for text in "aab"]
+
+    result = embedder.run(documents=docs)
+    assert inner.embedded == ["a", "b"]
+    assert [doc.embedding for doc in result["documents"]] == [[1.0, 1.0]] * 3
+    assert result["meta"] == {"model": "fake", "cache_hits": 0, "cache_misses": 3}
+
+    docs.append(Document(content="cc", meta={"source": "cc"}))
+    result = CachedDocumentEmbedder(FakeEmbedder(), cache_fol=tmp_path).run(
+        documents=docs
+    )
+    assert result["meta"]["cache_hits"] == 3
+    assert result["documents"][3].embedding == [2.0, 1.0]
+    assert docs[0].embedding is None
+
+
+def test_cached_text_embedder(tmp_path: Path) -> None:
+    """Test a repeated text is read from the cache."""
+    inner = FakeTextEmbedder()
+    embedder = CachedTextEmbedder(inner, cache_fol=tmp_path)
+    first = embedder.run(text="hello")
+    second = embedder.run(text="hello")
+    assert first == {"embedding": [5.0, 0.5], "meta": {"cache_hit": False}}
+    assert second == {"embedding": [5.0, 0.5], "meta": {"cache_hit": True}}
+    assert inner.calls == 1
+    assert embedder.cache.stats.hit_rate == 0.5
+
+
+def test_wrappers_use_an_empty_cache(tmp_path: Path) -> None:
+    """Test an empty cache passed in is used, not replaced."""
+    cache = EmbeddingCache(tmp_path / "given")
+    assert CachedTextEmbedder(FakeTextEmbedder(), cache=cache).cache is cache
+    embedder = CachedDocumentEmbedder(FakeEmbedder(), cache=cache, cache_fol=tmp_path)
+    assert embedder.cache is cache
@@ -0,0 +1,61 @@
+"""Tests for the hybrid BM25 and embedding retrieval."""
+
+from haystack import Document
+from haystack.components.retrievers.in_memory import InMemoryEmbeddingRetriever
+from haystack.document_stores.in_memory import InMemoryDocumentStore
+import pytest
+
+from project_name.rag.bm25 import BM25Index
+from project_name.rag.bm25 import BM25Retriever
+from project_name.rag.hybrid import HybridRetriever
+from project_name.rag.hybrid import reciprocal_rank_fusion
+from project_name.rag.query import HaystackRetriever
+
+
+def docs(*ids: str) -> list[Document]:
+    """Return empty documents with the given ids."""
+    return [Document(id=doc_id, content=doc_id) for doc_id in ids]
+
+
+def test_reciprocal_rank_fusion() -> None:
+    """Test chunks found by both rankings come first."""
+    fused = reciprocal_rank_fusion([docs("a", "b", "c"), docs("c", "d")], top_k=3)
+    assert [doc.id for doc in fused] == ["c", "a", "b"]
+    assert fused[0].score == pytest.approx(1 / 63 + 1 / 61)
+    assert fused[1].score == pytest.approx(1 / 61)
+    # Ties keep the order of first appearance
+    assert [d.id for d in reciprocal_rank_fusion([docs("x"), docs("y")], 2)] == [
+        "x",
+        "y",
+    ]
+
+
+def test_hybrid_finds_exact_identifiers() -> None:
+    """Test an identifier the embeddings miss is fused into the results."""
+    chunks = [
+        Document(id="err", content="ERR_CONN_RESET means the peer closed."),
+        Document(id="net", content="Network problems and connection errors."),
+        Document(id="db", content="Database connection pooling."),
+    ]
+    # The embeddings rank the generic chunk first and the exact one last
+    vectors = {"err": [0.2, 1.0], "net": [1.0, 0.0], "db": [0.9, 0.3]}
+    store = InMemoryDocumentStore()
+    store.write_documents(
+        [Document(id=d.id, content=d.content, embedding=vectors[d.id]) for d in chunks]
+    )
+    index = BM25Index()
+    index.add(chunks)
+
+    class FixedEmbedder:
+        def run(self, text: str) -> dict:  # noqa: ARG002
+            return {"embedding": [1.0, 0.0]}
+
+    hybrid = HybridRetriever(
+        BM25Retriever(index), InMemoryEmbeddingRetriever(store), candidate_factor=2
+    )
+    retriever = HaystackRetriever(FixedEmbedder(), hybrid)
+    dense = InMemoryEmbeddingRetriever(store).run(query_embedding=[1.0, 0.0], top_k=2)
+    assert "err" not in [doc.id for doc in dense["documents"]]
+
+    documents = retriever.retrieve("What does ERR_CONN_RESET mean?", top_k=2)
+    assert [doc.id for doc in documents] == ["err", "net"]
@@ -0,0 +1,176 @@
+"""Tests for the streaming document ingestion."""
+
+from haystack.document_stores.in_memory import InMemoryDocumentStore
+import pytest
+
+from project_name.config.rag.ingest_config import BM25Config
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.ingest_config import IngestConfig
+from project_name.rag.bm25 import BM25Index
+from project_name.rag.components import MissingApiKeyError
+from project_name.rag.components import build_document_embedder
+from project_name.rag.embedding_cache import CachedDocumentEmbedder
+from project_name.rag.ingest import DocumentIngestor
+from project_name.rag.ingest import IngestReport
+from tests.rag.conftest import FakeEmbedder
+
+
+def sources(store: InMemoryDocumentStore) -> dict[str, int]:
+    """Count the chunks in the store per source file."""
+    counts: dict[str, int] = {}
+    for doc in store.filter_documents():
+        counts[doc.meta["source"]] = counts.get(doc.meta["source"], 0) + 1
+    return counts
+
+
+def test_ingest_splits_embeds_and_writes(
+    ingest_config: IngestConfig, make_embedder: type[FakeEmbedder]
+) -> None:
+    """Test every matching file is chunked, embedded and written."""
+    store = InMemoryDocumentStore()
+    embedder = make_embedder()
+
+    report = DocumentIngestor(ingest_config, store, embedder).run()
+
+    assert report == IngestReport(added=3, chunks=6)
+    assert sources(store) == {"a.md": 4, "b.txt": 1, "sub/c.md": 1}
+    assert len(embedder.embedded) == 6
+    doc = store.filter_documents()[0]
+    assert doc.embedding is not None
+    assert len(doc.meta["content_hash"]) == 32
+
+
+def test_reingest_skips_unchanged_files(
+    ingest_config: IngestConfig, make_embedder: type[FakeEmbedder]
+) -> None:
+    """Test a re-ingest embeds only changed files and drops removed ones."""
+    store = InMemoryDocumentStore()
+    DocumentIngestor(ingest_config, store, make_embedder()).run()
+
+    data_fol = ingest_config.data_fol
+    (data_fol / "b.txt").write_text("bravo " * 15)
+    (data_fol / "sub" / "c.md").unlink()
+    (data_fol / "d.txt").write_text("delta")
+    embedder = make_embedder()
+    report = DocumentIngestor(ingest_config, store, embedder).run()
+
+    assert report == IngestReport(added=1, updated=1, unchanged=1, removed=1, chunks=3)
+    assert sorted(set(embedder.embedded)) == ["b.txt", "d.txt"]
+    assert sources(store) == {"a.md": 4, "b.txt": 2, "d.txt": 1}
+
+    embedder = make_embedder()
+    report = DocumentIngestor(ingest_config, store, embedder).run()
+    assert report == IngestReport(unchanged=3)
+    assert embedder.embedded == []
+
+
+def test_interrupted_ingest_leaves_no_orphans(
+    ingest_config: IngestConfig,
+    make_embedder: type[FakeEmbedder],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test chunks written before a crash are deleted once their file is gone."""
+    store = InMemoryDocumentStore()
+    ingestor = DocumentIngestor(ingest_config, store, make_embedder())
+
+    def crash(*_: object) -> None:
+        msg = "interrupted"
+        raise RuntimeError(msg)
+
+    # The first batch is written, then the run stops before the manifest is saved
+    monkeypatch.setattr(ingestor, "save_manifest", crash)
+    with pytest.raises(RuntimeError):
+        ingestor.run()
+    assert sources(store) == {"a.md": 4, "b.txt": 1}
+    assert ingestor.load_pending() == {"a.md", "b.txt"}
+
+    (ingest_config.data_fol / "b.txt").unlink()
+    ingestor = DocumentIngestor(ingest_config, store, make_embedder())
+    report = ingestor.run()
+
+    assert report == IngestReport(added=2, chunks=5)
+    assert sources(store) == {"a.md": 4, "sub/c.md": 1}
+    assert not ingestor.pending_fp.exists()
+
+
+def test_rebuilt_store_reads_the_embedding_cache(
+    ingest_config: IngestConfig, make_embedder: type[FakeEmbedder]
+) -> None:
+    """Test re-ingesting into an empty store embeds only the changed chunks."""
+    cache_fol = ingest_config.store.persist_fol.parent / "embeddings"
+    DocumentIngestor(
+        ingest_config,
+        InMemoryDocumentStore(),
+        CachedDocumentEmbedder(make_embedder(), cache_fol=cache_fol),
+    ).run()
+
+    # One changed chunk out of six, then a rebuild from scratch
+    (ingest_config.data_fol / "b.txt").write_text("bravo " * 4)
+    ingest_config.store.persist_fol.joinpath("ingest_manifest.json").unlink()
+    embedder = make_embedder()
+    report = DocumentIngestor(
+        ingest_config,
+        InMemoryDocumentStore(),
+        CachedDocumentEmbedder(embedder, cache_fol=cache_fol),
+    ).run()
+
+    assert report == IngestReport(added=3, chunks=6, cached_chunks=5)
+    assert embedder.embedded == ["b.txt"]
+
+
+def test_bm25_index_follows_the_store(
+    ingest_config: IngestConfig, make_embedder: type[FakeEmbedder]
+) -> None:
+    """Test the keyword index gets the chunks written and deleted in the store."""
+    store = InMemoryDocumentStore()
+    DocumentIngestor(ingest_config, store, make_embedder()).run()
+
+    # An index added to an ingested store is filled from the store
+    bm25_fol = ingest_config.store.persist_fol.parent / "bm25"
+    config = ingest_config.model_copy(update={"bm25": BM25Config(fol=bm25_fol)})
+    report = DocumentIngestor(config, store, make_embedder()).run()
+    assert report == IngestReport(unchanged=3)
+    assert len(BM25Index(bm25_fol)) == 6
+    # Both batches are saved once, at the end of the run
+    assert len(list(bm25_fol.glob("gen-*"))) == 1
+
+    (config.data_fol / "b.txt").write_text("bravo " * 15)
+    (config.data_fol / "sub" / "c.md").unlink()
+    DocumentIngestor(config, store, make_embedder()).run()
+
+    index = BM25Index(bm25_fol)
+    assert len(index) == store.count_documents() == 6
+    assert index.search("charlie", top_k=5) == []
+    hits = index.search("bravo", top_k=5)
+    assert {doc.id for doc in hits} == {
+        doc.id for doc in store.filter_documents() if doc.meta["source"] == "b.txt"
+    }
+
+
+def test_ingest_persists_to_chroma(
+    ingest_config: IngestConfig, make_embedder: type[FakeEmbedder]
+) -> None:
+    """Test the default store is a persistent Chroma collection."""
+    DocumentIngestor(ingest_config, embedder=make_embedder()).run()
+
+    reopened = DocumentIngestor(ingest_config, embedder=make_embedder())
+    assert reopened.document_store.count_documents() == 6
+    assert reopened.run() == IngestReport(unchanged=3)
+
+
+def test_build_document_embedder_uses_the_cache(ingest_config: IngestConfig) -> None:
+    """Test a configured cache folder wraps the embedder in the cache."""
+    assert not isinstance(
+        build_document_embedder(ingest_config.embedder), CachedDocumentEmbedder
+    )
+    cache_fol = ingest_config.store.persist_fol.parent / "embeddings"
+    config = ingest_config.embedder.model_copy(update={"cache_fol": cache_fol})
+    embedder = build_document_embedder(config)
+    assert isinstance(embedder, CachedDocumentEmbedder)
+    assert embedder.cache.fol.parent == cache_fol
+
+
+def test_openai_embedder_needs_api_key() -> None:
+    """Test the openai backend refuses to build without a key."""
+    with pytest.raises(MissingApiKeyError):
+        build_document_embedder(EmbedderConfig(backend="openai", model="m"))
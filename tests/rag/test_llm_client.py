@@ -0,0 +1,243 @@
+"""Tests for the shared batching, deduplicating LLM client."""
+
+import asyncio
+
+from haystack import Document
+from pydantic import SecretStr
+import pytest
+
+from project_name.config.rag.ingest_config import EmbedderConfig
+from project_name.config.rag.llm_client_config import LLMClientConfig
+from project_name.config.rag.query_config import GeneratorConfig
+from project_name.rag.chat import ChatBackendError
+from project_name.rag.llm_client import AdaptiveLimiter
+from project_name.rag.llm_client import EmbeddingBackendError
+from project_name.rag.llm_client import LLMClient
+from project_name.rag.llm_client import LLMDocumentEmbedder
+from project_name.rag.llm_client import build_llm_client
+from tests.rag.conftest import FAKE_LLM_TOKENS
+from tests.rag.conftest import FakeChatBackend
+from tests.rag.conftest import FakeEmbeddingBackend
+from tests.rag.conftest import fake_vector
+
+MESSAGES = [{"role": "user", "content": "Say hello"}]
+NO_BACKOFF = LLMClientConfig(retry_backoff=0.0)
+
+
+class ThrottledChatBackend(FakeChatBackend):
+    """Refuse the first request with 429, then stream the tokens."""
+
+    async def stream(self, messages: list[dict[str, str]]):  # noqa: ANN201
+        """Refuse the first request, then stream as ``FakeChatBackend``."""
+        if not self.messages:
+            self.messages.append(messages)
+            raise ChatBackendError(self.name, "slow down", 429)
+        async for text in super().stream(messages):
+            yield text
+
+
+class BrokenChatBackend(FakeChatBackend):
+    """Stream the tokens, then fail with an error that is not a backend error."""
+
+    async def stream(self, messages: list[dict[str, str]]):  # noqa: ANN201
+        """Stream as ``FakeChatBackend``, then raise ``RuntimeError``."""
+        async for text in super().stream(messages):
+            yield text
+        msg = "connection reset"
+        raise RuntimeError(msg)
+
+
+@pytest.mark.asyncio
+async def test_limiter_adapts_to_latency_and_throttling() -> None:
+    """Test the limit grows while saturated and fast, and shrinks otherwise."""
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=4)
+    await limiter.acquire()
+    await limiter.acquire()
+    limiter.record(0.0, ended_at=0.1)
+    assert limiter.baseline == 0.1
+    assert limiter.limit == pytest.approx(2.5)
+    limiter.release()
+    limiter.release()
+
+    # A 429 halves the limit once per round trip
+    limiter.record(1.0, throttled=True, ended_at=1.1)
+    assert limiter.limit == pytest.approx(1.25)
+    limiter.record(0.9, throttled=True, ended_at=1.2)
+    assert limiter.limit == pytest.approx(1.25)
+    limiter.record(2.0, throttled=True, ended_at=2.1)
+    assert limiter.limit == 1
+
+    # A slow response shrinks it, a fast one while idle leaves it
+    limiter.limit = 3.0
+    limiter.record(3.0, ended_at=3.5)
+    assert limiter.limit == pytest.approx(2.7)
+    limiter.record(4.0, ended_at=4.1)
+    assert limiter.limit == pytest.approx(2.7)
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_requests_in_flight() -> None:
+    """Test a request waits for a slot and a cancelled wait frees nothing."""
+    limiter = AdaptiveLimiter(initial=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    cancelled = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+    cancelled.cancel()
+    limiter.release()
+    await waiting
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_embeddings_share_a_batch() -> None:
+    """Test texts requested together are sent once, in one request."""
+    backend = FakeEmbeddingBackend()
+    client = LLMClient(backend)
+    one, two, again, many = await asyncio.gather(
+        client.embed("one"),
+        client.embed("two!"),
+        client.embed("one"),
+        client.embed_many(["three", "two!"]),
+    )
+    assert backend.batches == [["one", "two!", "three"]]
+    assert one == again == fake_vector("one")
+    assert two == fake_vector("two!")
+    assert many == [fake_vector("three"), fake_vector("two!")]
+    assert client.stats.deduplicated == 2
+    assert client.stats.embedding_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_large_requests_are_split_and_sent_concurrently() -> None:
+    """Test a long list is cut in ``batch_size`` requests sent at once."""
+    backend = FakeEmbeddingBackend(delay=0.01)
+    client = LLMClient(backend, batch_size=2)
+    texts = [f"text {i}" for i in range(5)]
+    assert await client.embed_many(texts) == [fake_vector(t) for t in texts]
+    assert [len(batch) for batch in backend.batches] == [2, 2, 1]
+    assert backend.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_throttled_embeddings_are_retried() -> None:
+    """Test 429s lower the limit and are retried up to ``max_retries``."""
+    backend = FakeEmbeddingBackend(throttle=2)
+    client = LLMClient(backend, config=NO_BACKOFF)
+    assert await client.embed("hi") == fake_vector("hi")
+    assert len(backend.batches) == 3
+    assert client.stats.throttled == 2
+    assert client.embedding_limiter.limit < NO_BACKOFF.initial_concurrency
+
+    backend.throttle = 10
+    with pytest.raises(EmbeddingBackendError, match="slow down"):
+        await client.embed("again")
+    assert client.stats.throttled == 2 + NO_BACKOFF.max_retries + 1
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_share_one_generation() -> None:
+    """Test a prompt in flight is streamed to every caller from the start."""
+    backend = FakeChatBackend(FAKE_LLM_TOKENS, delay=0.01)
+    client = LLMClient(chat_backend=backend)
+
+    async def answer(messages: list[dict[str, str]]) -> list[str]:
+        return [text async for text in client.stream(messages)]
+
+    first = asyncio.create_task(answer(MESSAGES))
+    await asyncio.sleep(0.015)
+    answers = await asyncio.gather(
+        first, answer(MESSAGES), answer([{"role": "user", "content": "Other"}])
+    )
+    assert answers == [FAKE_LLM_TOKENS] * 3
+    assert len(backend.messages) == 2
+    assert client.stats.deduplicated == 1
+
+    # Finished generations are not shared
+    assert await answer(MESSAGES) == FAKE_LLM_TOKENS
+    assert len(backend.messages) == 3
+
+
+@pytest.mark.asyncio
+async def test_shared_generation_stops_when_every_caller_leaves() -> None:
+    """Test the upstream request is closed once no caller reads it."""
+    backend = FakeChatBackend(["a"], hang=True)
+    client = LLMClient(chat_backend=backend)
+    streams = [client.stream(MESSAGES), client.stream(MESSAGES)]
+    assert [await anext(stream) for stream in streams] == ["a", "a"]
+    await streams[0].aclose()
+    await asyncio.sleep(0)
+    assert backend.finished == 0
+    await streams[1].aclose()
+    await asyncio.sleep(0.01)
+    assert backend.finished == 1
+    assert client.chat_limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_throttled_chat_is_retried_before_the_first_token() -> None:
+    """Test a 429 before any text retries the request."""
+    backend = ThrottledChatBackend(FAKE_LLM_TOKENS)
+    client = LLMClient(chat_backend=backend, config=NO_BACKOFF)
+    assert [text async for text in client.stream(MESSAGES)] == FAKE_LLM_TOKENS
+    assert client.stats.throttled == 1
+    assert len(backend.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_unexpected_chat_error_reaches_every_caller() -> None:
+    """Test any error of a shared generation is raised as a backend error."""
+    backend = BrokenChatBackend(["partial "], delay=0.01)
+    client = LLMClient(chat_backend=backend)
+
+    async def answer() -> tuple[list[str], str]:
+        parts: list[str] = []
+        try:
+            async for text in client.stream(MESSAGES):
+                parts.append(text)  # noqa: PERF401
+        except ChatBackendError as exc:
+            return parts, exc.reason
+        return parts, "completed"
+
+    answers = await asyncio.gather(answer(), answer())
+    assert answers == [(["partial "], "connection reset")] * 2
+    assert len(backend.messages) == 1
+
+
+def test_document_embedder_from_sync_code() -> None:
+    """Test the haystack component runs the client on its own loop."""
+    backend = FakeEmbeddingBackend()
+    client = LLMClient(backend, batch_size=2)
+    embedder = LLMDocumentEmbedder(
+        client, prefix="doc: ", meta_fields_to_embed=["title"]
+    )
+    documents = [
+        Document(content="alpha", meta={"title": "A"}),
+        Document(content="beta"),
+        Document(content="gamma"),
+    ]
+    result = embedder.run(documents=documents)
+    assert [doc.embedding for doc in result["documents"]] == [
+        fake_vector("doc: A\nalpha"),
+        fake_vector("doc: beta"),
+        fake_vector("doc: gamma"),
+    ]
+    assert embedder.run(documents=documents[:1])["meta"] == {"model": "fake"}
+    client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["openai", "ollama"])
+async def test_client_against_fake_server(backend: str, fake_llm_url: str) -> None:
+    """Test one pooled SDK client serves the embeddings and the answers."""
+    url = f"{fake_llm_url}/v1" if backend == "openai" else fake_llm_url
+    key = SecretStr("test-key") if backend == "openai" else None
+    client = build_llm_client(
+        EmbedderConfig(backend=backend, model="fake", url=url, api_key=key),
+        GeneratorConfig(backend=backend, model="fake", url=url, api_key=key),
+    )
+    assert client.embedding_backend.client is client.chat_backend.client  # type: ignore[union-attr]
+    assert await client.embed_many(["a", "bb"]) == [fake_vector("a"), fake_vector("bb")]
+    assert [text async for text in client.stream(MESSAGES)] == FAKE_LLM_TOKENS
+    await client.aclose()
@@ -0,0 +1,195 @@
+"""Tests for the streaming query service."""
+
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+
+from haystack import Document
+from haystack.components.retrievers.in_memory import InMemoryEmbeddingRetriever
+from haystack.document_stores.in_memory import InMemoryDocumentStore
+import pytest
+
+from project_name.rag.answer_cache import SemanticAnswerCache
+from project_name.rag.llm_client import LLMClient
+from project_name.rag.query import HaystackRetriever
+from project_name.rag.query import QueryBusyError
+from project_name.rag.query import QueryService
+from project_name.rag.query import build_messages
+from tests.rag.conftest import FakeChatBackend
+from tests.rag.conftest import FakeEmbeddingBackend
+from tests.rag.conftest import FakeRetriever
+from tests.rag.conftest import fake_vector
+
+DOCS = [
+    Document(content="Alpha is first.", meta={"source": "a.md"}, score=0.9),
+    Document(content="Bravo is second.", meta={"source": "b.md"}, score=0.5),
+]
+
+
+async def collect(
+    service: QueryService, question: str = "What is first?"
+) -> list[tuple[str, dict]]:
+    """Retrieve and stream one answer, returning all its events."""
+    documents = await service.retrieve(question)
+    return [event async for event in service.stream_answer(question, documents)]
+
+
+@pytest.mark.asyncio
+async def test_stream_answer_events() -> None:
+    """Test sources come first, then one event per token, then the timings."""
+    backend = FakeChatBackend(["Alpha", " is", " first."])
+    retriever = FakeRetriever(DOCS)
+    service = QueryService(retriever, backend, top_k=1)
+
+    events = await collect(service)
+
+    assert retriever.queries == [("What is first?", 1)]
+    assert events[0] == (
+        "sources",
+        {"sources": [{"id": DOCS[0].id, "source": "a.md", "score": 0.9}]},
+    )
+    assert [data["text"] for name, data in events if name == "token"] == [
+        "Alpha",
+        " is",
+        " first.",
+    ]
+    name, done = events[-1]
+    assert name == "done"
+    assert done["tokens"] == 3
+    assert 0 <= done["ttft_ms"] <= done["total_ms"]
+    assert "[1] Alpha is first." in backend.messages[0][1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_yields_error_event() -> None:
+    """Test a failing backend ends the stream with an error event."""
+    service = QueryService(FakeRetriever(DOCS), FakeChatBackend(["Al"], fail=True))
+    events = await collect(service)
+    assert [name for name, _ in events] == ["sources", "token", "error"]
+    assert "boom" in events[-1][1]["detail"]
+
+
+@pytest.mark.asyncio
+async def test_acquire_refuses_when_busy() -> None:
+    """Test a request waiting longer than queue_timeout is refused."""
+    service = QueryService(
+        FakeRetriever(DOCS), FakeChatBackend([]), max_concurrency=1, queue_timeout=0.01
+    )
+    await service.acquire()
+    assert service.in_flight == 1
+    with pytest.raises(QueryBusyError, match="All 1 answer slots"):
+        await service.acquire()
+
+    waiter = asyncio.create_task(service.acquire())
+    service.release()
+    await waiter
+    assert service.in_flight == 1
+    service.release()
+    assert service.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_answer_closes_backend_stream() -> None:
+    """Test closing the answer early closes the backend stream."""
+    backend = FakeChatBackend(["a", "b"], hang=True)
+    service = QueryService(FakeRetriever(DOCS), backend)
+    answer = service.stream_answer("q", DOCS)
+    assert [await anext(answer) for _ in range(3)][-1] == ("token", {"text": "b"})
+    await answer.aclose()
+    assert backend.finished == 1
+
+
+@pytest.mark.asyncio
+async def test_questions_embedded_through_the_client() -> None:
+    """Test concurrent questions share one embedding request of the client."""
+    embedding_backend = FakeEmbeddingBackend()
+    llm = LLMClient(embedding_backend, FakeChatBackend(["ok"]))
+    retriever = FakeRetriever(DOCS)
+    service = QueryService(retriever, llm, llm=llm)
+    vectors = await asyncio.gather(service.embed("one"), service.embed("three"))
+    assert vectors == [fake_vector("one"), fake_vector("three")]
+    assert embedding_backend.batches == [["one", "three"]]
+
+    events = await collect(service, "two")
+    assert embedding_backend.batches[-1] == ["two"]
+    assert retriever.embedded == []
+    assert events[1] == ("token", {"text": "ok"})
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_answered_from_cache(tmp_path: Path) -> None:
+    """Test a complete answer is cached and replayed for a close question."""
+    backend = FakeChatBackend(["Alpha", " is", " first."])
+    retriever = FakeRetriever(DOCS)
+    service = QueryService(
+        retriever,
+        backend,
+        answer_cache=SemanticAnswerCache(tmp_path / "answers.sqlite"),
+    )
+
+    async def ask(question: str) -> list[tuple[str, dict]]:
+        embedding = await service.embed(question)
+        cached = await service.cached_answer(embedding)
+        if cached is not None:
+            return [event async for event in service.replay(cached)]
+        documents = await service.retrieve(question, embedding=embedding)
+        answer = service.stream_answer(question, documents, embedding=embedding)
+        return [event async for event in answer]
+
+    generated = await ask("What is first?")
+    assert generated[-1][1]["cached"] is False
+    replayed = await ask("what is FIRST")
+    assert [name for name, _ in replayed] == ["sources", "token", "done"]
+    assert replayed[0] == generated[0]
+    assert replayed[1] == ("token", {"text": "Alpha is first."})
+    assert replayed[-1][1]["cached"] is True
+    assert replayed[-1][1]["similarity"] == pytest.approx(1.0)
+    # One generation, and each question embedded once
+    assert len(backend.messages) == 1
+    assert retriever.embedded == ["What is first?", "what is FIRST"]
+
+    await ask("Where is Bravo?")
+    assert len(backend.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_answer_is_not_cached(tmp_path: Path) -> None:
+    """Test an answer cut by a backend error is not cached."""
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite")
+    service = QueryService(
+        FakeRetriever(DOCS), FakeChatBackend(["Al"], fail=True), answer_cache=cache
+    )
+    embedding = await service.embed("q")
+    [event async for event in service.stream_answer("q", DOCS, embedding=embedding)]
+    assert len(cache) == 0
+
+
+def test_haystack_retriever() -> None:
+    """Test retrieval embeds the query and searches the store."""
+
+    class KeywordEmbedder:
+        def run(self, text: str) -> dict:
+            return {"embedding": [1.0, 0.0] if "Alpha" in text else [0.0, 1.0]}
+
+    embedder = KeywordEmbedder()
+    store = InMemoryDocumentStore()
+    store.write_documents(
+        [
+            replace(doc, embedding=embedder.run(doc.content or "")["embedding"])
+            for doc in DOCS
+        ]
+    )
+    retriever = HaystackRetriever(
+        embedder, InMemoryEmbeddingRetriever(document_store=store)
+    )
+    documents = retriever.retrieve("What is Alpha?", top_k=1)
+    assert [doc.content for doc in documents] == ["Alpha is first."]
+
+
+def test_build_messages() -> None:
+    """Test the context chunks are numbered in the user message."""
+    messages = build_messages("Q?", DOCS, "Be brief.")
+    assert messages[0] == {"role": "system", "content": "Be brief."}
+    assert messages[1]["content"] == (
+        "Context:\n[1] Alpha is first.\n\n[2] Bravo is second.\n\nQuestion: Q?"
+    )
@@ -0,0 +1,79 @@
+"""Import-time regression tests.
+
+Each test imports a module in a fresh interpreter with ``-X importtime`` and
+checks both which modules the import pulls in and its cumulative time, so
+worker boot and cold starts stay light.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time budgets in microseconds, well above the local
+# measurements to absorb slow CI machines
+IMPORT_BUDGET_US: dict[str, int] = {
+    "project_name.params.project_name_params": 250_000,
+    "project_name.webapp": 250_000,
+}
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """Import ``module`` in a subprocess and return cumulative times per module.
+
+    Args:
+        module: Dotted module name to import.
+
+    Returns:
+        Cumulative import time in microseconds for every imported module.
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ.copy(),
+    )
+    profile: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+@pytest.mark.parametrize(
+    ("module", "forbidden"),
+    [
+        (
+            "project_name.params.project_name_params",
+            [
+                "fastapi",
+                "project_name.params.sample_params",
+                "project_name.params.rag.answer_cache_params",
+                "project_name.params.rag.ingest_params",
+                "project_name.params.rag.llm_client_params",
+                "project_name.params.rag.query_params",
+                "project_name.params.webapp.webapp_params",
+            ],
+        ),
+        (
+            "project_name.webapp",
+            ["fastapi_tools", "project_name.webapp.app", "project_name.webapp.main"],
+        ),
+        ("project_name.rag", ["haystack", "chromadb"]),
+    ],
+)
+def test_import_is_lazy(module: str, forbidden: list[str]) -> None:
+    """Light imports do not pull in the heavy modules."""
+    profile = import_profile(module)
+    assert module in profile
+    assert not set(forbidden) & set(profile)
+
+
+@pytest.mark.parametrize(("module", "budget_us"), IMPORT_BUDGET_US.items())
+def test_import_time_budget(module: str, budget_us: int) -> None:
+    """Importing the module stays within its time budget."""
+    assert import_profile(module)[module] < budget_us
@@ -0,0 +1,85 @@
+"""Tests for the opt-in startup profiler."""
+
+import builtins
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+from project_name.startup_profile import STARTUP_PROFILE_ENV_VAR
+from project_name.startup_profile import StartupProfiler
+from project_name.startup_profile import check_budgets
+
+
+def test_disabled_profiler_records_nothing(tmp_path: Path) -> None:
+    """Without the env var, phases are not timed and no report is written."""
+    profiler = StartupProfiler()
+    with profiler.phase("build_app"):
+        pass
+    assert profiler.phases == []
+    assert profiler.write_report(tmp_path) is None
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """The env var enables profiling and may name the report path."""
+    monkeypatch.setenv(STARTUP_PROFILE_ENV_VAR, "0")
+    assert not StartupProfiler.from_env().enabled
+    monkeypatch.setenv(STARTUP_PROFILE_ENV_VAR, "1")
+    assert StartupProfiler.from_env().report_fp is None
+    monkeypatch.setenv(STARTUP_PROFILE_ENV_VAR, str(tmp_path / "p.json"))
+    assert StartupProfiler.from_env().report_fp == tmp_path / "p.json"
+
+
+def test_nested_phases(tmp_path: Path) -> None:
+    """Nested phases record their depth and parent in the report."""
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("build_app"), profiler.phase("create_app"):
+        pass
+    fp = profiler.write_report(tmp_path)
+    assert fp == tmp_path / "startup_profile.json"
+
+    report = json.loads(fp.read_text())
+    phases = {p["name"]: p for p in report["phases"]}
+    assert phases["build_app"]["depth"] == 0
+    assert phases["create_app"]["parent"] == "build_app"
+    assert report["budget_violations"] == []
+
+
+def test_import_hook(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """First imports are timed while the hook is installed."""
+    (tmp_path / "profiled_module.py").write_text("import profiled_child\n")
+    (tmp_path / "profiled_child.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    original = builtins.__import__
+
+    profiler = StartupProfiler(enabled=True)
+    profiler.install_import_hook()
+    try:
+        import profiled_module  # noqa: F401, PLC0415
+    finally:
+        profiler.uninstall_import_hook()
+        sys.modules.pop("profiled_module", None)
+        sys.modules.pop("profiled_child", None)
+
+    assert builtins.__import__ is original
+    timings = {i.module: i for i in profiler.imports}
+    parent, child = timings["profiled_module"], timings["profiled_child"]
+    assert parent.cumulative_ms >= child.cumulative_ms
+    assert parent.self_ms == pytest.approx(
+        parent.cumulative_ms - child.cumulative_ms, abs=1e-6
+    )
+
+
+def test_check_budgets() -> None:
+    """Phases over budget are reported; repeated phases are summed."""
+    report = {
+        "phases": [
+            {"name": "create_app", "duration_ms": 3.0},
+            {"name": "create_app", "duration_ms": 3.0},
+            {"name": "load_env", "duration_ms": 1.0},
+        ]
+    }
+    assert check_budgets(report, {"create_app": 5.0, "load_env": 5.0}) == [
+        "create_app: 6.0 ms > 5.0 ms"
+    ]
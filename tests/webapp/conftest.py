@@ -9,6 +9,7 @@ from unittest.mock import MagicMock
 from unittest.mock import patch
 
 from fastapi import FastAPI
+from fastapi.templating import Jinja2Templates
 from fastapi.testclient import TestClient
 from fastapi_tools import create_app
 from fastapi_tools.config.webapp_config import CORSConfig
@@ -20,6 +21,11 @@ from fastapi_tools.schemas.auth import GoogleUserInfo
 from fastapi_tools.schemas.auth import SessionData
 import pytest
 
+from project_name.webapp.api.v1.api_router import router as api_v1_router
+from project_name.webapp.core.assets import AssetManifest
+from project_name.webapp.core.assets import install_assets
+from project_name.webapp.core.templates import configure_templates
+from project_name.webapp.routers.assets_router import router as assets_router
 from project_name.webapp.routers.pages_router import router as pages_router
 
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -55,14 +61,25 @@ def test_config() -> WebappConfig:
 
 
 @pytest.fixture
-def app(test_config: WebappConfig) -> FastAPI:
+def app(test_config: WebappConfig, tmp_path: Path) -> FastAPI:
     """Create test FastAPI application."""
-    return create_app(
+    app = create_app(
         config=test_config,
-        extra_routers=[pages_router],
+        extra_routers=[pages_router, api_v1_router, assets_router],
         static_dir=_STATIC_DIR,
         templates_dir=_TEMPLATES_DIR,
     )
+    install_assets(app, tmp_path / "static_build")
+    configure_templates(app.state.templates, tmp_path / "jinja")
+    return app
+
+
+@pytest.fixture
+def templates() -> Jinja2Templates:
+    """Create a standalone template renderer on the project templates."""
+    templates = Jinja2Templates(directory=_TEMPLATES_DIR)
+    templates.env.globals["asset_url"] = AssetManifest().url
+    return templates
 
 
 @pytest.fixture
@@ -0,0 +1,83 @@
+"""Tests for the fingerprinted static asset pipeline."""
+
+import gzip
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+import pytest
+
+from project_name.webapp.core.assets import IMMUTABLE_CACHE_CONTROL
+from project_name.webapp.core.assets import AssetManifest
+from project_name.webapp.core.assets import build_assets
+from project_name.webapp.core.assets import fingerprint_name
+from project_name.webapp.core.assets import install_assets
+from project_name.webapp.routers.assets_router import router as assets_router
+
+_CSS = b"body { color: black; }\n" * 50
+
+
+@pytest.fixture
+def static_fol(tmp_path: Path) -> Path:
+    """Create a small static folder."""
+    static_fol = tmp_path / "static"
+    (static_fol / "css").mkdir(parents=True)
+    (static_fol / "css" / "app.css").write_bytes(_CSS)
+    (static_fol / "img").mkdir()
+    (static_fol / "img" / "photo.png").write_bytes(b"\x89PNG fake")
+    (static_fol / ".gitkeep").touch()
+    return static_fol
+
+
+def test_fingerprint_name() -> None:
+    """The hash goes before the suffix and changes with the content."""
+    name = fingerprint_name("css/app.css", b"a")
+    assert name.startswith("css/app.")
+    assert name.endswith(".css")
+    assert name != fingerprint_name("css/app.css", b"b")
+    assert fingerprint_name("LICENSE", b"a").startswith("LICENSE.")
+
+
+def test_build_assets(static_fol: Path, tmp_path: Path) -> None:
+    """Text assets get compressed siblings; the manifest round-trips."""
+    build_fol = tmp_path / "build"
+    manifest = build_assets(static_fol, build_fol, brotli_compress=lambda b: b[:5])
+
+    assert set(manifest.entries) == {"css/app.css", "img/photo.png"}
+    css = manifest.entries["css/app.css"]
+    assert css.encodings == ("br", "gzip")
+    assert gzip.decompress((build_fol / f"{css.path}.gz").read_bytes()) == _CSS
+    assert manifest.entries["img/photo.png"].encodings == ()
+
+    loaded = AssetManifest.load(build_fol / "manifest.json")
+    assert loaded.entries == manifest.entries
+    assert loaded.url("css/app.css") == f"/assets/{css.path}"
+    assert loaded.url("js/missing.js") == "/static/js/missing.js"
+
+
+def test_assets_route(static_fol: Path, tmp_path: Path) -> None:
+    """Built assets are served immutable, in the negotiated encoding."""
+    build_fol = tmp_path / "build"
+    manifest = build_assets(static_fol, build_fol)
+    app = FastAPI()
+    app.state.templates = Jinja2Templates(directory=tmp_path)
+    app.include_router(assets_router)
+    install_assets(app, build_fol)
+    client = TestClient(app)
+    url = manifest.url("css/app.css")
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.content == _CSS
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == _CSS
+
+    assert app.state.templates.env.globals["asset_url"]("css/app.css") == url
+    assert client.get("/assets/css/app.css").status_code == 404
+    assert client.get("/assets/../manifest.json").status_code == 404
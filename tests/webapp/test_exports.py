@@ -0,0 +1,18 @@
+"""Tests for the lazy router re-exports of the webapp packages."""
+
+from fastapi import APIRouter
+
+import project_name.webapp.main  # noqa: F401
+
+
+def test_router_exports_after_submodule_import() -> None:
+    """Test names shared with their submodule resolve to the routers."""
+    from project_name.webapp.api import v1_router  # noqa: PLC0415
+    from project_name.webapp.api.v1 import api_router  # noqa: PLC0415
+    from project_name.webapp.routers import assets_router  # noqa: PLC0415
+    from project_name.webapp.routers import pages_router  # noqa: PLC0415
+
+    assert isinstance(api_router, APIRouter)
+    assert isinstance(assets_router, APIRouter)
+    assert isinstance(pages_router, APIRouter)
+    assert v1_router is api_router
@@ -0,0 +1,31 @@
+"""Tests for the application shutdown hooks."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from project_name.webapp.core.lifespan import add_shutdown_hook
+
+
+def test_shutdown_hooks_run_after_the_app_lifespan() -> None:
+    """Hooks run at shutdown, last added first, inside the app's lifespan."""
+    events: list[str] = []
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    async def close_async() -> None:
+        events.append("async hook")
+
+    app = FastAPI(lifespan=lifespan)
+    add_shutdown_hook(app, lambda: events.append("sync hook"))
+    add_shutdown_hook(app, close_async)
+
+    with TestClient(app):
+        assert events == ["startup"]
+    assert events == ["startup", "async hook", "sync hook", "shutdown"]
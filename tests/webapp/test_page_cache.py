@@ -0,0 +1,50 @@
+"""Tests for the precompressed anonymous page cache."""
+
+import gzip
+
+from fastapi.templating import Jinja2Templates
+
+from project_name.webapp.core.page_cache import CachedPage
+from project_name.webapp.core.page_cache import PageCache
+from project_name.webapp.core.page_cache import accepted_encodings
+
+_ERROR_CONTEXT = {"user": None, "status_code": 404, "message": "Missing"}
+
+
+def test_accepted_encodings() -> None:
+    """Codings are parsed case-insensitively and q=0 excludes a coding."""
+    assert accepted_encodings("gzip, deflate, BR") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("gzip;q=0, br;q=0.5") == {"br"}
+    assert accepted_encodings(None) == set()
+
+
+def test_cached_page_encodings() -> None:
+    """Pages are stored once per coding, each with its own strong ETag."""
+    page = CachedPage.from_html("<p>hi</p>" * 100, brotli_compress=lambda b: b[:10])
+    assert gzip.decompress(page.bodies["gzip"]) == page.bodies["identity"]
+    assert len(set(page.etags.values())) == 3
+    assert page.choose_encoding("gzip, br") == "br"
+    assert page.choose_encoding("gzip") == "gzip"
+    assert page.choose_encoding("br;q=0, gzip") == "gzip"
+    assert page.choose_encoding(None) == "identity"
+
+    no_brotli = CachedPage.from_html("<p>hi</p>")
+    assert no_brotli.choose_encoding("br") == "identity"
+
+
+def test_page_rendered_once(templates: Jinja2Templates) -> None:
+    """A repeat lookup returns the same encoded page."""
+    cache = PageCache()
+    page = cache.get_page(templates, "pages/error.html", _ERROR_CONTEXT, 404)
+    assert page.status_code == 404
+    assert b"Missing" in page.bodies["identity"]
+    assert cache.get_page(templates, "pages/error.html", _ERROR_CONTEXT, 404) is page
+
+
+def test_page_cache_is_bounded(templates: Jinja2Templates) -> None:
+    """Client-controlled keys cannot grow the cache past max_entries."""
+    cache = PageCache(max_entries=2)
+    for code in (400, 401, 403):
+        context = {**_ERROR_CONTEXT, "status_code": code}
+        cache.get_page(templates, "pages/error.html", context, code)
+    assert len(cache) == 2
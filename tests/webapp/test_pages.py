@@ -30,6 +30,23 @@ class TestLandingPage:
         assert response.status_code == 200
         assert "Authentication failed" in response.text
 
+    def test_landing_gzip_and_not_modified(self, client: TestClient) -> None:
+        """Anonymous landing is served precompressed with a strong ETag."""
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "public" in response.headers["cache-control"]
+        assert "/auth/google/login" in response.text
+
+        cached = client.get(
+            "/",
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": response.headers["etag"],
+            },
+        )
+        assert cached.status_code == 304
+
     def test_landing_with_unknown_error(self, client: TestClient) -> None:
         """Landing page handles unknown error codes gracefully."""
         response = client.get("/?error=something_weird")
@@ -110,6 +127,25 @@ class TestUserCardPartial:
         # Should be a fragment, not a full page
         assert "<!DOCTYPE html>" not in response.text
 
+    def test_user_card_not_modified(self, authenticated_client: TestClient) -> None:
+        """A matching If-None-Match gets an empty 304 with the same ETag."""
+        response = authenticated_client.get("/pages/partials/user-card")
+        etag = response.headers["etag"]
+
+        cached = authenticated_client.get(
+            "/pages/partials/user-card",
+            headers={"HX-Request": "true", "If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert not cached.content
+
+        stale = authenticated_client.get(
+            "/pages/partials/user-card",
+            headers={"If-None-Match": '"stale"'},
+        )
+        assert stale.status_code == 200
+
     def test_user_card_unauthenticated(self, client: TestClient) -> None:
         """Unauthenticated request to partial returns 401 or redirect."""
         response = client.get(
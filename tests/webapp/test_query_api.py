@@ -0,0 +1,134 @@
+"""Tests for the streaming query API."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from haystack import Document
+import pytest
+
+from project_name.rag.answer_cache import SemanticAnswerCache
+from project_name.rag.query import QueryService
+from project_name.webapp.core.dependencies import close_query_service
+from project_name.webapp.core.dependencies import get_query_service
+from tests.rag.conftest import FakeChatBackend
+from tests.rag.conftest import FakeRetriever
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    """Parse a Server-Sent Events body, skipping comments."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1)
+            for line in block.splitlines()
+            if not line.startswith(":")
+        )
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.fixture
+def query_service(app: FastAPI) -> QueryService:
+    """Install a query service on fakes for the test app."""
+    service = QueryService(
+        FakeRetriever([Document(content="Alpha.", meta={"source": "a.md"})]),
+        FakeChatBackend(["Al", "pha"]),
+        max_concurrency=1,
+        queue_timeout=0.01,
+    )
+    app.dependency_overrides[get_query_service] = lambda: service
+    return service
+
+
+def test_query_requires_auth(client: TestClient, query_service: QueryService) -> None:
+    """Querying requires authentication."""
+    response = client.get("/api/v1/query", params={"q": "What?"})
+    assert response.status_code == 401
+
+
+def test_query_streams_events(
+    authenticated_client: TestClient, query_service: QueryService
+) -> None:
+    """The answer is streamed as sources, tokens and done events."""
+    response = authenticated_client.get(
+        "/api/v1/query", params={"q": "What?", "top_k": 3}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["x-accel-buffering"] == "no"
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["sources", "token", "token", "done"]
+    assert events[0][1]["sources"][0]["source"] == "a.md"
+    assert "".join(data["text"] for name, data in events if name == "token") == "Alpha"
+    assert events[-1][1]["ttft_ms"] <= events[-1][1]["total_ms"]
+    assert query_service.retriever.queries == [("What?", 3)]  # type: ignore[attr-defined]
+    assert query_service.in_flight == 0
+
+
+def test_query_answered_from_cache(
+    app: FastAPI, authenticated_client: TestClient, tmp_path: Path
+) -> None:
+    """A repeated question is answered from the cache, even with no free slot."""
+    backend = FakeChatBackend(["Al", "pha"])
+    service = QueryService(
+        FakeRetriever([Document(content="Alpha.", meta={"source": "a.md"})]),
+        backend,
+        max_concurrency=1,
+        queue_timeout=0.01,
+        answer_cache=SemanticAnswerCache(tmp_path / "answers.sqlite"),
+    )
+    app.dependency_overrides[get_query_service] = lambda: service
+    first = authenticated_client.get("/api/v1/query", params={"q": "What?"})
+    assert parse_events(first.text)[-1][1]["cached"] is False
+
+    asyncio.run(service.acquire())
+    second = authenticated_client.get("/api/v1/query", params={"q": "what"})
+    assert second.status_code == 200
+    events = parse_events(second.text)
+    assert [name for name, _ in events] == ["sources", "token", "done"]
+    assert events[1][1]["text"] == "Alpha"
+    assert events[-1][1]["cached"] is True
+    assert len(backend.messages) == 1
+
+
+def test_query_busy(
+    authenticated_client: TestClient, query_service: QueryService
+) -> None:
+    """A query finding every slot busy is refused with 503."""
+    asyncio.run(query_service.acquire())
+    response = authenticated_client.get("/api/v1/query", params={"q": "What?"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_query_validates_question(
+    authenticated_client: TestClient, query_service: QueryService
+) -> None:
+    """An empty question is rejected with 422."""
+    response = authenticated_client.get("/api/v1/query", params={"q": ""})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_close_query_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The shared service is closed and forgotten, and never built to be closed."""
+    closed: list[QueryService] = []
+
+    class ClosingService(QueryService):
+        async def aclose(self) -> None:
+            closed.append(self)
+
+    service = ClosingService(FakeRetriever([]), FakeChatBackend([]))
+    monkeypatch.setattr(QueryService, "from_config", classmethod(lambda *_: service))
+    get_query_service.cache_clear()
+    await close_query_service()
+    assert get_query_service.cache_info().currsize == 0
+
+    assert get_query_service() is service
+    await close_query_service()
+    assert closed == [service]
+    assert get_query_service.cache_info().currsize == 0
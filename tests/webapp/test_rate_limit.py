@@ -0,0 +1,132 @@
+"""Tests for the shared token-bucket rate limiter."""
+
+from pathlib import Path
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from project_name.webapp.core.rate_limit import LocalBucketStore
+from project_name.webapp.core.rate_limit import SharedMemoryBucketStore
+from project_name.webapp.core.rate_limit import SharedRateLimitMiddleware
+from project_name.webapp.core.rate_limit import TokenBucketLimiter
+from project_name.webapp.core.rate_limit import UnknownRateLimitBackendError
+from project_name.webapp.core.rate_limit import install_rate_limiter
+
+
+def test_local_store_grants_up_to_capacity() -> None:
+    """A full bucket grants its capacity, then nothing until refilled."""
+    store = LocalBucketStore()
+    assert store.take("k", 3, rate=0.0, capacity=5) == 3
+    assert store.take("k", 3, rate=0.0, capacity=5) == 2
+    assert store.take("k", 3, rate=0.0, capacity=5) == 0
+    assert store.take("other", 1, rate=0.0, capacity=5) == 1
+
+
+def test_shared_memory_store_is_shared(tmp_path: Path) -> None:
+    """Two stores on the same file see the same buckets, like two workers."""
+    fp = tmp_path / "rate_limit.shm"
+    first = SharedMemoryBucketStore(fp, n_slots=64)
+    second = SharedMemoryBucketStore(fp, n_slots=64)
+    try:
+        assert first.take("client", 4, rate=0.0, capacity=6) == 4
+        assert second.take("client", 4, rate=0.0, capacity=6) == 2
+        assert first.take("client", 1, rate=0.0, capacity=6) == 0
+    finally:
+        first.close()
+        second.close()
+
+
+def test_shared_memory_store_never_refills_on_collision(tmp_path: Path) -> None:
+    """Colliding keys probe for their own slot and are denied when none is free."""
+    store = SharedMemoryBucketStore(tmp_path / "rate_limit.shm", n_slots=2)
+    try:
+        assert store.take("a", 2, rate=0.0, capacity=2) == 2
+        assert store.take("b", 2, rate=0.0, capacity=2) == 2
+        assert store.take("a", 1, rate=0.0, capacity=2) == 0
+        assert store.take("b", 1, rate=0.0, capacity=2) == 0
+        assert store.take("c", 1, rate=0.0, capacity=2) == 0
+    finally:
+        store.close()
+
+    store = SharedMemoryBucketStore(tmp_path / "refill.shm", n_slots=1)
+    try:
+        assert store.take("a", 1, rate=1000.0, capacity=1) == 1
+        assert store.take("b", 1, rate=1000.0, capacity=1) == 0
+        time.sleep(0.01)
+        # A bucket that refilled frees its slot
+        assert store.take("b", 1, rate=1000.0, capacity=1) == 1
+    finally:
+        store.close()
+
+
+def test_limiter_leases_tokens() -> None:
+    """The limiter spends leased tokens locally before asking the store."""
+    store = LocalBucketStore()
+    limiter = TokenBucketLimiter(
+        store, requests_per_minute=0, burst_size=4, lease_size=2, lease_ttl=60
+    )
+    assert [limiter.allow("ip") for _ in range(5)] == [True] * 4 + [False]
+
+
+def test_limiters_share_one_budget() -> None:
+    """Limiters of different workers on one store share the bucket."""
+    store = LocalBucketStore()
+    workers = [
+        TokenBucketLimiter(store, requests_per_minute=0, burst_size=3, lease_size=1)
+        for _ in range(3)
+    ]
+    assert [worker.allow("ip") for worker in workers] == [True, True, True]
+    assert not any(worker.allow("ip") for worker in workers)
+
+
+@pytest.mark.asyncio
+async def test_aallow_asks_the_store_off_the_event_loop() -> None:
+    """The async limiter calls the store from a worker thread."""
+    threads: list[threading.Thread] = []
+
+    class RecordingStore(LocalBucketStore):
+        def take(self, key: str, n: int, rate: float, capacity: int) -> int:
+            threads.append(threading.current_thread())
+            return super().take(key, n, rate, capacity)
+
+    limiter = TokenBucketLimiter(
+        RecordingStore(), requests_per_minute=0, burst_size=2, lease_size=2
+    )
+    assert [await limiter.aallow("ip") for _ in range(3)] == [True, True, False]
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_middleware_returns_429() -> None:
+    """Requests over the limit are rejected with 429 and Retry-After."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    store = LocalBucketStore()
+    app.add_middleware(
+        SharedRateLimitMiddleware,
+        limiter=TokenBucketLimiter(store, requests_per_minute=0, burst_size=2),
+        auth_limiter=TokenBucketLimiter(store, requests_per_minute=0, burst_size=1),
+    )
+    client = TestClient(app)
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 200
+    response = client.get("/ping")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+
+def test_install_rate_limiter_unknown_backend() -> None:
+    """An unknown backend name raises a descriptive error."""
+
+    class FakeParams:
+        rate_limit_backend = "carrier-pigeon"
+
+    with pytest.raises(UnknownRateLimitBackendError):
+        install_rate_limiter(None, FakeParams(), None)  # type: ignore[arg-type]
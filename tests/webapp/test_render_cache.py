@@ -0,0 +1,72 @@
+"""Tests for the fragment render cache."""
+
+from fastapi.templating import Jinja2Templates
+from fastapi_tools.schemas.auth import GoogleUserInfo
+
+from project_name.webapp.core.render_cache import RenderCache
+from project_name.webapp.core.render_cache import context_key
+from project_name.webapp.core.render_cache import etag_matches
+from project_name.webapp.services.user_service import UserService
+
+_CARD = "partials/user_card.html"
+
+
+def _context(name: str = "Ada") -> dict:
+    return {"user": {"id": "u1", "name": name, "email": "ada@example.com"}}
+
+
+def test_context_key_is_stable() -> None:
+    """Key order does not matter; values and template names do."""
+    assert context_key(_CARD, {"a": 1, "b": 2}) == context_key(_CARD, {"b": 2, "a": 1})
+    assert context_key(_CARD, {"a": 1}) != context_key(_CARD, {"a": 2})
+    assert context_key(_CARD, {"a": 1}) != context_key("other.html", {"a": 1})
+
+
+def test_render_hits_cache(templates: Jinja2Templates) -> None:
+    """A repeat render returns the same cached fragment."""
+    cache = RenderCache()
+    first = cache.render(templates, _CARD, _context())
+    assert "ada@example.com" in first.html
+    assert cache.render(templates, _CARD, _context()) is first
+    assert cache.render(templates, _CARD, _context("Bob")).etag != first.etag
+
+
+def test_lru_eviction_and_ttl() -> None:
+    """The cache is bounded and entries expire."""
+    cache = RenderCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+    expiring = RenderCache(ttl_seconds=0)
+    expiring.put("a", "A")
+    assert expiring.get("a") is None
+
+
+def test_invalidated_by_user_service(
+    templates: Jinja2Templates,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """A user write in UserService drops that user's fragments."""
+    cache = RenderCache()
+    service = UserService()
+    service.add_update_listener(cache.invalidate_owner)
+    cache.render(templates, _CARD, _context(), owner=mock_google_user_info.sub)
+    cache.render(templates, _CARD, _context("Bob"), owner="someone_else")
+
+    service.get_or_create_user(mock_google_user_info)
+
+    assert len(cache) == 1
+    assert cache.invalidate_owner("someone_else") == 1
+
+
+def test_etag_matches() -> None:
+    """If-None-Match lists, weak tags and the wildcard are honoured."""
+    assert etag_matches('"x", W/"y"', '"y"')
+    assert etag_matches("*", '"y"')
+    assert not etag_matches(None, '"y"')
+    assert not etag_matches('"x"', '"y"')
@@ -0,0 +1,117 @@
+"""Tests for the Redis-backed session store and its local stand-in."""
+
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from fastapi_tools.schemas.auth import SessionData
+import pytest
+
+from project_name.webapp.core.local_redis import LocalRedis
+from project_name.webapp.core.session_store import RedisSessionStore
+from project_name.webapp.core.session_store import UnknownSessionBackendError
+from project_name.webapp.core.session_store import install_session_store
+
+
+@pytest.fixture
+def redis_client() -> LocalRedis:
+    """Create an in-process Redis stand-in."""
+    return LocalRedis()
+
+
+@pytest.fixture
+def store(redis_client: LocalRedis) -> RedisSessionStore:
+    """Create a session store with TTL refreshes flushed on every access."""
+    return RedisSessionStore(redis_client, ttl_seconds=600, refresh_interval=0)
+
+
+def test_local_redis_expiry(redis_client: LocalRedis) -> None:
+    """Keys expire and report TTLs like Redis."""
+    redis_client.set("a", b"1", ex=100)
+    redis_client.set("b", "2")
+    assert redis_client.get("a") == b"1"
+    assert redis_client.ttl("b") == -1
+    assert redis_client.ttl("missing") == -2
+    redis_client.expire("a", 0)
+    assert redis_client.get("a") is None
+
+
+def test_local_redis_pipeline(redis_client: LocalRedis) -> None:
+    """Pipelines buffer commands until execute."""
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.set("a", b"1").get("a").delete("a")
+    assert redis_client.get("a") is None
+    assert pipe.execute() == [True, b"1", 1]
+
+
+def test_create_and_get_session(
+    store: RedisSessionStore,
+    redis_client: LocalRedis,
+    mock_session_data: SessionData,
+) -> None:
+    """Sessions are stored in Redis and read back."""
+    store.create_session(mock_session_data)
+    assert redis_client.ttl(f"session:{mock_session_data.session_id}") == 600
+    assert store.get_session(mock_session_data.session_id) == mock_session_data
+
+
+def test_session_shared_between_stores(
+    redis_client: LocalRedis,
+    mock_session_data: SessionData,
+) -> None:
+    """A session created by one worker's store is visible to another."""
+    RedisSessionStore(redis_client, ttl_seconds=600).create_session(mock_session_data)
+    other = RedisSessionStore(redis_client, ttl_seconds=600)
+    assert other.get_session(mock_session_data.session_id) == mock_session_data
+
+
+def test_delete_session(
+    store: RedisSessionStore,
+    mock_session_data: SessionData,
+) -> None:
+    """Deleted sessions are gone from both Redis and the local cache."""
+    store.create_session(mock_session_data)
+    assert store.delete_session(mock_session_data.session_id) is True
+    assert store.get_session(mock_session_data.session_id) is None
+    assert store.delete_session(mock_session_data.session_id) is False
+
+
+def test_expired_session_is_dropped(
+    store: RedisSessionStore,
+    redis_client: LocalRedis,
+    mock_session_data: SessionData,
+) -> None:
+    """A session past its absolute expiry is not returned."""
+    expired = mock_session_data.model_copy(
+        update={"expires_at": datetime.now(UTC) - timedelta(seconds=1)}
+    )
+    key = f"session:{expired.session_id}"
+    redis_client.set(key, expired.model_dump_json().encode())
+    assert store.get_session(expired.session_id) is None
+    assert redis_client.get(key) is None
+
+
+def test_ttl_refresh_is_pipelined(
+    redis_client: LocalRedis,
+    mock_session_data: SessionData,
+) -> None:
+    """TTL refreshes are queued and sent together on flush."""
+    store = RedisSessionStore(redis_client, ttl_seconds=600, refresh_interval=3600)
+    store.create_session(mock_session_data)
+    key = f"session:{mock_session_data.session_id}"
+    redis_client.expire(key, 10)
+
+    store.get_session(mock_session_data.session_id)
+    assert redis_client.ttl(key) == 10
+    store.flush_refreshes()
+    assert redis_client.ttl(key) == 600
+
+
+def test_install_session_store_unknown_backend() -> None:
+    """An unknown backend name raises a descriptive error."""
+
+    class FakeParams:
+        session_backend = "carrier-pigeon"
+
+    with pytest.raises(UnknownSessionBackendError):
+        install_session_store(None, FakeParams())  # type: ignore[arg-type]
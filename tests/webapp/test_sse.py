@@ -0,0 +1,53 @@
+"""Tests for the Server-Sent Events response."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from project_name.webapp.core.sse import EventStreamResponse
+from project_name.webapp.core.sse import format_event
+
+
+def test_format_event() -> None:
+    """Events carry their name and a single-line JSON payload."""
+    assert format_event("token", {"text": "a\nb"}) == (
+        b'event: token\ndata: {"text":"a\\nb"}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_stream() -> None:
+    """A client leaving mid-stream cancels the generator and calls on_close."""
+    first_sent = asyncio.Event()
+    cleaned_up: list[str] = []
+
+    async def events() -> AsyncGenerator[tuple[str, Any]]:
+        try:
+            yield "token", {"text": "first"}
+            # A model thinking about its next token
+            await asyncio.Event().wait()
+        finally:
+            cleaned_up.append("events")
+
+    sent: list[dict[str, Any]] = []
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+        if b"first" in message.get("body", b""):
+            first_sent.set()
+
+    async def receive() -> dict[str, Any]:
+        await first_sent.wait()
+        return {"type": "http.disconnect"}
+
+    response = EventStreamResponse(
+        events(), on_close=lambda: cleaned_up.append("on_close")
+    )
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    await asyncio.wait_for(response(scope, receive, send), timeout=2)
+
+    assert cleaned_up == ["events", "on_close"]
+    assert sent[0]["status"] == 200
+    assert all(message.get("more_body", True) for message in sent[1:])
@@ -0,0 +1,66 @@
+"""Tests for the startup profile of the real application.
+
+The phase budgets depend on the machine, so they are checked only with
+``PROJECT_NAME_CHECK_STARTUP_BUDGET=1``; otherwise the test only checks that
+every phase was recorded.
+"""
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+from project_name.startup_profile import PHASE_BUDGETS_MS
+from project_name.startup_profile import STARTUP_PROFILE_ENV_VAR
+from project_name.startup_profile import check_budgets
+
+pytest.importorskip("fastapi_tools")
+
+CHECK_BUDGET_ENV_VAR = "PROJECT_NAME_CHECK_STARTUP_BUDGET"
+
+# Build the app with the cache folder, where the Jinja bytecode and the rate
+# limit buckets are written, moved to the folder given as first argument
+BUILD_APP = """
+import sys
+from pathlib import Path
+
+from project_name.params.project_name_paths import ProjectNamePaths
+
+load_common_config_pre = ProjectNamePaths.load_common_config_pre
+
+
+def load_in_tmp(self):
+    load_common_config_pre(self)
+    self.cache_fol = Path(sys.argv[1])
+
+
+ProjectNamePaths.load_common_config_pre = load_in_tmp
+
+from project_name.webapp.main import build_app
+
+build_app()
+"""
+
+
+def test_startup_profile(tmp_path: Path) -> None:
+    """Building the app in a fresh process records every phase."""
+    cache_fol = tmp_path / "cache"
+    report_fp = tmp_path / "startup_profile.json"
+    env = {**os.environ, STARTUP_PROFILE_ENV_VAR: str(report_fp)}
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-c", BUILD_APP, str(cache_fol)],
+        check=True,
+        capture_output=True,
+        env=env,
+    )
+
+    report = json.loads(report_fp.read_text())
+    recorded = {phase["name"] for phase in report["phases"]}
+    assert set(PHASE_BUDGETS_MS) <= recorded
+    assert report["imports"]["count"] > 0
+    assert (cache_fol / "jinja").is_dir()
+    if os.getenv(CHECK_BUDGET_ENV_VAR) == "1":
+        assert check_budgets(report) == []
@@ -0,0 +1,38 @@
+"""Tests for the Jinja2 bytecode cache and template precompilation."""
+
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+
+from project_name.webapp.core.templates import configure_templates
+
+_TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates"
+
+
+def test_configure_templates_precompiles_all(tmp_path: Path) -> None:
+    """Every template is compiled at startup and written to the bytecode cache."""
+    templates = Jinja2Templates(directory=_TEMPLATES_DIR)
+    n_templates = len(list(_TEMPLATES_DIR.rglob("*.html")))
+
+    count = configure_templates(templates, tmp_path / "jinja", auto_reload=False)
+
+    assert count == n_templates
+    assert len(templates.env.cache) == n_templates
+    assert len(list((tmp_path / "jinja").iterdir())) == n_templates
+    assert templates.env.auto_reload is False
+
+
+def test_bytecode_cache_is_reused(tmp_path: Path) -> None:
+    """A second environment loads from the bytecode cache, not from source."""
+    cache_fol = tmp_path / "jinja"
+    configure_templates(Jinja2Templates(directory=_TEMPLATES_DIR), cache_fol)
+    mtimes = {fp: fp.stat().st_mtime_ns for fp in cache_fol.iterdir()}
+
+    templates = Jinja2Templates(directory=_TEMPLATES_DIR)
+    configure_templates(templates, cache_fol, precompile=False)
+    html = templates.env.get_template("partials/user_card.html").render(
+        user={"name": "Ada", "email": "ada@example.com", "picture": None}
+    )
+
+    assert "ada@example.com" in html
+    assert {fp: fp.stat().st_mtime_ns for fp in cache_fol.iterdir()} == mtimes
@@ -0,0 +1,244 @@
+"""Tests for UserService and its storage backends."""
+
+from collections.abc import AsyncIterator
+from collections.abc import Generator
+from pathlib import Path
+
+from fastapi_tools.schemas.auth import GoogleUserInfo
+from fastapi_tools.schemas.auth import UserResponse
+import pytest
+
+from project_name.webapp.services import user_service
+from project_name.webapp.services.user_service import UserImportError
+from project_name.webapp.services.user_service import UserService
+from project_name.webapp.services.user_store import InMemoryUserStore
+from project_name.webapp.services.user_store import SqliteUserStore
+from project_name.webapp.services.user_store import UserRecord
+from project_name.webapp.services.user_store import UserStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> Generator[UserStore]:
+    """Yield each available user store backend."""
+    if request.param == "memory":
+        yield InMemoryUserStore()
+        return
+    sqlite_store = SqliteUserStore(tmp_path / "users.db", batch_size=2)
+    yield sqlite_store
+    sqlite_store.close()
+
+
+def test_get_or_create_user_creates(
+    store: UserStore,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """A new Google user is created and stored."""
+    service = UserService(store)
+    user = service.get_or_create_user(mock_google_user_info)
+    assert user.id == mock_google_user_info.sub
+    assert service.get_user_by_id(user.id) == user
+    assert len(store) == 1
+
+
+def test_get_or_create_user_updates(
+    store: UserStore,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """A changed Google profile updates the stored user and email index."""
+    service = UserService(store)
+    service.get_or_create_user(mock_google_user_info)
+    changed = mock_google_user_info.model_copy(update={"email": "new@example.com"})
+    service.get_or_create_user(changed)
+    assert service.get_user_by_email("new@example.com") is not None
+    assert service.get_user_by_email(mock_google_user_info.email) is None
+    assert len(store) == 1
+
+
+def test_get_user_by_email(
+    store: UserStore,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """Users can be looked up by email."""
+    service = UserService(store)
+    user = service.get_or_create_user(mock_google_user_info)
+    assert service.get_user_by_email(mock_google_user_info.email) == user
+    assert service.get_user_by_email("missing@example.com") is None
+
+
+def test_delete_user(
+    store: UserStore,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """Deleting removes the user from both indexes."""
+    service = UserService(store)
+    user = service.get_or_create_user(mock_google_user_info)
+    assert service.delete_user(user.id) is True
+    assert service.delete_user(user.id) is False
+    assert service.get_user_by_email(user.email) is None
+
+
+def test_matches(store: UserStore) -> None:
+    """A store matches a user only with the exact stored profile."""
+    store.put(UserResponse(id="u1", email="u1@example.com", name="One"))
+    assert store.matches("u1", "u1@example.com", "One", None)
+    assert not store.matches("u1", "u1@example.com", "One", "pic.png")
+    assert not store.matches("u1", "u1@example.com", "Renamed", None)
+    assert not store.matches("u2", "u1@example.com", "One", None)
+
+
+def test_put_many(store: UserStore) -> None:
+    """Bulk upserts write every user, across batch boundaries."""
+    users = [
+        UserResponse(id=f"id_{i}", email=f"u{i}@example.com", name=f"U{i}")
+        for i in range(5)
+    ]
+    assert store.put_many(users) == 5
+    assert len(store) == 5
+    assert store.get_by_email("u3@example.com") == users[3]
+
+
+def test_sqlite_store_persists(
+    tmp_path: Path,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """Users written to SQLite survive reopening the store."""
+    db_fp = tmp_path / "users.db"
+    first = SqliteUserStore(db_fp)
+    UserService(first).get_or_create_user(mock_google_user_info)
+    first.close()
+
+    second = SqliteUserStore(db_fp)
+    assert second.get(mock_google_user_info.sub) is not None
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_aget_or_create_user(mock_google_user_info: GoogleUserInfo) -> None:
+    """The async variant returns the same user as the sync one."""
+    service = UserService()
+    user = await service.aget_or_create_user(mock_google_user_info)
+    assert service.get_user_by_id(user.id) == user
+
+
+def test_repeat_login_skips_write(mock_google_user_info: GoogleUserInfo) -> None:
+    """An unchanged profile returns the stored user without rewriting it."""
+    service = UserService()
+    first = service.get_or_create_user(mock_google_user_info)
+    second = service.get_or_create_user(mock_google_user_info)
+    assert second == first
+    # Every caller gets a response of its own
+    assert second is not first
+    assert service.stats.hits == 1
+    assert service.stats.misses == 1
+
+
+def test_changed_profile_is_written(mock_google_user_info: GoogleUserInfo) -> None:
+    """A changed profile counts as a miss and updates the stored user."""
+    service = UserService()
+    service.get_or_create_user(mock_google_user_info)
+    changed = mock_google_user_info.model_copy(update={"name": "Renamed User"})
+    user = service.get_or_create_user(changed)
+    assert user.name == "Renamed User"
+    assert service.stats.hits == 0
+    assert service.stats.misses == 2
+
+
+def test_repeat_login_after_restart_skips_write(
+    tmp_path: Path,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """A fresh service compares with the persisted user instead of rewriting."""
+    store = SqliteUserStore(tmp_path / "users.db")
+    UserService(store).get_or_create_user(mock_google_user_info)
+
+    service = UserService(store)
+    service.get_or_create_user(mock_google_user_info)
+    assert service.stats.hits == 1
+    assert service.stats.misses == 0
+    store.close()
+
+
+def test_profile_written_by_another_service_is_seen(
+    tmp_path: Path,
+    mock_google_user_info: GoogleUserInfo,
+) -> None:
+    """A login compares with the stored user, not with what this process wrote."""
+    store = SqliteUserStore(tmp_path / "users.db")
+    first = UserService(store)
+    second = UserService(store)
+    first.get_or_create_user(mock_google_user_info)
+    changed = mock_google_user_info.model_copy(update={"name": "Renamed User"})
+    second.get_or_create_user(changed)
+
+    user = first.get_or_create_user(mock_google_user_info)
+    assert user.name == mock_google_user_info.name
+    assert store.get(user.id).name == mock_google_user_info.name  # type: ignore[union-attr]
+    assert first.stats.misses == 2
+    store.close()
+
+
+def test_ndjson_round_trip(store: UserStore) -> None:
+    """Users exported as NDJSON can be imported into another service."""
+    source = UserService(store)
+    source.import_users(
+        UserResponse(id=f"id_{i}", email=f"u{i}@example.com", name=f"U{i}")
+        for i in range(5)
+    )
+    lines = list(source.export_ndjson())
+    assert len(lines) == 5
+    assert all(line.endswith(b"\n") for line in lines)
+
+    target = UserService()
+    assert target.import_ndjson([*lines, b"\n"]) == 5
+    assert target.get_user_by_id("id_4") == source.get_user_by_id("id_4")
+
+
+@pytest.mark.asyncio
+async def test_aimport_ndjson_keeps_the_batches_before_an_invalid_line(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Streamed lines are written in batches until an invalid one."""
+    monkeypatch.setattr(user_service, "IMPORT_BATCH_SIZE", 2)
+    lines = [
+        UserResponse(id=f"id_{i}", email=f"u{i}@example.com", name=f"U{i}")
+        .model_dump_json()
+        .encode()
+        for i in range(3)
+    ]
+
+    async def stream(lines: list[bytes]) -> AsyncIterator[bytes]:
+        for line in lines:
+            yield line
+
+    service = UserService()
+    assert await service.aimport_ndjson(stream(lines)) == 3
+
+    store = InMemoryUserStore()
+    with pytest.raises(UserImportError) as exc_info:
+        await UserService(store).aimport_ndjson(stream([*lines, b'{"id": "bad"}']))
+    # The third user was in the batch of the invalid line
+    assert exc_info.value.imported == 2
+    assert len(store) == 2
+
+
+def test_import_notifies_after_the_write(store: UserStore) -> None:
+    """Listeners hear of imported users once they are in the store."""
+    service = UserService(store)
+    stored: list[bool] = []
+    service.add_update_listener(
+        lambda user_id: stored.append(service.get_user_by_id(user_id) is not None)
+    )
+    service.import_users(
+        UserResponse(id=f"id_{i}", email=f"u{i}@example.com", name=f"U{i}")
+        for i in range(3)
+    )
+    assert stored == [True, True, True]
+
+
+def test_user_record_round_trip() -> None:
+    """UserRecord converts to an equal UserResponse at the boundary."""
+    user = UserResponse(id="u1", email="u1@example.com", name="One", picture=None)
+    record = UserRecord.from_response(user)
+    assert not hasattr(record, "__dict__")
+    assert record.to_response() == user
+    assert record.to_response() is not record.to_response()
@@ -0,0 +1,87 @@
+"""Tests for the bulk user import / export API."""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from project_name.webapp.api.v1.users_router import MAX_LINE_BYTES
+from project_name.webapp.core.dependencies import get_admin_emails
+from project_name.webapp.core.dependencies import get_user_service
+from project_name.webapp.services.user_service import UserService
+
+NDJSON_BODY = (
+    b'{"id": "u1", "email": "u1@example.com", "name": "One"}\n'
+    b'{"id": "u2", "email": "u2@example.com", "name": "Two"}\n'
+)
+
+
+@pytest.fixture
+def user_service(app: FastAPI) -> UserService:
+    """Install a fresh UserService for the test app, with the test user as admin."""
+    service = UserService()
+    app.dependency_overrides[get_user_service] = lambda: service
+    app.dependency_overrides[get_admin_emails] = lambda: frozenset({"test@example.com"})
+    return service
+
+
+def test_export_requires_auth(client: TestClient) -> None:
+    """Exporting users requires authentication."""
+    response = client.get("/api/v1/users/export")
+    assert response.status_code == 401
+
+
+def test_import_then_export(
+    authenticated_client: TestClient,
+    user_service: UserService,
+) -> None:
+    """Imported users are streamed back as NDJSON."""
+    response = authenticated_client.post("/api/v1/users/import", content=NDJSON_BODY)
+    assert response.status_code == 200
+    assert "Imported 2 users" in response.json()["message"]
+    assert user_service.get_user_by_email("u2@example.com") is not None
+
+    response = authenticated_client.get("/api/v1/users/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.strip().splitlines()
+    assert len(lines) == 2
+    assert '"u1@example.com"' in lines[0]
+
+
+def test_import_invalid_line(
+    authenticated_client: TestClient,
+    user_service: UserService,
+) -> None:
+    """An invalid NDJSON line is rejected with 422."""
+    response = authenticated_client.post(
+        "/api/v1/users/import",
+        content=b'{"id": "u1"}\n',
+    )
+    assert response.status_code == 422
+
+
+def test_bulk_routes_require_admin(
+    app: FastAPI,
+    authenticated_client: TestClient,
+    user_service: UserService,
+) -> None:
+    """A session whose email is not an admin email gets 403."""
+    app.dependency_overrides[get_admin_emails] = lambda: frozenset(
+        {"admin@example.com"}
+    )
+    assert authenticated_client.get("/api/v1/users/export").status_code == 403
+    response = authenticated_client.post("/api/v1/users/import", content=NDJSON_BODY)
+    assert response.status_code == 403
+    assert user_service.get_user_by_email("u1@example.com") is None
+
+
+def test_import_rejects_long_line(
+    authenticated_client: TestClient,
+    user_service: UserService,
+) -> None:
+    """A line longer than ``MAX_LINE_BYTES`` is rejected with 413."""
+    response = authenticated_client.post(
+        "/api/v1/users/import",
+        content=b"x" * (MAX_LINE_BYTES + 1),
+    )
+    assert response.status_code == 413